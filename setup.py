@@ -137,7 +137,8 @@ setup(
 
     entry_points={
         'console_scripts': [
-            'rafcon_core = rafcon.core.start:main'
+            'rafcon_core = rafcon.core.start:main',
+            'rafcon_execution_log_index = rafcon.core.execution.log_index:main'
         ],
         'gui_scripts': [
             'rafcon_execution_log_viewer = rafcon.gui.execution_log_viewer:main',
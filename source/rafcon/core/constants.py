@@ -23,3 +23,10 @@ from rafcon.utils.constants import RAFCON_TEMP_PATH_STORAGE
 # Constants
 UNIQUE_DECIDER_STATE_ID = "unique_decider_state_id"
 DEFAULT_SCRIPT_PATH = RAFCON_TEMP_PATH_STORAGE
+
+# Execution backends of execution states
+#: The script is executed in the thread of the state (default)
+THREAD_BACKEND = "thread"
+#: The script is executed in a worker process (only available with Python 3)
+PROCESS_BACKEND = "process"
+EXECUTION_BACKENDS = (THREAD_BACKEND, PROCESS_BACKEND)
@@ -60,3 +60,15 @@ def lock_state_machine(func):
                 global_lock_counter -= 1
         return return_value
     return func_wrapper
+
+
+def lock_scoped_data(func):
+    @wraps_safely(func)
+    def func_wrapper(self, *args, **kwargs):
+        """ Decorate methods of container states modifying their scoped data during the execution. In contrast to
+        :func:`lock_state_machine`, only the scoped data lock of the container state is acquired, so concurrently
+        executed branches do not contend for the modification lock of the whole state machine.
+        """
+        with self._scoped_data_lock:
+            return func(self, *args, **kwargs)
+    return func_wrapper
@@ -0,0 +1,445 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: binary_log
+   :synopsis: An append-only binary file format for execution logs with a background writer and a streaming reader
+
+A binary log file starts with the :data:`MAGIC` bytes, followed by length-prefixed records. Each record consists of a
+header (codec, length of the key, length of the payload), the key (the history item id) and the payload (the pickled
+dictionary of the history item, optionally compressed). A record, which was not completely written (e.g. because of a
+crash), is ignored by the reader.
+"""
+from future import standard_library
+standard_library.install_aliases()
+from future.utils import native_str
+from builtins import object
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+import zlib
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+MAGIC = b"RAFCONLOG\x01"
+RECORD_HEADER = struct.Struct(">BHI")
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+
+def get_compression_codec():
+    """Return the codec used for compressed logs: zstd if the zstandard package is installed, zlib otherwise"""
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def encode_record(key, value, codec=CODEC_NONE):
+    """Encode a key and a value as binary log record
+
+    :param str key: the key of the record
+    :param value: the value of the record, which must be picklable
+    :param int codec: the compression codec of the payload
+    :return: the record
+    :rtype: bytes
+    """
+    key_bytes = native_str(key).encode("utf-8")
+    payload = pickle.dumps(value, protocol=2)
+    if codec == CODEC_ZLIB:
+        payload = zlib.compress(payload)
+    elif codec == CODEC_ZSTD:
+        payload = zstandard.ZstdCompressor().compress(payload)
+    return RECORD_HEADER.pack(codec, len(key_bytes), len(payload)) + key_bytes + payload
+
+
+def decode_payload(codec, payload):
+    """Decode the payload of a record
+
+    :param int codec: the compression codec of the payload
+    :param bytes payload: the payload
+    :return: the value of the record
+    """
+    if codec == CODEC_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ImportError("The Python package 'zstandard' is required to read zstd compressed execution logs")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec != CODEC_NONE:
+        raise ValueError("Unknown codec {0} of execution log record".format(codec))
+    return pickle.loads(payload)
+
+
+def is_binary_log(filename):
+    """Check whether the file is a binary log
+
+    :param str filename: the path of the file
+    :rtype: bool
+    """
+    try:
+        with open(filename, "rb") as log_file:
+            return log_file.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
+
+
+class BinaryExecutionHistoryStorage(object):
+    """Execution history storage writing the history items into a binary log file
+
+    The interface is the same as the one of :class:`rafcon.core.execution.execution_history.ExecutionHistoryStorage`.
+    Items are handed to a background thread via a bounded queue, thus the executing threads only block if the writer
+    cannot keep up. The writer appends all queued records at once and syncs the file to disk at most every
+    `fsync_interval` seconds, as well as on :meth:`flush` and :meth:`close`. If the file cannot be written, the error is
+    recorded in `error` and the writer discards all further items, so that neither the executing threads nor
+    :meth:`close` block on the queue.
+
+    :ivar str filename: the path of the log file
+    :ivar bool compress: whether the records are compressed (see :func:`get_compression_codec`)
+    :ivar float fsync_interval: the minimal time in seconds between two syncs of the file to disk
+    :ivar index: the index of the log (see :class:`rafcon.core.execution.log_index.ExecutionLogIndex`), updated by the
+        writer after each batch, or None
+    :ivar error: the exception, which stopped the writing of the log file, or None
+    """
+
+    def __init__(self, filename, compress=False, max_queue_size=10000, fsync_interval=1., index=False):
+        self.filename = filename
+        self.compress = compress
+        self.fsync_interval = fsync_interval
+        self.closed = False
+        self.error = None
+        self.index = None
+        if index:
+            from rafcon.core.execution.log_index import ExecutionLogIndex
+            self.index = ExecutionLogIndex(filename)
+        self._codec = get_compression_codec() if compress else CODEC_NONE
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._offsets = {}
+        self._last_sync = time.time()
+        self._file = open(filename, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._close_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_records, name="ExecutionLogWriter")
+        self._writer.daemon = True
+        self._writer.start()
+        logger.debug('Opened log file for writing %s' % self.filename)
+
+    def store_item(self, key, value):
+        """Queue an item for writing
+
+        :param str key: the history item id
+        :param dict value: the dictionary representation of the history item
+        """
+        if self.closed:
+            logger.error("Cannot store item {0}, the log file {1} is already closed".format(key, self.filename))
+            return
+        if self.error is not None:
+            # the error was already logged by the writer
+            return
+        self._put((key, value))
+
+    def _put(self, entry):
+        """Queue an entry for the writer, as long as the writer is running
+
+        :param entry: the entry to be queued
+        :return: whether the entry was queued
+        :rtype: bool
+        """
+        while self._writer.is_alive():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _write_records(self):
+        while True:
+            entries = [self._queue.get()]
+            try:
+                while True:
+                    entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if self.error is None:
+                try:
+                    if self._write_entries(entries):
+                        return
+                    continue
+                except Exception as e:
+                    self.error = e
+                    logger.exception("Could not write log file {0}, all further history items are discarded".format(
+                        self.filename))
+                    self._abort()
+
+            # the log file cannot be written anymore, thus all entries are dropped and waiting threads are released
+            for entry in entries:
+                if entry is None:
+                    return
+                elif isinstance(entry, threading.Event):
+                    entry.set()
+
+    def _write_entries(self, entries):
+        """Write a batch of queued entries to the log file
+
+        :param list entries: history items to be written, events of flush requests and None as close request
+        :return: True, if the log file was closed
+        :rtype: bool
+        """
+        written_offsets = {}
+        indexed_items = []
+        for entry in entries:
+            if entry is None:
+                self._offsets.update(written_offsets)
+                self._sync()
+                self._file.close()
+                self._update_index(indexed_items, complete=True)
+                return True
+            elif isinstance(entry, tuple):
+                key, value = entry
+                try:
+                    record = encode_record(key, value, self._codec)
+                except Exception:
+                    logger.exception("Could not encode history item {0}".format(key))
+                    continue
+                written_offsets[native_str(key)] = self._file.tell()
+                if self.index is not None:
+                    indexed_items.append((key, value, written_offsets[native_str(key)]))
+                self._file.write(record)
+            else:  # an event of a flush request
+                self._sync()
+                self._offsets.update(written_offsets)
+                written_offsets = {}
+                self._update_index(indexed_items)
+                indexed_items = []
+                self._last_sync = time.time()
+                entry.set()
+        self._file.flush()
+        # the offsets are published after the records were handed to the operating system, so they can be read
+        self._offsets.update(written_offsets)
+        self._update_index(indexed_items)
+        if time.time() - self._last_sync >= self.fsync_interval:
+            self._sync()
+            self._last_sync = time.time()
+        return False
+
+    def _update_index(self, indexed_items, complete=False):
+        if self.index is None:
+            return
+        try:
+            self.index.add_items(indexed_items)
+            if complete:
+                self.index.mark_complete()
+                self.index.close()
+            else:
+                self.index.commit()
+        except Exception:
+            logger.exception("Could not update the index of log file {0}".format(self.filename))
+
+    def _abort(self):
+        """Close the log file and its index after a write error, without marking the index as complete"""
+        try:
+            self._file.close()
+        except (IOError, OSError):
+            logger.exception("Could not close log file {0}".format(self.filename))
+        if self.index is not None:
+            try:
+                self.index.close()
+            except Exception:
+                logger.exception("Could not close the index of log file {0}".format(self.filename))
+
+    def _sync(self):
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except (IOError, OSError, ValueError):
+            logger.exception("Could not sync log file {0}".format(self.filename))
+
+    def flush(self):
+        """Wait until all queued items are written and synced to disk"""
+        if self.closed:
+            return
+        written = threading.Event()
+        if not self._put(written):
+            return
+        # the log file might be closed concurrently, then the request is not handled anymore
+        while not written.wait(0.1):
+            if not self._writer.is_alive():
+                return
+        logger.debug('Flushed log file %s' % self.filename)
+
+    def get_item(self, key):
+        """Read a stored item
+
+        :param str key: the history item id of the item
+        :return: the stored dictionary of the item or None, if it is not stored
+        """
+        offset = self._offsets.get(native_str(key))
+        if offset is None:
+            # the item might still be queued
+            self.flush()
+            offset = self._offsets.get(native_str(key))
+            if offset is None:
+                return None
+        try:
+            with open(self.filename, "rb") as log_file:
+                return BinaryLogReader.read_record_at(log_file, offset)[1]
+        except Exception:
+            logger.exception('Exception:')
+            return None
+
+    def close(self, make_read_and_writable_for_all=False):
+        """Write all queued items and close the log file
+
+        :param bool make_read_and_writable_for_all: if True, the file permissions are set to read and write for all
+        """
+        with self._close_lock:
+            if self.closed:
+                return
+            self.closed = True
+        # the writer also consumes the request, if the log file could not be written
+        self._put(None)
+        self._writer.join()
+        logger.debug('Closed log file %s' % self.filename)
+        if make_read_and_writable_for_all:
+            try:
+                os.chmod(self.filename, 0o666)
+                logger.debug('Set log file readable for all, file %s' % self.filename)
+            except OSError:
+                logger.debug('Could not make log file readable for all, file %s' % self.filename)
+
+    def __del__(self):
+        if hasattr(self, "_writer"):
+            self.close()
+
+
+class BinaryLogReader(Mapping):
+    """Read-only mapping of a binary log file from history item ids to the stored dictionaries
+
+    Only the offsets of the records are kept in memory, the records are read on access. :meth:`items` and
+    :meth:`values` stream the records sequentially, so the log can be processed without loading the whole file.
+
+    :ivar str filename: the path of the log file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError("{0} is not a binary execution log file".format(filename))
+        self._offsets = None
+
+    @staticmethod
+    def read_record_at(log_file, offset):
+        """Read the record at the given offset
+
+        :param log_file: the opened log file
+        :param int offset: the offset of the record
+        :return: the key and the value of the record
+        :rtype: tuple
+        """
+        log_file.seek(offset)
+        codec, key_length, payload_length = RECORD_HEADER.unpack(log_file.read(RECORD_HEADER.size))
+        key = log_file.read(key_length).decode("utf-8")
+        return key, decode_payload(codec, log_file.read(payload_length))
+
+    def _iter_record_headers(self, read_payload=False):
+        """Iterate over the complete records of the file
+
+        :return: tuples of the offset, key, codec and the payload (None, if `read_payload` is False) of each record
+        """
+        offset = len(MAGIC)
+        file_size = os.fstat(self._file.fileno()).st_size
+        while offset + RECORD_HEADER.size <= file_size:
+            self._file.seek(offset)
+            codec, key_length, payload_length = RECORD_HEADER.unpack(self._file.read(RECORD_HEADER.size))
+            record_end = offset + RECORD_HEADER.size + key_length + payload_length
+            if record_end > file_size:
+                break
+            key = self._file.read(key_length).decode("utf-8")
+            payload = self._file.read(payload_length) if read_payload else None
+            yield offset, native_str(key), codec, payload
+            offset = record_end
+        if offset != file_size:
+            logger.warning("The log file {0} ends with an incomplete record, which is ignored".format(self.filename))
+
+    def _get_offsets(self):
+        if self._offsets is None:
+            self._offsets = {key: offset for offset, key, _, _ in self._iter_record_headers()}
+        return self._offsets
+
+    def iter_records(self):
+        """Stream all records of the file in the order they were written
+
+        :return: tuples of record offset, history item id and dictionary of the history item
+        """
+        for offset, key, codec, payload in self._iter_record_headers(read_payload=True):
+            yield offset, key, decode_payload(codec, payload)
+
+    def iter_items(self):
+        """Stream all records of the file in the order they were written
+
+        :return: tuples of history item id and dictionary of the history item
+        """
+        for _, key, value in self.iter_records():
+            yield key, value
+
+    def read_item_at(self, offset):
+        """Read the value of the record at the given offset, e.g. taken from the index of the log
+
+        :param int offset: the offset of the record
+        :return: the dictionary of the history item
+        """
+        return self.read_record_at(self._file, offset)[1]
+
+    def items(self):
+        return self.iter_items()
+
+    def values(self):
+        return (value for _, value in self.iter_items())
+
+    def keys(self):
+        return list(self._get_offsets().keys())
+
+    def __getitem__(self, key):
+        offset = self._get_offsets()[native_str(key)]
+        return self.read_record_at(self._file, offset)[1]
+
+    def __contains__(self, key):
+        return native_str(key) in self._get_offsets()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._get_offsets())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,120 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: data_passing
+   :synopsis: A module defining how values are passed along data flows and into the execution history
+
+"""
+from copy import deepcopy
+from threading import Lock
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+DEEP_COPY = "deepcopy"
+SHARE = "share"
+READ_ONLY = "read_only"
+POLICIES = (DEEP_COPY, SHARE, READ_ONLY)
+
+
+class DataPassingPolicies(object):
+    """Resolves the passing policy for the type of a value
+
+    The policies are configured via the ``DATA_PASSING_POLICIES`` dictionary of the core config, mapping data type
+    names (as used for data ports, e.g. "numpy.ndarray" or "list") to one of :data:`POLICIES`. The policy of a type is
+    the one of the first class in its MRO having a configured policy, otherwise :data:`DEEP_COPY`. Resolved policies
+    are cached per type, the cache is reset if the configured dictionary changes.
+    """
+
+    def __init__(self):
+        self._configured_policies = None
+        self._policy_cache = {}
+        self._lock = Lock()
+
+    def _get_configured_policies(self):
+        configured_policies = global_config.get_config_value("DATA_PASSING_POLICIES", None) or {}
+        if configured_policies != self._configured_policies:
+            with self._lock:
+                self._policy_cache = {}
+                self._configured_policies = dict(configured_policies)
+        return self._configured_policies
+
+    def get_policy(self, value_type):
+        """Return the passing policy of a type
+
+        :param type value_type: the type of the passed value
+        :return: one of :data:`POLICIES`
+        :rtype: str
+        """
+        configured_policies = self._get_configured_policies()
+        if not configured_policies:
+            return DEEP_COPY
+        policy = self._policy_cache.get(value_type)
+        if policy is None:
+            policy = DEEP_COPY
+            for cls in getattr(value_type, "__mro__", (value_type, )):
+                names = (cls.__name__, "{0}.{1}".format(cls.__module__, cls.__name__))
+                configured_names = [name for name in names if name in configured_policies]
+                if configured_names:
+                    policy = configured_policies[configured_names[0]]
+                    if policy not in POLICIES:
+                        logger.error("Invalid data passing policy '{0}' for type {1}, using '{2}'".format(
+                            policy, configured_names[0], DEEP_COPY))
+                        policy = DEEP_COPY
+                    break
+            with self._lock:
+                self._policy_cache[value_type] = policy
+        return policy
+
+
+data_passing_policies = DataPassingPolicies()
+
+
+def get_read_only_value(value):
+    """Return a read-only representation of a value sharing its memory
+
+    Arrays providing writeable flags (like numpy arrays) are returned as read-only view on the same buffer. For all
+    other values no read-only representation is known, thus they are deep copied.
+
+    :param value: the value to be shared
+    :return: the read-only view or a copy of the value
+    """
+    flags = getattr(value, "flags", None)
+    if flags is not None and hasattr(flags, "writeable") and hasattr(value, "view"):
+        read_only_view = value.view()
+        read_only_view.flags.writeable = False
+        return read_only_view
+    return deepcopy(value)
+
+
+def pass_value(value):
+    """Return the value, which is passed along a data flow or stored in the execution history, according to its policy
+
+    :param value: the value of a data port or of scoped data
+    :return: a deep copy, a read-only view or the value itself
+    """
+    policy = data_passing_policies.get_policy(type(value))
+    if policy == SHARE:
+        return value
+    if policy == READ_ONLY:
+        return get_read_only_value(value)
+    return deepcopy(value)
+
+
+def pass_values(dictionary):
+    """Apply :func:`pass_value` to all values of a dictionary
+
+    :param dict dictionary: the data dictionary, e.g. the input data of a state
+    :return: a new dictionary with the passed values
+    :rtype: dict
+    """
+    if not isinstance(dictionary, dict):
+        return deepcopy(dictionary)
+    return {key: pass_value(value) for key, value in dictionary.items()}
@@ -27,7 +27,10 @@ import queue
 from threading import Lock, RLock
 import sys
 
+from future.utils import PY2
 from gtkmvc3.observable import Observable
+from rafcon.core.execution import execution_events
+from rafcon.core.execution.execution_events import ExecutionEventDispatcher, ExecutionFuture
 from rafcon.core.execution.execution_status import ExecutionStatus
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.config import global_config
@@ -43,6 +46,7 @@ class ExecutionEngine(Observable):
     :ivar state_machine_manager: holds the state machine manager of all states that can be executed
     :ivar status: holds the current execution status of the state machine
     :ivar execution_history: the history of the execution TODO: should be an list
+    :ivar execution_finished: the future of the current (or last) execution, done when the execution finished
 
     """
 
@@ -66,6 +70,9 @@ class ExecutionEngine(Observable):
         # counts how often a state asks for the current execution status
         self.state_counter = 0
         self.state_counter_lock = Lock()
+        self._events = ExecutionEventDispatcher()
+        self.execution_finished = ExecutionFuture()
+        self.execution_finished.set_result(None)
 
     @Observable.observed
     def pause(self):
@@ -172,15 +179,13 @@ class ExecutionEngine(Observable):
         :rtype: bool
         """
         if self.__wait_for_finishing_thread:
-            if not timeout:
-                # signal handlers won't work if timeout is None and the thread is joined
-                while True:
-                    self.__wait_for_finishing_thread.join(0.5)
-                    if not self.__wait_for_finishing_thread.isAlive():
-                        break
+            if not timeout and PY2:
+                # signal handlers won't work in Python 2 if the wait has no timeout
+                while not self.execution_finished.wait(0.5):
+                    pass
             else:
-                self.__wait_for_finishing_thread.join(timeout)
-            return not self.__wait_for_finishing_thread.is_alive()
+                self.execution_finished.wait(timeout)
+            return self.execution_finished.done()
         else:
             logger.warning("Cannot join as state machine was not started yet.")
             return False
@@ -206,6 +211,7 @@ class ExecutionEngine(Observable):
         self.__running_state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
 
         if self.__running_state_machine:
+            self.execution_finished = ExecutionFuture()
             self.__running_state_machine.start()
 
             self.__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
@@ -217,12 +223,51 @@ class ExecutionEngine(Observable):
     def _wait_for_finishing(self):
         """Observe running state machine and stop engine if execution has finished"""
         self.state_machine_running = True
-        self.__running_state_machine.join()
-        self.__set_execution_mode_to_finished()
-        self.state_machine_manager.active_state_machine_id = None
-        plugins.run_on_state_machine_execution_finished()
-        # self.__set_execution_mode_to_stopped()
-        self.state_machine_running = False
+        state_machine = self.__running_state_machine
+        execution_finished = self.execution_finished
+        try:
+            state_machine.join()
+            self.__set_execution_mode_to_finished()
+            self.state_machine_manager.active_state_machine_id = None
+            plugins.run_on_state_machine_execution_finished()
+            # self.__set_execution_mode_to_stopped()
+            self.state_machine_running = False
+            self._events.emit(execution_events.FINISHED, state_machine)
+        finally:
+            execution_finished.set_result(state_machine)
+
+    def add_event_callback(self, event, callback):
+        """Register a callback for an execution event
+
+        :param str event: one of the events defined in :mod:`rafcon.core.execution.execution_events`, e.g.
+            ``FINISHED`` or ``STATE_ENTERED``
+        :param callback: the function to call with the arguments of the event; it is called in the thread emitting
+            the event and must not block
+        """
+        self._events.add_callback(event, callback)
+
+    def remove_event_callback(self, event, callback):
+        """Unregister a callback registered with :meth:`add_event_callback`"""
+        self._events.remove_callback(event, callback)
+
+    def wait_for_event(self, event, timeout=None, condition=None):
+        """Block until the next occurrence of an execution event
+
+        To wait for the end of an execution, which might already be over, use :attr:`execution_finished` or
+        :meth:`join` instead.
+
+        :param str event: one of the events defined in :mod:`rafcon.core.execution.execution_events`
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :param condition: an optional function, which gets the arguments of the event and returns whether the wait
+            is over, e.g. to wait for a specific state being entered
+        :return: True if the event occurred, False if the timeout occurred
+        :rtype: bool
+        """
+        return self._events.wait_for(event, timeout, condition)
+
+    def notify_state_entered(self, state):
+        """Emit the ``STATE_ENTERED`` event, called by states starting their execution"""
+        self._events.emit(execution_events.STATE_ENTERED, state)
 
     def backward_step(self):
         """Take a backward step for all active states in the state machine
@@ -531,6 +576,13 @@ class ExecutionEngine(Observable):
         if notify:
             with self._status.execution_condition_variable:
                 self._status.execution_condition_variable.notify_all()
+        self._events.emit(execution_events.EXECUTION_MODE_CHANGED, execution_mode)
+        if execution_mode is StateMachineExecutionStatus.STARTED:
+            self._events.emit(execution_events.STARTED)
+        elif execution_mode is StateMachineExecutionStatus.PAUSED:
+            self._events.emit(execution_events.PAUSED)
+        elif execution_mode is StateMachineExecutionStatus.STOPPED:
+            self._events.emit(execution_events.STOPPED)
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
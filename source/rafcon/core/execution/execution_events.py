@@ -0,0 +1,157 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_events
+   :synopsis: Events and futures to synchronize with the execution of state machines without polling
+
+"""
+from builtins import object
+import threading
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+#: The execution mode of the execution engine changed, the callbacks get the new execution mode
+EXECUTION_MODE_CHANGED = "execution_mode_changed"
+#: The execution of a state machine was started or resumed
+STARTED = "started"
+#: The execution was paused
+PAUSED = "paused"
+#: The execution was stopped
+STOPPED = "stopped"
+#: The execution of a state machine finished, the callbacks get the state machine
+FINISHED = "finished"
+#: A state started its (forward) execution, the callbacks get the state and are called in the executing thread
+STATE_ENTERED = "state_entered"
+
+EVENTS = (EXECUTION_MODE_CHANGED, STARTED, PAUSED, STOPPED, FINISHED, STATE_ENTERED)
+
+
+class ExecutionFuture(object):
+    """The result of an asynchronous execution, e.g. of a state machine run
+
+    Threads can block on :meth:`wait` or :meth:`result` and callbacks can be registered, which are called with the
+    future as soon as the execution is done.
+    """
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the execution is done
+
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :return: True if the execution is done, False if the timeout occurred
+        :rtype: bool
+        """
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        """Block until the execution is done and return its result
+
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :return: the result of the execution
+        :raises RuntimeError: if the execution is not done within the timeout
+        """
+        if not self._done.wait(timeout):
+            raise RuntimeError("The execution did not finish within {0} seconds".format(timeout))
+        return self._result
+
+    def add_done_callback(self, callback):
+        """Register a callback, which is called with the future as argument as soon as the execution is done
+
+        If the execution is already done, the callback is called immediately.
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+    def set_result(self, result):
+        """Mark the execution as done, wake up all waiting threads and call the registered callbacks"""
+        with self._lock:
+            if self._done.is_set():
+                return
+            self._result = result
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call(callback)
+
+    def _call(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            logger.exception("Exception in callback {0} of execution future".format(callback))
+
+
+class ExecutionEventDispatcher(object):
+    """Registry of callbacks for execution events (see :data:`EVENTS`)
+
+    The callbacks are called in the thread emitting the event and should return quickly. Emitting an event without
+    registered callbacks is cheap.
+    """
+
+    def __init__(self):
+        self._callbacks = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, event, callback):
+        """Register a callback for an event
+
+        :param str event: one of :data:`EVENTS`
+        :param callback: the function to call with the arguments of the event
+        """
+        if event not in EVENTS:
+            raise ValueError("Unknown execution event {0}".format(event))
+        with self._lock:
+            # copy on write, so emit can iterate without lock
+            self._callbacks[event] = self._callbacks.get(event, ()) + (callback,)
+
+    def remove_callback(self, event, callback):
+        with self._lock:
+            callbacks = list(self._callbacks.get(event, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+
+    def emit(self, event, *args):
+        for callback in self._callbacks.get(event, ()):
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Exception in callback {0} of execution event {1}".format(callback, event))
+
+    def wait_for(self, event, timeout=None, condition=None):
+        """Block until the next occurrence of an event
+
+        :param str event: one of :data:`EVENTS`
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :param condition: an optional function, which gets the arguments of the event and returns whether the wait
+            is over
+        :return: True if the event occurred, False if the timeout occurred
+        :rtype: bool
+        """
+        occurred = threading.Event()
+
+        def callback(*args):
+            if condition is None or condition(*args):
+                occurred.set()
+        self.add_callback(event, callback)
+        try:
+            return occurred.wait(timeout)
+        finally:
+            self.remove_callback(event, callback)
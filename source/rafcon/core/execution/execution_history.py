@@ -21,6 +21,7 @@ from future.utils import native_str
 from builtins import object
 from builtins import range
 from builtins import str
+import sys
 import time
 import copy
 from collections import Iterable, Sized
@@ -33,7 +34,9 @@ from threading import Lock
 from enum import Enum
 from gtkmvc3.observable import Observable
 
+from rafcon.core.config import global_config
 from rafcon.core.id_generator import history_item_id_generator
+from rafcon.core.execution.data_passing import pass_values
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 import os
@@ -43,9 +46,14 @@ from weakref import ref
 
 
 class ExecutionHistoryStorage(object):
-    def __init__(self, filename):
+    def __init__(self, filename, index=False):
         self.filename = filename
         self.store_lock = Lock()
+        self.closed = False
+        self.index = None
+        if index:
+            from rafcon.core.execution.log_index import ExecutionLogIndex
+            self.index = ExecutionLogIndex(filename)
         try:
             # 'c' for read/write/create
             # protocol 2 cause of in some cases smaller file size
@@ -59,14 +67,37 @@ class ExecutionHistoryStorage(object):
         with self.store_lock:
             try:
                 self.store[native_str(key)] = value
+                if self.index is not None:
+                    self.index.add_items([(key, value, None)])
             except Exception:
                 logger.exception('Exception:')
 
+    def get_item(self, key):
+        """Read a stored item
+
+        :param str key: the history item id of the item
+        :return: the stored dictionary of the item or None, if it is not stored
+        """
+        with self.store_lock:
+            try:
+                if not self.closed:
+                    return self.store.get(native_str(key))
+                store = shelve.open(self.filename, flag='r', protocol=2)
+                try:
+                    return store.get(native_str(key))
+                finally:
+                    store.close()
+            except Exception:
+                logger.exception('Exception:')
+                return None
+
     def flush(self):
         with self.store_lock:
             try:
                 self.store.close()
                 self.store = shelve.open(self.filename, flag='c', protocol=2, writeback=False)
+                if self.index is not None:
+                    self.index.commit()
                 logger.debug('Flushed log file %s' % self.filename)
             except Exception:
                 if self.destroyed:
@@ -78,7 +109,12 @@ class ExecutionHistoryStorage(object):
         with self.store_lock:
             try:
                 self.store.close()
+                self.closed = True
                 logger.debug('Closed log file %s' % self.filename)
+                if self.index is not None:
+                    self.index.mark_complete()
+                    self.index.close()
+                    self.index = None
                 if make_read_and_writable_for_all:
                     ret = subprocess.call(['chmod', 'a+rw', self.filename])
                     if ret:
@@ -103,16 +139,36 @@ class ExecutionHistory(Observable, Iterable, Sized):
 
         It stores all history elements in a stack wise fashion.
 
+        If ``EXECUTION_HISTORY_MAX_ITEMS`` or ``EXECUTION_HISTORY_MAX_BYTES`` is configured, the history works as
+        ring buffer: the oldest items are evicted if the budget is exceeded. Evicted items are still accessible via
+        the execution history storage (if file logging is enabled), otherwise they are dropped. Backward stepping is
+        only possible within the retained items.
+
         :ivar initial_prev: optional link to a previous element for the first element pushed into this history of
                             type :class:`rafcon.core.execution.execution_history.HistoryItem`
+        :ivar int max_items: the maximum number of retained items, None for no limit
+        :ivar int max_bytes: the maximum estimated size of the retained items, None for no limit
     """
 
     def __init__(self, initial_prev=None):
         super(ExecutionHistory, self).__init__()
-        self._history_items = []            
+        self._history_items = []
         self.initial_prev = initial_prev
         self.execution_history_storage = None
         self.new_execution_command_handled = True
+        self.max_items = self._get_budget_config_value("EXECUTION_HISTORY_MAX_ITEMS")
+        self.max_bytes = self._get_budget_config_value("EXECUTION_HISTORY_MAX_BYTES")
+        self._size = 0
+        self._number_of_evicted_items = 0
+        self._last_evicted_item_id = None
+
+    @staticmethod
+    def _get_budget_config_value(key):
+        value = global_config.get_config_value(key, None)
+        # None is read as string from the config file
+        if value is None or value == "None":
+            return None
+        return int(value)
 
     def destroy(self):
         # logger.verbose("Destroy execution history!")
@@ -129,17 +185,116 @@ class ExecutionHistory(Observable, Iterable, Sized):
         self.initial_prev = None
 
     def __iter__(self):
-        return iter(self._history_items)                        
+        return iter(self._history_items)
 
     def set_execution_history_storage(self, execution_history_storage):
         self.execution_history_storage = execution_history_storage
-        
+
     def __len__(self):
         return len(self._history_items)
 
     def __getitem__(self, index):
         return self._history_items[index]
 
+    @property
+    def number_of_evicted_items(self):
+        """The number of items evicted from the history because of the configured budget"""
+        return self._number_of_evicted_items
+
+    @property
+    def size(self):
+        """The estimated size of the retained items in bytes"""
+        return self._size
+
+    def _is_over_budget(self):
+        # at least the last two items are retained, as the previous item of the last item is used during execution
+        if len(self._history_items) <= 2:
+            return False
+        if self.max_items is not None and len(self._history_items) > self.max_items:
+            return True
+        if self.max_bytes is not None and self._size > self.max_bytes:
+            return True
+        return False
+
+    def _evict_items(self):
+        while self._is_over_budget():
+            evicted_item = self._history_items.pop(0)
+            self._size -= evicted_item.size
+            self._number_of_evicted_items += 1
+            self._last_evicted_item_id = evicted_item.history_item_id
+            # unlink the evicted item, otherwise it would be kept alive by the references of the retained items
+            evicted_item.next = None
+            self._history_items[0].prev = None
+
+    def get_evicted_item_records(self, number_of_items, offset=0):
+        """Read evicted items from the execution history storage
+
+        The items are read from the newest to the oldest evicted item, by following the ids of the previous items.
+
+        :param int number_of_items: the maximum number of items to be read
+        :param int offset: the number of newest evicted items to be skipped
+        :return: the dictionaries of the items (see :meth:`HistoryItem.to_dict`), newest first
+        :rtype: list[dict]
+        """
+        records = []
+        if self.execution_history_storage is None:
+            return records
+        history_item_id = self._last_evicted_item_id
+        number_of_items = min(number_of_items, self._number_of_evicted_items - offset)
+        for index in range(offset + number_of_items):
+            if history_item_id is None:
+                break
+            record = self.execution_history_storage.get_item(history_item_id)
+            if record is None:
+                break
+            if index >= offset:
+                records.append(record)
+            history_item_id = record['prev_history_item_id']
+        return records
+
+    def _is_fully_retained(self):
+        if self._number_of_evicted_items > 0:
+            return False
+        for history_item in self._history_items:
+            if isinstance(history_item, ConcurrencyItem):
+                if not all(execution_history._is_fully_retained()
+                           for execution_history in history_item.execution_histories):
+                    return False
+        return True
+
+    def is_backward_step_possible(self):
+        """Check if the history items required for a backward step of a hierarchy state are retained
+
+        The hierarchy state, which is in the execution history of this history, either steps back its last child state
+        or leaves itself. Without evicted items, this is always possible.
+
+        :return: True, if the backward step is possible
+        :rtype: bool
+        """
+        if self._number_of_evicted_items == 0:
+            return True
+        history_items = self._history_items
+        last_history_item = self.get_last_history_item()
+        if isinstance(last_history_item, CallItem):
+            # the call item of the hierarchy state: the parent needs the item before to step back
+            return len(history_items) >= 2
+        if not isinstance(last_history_item, ReturnItem):
+            return False
+        # the call item of the child state and two items before are needed to leave the hierarchy state afterwards
+        for index in range(len(history_items) - 2, 1, -1):
+            history_item = history_items[index]
+            if isinstance(history_item, CallItem) and history_item.run_id == last_history_item.run_id and \
+                    history_item.state_reference is last_history_item.state_reference:
+                break
+        else:
+            return False
+        for history_item in history_items[index:]:
+            if isinstance(history_item, ConcurrencyItem):
+                if not all(execution_history._is_fully_retained()
+                           for execution_history in history_item.execution_histories):
+                    return False
+        return True
+
     def get_last_history_item(self):
         """Returns the history item that was added last
 
@@ -165,6 +320,9 @@ class ExecutionHistory(Observable, Iterable, Sized):
                 pass # this is fine
             else:
                 raise
+        else:
+            self._size += current_item.size
+            self._evict_items()
         return current_item
 
     @Observable.observed
@@ -232,6 +390,8 @@ class ExecutionHistory(Observable, Iterable, Sized):
         if self.execution_history_storage is not None:
             self.execution_history_storage.store_item(return_item.history_item_id, return_item.to_dict())
         self._history_items.append(return_item)
+        self._size += return_item.size
+        self._evict_items()
         return return_item
 
     @Observable.observed
@@ -242,10 +402,12 @@ class ExecutionHistory(Observable, Iterable, Sized):
         :rtype: HistoryItem
         """
         try:
-            return self._history_items.pop()
+            history_item = self._history_items.pop()
         except IndexError:
             logger.error("No item left in the history item list in the execution history.")
             return None
+        self._size -= history_item.size
+        return history_item
 
 
 class HistoryItem(object):
@@ -259,8 +421,11 @@ class HistoryItem(object):
     :ivar timestamp: the time of the call/return
     :ivar prev: the previous history item
     :ivar next: the next history item
+    :ivar size: the estimated size of the data held by the item in bytes
     """
 
+    size = 0
+
     def __init__(self, state, prev, run_id):
         self._state_reference = state
         self.path = copy.deepcopy(state.get_path())
@@ -387,7 +552,11 @@ class ScopedDataItem(HistoryItem):
             raise Exception('unkown calltype, neither CONTAINER nor EXECUTE')
         self.call_type = call_type
         self.scoped_data = {} if state_for_scoped_data is None else copy.deepcopy(state_for_scoped_data._scoped_data)
-        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data)
+        # the values of the scoped data are not copied, as ScopedData.__deepcopy__ only creates a shallow copy
+        self.child_state_input_output_data = pass_values(child_state_input_output_data)
+        self.size = sum(get_value_size(scoped_data.value) for scoped_data in self.scoped_data.values())
+        if self.child_state_input_output_data:
+            self.size += sum(get_value_size(value) for value in self.child_state_input_output_data.values())
 
     def to_dict(self):
         record = HistoryItem.to_dict(self)
@@ -494,4 +663,22 @@ class ConcurrencyItem(HistoryItem):
         super(ConcurrencyItem, self).destroy()
 
 
+def get_value_size(value):
+    """Estimate the memory size of a value in bytes
+
+    The size of array buffers (``nbytes``) is used if available, otherwise the shallow size of the object.
+
+    :param value: the value
+    :return: the estimated size in bytes
+    :rtype: int
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return sys.getsizeof(value)
+    except TypeError:
+        return 0
+
+
 CallType = Enum('METHOD_NAME', 'EXECUTE CONTAINER')
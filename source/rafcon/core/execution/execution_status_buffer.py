@@ -0,0 +1,79 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_status_buffer
+   :synopsis: A module to decouple observers of the execution status of states from the executing threads
+
+Each change of :attr:`rafcon.core.states.state.State.state_execution_status` is an observable operation, whose
+observers are called by the executing thread. If a consumer, like the GUI, enables the buffer, the changes are no
+longer notified through the observers, but only recorded. The consumer drains the recorded changes at its own rate and
+only processes the latest execution status of each state.
+"""
+
+from builtins import object
+from collections import deque, OrderedDict
+import threading
+
+
+class ExecutionStatusBuffer(object):
+    """Records the states whose execution status changed for consumers polling the changes
+
+    Recording only appends to a :class:`collections.deque`, which is thread-safe without a lock, so the executing
+    threads never wait for a consumer.
+    """
+
+    def __init__(self):
+        self._changed_states = deque()
+        self._consumers = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether execution status changes are recorded instead of being notified to the observers of the state"""
+        return self._consumers > 0
+
+    def enable(self):
+        """Registers a consumer, which regularly calls :meth:`drain`"""
+        with self._lock:
+            self._consumers += 1
+
+    def disable(self):
+        """Unregisters a consumer, without consumers the recorded changes are dropped"""
+        with self._lock:
+            self._consumers = max(0, self._consumers - 1)
+            if not self._consumers:
+                self._changed_states.clear()
+
+    def record(self, state):
+        """Records a change of the execution status of a state
+
+        :param rafcon.core.states.state.State state: the state whose execution status changed
+        """
+        self._changed_states.append(state)
+
+    def drain(self):
+        """Removes and returns all states, whose execution status changed since the last call
+
+        Multiple changes of the same state are coalesced, the states are ordered by their last change.
+
+        :return: the changed states
+        :rtype: list[rafcon.core.states.state.State]
+        """
+        changed_states = OrderedDict()
+        while True:
+            try:
+                state = self._changed_states.popleft()
+            except IndexError:
+                break
+            changed_states.pop(id(state), None)
+            changed_states[id(state)] = state
+        return list(changed_states.values())
+
+
+# This variable holds the global execution status buffer
+execution_status_buffer = ExecutionStatusBuffer()
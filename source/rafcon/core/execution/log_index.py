@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: log_index
+   :synopsis: A sidecar index for execution logs, allowing point queries by run_id, state path, item type and time
+
+The index is a SQLite database next to the log file (``<log file>.index``). It stores one row per history item with
+the history item id, the offset of the record in binary logs, the run_id, the state path (by id and by name), the item
+and call type and the timestamp. The index can be built incrementally while the log is written (see the
+``EXECUTION_LOG_INDEX`` config option) or afterwards with the ``rafcon_execution_log_index`` command.
+"""
+from future.utils import native_str
+from builtins import object
+import os
+import shelve
+import sqlite3
+import threading
+
+from rafcon.core.execution.binary_log import BinaryLogReader, is_binary_log
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+INDEX_FILE_EXTENSION = ".index"
+INDEX_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    history_item_id TEXT PRIMARY KEY,
+    offset INTEGER,
+    run_id TEXT,
+    run_id_number INTEGER,
+    path TEXT,
+    path_by_name TEXT,
+    item_type TEXT,
+    call_type TEXT,
+    timestamp REAL
+);
+CREATE INDEX IF NOT EXISTS items_run_id ON items (run_id);
+CREATE INDEX IF NOT EXISTS items_run_id_number ON items (run_id_number);
+CREATE INDEX IF NOT EXISTS items_path ON items (path);
+CREATE INDEX IF NOT EXISTS items_path_by_name ON items (path_by_name);
+CREATE INDEX IF NOT EXISTS items_item_type_timestamp ON items (item_type, timestamp);
+CREATE INDEX IF NOT EXISTS items_timestamp ON items (timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def get_index_filename(log_filename):
+    """Return the path of the index file belonging to a log file"""
+    return log_filename + INDEX_FILE_EXTENSION
+
+
+def get_run_id_number(run_id):
+    """Return the counter of a run_id (see :func:`rafcon.core.id_generator.run_id_generator`)
+
+    :param run_id: the run_id or directly its counter
+    :rtype: int
+    """
+    if isinstance(run_id, int):
+        return run_id
+    try:
+        return int(run_id.rsplit('.', 1)[-1])
+    except (AttributeError, ValueError):
+        return None
+
+
+class ExecutionLogIndex(object):
+    """Sidecar index of an execution log
+
+    The timestamps are indexed by a B-tree, so time windows are answered by range scans without explicit time
+    buckets. State paths are matched as prefixes, i.e. a query for a state also returns the items of its descendants.
+
+    :ivar str log_filename: the path of the indexed log file
+    :ivar str filename: the path of the index file
+    """
+
+    def __init__(self, log_filename, filename=None):
+        self.log_filename = log_filename
+        self.filename = filename if filename is not None else get_index_filename(log_filename)
+        self._lock = threading.Lock()
+        create = not os.path.exists(self.filename)
+        # the index is written by the thread writing the log, but might be created by another one
+        self._connection = sqlite3.connect(self.filename, check_same_thread=False)
+        if create:
+            self._connection.executescript(_SCHEMA)
+            self._set_meta("version", INDEX_VERSION)
+            self.commit()
+
+    @classmethod
+    def open(cls, log_filename):
+        """Open the index of a log file for querying
+
+        :param str log_filename: the path of the log file
+        :return: the index or None, if there is no complete and up-to-date index for the log
+        :rtype: ExecutionLogIndex
+        """
+        filename = get_index_filename(log_filename)
+        if not os.path.isfile(filename):
+            return None
+        try:
+            index = cls(log_filename)
+        except sqlite3.Error:
+            logger.warning("Could not open the execution log index {0}".format(filename))
+            return None
+        if not index.is_up_to_date():
+            logger.warning("The execution log index {0} is incomplete or outdated and is ignored".format(filename))
+            index.close()
+            return None
+        return index
+
+    @classmethod
+    def build(cls, log_filename):
+        """Build the index of an existing log file, replacing an existing index
+
+        :param str log_filename: the path of the log file
+        :return: the built index
+        :rtype: ExecutionLogIndex
+        """
+        filename = get_index_filename(log_filename)
+        if os.path.exists(filename):
+            os.remove(filename)
+        index = cls(log_filename)
+        if is_binary_log(log_filename):
+            with BinaryLogReader(log_filename) as reader:
+                index._add_in_batches((key, value, offset) for offset, key, value in reader.iter_records())
+        else:
+            log_file = shelve.open(log_filename, 'r')
+            try:
+                index._add_in_batches((key, value, None) for key, value in log_file.items())
+            finally:
+                log_file.close()
+        index.mark_complete()
+        return index
+
+    def _add_in_batches(self, items, batch_size=10000):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self.add_items(batch)
+                batch = []
+        self.add_items(batch)
+        self.commit()
+
+    def _set_meta(self, key, value):
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, native_str(value)))
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def add_items(self, items):
+        """Add history items to the index
+
+        :param items: tuples of history item id, the dictionary of the history item and the offset of its record (or
+            None for shelve logs)
+        """
+        rows = []
+        for key, value, offset in items:
+            rows.append((native_str(key), offset, value.get('run_id'), get_run_id_number(value.get('run_id')),
+                         value.get('path'), value.get('path_by_name'), value.get('item_type'),
+                         value.get('call_type'), value.get('timestamp')))
+        if not rows:
+            return
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def commit(self):
+        with self._lock:
+            self._connection.commit()
+
+    def mark_complete(self):
+        """Mark the index as complete, called after the last item of the log was added"""
+        if is_binary_log(self.log_filename):
+            self._set_meta("log_size", os.path.getsize(self.log_filename))
+        self._set_meta("complete", "1")
+        self.commit()
+
+    def is_up_to_date(self):
+        """Check whether the index is complete and, for binary logs, covers the whole log file"""
+        if self._get_meta("version") != INDEX_VERSION or self._get_meta("complete") != "1":
+            return False
+        log_size = self._get_meta("log_size")
+        if log_size is not None and os.path.isfile(self.log_filename):
+            return int(log_size) == os.path.getsize(self.log_filename)
+        return True
+
+    @staticmethod
+    def _get_conditions(state_path=None, run_id_range=None, time_window=None, item_type=None):
+        conditions = []
+        parameters = []
+        if state_path is not None:
+            # the range comparison uses the path indices, '0' is the character following '/'
+            conditions.append("(path = ? OR (path > ? AND path < ?) OR "
+                              "path_by_name = ? OR (path_by_name > ? AND path_by_name < ?))")
+            parameters.extend([state_path, state_path + '/', state_path + '0'] * 2)
+        if run_id_range is not None:
+            first, last = (None if bound is None else get_run_id_number(bound) for bound in run_id_range)
+            if first is not None:
+                conditions.append("run_id_number >= ?")
+                parameters.append(first)
+            if last is not None:
+                conditions.append("run_id_number <= ?")
+                parameters.append(last)
+        if time_window is not None:
+            start, end = time_window
+            if start is not None:
+                conditions.append("timestamp >= ?")
+                parameters.append(start)
+            if end is not None:
+                conditions.append("timestamp <= ?")
+                parameters.append(end)
+        if item_type is not None:
+            conditions.append("item_type = ?")
+            parameters.append(item_type)
+        return " AND ".join(conditions) if conditions else "1", parameters
+
+    def _query(self, query, parameters):
+        with self._lock:
+            return [(native_str(key), offset) for key, offset in self._connection.execute(query, parameters)]
+
+    def find_items(self, state_path=None, run_id_range=None, time_window=None, item_type=None):
+        """Find the history items fulfilling all given criteria
+
+        :param str state_path: the path of a state, by state ids or by state names
+        :param tuple run_id_range: (first, last) run_ids (or their counters); either bound can be None
+        :param tuple time_window: (start, end) time stamps in seconds since the epoch; either bound can be None
+        :param str item_type: the type of the history items, e.g. "CallItem"
+        :return: tuples of history item id and record offset (None for shelve logs), in the order of writing
+        :rtype: list
+        """
+        where, parameters = self._get_conditions(state_path, run_id_range, time_window, item_type)
+        return self._query("SELECT history_item_id, offset FROM items WHERE {0} ORDER BY rowid".format(where),
+                           parameters)
+
+    def find_state_executions(self, state_path=None, run_id_range=None, time_window=None):
+        """Find the call and return items of all state executions, whose CallItem fulfills the given criteria
+
+        :return: tuples of history item id and record offset (None for shelve logs), in the order of writing
+        :rtype: list
+        """
+        where, parameters = self._get_conditions(state_path, run_id_range, time_window, item_type="CallItem")
+        return self._query("SELECT history_item_id, offset FROM items WHERE item_type IN ('CallItem', 'ReturnItem') "
+                           "AND run_id IN (SELECT run_id FROM items WHERE {0}) ORDER BY rowid".format(where),
+                           parameters)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the sidecar index of RAFCON execution logs")
+    parser.add_argument("files", nargs='+', help="paths to the log files")
+    args = parser.parse_args()
+
+    for log_filename in args.files:
+        index = ExecutionLogIndex.build(log_filename)
+        logger.info("Indexed {0} history items of {1} in {2}".format(len(index), log_filename, index.filename))
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
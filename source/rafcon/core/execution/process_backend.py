@@ -0,0 +1,281 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: process_backend
+   :synopsis: Execution of the scripts of execution states in worker processes
+
+Execution states with the execution backend :data:`rafcon.core.constants.PROCESS_BACKEND` run their script in a
+separate process instead of the thread of the state. Thus, CPU bound scripts of concurrent branches are not serialized
+by the GIL.
+
+The inputs, outputs and persistent variables of the state are pickled and sent through a pipe. The executing thread of
+the state serves the calls of the script to the global variable manager (see :class:`GlobalVariableManagerProxy`)
+until the script returns. A preemption of the state is forwarded to the worker process as ``SIGINT``, which sets the
+``preempted`` flag of the state proxy in the worker, so that ``self.preemptive_wait`` returns. If the script does not
+return within ``EXECUTION_PROCESS_PREEMPTION_TIMEOUT`` seconds, the worker process is killed.
+
+This module is imported by the worker processes and therefore only depends on the standard library and
+:mod:`rafcon.utils.log`. It requires Python 3 and is only imported when a state with the process backend is executed.
+"""
+from builtins import object
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import signal
+import threading
+import time
+import traceback
+import types
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+# interval in which the executing thread checks for a preemption while waiting for the worker process
+_PREEMPTION_CHECK_INTERVAL = 0.05
+# only POSIX systems allow to interrupt the worker process with a signal, otherwise it is terminated directly
+_POSIX = os.name == 'posix'
+
+_STARTED = "started"
+_CALL = "call"
+_RESULT = "result"
+_EXCEPTION = "exception"
+# replaces the state proxy in the arguments of calls to the global variable manager, e.g. of `wait_for_change`
+_STATE = "__rafcon_calling_state__"
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def get_context():
+    """Return the multiprocessing context used to start the worker processes
+
+    Worker processes are not forked from the (multi-threaded) RAFCON process, but from a fork server, which only
+    imports this module, or are spawned on platforms without fork server.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _context = multiprocessing.get_context("forkserver")
+                _context.set_forkserver_preload([__name__])
+            else:
+                _context = multiprocessing.get_context("spawn")
+        return _context
+
+
+class ScriptProcessError(RuntimeError):
+    """Raised in the executing thread if the script failed in the worker process with an exception, which could not
+    be transferred"""
+    pass
+
+
+class StateProxy(object):
+    """Replacement for the execution state passed as `self` to the script in the worker process
+
+    It provides the attributes and methods of the execution state typically used by scripts.
+    """
+
+    def __init__(self, name, state_id, persistent_variables):
+        self.name = name
+        self.state_id = state_id
+        self.persistent_variables = persistent_variables
+        self.logger = log.get_logger(name)
+        self._preempted = threading.Event()
+
+    @property
+    def preempted(self):
+        return self._preempted.is_set()
+
+    def preempt(self, *args):
+        self._preempted.set()
+
+    def preemptive_wait(self, time=None):
+        """See :meth:`rafcon.core.states.state.State.preemptive_wait`"""
+        return self._preempted.wait(time)
+
+    def wait_for_interruption(self, timeout=None):
+        """In worker processes, only a preemption interrupts the script"""
+        return self._preempted.wait(timeout)
+
+
+class GlobalVariableManagerProxy(object):
+    """Replacement for the global variable manager passed to the script in the worker process
+
+    All public methods are forwarded to the global variable manager of the RAFCON process. As the values are
+    transferred by pickling, variables cannot be accessed per reference and no change callbacks can be registered. A
+    state proxy passed as argument is replaced by the calling state, so that e.g.
+    ``gvm.wait_for_change(key, state=self)`` is interrupted by a preemption of the state.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def _call(self, method, args, kwargs):
+        with self._lock:
+            self._connection.send((_CALL, method, args, kwargs))
+            message_type, value = self._connection.recv()
+        if message_type == _EXCEPTION:
+            raise value
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            if kwargs.get("per_reference"):
+                raise ValueError("Global variables cannot be accessed per reference from a worker process")
+            args = tuple(_STATE if isinstance(arg, StateProxy) else arg for arg in args)
+            kwargs = {key: _STATE if isinstance(arg, StateProxy) else arg for key, arg in kwargs.items()}
+            return self._call(name, args, kwargs)
+        method.__name__ = name
+        return method
+
+
+def _run_script(connection, task):
+    """Entry point of the worker processes"""
+    state = StateProxy(task["name"], task["state_id"], task["persistent_variables"])
+    signal.signal(signal.SIGINT, state.preempt)
+    # preemptions are only forwarded after the signal handler is installed
+    connection.send((_STARTED,))
+    gvm = GlobalVariableManagerProxy(connection)
+    try:
+        module = types.ModuleType(task["module_name"])
+        exec(compile(task["script"], task["filename"], 'exec'), module.__dict__)
+        inputs, outputs = task["inputs"], task["outputs"]
+        if task["backward_execution"]:
+            if hasattr(module, "backward_execute"):
+                outcome = module.backward_execute(state, inputs, outputs, gvm)
+            else:
+                outcome = None
+        else:
+            outcome = module.execute(state, inputs, outputs, gvm)
+        connection.send((_RESULT, (outcome, outputs, state.persistent_variables)))
+    except BaseException as e:
+        formatted_exc = traceback.format_exc()
+        try:
+            connection.send((_EXCEPTION, (e, formatted_exc)))
+        except Exception:
+            # the exception or its arguments cannot be pickled
+            connection.send((_EXCEPTION, (None, formatted_exc)))
+    finally:
+        connection.close()
+
+
+def _is_state_placeholder(arg):
+    return isinstance(arg, str) and arg == _STATE
+
+
+def _serve_call(connection, global_variable_manager, state, method, args, kwargs):
+    try:
+        if method.startswith('_'):
+            raise AttributeError("The global variable manager has no public method {0}".format(method))
+        args = tuple(state if _is_state_placeholder(arg) else arg for arg in args)
+        kwargs = {key: state if _is_state_placeholder(arg) else arg for key, arg in kwargs.items()}
+        value = getattr(global_variable_manager, method)(*args, **kwargs)
+        connection.send((_RESULT, value))
+    except Exception as e:
+        try:
+            connection.send((_EXCEPTION, e))
+        except Exception:
+            connection.send((_EXCEPTION, ScriptProcessError("{0}: {1}".format(type(e).__name__, e))))
+
+
+def execute_in_process(state, inputs, outputs, backward_execution=False):
+    """Execute the script of an execution state in a worker process
+
+    Blocks until the script returned, serving the calls of the script to the global variable manager in the meantime.
+    The outputs and the persistent variables of the state are updated with the values of the worker process.
+
+    :param rafcon.core.states.execution_state.ExecutionState state: the state whose script is executed
+    :param dict inputs: the input data of the script
+    :param dict outputs: the output data of the script
+    :param bool backward_execution: Flag whether to run the script in backwards mode
+    :return: Return value of the execute script or None, if the worker process was killed after a preemption
+    :raises ScriptProcessError: if the script raised an exception, which could not be transferred
+    """
+    from rafcon.core.config import global_config
+    from rafcon.core.singleton import global_variable_manager
+    script = state.script
+    task = {
+        "name": state.name,
+        "state_id": state.state_id,
+        "script": script.script,
+        "filename": '%s (%s)' % (script.filename, state.state_id),
+        "module_name": os.path.splitext(script.filename)[0] + state.state_id,
+        "inputs": inputs,
+        "outputs": outputs,
+        "persistent_variables": state.persistent_variables,
+        "backward_execution": backward_execution,
+    }
+    preemption_timeout = float(global_config.get_config_value("EXECUTION_PROCESS_PREEMPTION_TIMEOUT", 2.))
+
+    context = get_context()
+    connection, child_connection = context.Pipe()
+    process = context.Process(target=_run_script, args=(child_connection, task),
+                              name="RAFCON script of {0}".format(state.state_id))
+    process.daemon = True
+    process.start()
+    child_connection.close()
+
+    started = False
+    kill_time = None
+    try:
+        while True:
+            if state.preempted and kill_time is None and (started or not _POSIX):
+                if _POSIX:
+                    kill_time = time.time() + preemption_timeout
+                    os.kill(process.pid, signal.SIGINT)
+                else:
+                    kill_time = time.time()
+            if kill_time is not None and time.time() > kill_time:
+                logger.warning("The script of {0} did not return after its preemption and is killed".format(state))
+                return None
+            ready = wait([connection, process.sentinel], _PREEMPTION_CHECK_INTERVAL)
+            if connection in ready:
+                try:
+                    message = connection.recv()
+                except EOFError:
+                    message = None
+            elif process.sentinel in ready:
+                # the worker process exited, but might have sent a message before
+                message = connection.recv() if connection.poll() else None
+            else:
+                continue
+
+            if message is None:
+                process.join(preemption_timeout)
+                raise ScriptProcessError("The worker process of {0} exited unexpectedly with exit code {1}".format(
+                    state, process.exitcode))
+            message_type = message[0]
+            if message_type == _STARTED:
+                started = True
+            elif message_type == _CALL:
+                _serve_call(connection, global_variable_manager, state, *message[1:])
+            elif message_type == _RESULT:
+                outcome, new_outputs, persistent_variables = message[1]
+                outputs.clear()
+                outputs.update(new_outputs)
+                state.persistent_variables = persistent_variables
+                return outcome
+            else:
+                exception, formatted_exc = message[1]
+                if exception is None or not isinstance(exception, Exception):
+                    exception = ScriptProcessError(formatted_exc)
+                raise exception
+    finally:
+        connection.close()
+        process.join(preemption_timeout if kill_time is None else 0.)
+        if process.is_alive():
+            if _POSIX:
+                os.kill(process.pid, signal.SIGKILL)
+            else:
+                process.terminate()
+            process.join()
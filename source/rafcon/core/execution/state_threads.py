@@ -0,0 +1,179 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: state_threads
+   :synopsis: A module providing the thread-like objects states are executed in
+
+"""
+from future import standard_library
+standard_library.install_aliases()
+import queue
+import threading
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class InlineExecution(object):
+    """Thread-like object running its target synchronously in the calling thread
+
+    It is used for states, whose parent waits for them to finish right after starting them, e.g. the children of
+    hierarchy states. Like for a thread, exceptions of the target are logged and not propagated to the caller.
+    """
+
+    def __init__(self, target):
+        self._target = target
+
+    def start(self):
+        try:
+            self._target()
+        except Exception:
+            logger.exception("Exception in inline execution of {0}".format(self._target))
+
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class PooledExecution(object):
+    """Thread-like object running its target in a thread of a :class:`WorkerPool`
+
+    :ivar WorkerPool pool: the pool the target is executed in
+    """
+
+    def __init__(self, target, pool):
+        self._target = target
+        self._finished = threading.Event()
+        self.pool = pool
+
+    def start(self):
+        self.pool.submit(self._run)
+
+    def _run(self):
+        try:
+            self._target()
+        except Exception:
+            logger.exception("Exception in pooled execution of {0}".format(self._target))
+        finally:
+            self._finished.set()
+
+    def join(self, timeout=None):
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+
+class WorkerPool(object):
+    """A pool of reusable worker threads
+
+    A submitted task is handed over to an idle worker. If there is no idle worker, a new one is created. Thus a task is
+    never queued behind blocked tasks, which is required as a state waits for its concurrent child states, which are
+    executed in the same pool (nested concurrency states). The pool is bounded by the number of idle workers it keeps:
+    a worker finishing a task terminates, if there are already `max_idle_workers` idle workers, or if it does not get
+    a new task within `idle_timeout` seconds.
+
+    :ivar int max_idle_workers: the maximum number of idle workers kept alive
+    :ivar float idle_timeout: the time in seconds after which an idle worker terminates
+    """
+
+    def __init__(self, max_idle_workers=16, idle_timeout=60.):
+        self.max_idle_workers = max_idle_workers
+        self.idle_timeout = idle_timeout
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle_workers = 0
+        self._number_of_workers = 0
+        self._created_workers = 0
+
+    @property
+    def number_of_workers(self):
+        """The number of alive worker threads (busy or idle)"""
+        return self._number_of_workers
+
+    @property
+    def number_of_idle_workers(self):
+        """The number of worker threads waiting for a task"""
+        return self._idle_workers
+
+    def submit(self, task):
+        """Execute the task in a worker thread
+
+        :param task: a callable without arguments
+        """
+        with self._lock:
+            if self._idle_workers > 0:
+                self._idle_workers -= 1
+                self._tasks.put(task)
+                return
+            self._number_of_workers += 1
+            self._created_workers += 1
+            worker = threading.Thread(target=self._work, args=(task,),
+                                      name="StateWorker-{0}".format(self._created_workers))
+        worker.daemon = True
+        worker.start()
+
+    def _work(self, task):
+        while task is not None:
+            task()
+            task = self._get_next_task()
+
+    def _get_next_task(self):
+        with self._lock:
+            if self._idle_workers >= self.max_idle_workers:
+                self._number_of_workers -= 1
+                return None
+            self._idle_workers += 1
+        try:
+            return self._tasks.get(timeout=self.idle_timeout)
+        except queue.Empty:
+            with self._lock:
+                # a task might have been submitted right after the timeout, it was accounted to this worker
+                try:
+                    return self._tasks.get_nowait()
+                except queue.Empty:
+                    self._idle_workers -= 1
+                    self._number_of_workers -= 1
+                    return None
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Return the process-wide worker pool for concurrent state executions, which is created on first access
+
+    :rtype: WorkerPool
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WorkerPool(global_config.get_config_value("EXECUTION_THREAD_POOL_MAX_IDLE_THREADS", 16))
+        return _worker_pool
+
+
+def create_state_thread(target, sequential=False):
+    """Create a thread-like object for the execution of a state
+
+    If the ``EXECUTION_THREAD_POOL_ENABLED`` configuration is False, a new thread is created for every execution.
+    Otherwise, a sequential execution runs inline in the calling thread and all other executions use the worker pool.
+
+    :param target: the run method of the state
+    :param bool sequential: True, if the caller waits for the execution to finish right after starting it
+    :return: an object with the start() and join() methods of a thread
+    """
+    if not global_config.get_config_value("EXECUTION_THREAD_POOL_ENABLED", False):
+        return threading.Thread(target=target)
+    if sequential:
+        return InlineExecution(target)
+    return PooledExecution(target, get_worker_pool())
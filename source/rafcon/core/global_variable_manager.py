@@ -20,37 +20,143 @@
 
 """
 
+from future.utils import string_types, PY2
+from builtins import object
 from builtins import str
-import time
+from collections import namedtuple
 import copy
+import itertools
+import time
 from gtkmvc3.observable import Observable
-from threading import Lock, currentThread, RLock
+from threading import Event, Lock, currentThread, RLock
 from rafcon.core.id_generator import *
 
 from rafcon.utils.type_helpers import type_inherits_of_type
 from rafcon.utils import log
+from rafcon.utils import multi_event
 from rafcon.utils import type_helpers
 logger = log.get_logger(__name__)
 
+NUMBER_OF_SHARDS = 16
+# interval in seconds to inform the user about a thread waiting for a locked variable
+LOCK_WAIT_LOG_INTERVAL = 2.
+# interval in seconds to poll a locked variable with Python 2, which does not support timeouts of lock acquisitions
+LOCK_POLL_INTERVAL = 0.01
+
+#: A global variable, entries are never modified, but replaced on each change
+GlobalVariableEntry = namedtuple('GlobalVariableEntry', ['value', 'data_type', 'per_reference', 'version'])
+
+
+class GlobalVariableShard(object):
+    """A part of the global variables, chosen by the hash of the key
+
+    :ivar lock: guards the creation and deletion of the variables of the shard
+    :ivar dict entries: maps the keys onto :class:`GlobalVariableEntry` objects
+    :ivar dict variable_locks: holds one mutex for each global variable
+    :ivar dict access_keys: holds the access key to each variable locked with
+        :meth:`GlobalVariableManager.lock_variable`
+    """
+
+    __slots__ = ('lock', 'entries', 'variable_locks', 'access_keys')
+
+    def __init__(self):
+        self.lock = RLock()
+        self.entries = {}
+        self.variable_locks = {}
+        self.access_keys = {}
+
 
 class GlobalVariableManager(Observable):
     """A class for organizing all global variables of the state machine
 
-    :ivar __global_variable_dictionary: the dictionary, where all global variables are stored
-    :ivar __variable_locks: a dictionary that holds one mutex for each global variable
-    :ivar __global_lock: a mutex to prevent that the dictionary is written by two threads simultaneously
-    :ivar __access_keys: a dictionary that holds an access key to each locked global variable
-    :ivar __variable_references: a dictionary that stores whether a variable can be returned by reference or not
+    The variables are distributed over several shards. Readers do not acquire any lock, as each change of a variable
+    atomically replaces its :class:`GlobalVariableEntry`. Writers of a variable are serialized by the mutex of the
+    variable, creations and deletions by the lock of the shard. Values are copied outside of all locks.
+
+    Each change of a variable assigns it a new version, which is larger than all previous versions. Readers polling for
+    updates can use :meth:`get_if_newer` to only copy changed values. Instead of polling, threads can block in
+    :meth:`wait_for_change` or register callbacks with :meth:`add_change_callback`.
+
+    :ivar __shards: the shards holding the global variables
+    :ivar __versions: the counter for the versions of the variables
+    :ivar __change_callbacks: maps keys (or None for all keys) onto tuples of callbacks
     """
 
-    def __init__(self):
+    def __init__(self, number_of_shards=NUMBER_OF_SHARDS):
         Observable.__init__(self)
-        self.__global_variable_dictionary = {}
-        self.__global_variable_type_dictionary = {}
-        self.__variable_locks = {}
-        self.__global_lock = RLock()
-        self.__access_keys = {}
-        self.__variable_references = {}
+        self.__shards = tuple(GlobalVariableShard() for _ in range(number_of_shards))
+        self.__versions = itertools.count(1)
+        self.__change_callbacks = {}
+        self.__change_callbacks_lock = Lock()
+
+    def __get_shard(self, key):
+        return self.__shards[hash(key) % len(self.__shards)]
+
+    @staticmethod
+    def __get_variable_lock(shard, key, create=False):
+        variable_lock = shard.variable_locks.get(key)
+        if variable_lock is None and create:
+            with shard.lock:
+                variable_lock = shard.variable_locks.setdefault(key, Lock())
+        return variable_lock
+
+    @staticmethod
+    def __acquire_variable_lock(variable_lock, timeout):
+        """Acquire the mutex of a variable within the given timeout
+
+        :return: whether the mutex was acquired
+        :rtype: bool
+        """
+        if not PY2:
+            return variable_lock.acquire(True, timeout)
+        end_time = time.time() + timeout
+        while not variable_lock.acquire(False):
+            if time.time() >= end_time:
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+        return True
+
+    @staticmethod
+    def __wait_for_variable_lock(variable_lock, key):
+        """Acquire the mutex of a variable, informing the user about long waits"""
+        duration = 0.
+        while not GlobalVariableManager.__acquire_variable_lock(variable_lock, LOCK_WAIT_LOG_INTERVAL):
+            duration += LOCK_WAIT_LOG_INTERVAL
+            logger.verbose("Variable '{2}' is locked and thread {0} waits already {1} seconds to access it."
+                           "".format(currentThread(), duration, key))
+
+    @staticmethod
+    def __is_locked_by(shard, key, access_key):
+        variable_lock = shard.variable_locks.get(key)
+        return access_key is not None and variable_lock is not None and variable_lock.locked() and \
+            shard.access_keys.get(key) == access_key
+
+    def __read_entry(self, shard, key, access_key):
+        """Return the entry of a variable, waiting until it is unlocked if locked by someone else
+
+        :raises exceptions.RuntimeError: if a wrong access key is passed
+        """
+        entry = shard.entries.get(key)
+        if entry is not None and key in shard.access_keys and not self.__is_locked_by(shard, key, access_key):
+            variable_lock = shard.variable_locks.get(key)
+            if variable_lock is not None and variable_lock.locked():
+                if access_key:
+                    raise RuntimeError("Wrong access key for accessing global variable")
+                # wait for the variable to be unlocked, to not read a value, which is about to be changed
+                self.__wait_for_variable_lock(variable_lock, key)
+                variable_lock.release()
+                entry = shard.entries.get(key)
+        return entry
+
+    @staticmethod
+    def __get_value(entry, per_reference):
+        if entry.per_reference:
+            if per_reference or per_reference is None:
+                return entry.value
+            return copy.deepcopy(entry.value)
+        if per_reference:
+            raise RuntimeError("Variable cannot be accessed by reference")
+        return copy.deepcopy(entry.value)
 
     @Observable.observed
     def set_variable(self, key, value, per_reference=False, access_key=None, data_type=None):
@@ -63,45 +169,34 @@ class GlobalVariableManager(Observable):
         :raises exceptions.RuntimeError: if a wrong access key is passed
         """
         key = str(key)  # Ensure that we have the same string type for all keys (under Python2 and 3!)
-        if self.variable_exist(key):
-            if data_type is None:
-                data_type = self.__global_variable_type_dictionary[key]
-        else:
-            if data_type is None:
-                data_type = type(None)
+        shard = self.__get_shard(key)
+        entry = shard.entries.get(key)
+        if data_type is None:
+            data_type = entry.data_type if entry is not None else type(None)
         assert isinstance(data_type, type)
         self.check_value_and_type(value, data_type)
-
-        with self.__global_lock:
-            unlock = True
-            if self.variable_exist(key):
-                if self.is_locked(key) and not access_key:  # case: locked, no access key; thus, wait until I get lock
-                    access_key = self.lock_variable(key, block=True)
-                elif self.is_locked(key) and self.__access_keys[key] != access_key:  # case: locked, but wrong access key
-                    raise RuntimeError("Wrong access key for accessing global variable")
-                elif self.is_locked(key):  # case: locked and correct access key
-                    unlock = False
-                else:  # case not locked
-                    access_key = self.lock_variable(key, block=True)
-            else:
-                self.__variable_locks[key] = Lock()
-                access_key = self.lock_variable(key, block=True)
-
+        stored_value = value if per_reference else copy.deepcopy(value)
+
+        variable_lock = self.__get_variable_lock(shard, key, create=True)
+        locked_by_caller = self.__is_locked_by(shard, key, access_key)
+        if not locked_by_caller:
+            if access_key and variable_lock.locked():  # case: locked, but wrong access key
+                raise RuntimeError("Wrong access key for accessing global variable")
+            self.__wait_for_variable_lock(variable_lock, key)
+        try:
             # --- variable locked
-            if per_reference:
-                self.__global_variable_dictionary[key] = value
-                self.__global_variable_type_dictionary[key] = data_type
-                self.__variable_references[key] = True
-            else:
-                self.__global_variable_dictionary[key] = copy.deepcopy(value)
-                self.__global_variable_type_dictionary[key] = data_type
-                self.__variable_references[key] = False
+            with shard.lock:
+                shard.variable_locks.setdefault(key, variable_lock)
+                version = next(self.__versions)
+                shard.entries[key] = GlobalVariableEntry(stored_value, data_type, bool(per_reference), version)
+        finally:
             # --- release variable
+            if not locked_by_caller:
+                variable_lock.release()
 
-            if unlock:
-                self.unlock_variable(key, access_key)
-
-        logger.debug("Global variable '{}' was set to value '{}' with type '{}'".format(key, value, data_type.__name__))
+        # the message is only formatted if the debug level is enabled
+        logger.debug("Global variable '%s' was set to value '%s' with type '%s'", key, value, data_type.__name__)
+        self.__notify_change(key, version)
 
     def get_variable(self, key, per_reference=None, access_key=None, default=None):
         """Fetches the value of a global variable
@@ -114,39 +209,45 @@ class GlobalVariableManager(Observable):
         :raises exceptions.RuntimeError: if a wrong access key is passed or the variable cannot be accessed by reference
         """
         key = str(key)
-        if self.variable_exist(key):
-            unlock = True
-            if self.is_locked(key):
-                if self.__access_keys[key] == access_key:
-                    unlock = False
-                else:
-                    if not access_key:
-                        access_key = self.lock_variable(key, block=True)
-                    else:
-                        raise RuntimeError("Wrong access key for accessing global variable")
-            else:
-                access_key = self.lock_variable(key, block=True)
-
-            # --- variable locked
-            if self.variable_can_be_referenced(key):
-                if per_reference or per_reference is None:
-                    return_value = self.__global_variable_dictionary[key]
-                else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
-            else:
-                if per_reference:
-                    self.unlock_variable(key, access_key)
-                    raise RuntimeError("Variable cannot be accessed by reference")
-                else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
-            # --- release variable
-
-            if unlock:
-                self.unlock_variable(key, access_key)
-            return return_value
-        else:
+        entry = self.__read_entry(self.__get_shard(key), key, access_key)
+        if entry is None:
             # logger.warning("Global variable '{0}' not existing, returning default value".format(key))
             return default
+        return self.__get_value(entry, per_reference)
+
+    def get_if_newer(self, key, version, per_reference=None, access_key=None):
+        """Fetches the value of a global variable, if it changed since the given version
+
+        Unchanged values are neither copied nor is waited for a lock of the variable.
+
+        :param key: the key of the global variable to be fetched
+        :param int version: the last version known to the caller, e.g. returned by a previous call; 0 if none
+        :param bool per_reference: a flag to decide if the variable should be stored per reference or per value
+        :param access_key: if the variable was explicitly locked with the  rafcon.state lock_variable
+        :return: a tuple of a flag whether the variable is newer, its value (None if not newer) and its version
+        :rtype: tuple
+        :raises exceptions.RuntimeError: if a wrong access key is passed or the variable cannot be accessed by reference
+        """
+        key = str(key)
+        shard = self.__get_shard(key)
+        entry = shard.entries.get(key)
+        if entry is None or entry.version <= version:
+            return False, None, version
+        entry = self.__read_entry(shard, key, access_key)
+        if entry is None:
+            return False, None, version
+        return True, self.__get_value(entry, per_reference), entry.version
+
+    def get_version(self, key):
+        """Returns the version of a global variable
+
+        :param key: the key of the global variable
+        :return: the version of the last change of the variable or 0, if it does not exist
+        :rtype: int
+        """
+        key = str(key)
+        entry = self.__get_shard(key).entries.get(key)
+        return 0 if entry is None else entry.version
 
     def variable_can_be_referenced(self, key):
         """Checks whether the value of the variable can be returned by reference
@@ -155,7 +256,8 @@ class GlobalVariableManager(Observable):
         :return: True if value of variable can be returned by reference, False else
         """
         key = str(key)
-        return key in self.__variable_references and self.__variable_references[key]
+        entry = self.__get_shard(key).entries.get(key)
+        return entry is not None and entry.per_reference
 
     @Observable.observed
     def delete_variable(self, key):
@@ -168,17 +270,123 @@ class GlobalVariableManager(Observable):
         if self.is_locked(key):
             raise RuntimeError("Global variable is locked")
 
-        with self.__global_lock:
-            if key in self.__global_variable_dictionary:
-                access_key = self.lock_variable(key, block=True)
-                del self.__global_variable_dictionary[key]
-                self.unlock_variable(key, access_key)
-                del self.__variable_locks[key]
-                del self.__variable_references[key]
-            else:
-                raise AttributeError("Global variable %s does not exist!" % str(key))
+        shard = self.__get_shard(key)
+        variable_lock = self.__get_variable_lock(shard, key)
+        if variable_lock is None or key not in shard.entries:
+            raise AttributeError("Global variable %s does not exist!" % str(key))
+        self.__wait_for_variable_lock(variable_lock, key)
+        try:
+            with shard.lock:
+                if key not in shard.entries:
+                    raise AttributeError("Global variable %s does not exist!" % str(key))
+                del shard.entries[key]
+                del shard.variable_locks[key]
+                shard.access_keys.pop(key, None)
+        finally:
+            variable_lock.release()
+
+        logger.debug("Global variable %s was deleted!", key)
+        self.__notify_change(key, 0)
+
+    def __notify_change(self, key, version):
+        change_callbacks = self.__change_callbacks
+        if not change_callbacks:
+            return
+        for callback in change_callbacks.get(key, ()) + change_callbacks.get(None, ()):
+            try:
+                callback(key, version)
+            except Exception:
+                logger.exception("Exception in change callback {0} of global variable {1}".format(callback, key))
+
+    def add_change_callback(self, callback, keys=None):
+        """Register a callback, which is called after a global variable was set or deleted
+
+        The callback is called in the thread changing the variable with the key and the new version of the variable (0
+        if it was deleted) and should return quickly.
+
+        :param callback: the function to call
+        :param keys: a key or a list of keys of the global variables to observe, None for all variables
+        """
+        keys = self.__get_keys(keys)
+        with self.__change_callbacks_lock:
+            # copy on write, so the callbacks can be called without lock
+            change_callbacks = dict(self.__change_callbacks)
+            for key in keys:
+                change_callbacks[key] = change_callbacks.get(key, ()) + (callback,)
+            self.__change_callbacks = change_callbacks
+
+    def remove_change_callback(self, callback, keys=None):
+        """Remove a callback registered with :meth:`add_change_callback`
+
+        :param callback: the registered function
+        :param keys: the key(s) passed to :meth:`add_change_callback`
+        """
+        keys = self.__get_keys(keys)
+        with self.__change_callbacks_lock:
+            change_callbacks = dict(self.__change_callbacks)
+            for key in keys:
+                callbacks = list(change_callbacks.get(key, ()))
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if callbacks:
+                    change_callbacks[key] = tuple(callbacks)
+                else:
+                    change_callbacks.pop(key, None)
+            self.__change_callbacks = change_callbacks
 
-        logger.debug("Global variable %s was deleted!" % str(key))
+    @staticmethod
+    def __get_keys(keys):
+        if keys is None:
+            return [None]
+        if isinstance(keys, string_types):
+            return [str(keys)]
+        return [str(key) for key in keys]
+
+    def wait_for_change(self, keys, timeout=None, since_version=None, state=None):
+        """Block until one of the given global variables is set
+
+        Use this method instead of polling a variable with :meth:`get_variable`. The wait ends immediately, when a
+        variable is set. If a state is passed, the wait also ends if the state is preempted or paused, like
+        :meth:`rafcon.core.states.state.State.wait_for_interruption`.
+
+        :param keys: a key or a list of keys of the global variables to wait for
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :param int since_version: return variables changed after this version (see :meth:`get_version`), e.g. the
+            largest version returned by the last call; if None, only changes after this call are considered
+        :param rafcon.core.states.state.State state: the state calling the method, usually `self` in scripts
+        :return: the changed variables mapped onto their version, empty if the wait timed out or was interrupted
+        :rtype: dict
+        """
+        keys = self.__get_keys(keys)
+        if since_version is None:
+            since_version = max([self.get_version(key) for key in keys] + [0])
+        changed_event = Event()
+
+        def on_change(*args):
+            changed_event.set()
+        self.add_change_callback(on_change, keys)
+        interrupted_event = state._interrupted if state is not None else None
+        if interrupted_event is not None:
+            multi_event.orify(interrupted_event, on_change)
+        try:
+            end_time = None if timeout is None else time.time() + timeout
+            while True:
+                changed = {}
+                for key in keys:
+                    version = self.get_version(key)
+                    if version > since_version:
+                        changed[key] = version
+                if changed or (interrupted_event is not None and interrupted_event.is_set()):
+                    return changed
+                remaining_time = None if end_time is None else end_time - time.time()
+                if remaining_time is not None and remaining_time <= 0:
+                    return changed
+                changed_event.wait(remaining_time)
+                changed_event.clear()
+        finally:
+            self.remove_change_callback(on_change, keys)
+            if interrupted_event is not None:
+                multi_event.remove_callback(interrupted_event, on_change)
 
     @Observable.observed
     def lock_variable(self, key, block=False):
@@ -188,34 +396,20 @@ class GlobalVariableManager(Observable):
         :param block: a flag to specify if to wait for locking the variable in blocking mode
         """
         key = str(key)
-        # watch out for releasing the __dictionary_lock properly
-        try:
-            if key in self.__variable_locks:
-                # acquire without arguments is blocking
-                lock_successful = self.__variable_locks[key].acquire(False)
-                if lock_successful or block:
-                    if (not lock_successful) and block:  # case: lock could not be acquired => wait for it as block=True
-                        duration = 0.
-                        loop_time = 0.1
-                        while not self.__variable_locks[key].acquire(False):
-                            time.sleep(loop_time)
-                            duration += loop_time
-                            if int(duration*10) % 20 == 0:
-                                # while loops informs the user about long locked variables
-                                logger.verbose("Variable '{2}' is locked and thread {0} waits already {1} seconds to "
-                                               "access it.".format(currentThread(), duration, key))
-                    access_key = global_variable_id_generator()
-                    self.__access_keys[key] = access_key
-                    return access_key
-                else:
-                    logger.warning("Global variable {} already locked".format(str(key)))
-                    return False
-            else:
-                logger.error("Global variable key {} does not exist".format(str(key)))
-                return False
-        except Exception as e:
-            logger.error("Exception thrown: {}".format(str(e)))
+        shard = self.__get_shard(key)
+        variable_lock = self.__get_variable_lock(shard, key)
+        if variable_lock is None or key not in shard.entries:
+            logger.error("Global variable key {} does not exist".format(str(key)))
             return False
+        if not variable_lock.acquire(False):
+            if not block:
+                logger.warning("Global variable {} already locked".format(str(key)))
+                return False
+            # case: lock could not be acquired => wait for it as block=True
+            self.__wait_for_variable_lock(variable_lock, key)
+        access_key = global_variable_id_generator()
+        shard.access_keys[key] = access_key
+        return access_key
 
     @Observable.observed
     def unlock_variable(self, key, access_key, force=False):
@@ -228,10 +422,12 @@ class GlobalVariableManager(Observable):
         :raises exceptions.RuntimeError: if the wrong access key is passed
         """
         key = str(key)
-        if self.__access_keys[key] == access_key or force:
-            if key in self.__variable_locks:
-                if self.is_locked(key):
-                    self.__variable_locks[key].release()
+        shard = self.__get_shard(key)
+        if shard.access_keys.get(key) == access_key or force:
+            variable_lock = shard.variable_locks.get(key)
+            if variable_lock is not None:
+                if variable_lock.locked():
+                    variable_lock.release()
                     return True
                 else:
                     logger.error("Global variable {} is not locked, thus cannot unlock it".format(str(key)))
@@ -265,7 +461,7 @@ class GlobalVariableManager(Observable):
         :param key: the name of the global variable
         """
         key = str(key)
-        return key in self.__global_variable_dictionary
+        return key in self.__get_shard(key).entries
 
     variable_exists = variable_exist
 
@@ -274,8 +470,7 @@ class GlobalVariableManager(Observable):
 
         :param key: the name of the global variable
         """
-        key = str(key)
-        return key in self.__global_variable_type_dictionary
+        return self.variable_exist(key)
 
     def is_locked(self, key):
         """Returns the status of the lock of a global variable
@@ -284,10 +479,16 @@ class GlobalVariableManager(Observable):
         :return:
         """
         key = str(key)
-        if key in self.__variable_locks:
-            return self.__variable_locks[key].locked()
+        variable_lock = self.__get_shard(key).variable_locks.get(key)
+        if variable_lock is not None:
+            return variable_lock.locked()
         return False
 
+    def __iter_entries(self):
+        for shard in self.__shards:
+            for item in list(shard.entries.items()):
+                yield item
+
     def get_all_keys_starting_with(self, start_key):
         """ Returns all keys, which start with a certain pattern defined in :param start_key.
 
@@ -296,9 +497,7 @@ class GlobalVariableManager(Observable):
         """
         start_key = str(start_key)
         output_list = []
-        if len(self.__global_variable_dictionary) == 0:
-            return output_list
-        for g_key in self.__global_variable_dictionary.keys():
+        for g_key, _ in self.__iter_entries():
             # string comparison
             if g_key and start_key in g_key:
                 output_list.append(g_key)
@@ -312,11 +511,11 @@ class GlobalVariableManager(Observable):
     def global_variable_dictionary(self):
         """Property for the _global_variable_dictionary field"""
         dict_copy = {}
-        for key, value in self.__global_variable_dictionary.items():
-            if key in self.__variable_references and self.__variable_references[key]:
-                dict_copy[key] = value
+        for key, entry in self.__iter_entries():
+            if entry.per_reference:
+                dict_copy[key] = entry.value
             else:
-                dict_copy[key] = copy.deepcopy(value)
+                dict_copy[key] = copy.deepcopy(entry.value)
 
         return dict_copy
 
@@ -325,19 +524,21 @@ class GlobalVariableManager(Observable):
 
         :return: Keys of all variables
         """
-        return list(self.__global_variable_dictionary.keys())
+        return [key for key, _ in self.__iter_entries()]
 
     def get_representation(self, key):
         key = str(key)
-        if not self.variable_exist(key):
+        entry = self.__get_shard(key).entries.get(key)
+        if entry is None:
             return None
-        return self.__global_variable_dictionary[key]
+        return entry.value
 
     def get_data_type(self, key):
         key = str(key)
-        if not self.data_type_exist(key):
+        entry = self.__get_shard(key).entries.get(key)
+        if entry is None:
             return None
-        return self.__global_variable_type_dictionary[key]
+        return entry.data_type
 
     @staticmethod
     def check_value_and_type(value, data_type):
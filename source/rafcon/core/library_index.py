@@ -0,0 +1,160 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: library_index
+   :synopsis: A persistent index of the libraries within the library root paths
+
+Searching the library root paths for libraries requires to list each folder and to check each of its entries, which
+is slow for many library roots on network file systems. The index stores the libraries and folders found in each
+directory together with the modification time of the directory. As the modification time of a directory changes,
+whenever entries are added, removed or renamed, the stored entries remain valid as long as the modification time is
+unchanged. Thus, validating the index only requires one ``stat`` call per directory and only changed directories are
+listed again.
+
+The index is stored as compact json file, so that it can be reused by the next start of RAFCON.
+"""
+
+from builtins import object
+from collections import OrderedDict
+import os
+import stat
+import threading
+import time
+
+from rafcon.utils import filesystem
+from rafcon.utils import log
+from rafcon.utils import storage_utils
+
+logger = log.get_logger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+# directories modified less than this number of seconds ago are listed again on the next validation, as a further
+# modification within the resolution of the modification time of the file system would not be noticed
+_MTIME_RESOLUTION = 2.
+
+
+def _get_cachable_mtime(mtime):
+    return mtime if time.time() - mtime > _MTIME_RESOLUTION else None
+
+
+def _is_library(path):
+    from rafcon.core.storage import storage
+    return os.path.exists(os.path.join(path, storage.STATEMACHINE_FILE)) or \
+        os.path.exists(os.path.join(path, storage.STATEMACHINE_FILE_OLD))
+
+
+class LibraryIndex(object):
+    """Index of the libraries in library root paths, validated by the modification times of the directories
+
+    Each entry of the index maps the path of a directory onto a list of its modification time and its child entries.
+    For libraries, the child entries are None, for folders they are the names of the child directories.
+
+    :param str path: the path of the index file, if None, the index is not persisted
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._entries = {}
+        self._visited_entries = set()
+        self._changed = False
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return self._path
+
+    def load(self):
+        """Loads the index from the index file, if it exists and is valid"""
+        if not self._path or not os.path.isfile(self._path):
+            return
+        try:
+            index = storage_utils.load_objects_from_json(self._path, as_dict=True)
+            if index.get("version") != INDEX_FORMAT_VERSION:
+                return
+            with self._lock:
+                self._entries = index["entries"]
+        except Exception as e:
+            logger.debug("The library index {0} could not be loaded: {1}".format(self._path, e))
+
+    def save(self):
+        """Stores the index, if it was changed
+
+        Only entries, which were visited since the last call, are stored, thus folders, which are no longer within a
+        library root path, are removed.
+        """
+        with self._lock:
+            if not self._path or not (self._changed or set(self._entries) - self._visited_entries):
+                self._visited_entries = set()
+                return
+            self._entries = {path: entry for path, entry in self._entries.items() if path in self._visited_entries}
+            index = {"version": INDEX_FORMAT_VERSION, "entries": self._entries}
+            self._visited_entries = set()
+            self._changed = False
+        try:
+            filesystem.write_file(self._path, storage_utils.dump_objects_to_json_string(index, compact=True),
+                                  create_full_path=True, atomic=True)
+        except (IOError, OSError) as e:
+            logger.warning("The library index could not be stored at {0}: {1}".format(self._path, e))
+
+    def get_library_tree(self, library_root_path, check_name=None):
+        """Returns the libraries within a library root path
+
+        Only directories, whose modification time changed since the last call, are listed.
+
+        :param str library_root_path: the absolute path of the library root
+        :param check_name: optional function, which is called with the path of a listed directory and the name of each
+            of its entries
+        :return: the library tree as in :attr:`rafcon.core.library_manager.LibraryManager.libraries`: the
+            libraries mapped by their names onto their paths and the folders onto their library trees
+        :rtype: collections.OrderedDict
+        """
+        with self._lock:
+            return self._get_folder(library_root_path, os.stat(library_root_path).st_mtime, check_name)
+
+    def _get_folder(self, path, mtime, check_name):
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != mtime or entry[1] is None:
+            entry = [_get_cachable_mtime(mtime), self._list_folder(path, check_name)]
+            self._entries[path] = entry
+            self._changed = True
+        self._visited_entries.add(path)
+
+        library_tree = []
+        for name in entry[1]:
+            child = self._get_child(os.path.join(path, name), check_name)
+            if child is not None:
+                library_tree.append((name, child))
+        return OrderedDict(sorted(library_tree))
+
+    def _list_folder(self, path, check_name):
+        names = []
+        for name in os.listdir(path):
+            if check_name:
+                check_name(path, name)
+            if name[0] != '.' and os.path.isdir(os.path.join(path, name)):
+                names.append(name)
+        return names
+
+    def _get_child(self, path, check_name):
+        """Returns the path of the library or the library tree of the folder at path, or None, if it is no directory"""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(stat_result.st_mode):
+            return None
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stat_result.st_mtime and entry[1] is None:
+            self._visited_entries.add(path)
+            return path
+        if (entry is None or entry[0] != stat_result.st_mtime) and _is_library(path):
+            self._entries[path] = [_get_cachable_mtime(stat_result.st_mtime), None]
+            self._changed = True
+            self._visited_entries.add(path)
+            return path
+        return self._get_folder(path, stat_result.st_mtime, check_name)
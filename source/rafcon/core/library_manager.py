@@ -19,12 +19,13 @@
 
 import os
 import shutil
-import copy
+import time
 import warnings
 from collections import OrderedDict
 from gtkmvc3.observable import Observable
 
 from rafcon.core import interface
+from rafcon.core.library_index import LibraryIndex
 from rafcon.core.storage import storage
 from rafcon.core.custom_exceptions import LibraryNotFoundException
 import rafcon.core.config as config
@@ -63,6 +64,9 @@ class LibraryManager(Observable):
         self._loaded_libraries = {}
         self._libraries_instances = {}
 
+        self._library_index = None
+        self._last_library_update = 0.
+
     def prepare_destruction(self):
         self.clean_loaded_libraries()
 
@@ -73,11 +77,15 @@ class LibraryManager(Observable):
         """Initializes the library manager
 
         It searches through all library paths given in the config file for libraries, and loads the states.
+        Directories, which did not change since the last search, are not listed again (see
+        :mod:`rafcon.core.library_index`). The index of the libraries is persisted in the file given by the
+        ``LIBRARY_INDEX_PATH`` config option.
 
         This cannot be done in the __init__ function as the library_manager can be compiled and executed by
         singleton.py before the state*.pys are loaded
         """
         logger.debug("Initializing LibraryManager: Loading libraries ... ")
+        self._initialize_library_index()
         self._libraries = {}
         self._library_root_paths = {}
         self._replaced_libraries = {}
@@ -119,8 +127,17 @@ class LibraryManager(Observable):
             logger.debug("Adding library '{1}' from {0}".format(library_root_path, library_root_key))
 
         self._libraries = OrderedDict(sorted(self._libraries.items()))
+        self._library_index.save()
+        self._last_library_update = time.time()
         logger.debug("Initialization of LibraryManager done")
 
+    def _initialize_library_index(self):
+        index_path = config.global_config.get_config_value("LIBRARY_INDEX_PATH", None)
+        index_path = os.path.expanduser(os.path.expandvars(index_path)) if index_path else None
+        if self._library_index is None or self._library_index.path != index_path:
+            self._library_index = LibraryIndex(index_path)
+            self._library_index.load()
+
     @staticmethod
     def _clean_path(path):
         """Create a fully fissile absolute system path with no symbolic links and environment variables"""
@@ -141,9 +158,8 @@ class LibraryManager(Observable):
 
     def _load_libraries_from_root_path(self, library_root_key, library_root_path):
         self._library_root_paths[library_root_key] = library_root_path
-        self._libraries[library_root_key] = {}
-        self._load_nested_libraries(library_root_path, self._libraries[library_root_key])
-        self._libraries[library_root_key] = OrderedDict(sorted(self._libraries[library_root_key].items()))
+        self._libraries[library_root_key] = self._library_index.get_library_tree(library_root_path,
+                                                                                 self.check_clean_path_of_library)
 
     def check_clean_path_of_library(self, folder_path, folder_name):
         library_root_path = self._library_root_paths[self._get_library_root_key_for_os_path(folder_path)]
@@ -156,33 +172,47 @@ class LibraryManager(Observable):
                           "".format(not_allowed_characters, full_path), log.RAFCONDeprecationWarning)
         return folder_path, folder_name
 
-    def _load_nested_libraries(self, library_path, target_dict):
-        """Recursively load libraries within path
-
-        Adds all libraries specified in a given path and stores them into the provided library dictionary. The library
-        entries in the dictionary consist only of the path to the library in the file system.
-
-        :param library_path: the path to add all libraries from
-        :param target_dict: the target dictionary to store all loaded libraries to
-        """
-        for library_name in os.listdir(library_path):
-            library_folder_path, library_name = self.check_clean_path_of_library(library_path, library_name)
-            full_library_path = os.path.join(library_path, library_name)
-            if os.path.isdir(full_library_path) and library_name[0] != '.':
-                if os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE)) \
-                        or os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE_OLD)):
-                    target_dict[library_name] = full_library_path
-                else:
-                    target_dict[library_name] = {}
-                    self._load_nested_libraries(full_library_path, target_dict[library_name])
-                    target_dict[library_name] = OrderedDict(sorted(target_dict[library_name].items()))
-
     @Observable.observed
     def refresh_libraries(self):
         """Deletes all loaded libraries and reloads them from the file system
+
+        Only directories, which changed since they were last searched for libraries, are listed.
         """
         self.initialize()
 
+    def update_libraries(self, force=False):
+        """Updates the libraries of all library root paths with changed directories
+
+        In contrast to :meth:`refresh_libraries`, the library root paths are not reloaded from the config and the
+        libraries are only replaced (and observers notified), if a library was added, removed or moved. The
+        directories are checked at most every ``LIBRARY_INDEX_CHECK_INTERVAL`` seconds, unless `force` is True. The
+        method is called lazily, if a library cannot be found.
+
+        :param bool force: If True, the directories are checked independent of the time of the last check
+        :return: whether the libraries changed
+        :rtype: bool
+        """
+        check_interval = float(config.global_config.get_config_value("LIBRARY_INDEX_CHECK_INTERVAL", 5.))
+        if self._library_index is None or \
+                not force and time.time() - self._last_library_update < check_interval:
+            return False
+        self._last_library_update = time.time()
+        libraries = OrderedDict()
+        for library_root_key, library_root_tree in self._libraries.items():
+            library_root_path = self._library_root_paths[library_root_key]
+            try:
+                libraries[library_root_key] = self._library_index.get_library_tree(library_root_path,
+                                                                                   self.check_clean_path_of_library)
+            except OSError as e:
+                logger.warning("The library root path {0} cannot be accessed: {1}".format(library_root_path, e))
+                libraries[library_root_key] = OrderedDict()
+        self._library_index.save()
+        if libraries == self._libraries:
+            return False
+        logger.debug("Libraries changed on the file system and were updated")
+        self.libraries = libraries
+        return True
+
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
     #########################################################################
@@ -258,6 +288,9 @@ class LibraryManager(Observable):
         regularly_found = True
 
         library_os_path = self._get_library_os_path_from_library_dict_tree(library_path, library_name)
+        if library_os_path is None and self.update_libraries():
+            # the library might have been added since the libraries were searched
+            library_os_path = self._get_library_os_path_from_library_dict_tree(library_path, library_name)
         while library_os_path is None:  # until the library is found or the user aborts
 
             regularly_found = False
@@ -372,11 +405,14 @@ class LibraryManager(Observable):
         else:
             logger.warning("Library manager will not create a library instance which is not in the mounted libraries.")
 
-    def get_library_state_copy_instance(self, lib_os_path):
-        """ A method to get a state copy of the library specified via the lib_os_path.
+    def get_library_template(self, lib_os_path):
+        """ A method to get the root state of the library specified via the lib_os_path
+
+        The library is only loaded once. The returned root state is shared by all library states of the library as
+        template and must not be modified; library states copy it when their `state_copy` is accessed.
 
-        :param lib_os_path: the location of the library to get a copy for
-        :return:
+        :param lib_os_path: the location of the library to get the root state of
+        :return: the version and the root state of the library
         """
 
         # originally libraries were called like this; DO NOT DELETE; interesting for performance tests
@@ -384,21 +420,13 @@ class LibraryManager(Observable):
         # return state_machine.version, state_machine.root_state
 
         # TODO observe changes on file system and update data
-        if lib_os_path in self._loaded_libraries:
-            # this list can also be taken to open library state machines TODO -> implement it -> because faster
-            state_machine = self._loaded_libraries[lib_os_path]
-            # logger.info("Take copy of {0}".format(lib_os_path))
-            # as long as the a library state root state is never edited so the state first has to be copied here
-            state_copy = copy.deepcopy(state_machine.root_state)
-            return state_machine.version, state_copy
-        else:
-            state_machine = storage.load_state_machine_from_path(lib_os_path)
-            self._loaded_libraries[lib_os_path] = state_machine
-            if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
-                return state_machine.version, state_machine.root_state
-            else:
-                state_copy = copy.deepcopy(state_machine.root_state)
-                return state_machine.version, state_copy
+        if lib_os_path not in self._loaded_libraries:
+            self._loaded_libraries[lib_os_path] = storage.load_state_machine_from_path(lib_os_path)
+            # the library is not saved from here, its files are only remembered for open state machines
+            storage.forget_stored_files(lib_os_path)
+        # this list can also be taken to open library state machines TODO -> implement it -> because faster
+        state_machine = self._loaded_libraries[lib_os_path]
+        return state_machine.version, state_machine.root_state
 
     def remove_library_from_file_system(self, library_path, library_name):
         """Remove library from hard disk."""
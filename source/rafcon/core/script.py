@@ -20,7 +20,10 @@ from future.utils import string_types
 from builtins import str
 import os
 import imp
+import hashlib
 import yaml
+from collections import OrderedDict
+from threading import Lock
 from gtkmvc3.observable import Observable
 
 from rafcon.core.config import global_config
@@ -38,6 +41,81 @@ DEFAULT_SCRIPT_FILE = "default_script.py"
 DEFAULT_SCRIPT = filesystem.read_file(os.path.dirname(__file__), DEFAULT_SCRIPT_FILE)
 
 
+class CompiledCodeCache(object):
+    """A process-wide cache for the compiled code of scripts
+
+    The code objects are keyed by a hash of the script text and the file name the code is compiled for. Thus, a script
+    is only recompiled if its text really changed. The number of cache hits and misses is counted to be able to
+    monitor the cache.
+
+    :ivar int max_size: the maximum number of cached code objects, the least recently used ones are dropped first
+    :ivar int hits: the number of lookups that were answered from the cache
+    :ivar int misses: the number of lookups that required a compilation
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._code_objects = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def get_script_hash(script_text):
+        """Calculate the hash of a script text used as part of the cache key
+
+        :param str script_text: the text of the script
+        :return: the hex digest of the script text
+        :rtype: str
+        """
+        if not isinstance(script_text, bytes):
+            script_text = script_text.encode('utf-8')
+        return hashlib.sha256(script_text).hexdigest()
+
+    def get(self, script_hash, filename):
+        """Return the cached code object for a script and count the lookup as hit or miss
+
+        :param str script_hash: the hash of the script text, see :meth:`get_script_hash`
+        :param str filename: the file name the script was compiled for
+        :return: the code object or None if it is not cached
+        """
+        key = (script_hash, filename)
+        with self._lock:
+            code = self._code_objects.get(key)
+            if code is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                # mark as most recently used
+                self._code_objects[key] = self._code_objects.pop(key)
+            return code
+
+    def add(self, script_hash, filename, code):
+        """Store the code object of a script
+
+        :param str script_hash: the hash of the script text, see :meth:`get_script_hash`
+        :param str filename: the file name the script was compiled for
+        :param code: the compiled code object
+        """
+        with self._lock:
+            self._code_objects[(script_hash, filename)] = code
+            while len(self._code_objects) > self.max_size:
+                self._code_objects.popitem(last=False)
+
+    def clear(self):
+        """Remove all code objects and reset the counters"""
+        with self._lock:
+            self._code_objects.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._code_objects)
+
+
+compiled_code_cache = CompiledCodeCache()
+
+
 class Script(Observable, yaml.YAMLObject):
     """A class for representing the script file for all execution states in a state machine.
 
@@ -54,6 +132,10 @@ class Script(Observable, yaml.YAMLObject):
     yaml_tag = u'!Script'
 
     _script = None
+    # tuple of the last compiled script text and its hash
+    _hashed_script = None
+    # function loading the script text on first access, set for lazily loaded state machines
+    _script_loader = None
 
     def __init__(self, path=None, filename=None, parent=None):
 
@@ -72,18 +154,31 @@ class Script(Observable, yaml.YAMLObject):
 
     @property
     def script(self):
+        if self._script_loader is not None:
+            loader, self._script_loader = self._script_loader, None
+            self._script = loader()
         return self._script
 
     @script.setter
     def script(self, script_text):
         if not isinstance(script_text, string_types):
             raise ValueError("The script text needs to be a string")
+        self._script_loader = None
         self._script = script_text
 
     def set_script_without_compilation(self, script_text):
+        self._script_loader = None
         self._script = script_text
         self._compiled_module = None
 
+    def defer_script_loading(self, loader):
+        """Load the script text on first access instead of now, without compilation
+
+        :param loader: a function without arguments returning the script text
+        """
+        self._script_loader = loader
+        self._compiled_module = None
+
     def execute(self, state, inputs=None, outputs=None, backward_execution=False):
         """Execute the user 'execute' function specified in the script
 
@@ -127,23 +222,40 @@ class Script(Observable, yaml.YAMLObject):
     def compile_module(self):
         """Builds a temporary module from the script file
 
+        The compiled code of the script is taken from the :data:`compiled_code_cache`, if the script text did not
+        change since its last compilation. Only if the script needs to be compiled, the global import lock is acquired.
+
         :raises exceptions.IOError: if the compilation of the script module failed
         """
-        try:
-            imp.acquire_lock()
+        script_text = self.script
+        hashed_script = self._hashed_script
+        if hashed_script is None or hashed_script[0] is not script_text:
+            hashed_script = self._hashed_script = (script_text, compiled_code_cache.get_script_hash(script_text))
+        script_hash = hashed_script[1]
+        code_filename = '%s (%s)' % (self.filename, self._script_id)
+        code = compiled_code_cache.get(script_hash, code_filename)
+
+        if code is None:
+            try:
+                imp.acquire_lock()
+                code = compile(script_text, code_filename, 'exec')
+            except Exception:
+                self.compiled_module = None
+                raise
+            finally:
+                imp.release_lock()
+            compiled_code_cache.add(script_hash, code_filename, code)
 
-            code = compile(self.script, '%s (%s)' % (self.filename, self._script_id), 'exec')
+        try:
             # load module
             module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
             tmp_module = imp.new_module(module_name)
             exec(code, tmp_module.__dict__)
             # return the module
             self.compiled_module = tmp_module
-        except Exception as e:
+        except Exception:
             self.compiled_module = None
             raise
-        finally:
-            imp.release_lock()
 
     @classmethod
     def to_yaml(cls, dumper, data):
@@ -28,7 +28,6 @@ import argparse
 from os.path import realpath, dirname, join, exists
 import signal
 import time
-from queue import Empty
 import threading
 import sys
 import logging
@@ -40,7 +39,6 @@ import rafcon.utils.filesystem as filesystem
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
 from rafcon.core.storage import storage
-from rafcon.core.states.state import StateExecutionStatus
 
 from rafcon.utils import plugins
 from rafcon.utils import resources
@@ -49,6 +47,7 @@ from rafcon.utils import log
 logger = log.get_logger("rafcon.start.core")
 
 _user_abort = False
+_execution_done = threading.Event()
 
 
 def pre_setup_plugins():
@@ -160,6 +159,8 @@ def open_state_machine(state_machine_path):
 
 
 def start_state_machine(sm, start_state_path=None):
+    # reset the event of a previous execution, before the new one can set it
+    _execution_done.clear()
     core_singletons.state_machine_execution_engine.start(sm.state_machine_id, start_state_path=start_state_path)
 
     if reactor_required():
@@ -173,23 +174,14 @@ def wait_for_state_machine_finished(state_machine):
     :param state_machine: the statemachine to synchronize with
     :return:
     """
-    global _user_abort
-
-    from rafcon.core.states.execution_state import ExecutionState
-    if not isinstance(state_machine.root_state, ExecutionState):
-        while len(state_machine.execution_histories[0]) < 1:
-            time.sleep(0.1)
-    else:
-        time.sleep(0.5)
-
-    while state_machine.root_state.state_execution_status is not StateExecutionStatus.INACTIVE:
-        try:
-            state_machine.root_state.concurrency_queue.get(timeout=1)
-            # this check triggers if the state machine could not be stopped in the signal handler
-            if _user_abort:
-                return
-        except Empty:
-            pass
+    execution_finished = state_machine.execution_finished
+    if execution_finished is None:
+        logger.warning("The state machine was not started")
+        return
+    execution_finished.add_done_callback(lambda future: _execution_done.set())
+
+    # the event is also set by the signal handler, in case the state machine cannot be stopped
+    while not _execution_done.wait(1.):
         # no logger output here to make it easier for the parser
         logger.verbose("RAFCON live signal")
 
@@ -228,6 +220,7 @@ def signal_handler(signal, frame):
         logger.exception("Could not stop state machine")
 
     _user_abort = True
+    _execution_done.set()
 
     # shutdown twisted correctly
     if reactor_required():
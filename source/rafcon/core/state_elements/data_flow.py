@@ -164,6 +164,7 @@ class DataFlow(StateElement):
         if not valid:
             self._from_state = old_from_state
             self._from_key = old_from_key
+            self._change_reverted()
             raise ValueError("The data flow origin could not be changed: {0}".format(message))
 
     @property
@@ -219,6 +220,7 @@ class DataFlow(StateElement):
         if not valid:
             self._to_state = old_to_state
             self._to_key = old_to_key
+            self._change_reverted()
             raise ValueError("The data flow target could not be changed: {0}".format(message))
 
     @property
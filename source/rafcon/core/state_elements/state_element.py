@@ -200,9 +200,17 @@ class StateElement(Observable, YAMLObject, JSONObject, Hashable):
         valid, message = self._check_validity()
         if not valid:
             setattr(self, property_name, old_value)
+            self._change_reverted()
             class_name = self.__class__.__name__
             raise ValueError("The {2}'s '{0}' could not be changed: {1}".format(property_name[1:], message, class_name))
 
+    def _change_reverted(self):
+        """Informs the parent about a change of the state element, which was reverted after a failed validity check"""
+        from rafcon.core.states.state import State
+        parent = self.parent
+        if isinstance(parent, State):
+            parent.child_change_reverted(self)
+
     def _check_validity(self):
         """Checks the validity of the state element's properties
 
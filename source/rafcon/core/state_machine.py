@@ -34,6 +34,8 @@ from jsonconversion.jsonobject import JSONObject
 
 import rafcon
 from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage
+from rafcon.core.execution.binary_log import BinaryExecutionHistoryStorage
+from rafcon.core.execution.execution_events import ExecutionFuture
 from rafcon.core.id_generator import generate_state_machine_id, run_id_generator
 from rafcon.utils import log
 from rafcon.utils.hashable import Hashable
@@ -98,6 +100,7 @@ class StateMachine(Observable, JSONObject, Hashable):
             self.last_update = get_current_time_string()
 
         self._execution_histories = []
+        self._execution_finished = None
 
         # specifies if this state machine supports saving states with state_name + state_id
         self._supports_saving_state_names = True
@@ -141,6 +144,7 @@ class StateMachine(Observable, JSONObject, Hashable):
         # load default input data for the state
         self._root_state.input_data = self._root_state.get_default_input_values_for_state(self._root_state)
         self._root_state.output_data = self._root_state.create_output_dictionary_for_state(self._root_state)
+        self._execution_finished = ExecutionFuture()
         new_execution_history = self._add_new_execution_history()
         new_execution_history.push_state_machine_start_history_item(self, run_id_generator())
         self._root_state.start(new_execution_history)
@@ -155,6 +159,32 @@ class StateMachine(Observable, JSONObject, Hashable):
                 self._execution_histories[-1].execution_history_storage.close(set_read_and_writable_for_all)
         from rafcon.core.states.state import StateExecutionStatus
         self._root_state.state_execution_status = StateExecutionStatus.INACTIVE
+        if self._execution_finished is not None:
+            self._execution_finished.set_result(self._root_state.final_outcome)
+
+    @property
+    def execution_finished(self):
+        """The future of the current (or last) execution of the state machine
+
+        It is done as soon as the root state finished and the execution log is closed, its result is the final outcome
+        of the root state. Callbacks can be registered with ``add_done_callback``.
+
+        :return: the future or None, if the state machine was never started
+        :rtype: rafcon.core.execution.execution_events.ExecutionFuture
+        """
+        return self._execution_finished
+
+    def wait_for_execution_finished(self, timeout=None):
+        """Block until the current execution of the state machine finished
+
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :return: True if the execution finished (or the state machine was never started), False if the timeout
+            occurred
+        :rtype: bool
+        """
+        if self._execution_finished is None:
+            return True
+        return self._execution_finished.wait(timeout)
 
     def get_modification_lock(self):
         return self._modification_lock
@@ -233,10 +263,18 @@ class StateMachine(Observable, JSONObject, Hashable):
                 base_dir = base_dir.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir)
-            shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.shelve' %
-                                       (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
-                                        self.root_state.name.replace(' ', '-')))
-            execution_history_store = ExecutionHistoryStorage(shelve_name)
+            log_format = global_config.get_config_value("EXECUTION_LOG_FORMAT", "shelve")
+            file_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.%s' %
+                                     (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
+                                      self.root_state.name.replace(' ', '-'),
+                                      'binlog' if log_format == "binary" else 'shelve'))
+            index = global_config.get_config_value("EXECUTION_LOG_INDEX", False)
+            if log_format == "binary":
+                execution_history_store = BinaryExecutionHistoryStorage(
+                    file_name, compress=global_config.get_config_value("EXECUTION_LOG_COMPRESSION", False),
+                    index=index)
+            else:
+                execution_history_store = ExecutionHistoryStorage(file_name, index=index)
             new_execution_history.set_execution_history_storage(execution_history_store)
         self._execution_histories.append(new_execution_history)
         return new_execution_history
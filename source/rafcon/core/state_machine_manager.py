@@ -123,6 +123,9 @@ class StateMachineManager(Observable):
 
         # destroy execution history
         removed_state_machine.destroy_execution_histories()
+        if removed_state_machine.file_system_path:
+            from rafcon.core.storage import storage
+            storage.forget_stored_files(removed_state_machine.file_system_path)
         return removed_state_machine
 
     def get_active_state_machine(self):
@@ -19,7 +19,12 @@
 
 """
 
+from future import standard_library
+standard_library.install_aliases()
 from builtins import str
+from threading import Condition
+import queue
+import time
 
 from gtkmvc3.observable import Observable
 
@@ -35,6 +40,9 @@ from rafcon.utils import log
 from rafcon.core.config import global_config
 logger = log.get_logger(__name__)
 
+# time in seconds after which the barrier checks whether a child thread terminated without notifying the queue
+CHILD_STATE_CHECK_INTERVAL = 1.
+
 
 class BarrierConcurrencyState(ConcurrencyState):
     """ The barrier concurrency holds a list of states that are executed in parallel. It waits until all states
@@ -59,13 +67,24 @@ class BarrierConcurrencyState(ConcurrencyState):
 
         The decider state is not considered in the backward execution case.
 
+        The child states are joined in the order of their completion. The output data of each child state is added
+        to the scoped data as soon as it finished.
+
+        :ivar bool BarrierConcurrencyState.decider_early_start: if True, the decider state is started together with
+            the child states and can process their results while they finish, see
+            :meth:`DeciderState.wait_for_children`. The input data of the decider state is determined at its start
+            and only updated by :meth:`DeciderState.wait_for_children`, thus data flows from the child states are only
+            visible to the decider after that call.
+
     """
     yaml_tag = u'!BarrierConcurrencyState'
 
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
                  income=None, outcomes=None, states=None, transitions=None, data_flows=None, start_state_id=None,
-                 scoped_variables=None, decider_state=None, load_from_storage=False, safe_init=True):
+                 scoped_variables=None, decider_state=None, load_from_storage=False, safe_init=True,
+                 decider_early_start=False):
         self.__init_running = True
+        self._decider_early_start = False
         states = {} if states is None else states
         if decider_state is not None:
             if isinstance(decider_state, DeciderState):
@@ -94,8 +113,22 @@ class BarrierConcurrencyState(ConcurrencyState):
                             if "transition origin already connected to another transition" not in str(e):
                                 logger.error("default decider state transition could not be added: {}".format(e))
                                 raise
+        self.decider_early_start = decider_early_start
         self.__init_running = False
 
+    def __copy__(self):
+        state = super(BarrierConcurrencyState, self).__copy__()
+        state._decider_early_start = self.decider_early_start
+        return state
+
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = ContainerState.state_to_dict(state)
+        # only stored if set, so that state machines without early decider keep their format
+        if state.decider_early_start:
+            dict_representation['decider_early_start'] = True
+        return dict_representation
+
     def run(self):
         """ This defines the sequence of actions that are taken when the barrier concurrency state is executed
 
@@ -111,25 +144,35 @@ class BarrierConcurrencyState(ConcurrencyState):
 
         try:
             concurrency_history_item = self.setup_forward_or_backward_execution()
-            self.start_child_states(concurrency_history_item, decider_state)
-
-            # print("bcs1")
+            concurrency_queue = self.start_child_states(concurrency_history_item, decider_state)
+            decider_early_start = self.decider_early_start and not self.backward_execution
+            if decider_early_start:
+                self.start_decider_state(decider_state, child_errors, final_outcomes_dict)
 
             #######################################################
-            # wait for all child threads to finish
+            # join the child threads in the order they finish
             #######################################################
+            pending_history_indices = {}
             for history_index, state in enumerate(self.states.values()):
                 # skip the decider state
                 if state is not decider_state:
-                    self.join_state(state, history_index, concurrency_history_item)
-                    self.add_state_execution_output_to_scoped_data(state.output_data, state)
-                    self.update_scoped_variables_with_output_dictionary(state.output_data, state)
-                    # save the errors of the child state executions for the decider state
+                    pending_history_indices[state.state_id] = history_index
+            while pending_history_indices:
+                finished_state_id = self._get_finished_child_state_id(concurrency_queue, pending_history_indices)
+                # a state may notify the queue more than once, e.g. if it was left without transition
+                if finished_state_id not in pending_history_indices:
+                    continue
+                history_index = pending_history_indices.pop(finished_state_id)
+                state = self.states[finished_state_id]
+                self.join_state(state, history_index, concurrency_history_item)
+                self.add_state_execution_output_to_scoped_data(state.output_data, state)
+                self.update_scoped_variables_with_output_dictionary(state.output_data, state)
+                # save the errors of the child state executions for the decider state
+                with decider_state.child_results_condition:
                     if 'error' in state.output_data:
                         child_errors[state.state_id] = (state.name, state.output_data['error'])
                     final_outcomes_dict[state.state_id] = (state.name, state.final_outcome)
-
-            # print("bcs2")
+                    decider_state.child_results_condition.notify_all()
 
             #######################################################
             # handle backward execution case
@@ -146,7 +189,10 @@ class BarrierConcurrencyState(ConcurrencyState):
             #######################################################
             # execute decider state
             #######################################################
-            decider_state_error = self.run_decider_state(decider_state, child_errors, final_outcomes_dict)
+            if decider_early_start:
+                decider_state_error = self.join_decider_state(decider_state)
+            else:
+                decider_state_error = self.run_decider_state(decider_state, child_errors, final_outcomes_dict)
 
             # print("bcs4")
 
@@ -179,6 +225,25 @@ class BarrierConcurrencyState(ConcurrencyState):
             self.state_execution_status = StateExecutionStatus.WAIT_FOR_NEXT_STATE
             return self.finalize(Outcome(-1, "aborted"))
 
+    def _get_finished_child_state_id(self, concurrency_queue, pending_state_ids):
+        """ Waits for the next child state to finish
+
+        Besides the notification of the child states via the concurrency queue, the threads of the pending child states
+        are checked regularly, so that a child thread terminating without a notification does not block the barrier.
+
+        :param concurrency_queue: the queue, which the child states put their state id in after their execution
+        :param pending_state_ids: the ids of the child states, which were not joined yet
+        :return: the id of a finished child state
+        """
+        while True:
+            try:
+                return concurrency_queue.get(timeout=CHILD_STATE_CHECK_INTERVAL)
+            except queue.Empty:
+                for state_id in pending_state_ids:
+                    thread = self.states[state_id].thread
+                    if thread is None or not thread.is_alive():
+                        return state_id
+
     def run_decider_state(self, decider_state, child_errors, final_outcomes_dict):
         """ Runs the decider state of the barrier concurrency state. The decider state decides on which outcome the
         barrier concurrency is left.
@@ -188,6 +253,19 @@ class BarrierConcurrencyState(ConcurrencyState):
         :param final_outcomes_dict: dictionary of all outcomes of the concurrent branches
         :return:
         """
+        self.start_decider_state(decider_state, child_errors, final_outcomes_dict, sequential=True)
+        return self.join_decider_state(decider_state)
+
+    def start_decider_state(self, decider_state, child_errors, final_outcomes_dict, sequential=False):
+        """ Starts the decider state of the barrier concurrency state
+
+        :param decider_state: the decider state of the barrier concurrency state
+        :param child_errors: error of the concurrent branches, filled while the branches finish
+        :param final_outcomes_dict: dictionary of the outcomes of the concurrent branches, filled while the branches
+                                    finish
+        :param bool sequential: True, if the decider state is joined right after starting it
+        :return:
+        """
         decider_state.state_execution_status = StateExecutionStatus.ACTIVE
         # forward the decider specific data
         decider_state.child_errors = child_errors
@@ -195,7 +273,14 @@ class BarrierConcurrencyState(ConcurrencyState):
         # standard state execution
         decider_state.input_data = self.get_inputs_for_state(decider_state)
         decider_state.output_data = self.create_output_dictionary_for_state(decider_state)
-        decider_state.start(self.execution_history, backward_execution=False)
+        decider_state.start(self.execution_history, backward_execution=False, sequential=sequential)
+
+    def join_decider_state(self, decider_state):
+        """ Joins the decider state of the barrier concurrency state and processes its output data
+
+        :param decider_state: the decider state of the barrier concurrency state
+        :return: the error of the decider state, if it was aborted
+        """
         decider_state.join()
         decider_state_error = None
         if decider_state.final_outcome.outcome_id == -1:
@@ -283,6 +368,21 @@ class BarrierConcurrencyState(ConcurrencyState):
             for state in states.values():
                 self.add_state(state)
 
+    @property
+    def decider_early_start(self):
+        """Property for the _decider_early_start field
+
+        """
+        return self._decider_early_start
+
+    @decider_early_start.setter
+    @lock_state_machine
+    @Observable.observed
+    def decider_early_start(self, decider_early_start):
+        if not isinstance(decider_early_start, bool):
+            raise TypeError("decider_early_start must be of type bool")
+        self._decider_early_start = decider_early_start
+
     def remove_state(self, state_id, recursive=True, force=False, destroy=True):
         """ Overwrite the parent class remove state method by checking if the user tries to delete the decider state
 
@@ -315,7 +415,8 @@ class BarrierConcurrencyState(ConcurrencyState):
                     data_flows=data_flows if states else None,
                     scoped_variables=dictionary['scoped_variables'],
                     load_from_storage=True,
-                    safe_init=safe_init)
+                    safe_init=safe_init,
+                    decider_early_start=dictionary.get('decider_early_start', False))
         try:
             state.description = dictionary['description']
         except (TypeError, KeyError):  # (Very) old state machines do not have a description field
@@ -348,6 +449,36 @@ class DeciderState(ExecutionState):
 
         self.child_errors = {}
         self.final_outcomes_dict = {}
+        # notified whenever a child state of the barrier concurrency state finished, guards the dictionaries above
+        self.child_results_condition = Condition()
+
+    def wait_for_children(self, state_ids=None, timeout=None):
+        """ Waits until child states of the barrier concurrency state finished their execution
+
+        Note: This is only needed if the decider state is started early (see
+        :attr:`BarrierConcurrencyState.decider_early_start`). Otherwise, all child states are finished when the
+        decider state is executed. As preempted child states finish as well, the wait also ends on a preemption.
+        When the child states finished, the input data of the decider state is updated with the data of the finished
+        child states.
+
+        :param state_ids: the ids of the child states to wait for, all child states if None
+        :param float timeout: maximum time to wait in seconds or None for infinitely
+        :return: True if the child states finished, False if the timeout occurred
+        :rtype: bool
+        """
+        if state_ids is None:
+            state_ids = [state_id for state_id in self.parent.states if state_id != self.state_id]
+        end_time = None if timeout is None else time.time() + timeout
+        with self.child_results_condition:
+            while not all(state_id in self.final_outcomes_dict for state_id in state_ids):
+                remaining_time = None if end_time is None else end_time - time.time()
+                if remaining_time is not None and remaining_time <= 0:
+                    return False
+                self.child_results_condition.wait(remaining_time)
+            # the output data of the finished child states was added to the scoped data before they were registered
+            # the dictionary is updated in place, as it is the one passed to the execute function
+            self.input_data.update(self.parent.get_inputs_for_state(self))
+        return True
 
     def get_outcome_for_state_name(self, name):
         """ Returns the final outcome of the child state specified by name.
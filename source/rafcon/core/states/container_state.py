@@ -22,14 +22,16 @@
 from weakref import ref
 from builtins import str
 from copy import copy, deepcopy
-from threading import Condition
+from threading import Condition, RLock
 from collections import OrderedDict
 
 from gtkmvc3.observable import Observable
 
 from rafcon.core.custom_exceptions import RecoveryModeException
-from rafcon.core.decorators import lock_state_machine
+from rafcon.core.decorators import lock_state_machine, lock_scoped_data
+from rafcon.core.execution.execution_events import EXECUTION_MODE_CHANGED
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.data_passing import pass_value
 from rafcon.core.id_generator import *
 from rafcon.core.singleton import state_machine_execution_engine
 from rafcon.core.state_elements.data_flow import DataFlow
@@ -47,6 +49,9 @@ from rafcon.utils import log
 
 logger = log.get_logger(__name__)
 
+# upper bound in seconds for a single wait of a child execution for a transition, in case a change is not notified
+TRANSITION_WAIT_TIMEOUT = 1.
+
 
 class ContainerState(State):
     """A class for representing a state in the state machine
@@ -71,8 +76,12 @@ class ContainerState(State):
         self._states = OrderedDict()
         self._transitions = {}
         self._data_flows = {}
+        # lookup tables for transitions and data flows, built lazily by _get_connection_indexes
+        self._connection_indexes = None
         self._scoped_variables = {}
         self._scoped_data = {}
+        # guards the scoped data, which is modified during the execution independent of structural modifications
+        self._scoped_data_lock = RLock()
         self._current_state = None
         # condition variable to wait for not connected states
         self._transitions_cv = Condition()
@@ -111,6 +120,7 @@ class ContainerState(State):
         self._data_flows = data_flows if data_flows is not None else {}
         for _, data_flow in self._data_flows.items():
             data_flow._parent = ref(self)
+        self._invalidate_connection_indexes()
 
     # ---------------------------------------------------------------------------------------------
     # ----------------------------------- generic methods -----------------------------------------
@@ -245,8 +255,7 @@ class ContainerState(State):
         """
         super(ContainerState, self).recursively_preempt_states()
         # notify the transition condition variable to let the state instantaneously stop
-        with self._transitions_cv:
-            self._transitions_cv.notify_all()
+        self._notify_transition_change()
         for state in self.states.values():
             state.recursively_preempt_states()
 
@@ -317,8 +326,8 @@ class ContainerState(State):
 
             # wait until the user connects the outcome of the state with a transition
             logger.warning("Waiting for new transition at {1} of {0} ".format(state, state.final_outcome))
-            with self._transitions_cv:
-                self._transitions_cv.wait(3.0)
+            self._wait_for_transition_change(
+                lambda: self.preempted or self.get_transition_for_outcome(state, state.final_outcome))
 
             transition = self.get_transition_for_outcome(state, state.final_outcome)
 
@@ -338,11 +347,36 @@ class ContainerState(State):
                 # this will be caught at the end of the run method
                 return None
 
-            with self._transitions_cv:
-                self._transitions_cv.wait(3.0)
+            self._wait_for_transition_change(lambda: self.preempted or self.start_state_id is not None)
             start_state = self.get_start_state(set_final_outcome=True)
         return start_state
 
+    def _wait_for_transition_change(self, condition):
+        """Block until a transition is added, the state is preempted or the execution mode changes
+
+        The condition is checked while holding the lock of the transition condition variable, thus a notification
+        between the check and the wait cannot get lost. All changes of the transitions notify the condition variable,
+        the wait is nevertheless bounded by :data:`TRANSITION_WAIT_TIMEOUT`, as the callers check their condition
+        again in a loop.
+
+        :param condition: a function returning True, if there is no need to wait
+        """
+        def notify(*args):
+            self._notify_transition_change()
+
+        state_machine_execution_engine.add_event_callback(EXECUTION_MODE_CHANGED, notify)
+        try:
+            with self._transitions_cv:
+                if not condition() and not state_machine_execution_engine.finished_or_stopped():
+                    self._transitions_cv.wait(TRANSITION_WAIT_TIMEOUT)
+        finally:
+            state_machine_execution_engine.remove_event_callback(EXECUTION_MODE_CHANGED, notify)
+
+    def _notify_transition_change(self):
+        """Wakes up the child execution waiting in :meth:`_wait_for_transition_change`"""
+        with self._transitions_cv:
+            self._transitions_cv.notify_all()
+
     # ---------------------------------------------------------------------------------------------
     # -------------------------------------- state functions --------------------------------------
     # ---------------------------------------------------------------------------------------------
@@ -1199,6 +1233,113 @@ class ContainerState(State):
         else:
             super(ContainerState, self).remove(state_element, force=force, destroy=destroy)
 
+    # ---------------------------------------------------------------------------------------------
+    # ------------------------------- connection index functions ----------------------------------
+    # ---------------------------------------------------------------------------------------------
+
+    def _invalidate_connection_indexes(self):
+        """Drop the lookup tables for transitions and data flows
+
+        The tables are rebuilt on the next lookup. This is used whenever the connections are changed in a way that
+        is not tracked incrementally, e.g. if the whole transitions or data_flows dictionary is replaced.
+        """
+        self._connection_indexes = None
+
+    def _get_connection_indexes(self):
+        """Return the lookup tables for transitions and data flows and build them if necessary
+
+        The tables map (from_state, from_outcome) to a transition and (from_state, from_key) respectively
+        (to_state, to_key) to the list of data flows, in the order of the transitions and data_flows dictionaries.
+
+        :return: transitions by origin, data flows by origin, data flows by target
+        :rtype: tuple
+        """
+        connection_indexes = self._connection_indexes
+        if connection_indexes is not None:
+            return connection_indexes
+        transitions_by_origin = {}
+        for transition in list(self._transitions.values()):
+            transitions_by_origin[(transition.from_state, transition.from_outcome)] = transition
+        data_flows_by_origin = {}
+        data_flows_by_target = {}
+        for data_flow in list(self._data_flows.values()):
+            data_flows_by_origin.setdefault((data_flow.from_state, data_flow.from_key), []).append(data_flow)
+            data_flows_by_target.setdefault((data_flow.to_state, data_flow.to_key), []).append(data_flow)
+        connection_indexes = transitions_by_origin, data_flows_by_origin, data_flows_by_target
+        self._connection_indexes = connection_indexes
+        return connection_indexes
+
+    def _add_connection_to_indexes(self, connection):
+        """Register a newly added transition or data flow in the lookup tables
+
+        :param connection: The transition or data flow that was added to self
+        """
+        connection_indexes = self._connection_indexes
+        if connection_indexes is None:
+            return
+        transitions_by_origin, data_flows_by_origin, data_flows_by_target = connection_indexes
+        if isinstance(connection, Transition):
+            transitions_by_origin[(connection.from_state, connection.from_outcome)] = connection
+        else:
+            data_flows_by_origin.setdefault((connection.from_state, connection.from_key), []).append(connection)
+            data_flows_by_target.setdefault((connection.to_state, connection.to_key), []).append(connection)
+
+    def _remove_connection_from_indexes(self, connection):
+        """Unregister a removed transition or data flow from the lookup tables
+
+        If the tables are not consistent with the connection, they are invalidated instead.
+
+        :param connection: The transition or data flow that was removed from self
+        """
+        connection_indexes = self._connection_indexes
+        if connection_indexes is None:
+            return
+        transitions_by_origin, data_flows_by_origin, data_flows_by_target = connection_indexes
+        try:
+            if isinstance(connection, Transition):
+                origin = (connection.from_state, connection.from_outcome)
+                if transitions_by_origin[origin] is not connection:
+                    raise ValueError("Transition is not indexed")
+                del transitions_by_origin[origin]
+            else:
+                for index, port in ((data_flows_by_origin, (connection.from_state, connection.from_key)),
+                                    (data_flows_by_target, (connection.to_state, connection.to_key))):
+                    index[port].remove(connection)
+                    if not index[port]:
+                        del index[port]
+        except (KeyError, ValueError):
+            self._invalidate_connection_indexes()
+
+    def get_transition_by_origin(self, from_state_id, from_outcome_id):
+        """Look up the transition starting at the given outcome of a state
+
+        :param str from_state_id: The id of the origin state, None for the start transition
+        :param int from_outcome_id: The id of the origin outcome, None for the start transition
+        :return: The transition or None, if the outcome is not connected
+        :rtype: rafcon.core.state_elements.transition.Transition
+        """
+        return self._get_connection_indexes()[0].get((from_state_id, from_outcome_id))
+
+    def get_data_flows_by_origin(self, from_state_id, from_key):
+        """Look up all data flows starting at the given data port
+
+        :param str from_state_id: The id of the origin state
+        :param int from_key: The id of the origin data port
+        :return: The data flows in the order of the data_flows dictionary
+        :rtype: tuple
+        """
+        return tuple(self._get_connection_indexes()[1].get((from_state_id, from_key), ()))
+
+    def get_data_flows_by_target(self, to_state_id, to_key):
+        """Look up all data flows ending at the given data port
+
+        :param str to_state_id: The id of the target state
+        :param int to_key: The id of the target data port
+        :return: The data flows in the order of the data_flows dictionary
+        :rtype: tuple
+        """
+        return tuple(self._get_connection_indexes()[2].get((to_state_id, to_key), ()))
+
     # ---------------------------------------------------------------------------------------------
     # ---------------------------------- transition functions -------------------------------------
     # ---------------------------------------------------------------------------------------------
@@ -1230,11 +1371,9 @@ class ContainerState(State):
         :raises exceptions.AttributeError: if the outcome of the state with the state_id==from_state_id
                                             is already connected
         """
-        for trans_key, transition in self.transitions.items():
-            if transition.from_state == from_state_id:
-                if transition.from_outcome == from_outcome:
-                    raise AttributeError("Outcome %s of state %s is already connected" %
-                                         (str(from_outcome), str(from_state_id)))
+        if self.get_transition_by_origin(from_state_id, from_outcome) is not None:
+            raise AttributeError("Outcome %s of state %s is already connected" %
+                                 (str(from_outcome), str(from_state_id)))
 
     @lock_state_machine
     def create_transition(self, from_state_id, from_outcome, to_state_id, to_outcome, transition_id):
@@ -1276,9 +1415,10 @@ class ContainerState(State):
             self.transitions[transition_id] = \
                 Transition(None, None, to_state_id, to_outcome, transition_id, self)
 
+        self._add_connection_to_indexes(self.transitions[transition_id])
+
         # notify all states waiting for transition to be connected
-        with self._transitions_cv:
-            self._transitions_cv.notify_all()
+        self._notify_transition_change()
 
         return transition_id
 
@@ -1305,10 +1445,10 @@ class ContainerState(State):
 
         new_transition = Transition(from_state_id, from_outcome, to_state_id, to_outcome, transition_id, self)
         self.transitions[transition_id] = new_transition
+        self._add_connection_to_indexes(new_transition)
 
         # notify all states waiting for transition to be connected
-        with self._transitions_cv:
-            self._transitions_cv.notify_all()
+        self._notify_transition_change()
         # self.create_transition(from_state_id, from_outcome, to_state_id, to_outcome, transition_id)
         return transition_id
 
@@ -1324,11 +1464,7 @@ class ContainerState(State):
             raise TypeError("state must be of type State")
         if not isinstance(outcome, Outcome):
             raise TypeError("outcome must be of type Outcome")
-        result_transition = None
-        for key, transition in self.transitions.items():
-            if transition.from_state == state.state_id and transition.from_outcome == outcome.outcome_id:
-                result_transition = transition
-        return result_transition
+        return self.get_transition_by_origin(state.state_id, outcome.outcome_id)
 
     @lock_state_machine
     @Observable.observed
@@ -1344,7 +1480,9 @@ class ContainerState(State):
             raise AttributeError("The transition_id %s does not exist" % str(transition_id))
 
         self.transitions[transition_id].parent = None
-        return self.transitions.pop(transition_id)
+        transition = self.transitions.pop(transition_id)
+        self._remove_connection_from_indexes(transition)
+        return transition
 
     @lock_state_machine
     def remove_outcome_hook(self, outcome_id):
@@ -1395,6 +1533,7 @@ class ContainerState(State):
 
         self.data_flows[data_flow_id] = DataFlow(from_state_id, from_data_port_id, to_state_id, to_data_port_id,
                                                  data_flow_id, self)
+        self._add_connection_to_indexes(self.data_flows[data_flow_id])
         return data_flow_id
 
     @lock_state_machine
@@ -1409,7 +1548,9 @@ class ContainerState(State):
             raise AttributeError("The data_flow_id %s does not exist" % str(data_flow_id))
 
         self._data_flows[data_flow_id].parent = None
-        return self._data_flows.pop(data_flow_id)
+        data_flow = self._data_flows.pop(data_flow_id)
+        self._remove_connection_from_indexes(data_flow)
+        return data_flow
 
     @lock_state_machine
     def remove_data_flows_with_data_port_id(self, data_port_id):
@@ -1575,16 +1716,13 @@ class ContainerState(State):
             # for all input keys fetch the correct data_flow connection and read data into the result_dict
             actual_value = None
             actual_value_time = 0
-            for data_flow_key, data_flow in self.data_flows.items():
-
-                if data_flow.to_key == input_port_key:
-                    if data_flow.to_state == state.state_id:
-                        # fetch data from the scoped_data list: the key is the data_port_key + the state_id
-                        key = str(data_flow.from_key) + data_flow.from_state
-                        if key in self.scoped_data:
-                            if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
-                                actual_value = deepcopy(self.scoped_data[key].value)
-                                actual_value_time = self.scoped_data[key].timestamp
+            for data_flow in self.get_data_flows_by_target(state.state_id, input_port_key):
+                # fetch data from the scoped_data list: the key is the data_port_key + the state_id
+                key = str(data_flow.from_key) + data_flow.from_state
+                if key in self.scoped_data:
+                    if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
+                        actual_value = pass_value(self.scoped_data[key].value)
+                        actual_value_time = self.scoped_data[key].timestamp
 
             if actual_value is not None:
                 result_dict[value.name] = actual_value
@@ -1595,7 +1733,7 @@ class ContainerState(State):
     # ---------------------------- functions to modify the scoped data ----------------------------
     # ---------------------------------------------------------------------------------------------
 
-    @lock_state_machine
+    @lock_scoped_data
     def add_input_data_to_scoped_data(self, dictionary):
         """Add a dictionary to the scoped data
 
@@ -1611,15 +1749,14 @@ class ContainerState(State):
                     self.scoped_data[str(input_data_port_key) + self.state_id] = \
                         ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
                     # forward the data to scoped variables
-                    for data_flow_key, data_flow in self.data_flows.items():
-                        if data_flow.from_key == input_data_port_key and data_flow.from_state == self.state_id:
-                            if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
-                                current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                                self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                    ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
-                                               ScopedVariable, parent=self)
+                    for data_flow in self.get_data_flows_by_origin(self.state_id, input_data_port_key):
+                        if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
+                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                                ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
+                                           ScopedVariable, parent=self)
 
-    @lock_state_machine
+    @lock_scoped_data
     def add_state_execution_output_to_scoped_data(self, dictionary, state):
         """Add a state execution output to the scoped data
 
@@ -1638,7 +1775,7 @@ class ContainerState(State):
                     self.scoped_data[str(output_data_port_key) + state.state_id] = \
                         ScopedData(data_port.name, value, type(value), state.state_id, OutputDataPort, parent=self)
 
-    @lock_state_machine
+    @lock_scoped_data
     def add_default_values_of_scoped_variables_to_scoped_data(self):
         """Add the scoped variables default values to the scoped_data dictionary
 
@@ -1648,7 +1785,7 @@ class ContainerState(State):
                 ScopedData(scoped_var.name, scoped_var.default_value, scoped_var.data_type, self.state_id,
                            ScopedVariable, parent=self)
 
-    @lock_state_machine
+    @lock_scoped_data
     def update_scoped_variables_with_output_dictionary(self, dictionary, state):
         """Update the values of the scoped variables with the output dictionary of a specific state.
 
@@ -1666,14 +1803,13 @@ class ContainerState(State):
                 if not key == "error":
                     logger.warning("Output variable %s was written during state execution, "
                                    "that has no data port connected to it.", str(key))
-            for data_flow_key, data_flow in self.data_flows.items():
-                if data_flow.from_key == output_data_port_key and data_flow.from_state == state.state_id:
-                    if data_flow.to_state == self.state_id:  # is target of data flow own state id?
-                        if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
-                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
-                                           ScopedVariable, parent=self)
+            for data_flow in self.get_data_flows_by_origin(state.state_id, output_data_port_key):
+                if data_flow.to_state == self.state_id:  # is target of data flow own state id?
+                    if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
+                        current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                        self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                            ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
+                                       ScopedVariable, parent=self)
 
     # ---------------------------------------------------------------------------------------------
     # ------------------------ functions to modify the scoped data end ----------------------------
@@ -1704,6 +1840,8 @@ class ContainerState(State):
             if data_flow.to_state == old_state_id:
                 data_flow._to_state = self.state_id
 
+        self._invalidate_connection_indexes()
+
     def get_state_for_transition(self, transition):
         """Calculate the target state of a transition
 
@@ -1735,25 +1873,23 @@ class ContainerState(State):
             actual_value = None
             actual_value_was_written = False
             actual_value_time = 0
-            for data_flow_id, data_flow in self.data_flows.items():
-                if data_flow.to_state == self.state_id:
-                    if data_flow.to_key == output_port_id:
-                        scoped_data_key = str(data_flow.from_key) + data_flow.from_state
-                        if scoped_data_key in self.scoped_data:
-                            # if self.scoped_data[scoped_data_key].timestamp > actual_value_time is True
-                            # the data of a previous execution of the same state is overwritten
-                            if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
-                                actual_value = deepcopy(self.scoped_data[scoped_data_key].value)
-                                actual_value_time = self.scoped_data[scoped_data_key].timestamp
-                                actual_value_was_written = True
-                        else:
-                            if not self.backward_execution:
-                                logger.debug(
-                                    "Output data with name {0} of state {1} was not found in the scoped data "
-                                    "of state {2}. Thus the state did not write onto this output. "
-                                    "This can mean a state machine design error.".format(
-                                        str(output_name), str(self.states[data_flow.from_state].get_path()),
-                                        self.get_path()))
+            for data_flow in self.get_data_flows_by_target(self.state_id, output_port_id):
+                scoped_data_key = str(data_flow.from_key) + data_flow.from_state
+                if scoped_data_key in self.scoped_data:
+                    # if self.scoped_data[scoped_data_key].timestamp > actual_value_time is True
+                    # the data of a previous execution of the same state is overwritten
+                    if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
+                        actual_value = pass_value(self.scoped_data[scoped_data_key].value)
+                        actual_value_time = self.scoped_data[scoped_data_key].timestamp
+                        actual_value_was_written = True
+                else:
+                    if not self.backward_execution:
+                        logger.debug(
+                            "Output data with name {0} of state {1} was not found in the scoped data "
+                            "of state {2}. Thus the state did not write onto this output. "
+                            "This can mean a state machine design error.".format(
+                                str(output_name), str(self.states[data_flow.from_state].get_path()),
+                                self.get_path()))
             if actual_value_was_written:
                 output_dict[output_name] = actual_value
 
@@ -1778,11 +1914,33 @@ class ContainerState(State):
         # Continue with checks if previous ones did not fail
         # Check type of child and call appropriate validity test
         if isinstance(child, DataFlow):
-            return self._check_data_flow_validity(child)
+            valid, message = self._check_data_flow_validity(child)
+            # the ports of a data flow of self might have changed
+            if valid and self._data_flows.get(child.data_flow_id) is child:
+                self._invalidate_connection_indexes()
+            return valid, message
         if isinstance(child, Transition):
-            return self._check_transition_validity(child)
+            valid, message = self._check_transition_validity(child)
+            # the origin or target of a transition of self might have changed
+            if valid and self._transitions.get(child.transition_id) is child:
+                self._invalidate_connection_indexes()
+                # the transition already holds its new value, which might be the one a waiting execution needs
+                self._notify_transition_change()
+            return valid, message
         return valid, message
 
+    def child_change_reverted(self, child):
+        """Informs the state about a reverted change of a child object
+
+        The lookup tables for transitions and data flows might have been built with the rejected value of a connection
+        during its validity check and are therefore dropped.
+
+        :param object child: The child of the state that was reverted
+        """
+        if isinstance(child, Transition) and self._transitions.get(child.transition_id) is child or \
+                isinstance(child, DataFlow) and self._data_flows.get(child.data_flow_id) is child:
+            self._invalidate_connection_indexes()
+
     def check_data_port_connection(self, check_data_port):
         """Checks the connection validity of a data port
 
@@ -2249,6 +2407,9 @@ class ContainerState(State):
         self._transitions = dict((transition_id, t) for (transition_id, t) in self._transitions.items()
                                  if transition_id not in transition_ids_to_delete)
 
+        self._invalidate_connection_indexes()
+        self._notify_transition_change()
+
         # check that all old_transitions are no more referencing self as there parent
         for old_transition in old_transitions.values():
             if old_transition not in self._transitions.values() and old_transition.parent is self:
@@ -2306,6 +2467,8 @@ class ContainerState(State):
         self._data_flows = dict((data_flow_id, d) for (data_flow_id, d) in self._data_flows.items()
                                 if data_flow_id not in data_flow_ids_to_delete)
 
+        self._invalidate_connection_indexes()
+
         # check that all old_data_flows are no more referencing self as there parent
         for old_data_flow in old_data_flows.values():
             if old_data_flow not in self._data_flows.values() and old_data_flow.parent is self:
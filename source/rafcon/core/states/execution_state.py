@@ -23,6 +23,7 @@ import traceback
 import sys
 import os
 from copy import copy, deepcopy
+from future.utils import PY2
 
 from gtkmvc3.observable import Observable
 
@@ -32,6 +33,7 @@ from rafcon.core.state_elements.logical_port import Outcome
 from rafcon.core.script import Script
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.execution.execution_history import CallType
+from rafcon.core.constants import THREAD_BACKEND, PROCESS_BACKEND, EXECUTION_BACKENDS
 from rafcon.core.config import global_config
 
 from rafcon.utils import log
@@ -42,13 +44,19 @@ class ExecutionState(State):
     """A class to represent a state for executing arbitrary functions
 
     This kind of state does not have any child states.
+
+    :ivar str ExecutionState.execution_backend: whether the script is executed in the thread of the state
+        (:data:`THREAD_BACKEND`) or in a worker process (:data:`PROCESS_BACKEND`)
     """
 
     yaml_tag = u'!ExecutionState'
     
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
-                 income=None, outcomes=None, path=None, filename=None, check_path=True, safe_init=True):
+                 income=None, outcomes=None, path=None, filename=None, check_path=True, safe_init=True,
+                 execution_backend=THREAD_BACKEND):
         State.__init__(self, name, state_id, input_data_ports, output_data_ports, income, outcomes, safe_init=safe_init)
+        self._execution_backend = THREAD_BACKEND
+        self.execution_backend = execution_backend
         self._script = None
         self.script = Script(path, filename, parent=self)
         self.logger = log.get_logger(self.name)
@@ -71,6 +79,7 @@ class ExecutionState(State):
         outcomes = {elem_id: copy(self._outcomes[elem_id]) for elem_id in self._outcomes.keys()}
         state = self.__class__(self.name, self.state_id, input_data_ports, output_data_ports, income, outcomes, None,
                                safe_init=False)
+        state._execution_backend = self.execution_backend
 
         state.script_text = deepcopy(self.script_text)
 
@@ -97,6 +106,8 @@ class ExecutionState(State):
         outcomes = dictionary['outcomes']
         safe_init = global_config.get_config_value("LOAD_SM_WITH_CHECKS", True)
         state = cls(name, state_id, input_data_ports, output_data_ports, income, outcomes, safe_init=safe_init)
+        # older state machine versions and states using the thread backend don't have this set
+        state.execution_backend = dictionary.get('execution_backend', THREAD_BACKEND)
         try:
             state.description = dictionary['description']
         except (TypeError, KeyError):  # (Very) old state machines do not have a description field
@@ -105,11 +116,26 @@ class ExecutionState(State):
             logger.warning("Erroneous description for state '{1}': {0}".format(formatted_lines[-1], dictionary['name']))
         return state
 
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = State.state_to_dict(state)
+        # only stored if set, so that state machines without process backend keep their format
+        if state.execution_backend != THREAD_BACKEND:
+            dict_representation['execution_backend'] = state.execution_backend
+        return dict_representation
+
     def _execute(self, execute_inputs, execute_outputs, backward_execution=False):
         """Calls the custom execute function of the script.py of the state
 
+        Depending on the execution backend, the function is called in the thread of the state or in a worker process.
         """
-        outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+        if self.execution_backend == PROCESS_BACKEND:
+            # the process backend depends on Python 3 features of multiprocessing
+            from rafcon.core.execution import process_backend
+            outcome_item = process_backend.execute_in_process(self, execute_inputs, execute_outputs,
+                                                              backward_execution)
+        else:
+            outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
 
         # in the case of backward execution the outcome is not relevant
         if backward_execution:
@@ -202,6 +228,25 @@ class ExecutionState(State):
             raise AttributeError("The script of a ExecutionState has to reference the state it-self.")
         self._script = script
 
+    @property
+    def execution_backend(self):
+        """Property for the _execution_backend field
+
+        :raises exceptions.ValueError: if the execution backend is not one of :data:`EXECUTION_BACKENDS` or the
+            process backend is used with Python 2
+        """
+        return self._execution_backend
+
+    @execution_backend.setter
+    @lock_state_machine
+    @Observable.observed
+    def execution_backend(self, execution_backend):
+        if execution_backend not in EXECUTION_BACKENDS:
+            raise ValueError("The execution backend has to be one of {0}".format(", ".join(EXECUTION_BACKENDS)))
+        if execution_backend == PROCESS_BACKEND and PY2:
+            raise ValueError("The execution backend '{0}' requires Python 3".format(PROCESS_BACKEND))
+        self._execution_backend = execution_backend
+
     @property
     def script_text(self):
         return self._script.script
@@ -19,6 +19,7 @@
 """
 from future.utils import string_types
 from builtins import str
+from threading import RLock
 from weakref import ref
 from copy import copy, deepcopy
 
@@ -34,6 +35,9 @@ from rafcon.utils.hashable import Hashable
 
 logger = log.get_logger(__name__)
 
+# guards the creation of the state copies of library states from their templates
+_state_copy_lock = RLock()
+
 
 class LibraryState(State):
     """A class to represent a library state for the state machine
@@ -43,6 +47,11 @@ class LibraryState(State):
     The constructor uses an exceptions.AttributeError if the passed version of the library and the version found in
     the library paths do not match.
 
+    All library states of a library share the root state loaded by the library manager as read-only template. A
+    library state only owns copies of the outcomes and data ports of the template and its runtime values. The
+    `state_copy` (an own copy of the template) is only created when it is first accessed, e.g. for the execution, an
+    inspection or a modification of the library content.
+
     :ivar str library_path: the path of the library relative to a certain library path (e.g. lwr/gripper/)
     :ivar str library_name: the name of the library between all child states: (e.g. open, or close)
     :ivar str State.name: the name of the library state
@@ -64,6 +73,7 @@ class LibraryState(State):
     _library_name = None
     _version = None
     _state_copy = None
+    _template = None
 
     _input_data_port_runtime_values = {}
     _use_runtime_value_input_data_ports = {}
@@ -100,10 +110,12 @@ class LibraryState(State):
             logger.info("New library name '{0}' is located at {1}".format(new_library_name, new_library_path))
 
         # key = load_library_root_state_timer.start()
-        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
+        lib_version, template = library_manager.get_library_template(self.lib_os_path)
         if not str(lib_version) == version and not str(lib_version) == "None":
             raise AttributeError("Library does not have the correct version!")
-        self.state_copy = state_copy
+        if not isinstance(template, State):
+            raise TypeError("The root state of library {0} is no State".format(self.lib_os_path))
+        self._template = template
 
         if safe_init:
             LibraryState._safe_init(self, name)
@@ -123,27 +135,25 @@ class LibraryState(State):
         self.initialized = True
 
     def _safe_init(self, name):
-        self.state_copy.parent = self
         if name is None:
-            self.name = self.state_copy.name
-        # copy all ports and outcomes of self.state_copy to let the library state appear like the container state
+            self.name = self._template.name
+        # copy all ports and outcomes of the template to let the library state appear like the container state
         # this will also set the parent of all outcomes and data ports to self
-        self.outcomes = self.state_copy.outcomes
-        self.input_data_ports = self.state_copy.input_data_ports
-        self.output_data_ports = self.state_copy.output_data_ports
+        self.outcomes = {key: copy(outcome) for key, outcome in self._template.outcomes.items()}
+        self.input_data_ports = {key: copy(port) for key, port in self._template.input_data_ports.items()}
+        self.output_data_ports = {key: copy(port) for key, port in self._template.output_data_ports.items()}
 
     def _unsafe_init(self, name):
-        self.state_copy._parent = ref(self)
         if name is None:
-            self._name = self.state_copy.name
-        self._outcomes = self.state_copy.outcomes
+            self._name = self._template.name
+        self._outcomes = {key: copy(outcome) for key, outcome in self._template.outcomes.items()}
         # add parents manually
         for outcome_id, outcome in self._outcomes.items():
             outcome._parent = ref(self)
-        self._input_data_ports = self.state_copy.input_data_ports
+        self._input_data_ports = {key: copy(port) for key, port in self._template.input_data_ports.items()}
         for port_id, port in self._input_data_ports.items():
             port._parent = ref(self)
-        self._output_data_ports = self.state_copy.output_data_ports
+        self._output_data_ports = {key: copy(port) for key, port in self._template.output_data_ports.items()}
         for port_id, port in self._output_data_ports.items():
             port._parent = ref(self)
 
@@ -212,7 +222,7 @@ class LibraryState(State):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self._state_copy == other.state_copy
+        return str(self) == str(other) and self.library_root_state == other.library_root_state
 
     def __copy__(self):
         income = self._income
@@ -234,11 +244,13 @@ class LibraryState(State):
     def destroy(self, recursive=True):
         super(LibraryState, self).destroy(recursive)
         if recursive:
-            if self.state_copy:
-                self.state_copy.destroy(recursive)
-            else:
+            if self._state_copy:
+                self._state_copy.destroy(recursive)
+            elif self._template is None:
                 logger.verbose("Multiple calls of destroy {0}".format(self))
             self._state_copy = None
+            # the template is shared and therefore never destroyed
+            self._template = None
 
     def run(self):
         """ This defines the sequence of actions that are taken when the library state is executed
@@ -263,19 +275,23 @@ class LibraryState(State):
         """Preempt the state and all of it child states.
         """
         super(LibraryState, self).recursively_preempt_states()
-        self.state_copy.recursively_preempt_states()
+        # without state copy, the library state was never executed
+        if self._state_copy is not None:
+            self._state_copy.recursively_preempt_states()
 
     def recursively_pause_states(self):
         """Pause the state and all of it child states.
         """
         super(LibraryState, self).recursively_pause_states()
-        self.state_copy.recursively_pause_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_pause_states()
 
     def recursively_resume_states(self):
         """Resume the state and all of it child states.
         """
         super(LibraryState, self).recursively_resume_states()
-        self.state_copy.recursively_resume_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_resume_states()
 
     @lock_state_machine
     def add_outcome(self, name, outcome_id=None):
@@ -355,7 +371,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_input_runtime_value(self, input_data_port_id, value):
-        checked_value = self.state_copy.input_data_ports[input_data_port_id].check_default_value(value)
+        checked_value = self.input_data_ports[input_data_port_id].check_default_value(value)
         self._input_data_port_runtime_values[input_data_port_id] = checked_value
 
     @lock_state_machine
@@ -366,7 +382,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_output_runtime_value(self, output_data_port_id, value):
-        checked_value = self.state_copy.output_data_ports[output_data_port_id].check_default_value(value)
+        checked_value = self.output_data_ports[output_data_port_id].check_default_value(value)
         self._output_data_port_runtime_values[output_data_port_id] = checked_value
 
     @lock_state_machine
@@ -409,7 +425,7 @@ class LibraryState(State):
 
     def update_hash(self, obj_hash):
         super(LibraryState, self).update_hash(obj_hash)
-        self.state_copy.update_hash(obj_hash)
+        self.library_root_state.update_hash(obj_hash)
 
     @staticmethod
     def state_to_dict(state):
@@ -432,21 +448,21 @@ class LibraryState(State):
         Returns the numer of child states. As per default states do not have child states return 1.
         :return:
         """
-        return self.state_copy.get_states_statistics(hierarchy_level)
+        return self.library_root_state.get_states_statistics(hierarchy_level)
 
     def get_number_of_transitions(self):
         """
         Return the number of transitions for a state. Per default states do not have transitions.
         :return:
         """
-        return self.state_copy.get_number_of_transitions()
+        return self.library_root_state.get_number_of_transitions()
 
     def get_number_of_data_flows(self):
         """
         Return the number of data flows for a state. Per default states do not have data flows.
         :return:
         """
-        return self.state_copy.get_number_of_data_flows()
+        return self.library_root_state.get_number_of_data_flows()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -504,9 +520,33 @@ class LibraryState(State):
     def state_copy(self):
         """Property for the _state_copy field
 
+        The state copy is created from the template on the first access.
         """
+        if self._state_copy is None and self._template is not None:
+            self._create_state_copy()
         return self._state_copy
 
+    def _create_state_copy(self):
+        with _state_copy_lock:
+            if self._state_copy is not None:
+                return
+            state_copy = deepcopy(self._template)
+            # the library state and its state copy share their outcomes and data ports
+            state_copy._outcomes = self._outcomes
+            state_copy._input_data_ports = self._input_data_ports
+            state_copy._output_data_ports = self._output_data_ports
+            state_copy._parent = ref(self)
+            self._state_copy = state_copy
+
+    @property
+    def library_root_state(self):
+        """The state copy, if it was already created, else the template shared with other library states
+
+        The returned state must not be modified. Use this property for read-only access to the content of the
+        library without creating a state copy.
+        """
+        return self._state_copy if self._state_copy is not None else self._template
+
     @state_copy.setter
     @lock_state_machine
     @Observable.observed
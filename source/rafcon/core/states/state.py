@@ -26,6 +26,7 @@ standard_library.install_aliases()
 from future.utils import string_types
 import queue
 import copy
+import itertools
 import os
 import threading
 from builtins import staticmethod
@@ -44,6 +45,8 @@ from rafcon.core.state_elements.logical_port import Income, Outcome
 from rafcon.core.state_elements.scope import ScopedData
 from rafcon.core.storage import storage
 from rafcon.core.config import global_config
+from rafcon.core.execution.execution_status_buffer import execution_status_buffer
+from rafcon.core.execution.state_threads import create_state_thread
 from rafcon.utils import classproperty
 from rafcon.utils import log
 from rafcon.utils import multi_event
@@ -55,6 +58,9 @@ from rafcon.core.decorators import lock_state_machine
 logger = log.get_logger(__name__)
 PATH_SEPARATOR = '/'
 
+# counts the changes of state parents, each change invalidates the cached state machine references of all states
+_parent_changes = itertools.count(1)
+
 
 class State(Observable, YAMLObject, JSONObject, Hashable):
 
@@ -74,6 +80,11 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     """
 
     _parent = None
+    # number of the last parent change, the cached state machine reference is valid as long as it does not change
+    _structure_version = 0
+    _state_machine_cache = None
+    # function loading the semantic data on first access, set for lazily loaded state machines
+    _semantic_data_loader = None
     _state_element_attrs = ['income', 'outcomes', 'input_data_ports', 'output_data_ports']
 
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
@@ -278,16 +289,23 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     # ---------------------------------------------------------------------------------------------
 
     # give the state the appearance of a thread that can be started several times
-    def start(self, execution_history, backward_execution=False, generate_run_id=True):
+    def start(self, execution_history, backward_execution=False, generate_run_id=True, sequential=False):
         """ Starts the execution of the state in a new thread.
 
+        If the ``EXECUTION_THREAD_POOL_ENABLED`` configuration is set, the state is executed in the calling thread for
+        sequential executions and in a thread of a worker pool otherwise.
+
+        :param execution_history: the execution history to log the execution to
+        :param bool backward_execution: whether to execute the state backwards
+        :param bool generate_run_id: whether to generate a new run id
+        :param bool sequential: True, if the caller joins the state right after starting it
         :return:
         """
         self.execution_history = execution_history
         if generate_run_id:
             self._run_id = run_id_generator()
         self.backward_execution = copy.copy(backward_execution)
-        self.thread = threading.Thread(target=self.run)
+        self.thread = create_state_thread(self.run, sequential)
         self.thread.start()
 
     def generate_run_id(self):
@@ -316,6 +334,8 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         if not isinstance(self.output_data, dict):
             raise TypeError("output_data must be of type dict")
         self.check_input_data_type()
+        from rafcon.core.singleton import state_machine_execution_engine
+        state_machine_execution_engine.notify_state_entered(self)
 
     def setup_backward_run(self):
         self.state_execution_status = StateExecutionStatus.ACTIVE
@@ -613,16 +633,30 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     def get_state_machine(self):
         """Get a reference of the state_machine the state belongs to
 
+        The reference is cached until the parent of any state changes, as it is needed for every locked
+        modification of the state.
+
         :rtype rafcon.core.state_machine.StateMachine
         :return: respective state machine
         """
+        structure_version = State._structure_version
+        cache = self._state_machine_cache
+        if cache is not None and cache[0] == structure_version:
+            state_machine = cache[1]()
+            if state_machine is not None:
+                return state_machine
+
+        state_machine = None
         if self.parent:
             if self.is_root_state:
-                return self.parent
+                state_machine = self.parent
             else:
-                return self.parent.get_state_machine()
+                state_machine = self.parent.get_state_machine()
 
-        return None
+        # detached states are not cached, as they are (re-)attached without a parent change, e.g. by _unsafe_init
+        if state_machine is not None:
+            self._state_machine_cache = (structure_version, ref(state_machine))
+        return state_machine
 
     @property
     def file_system_path(self):
@@ -772,6 +806,15 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
             return self._check_scoped_data_validity(child)
         return False, "Invalid state element for state of type {}".format(self.__class__.__name__)
 
+    def child_change_reverted(self, child):
+        """Informs the state about a reverted change of a child object
+
+        The method is called by state child objects, when a change was reverted, as it did not pass the validity check.
+
+        :param object child: The child of the state that was reverted
+        """
+        pass
+
     def _check_income_validity(self, check_income):
         """Checks the validity of an income
 
@@ -1073,6 +1116,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise TypeError("parent must be of type State or StateMachine or None")
 
             self._parent = ref(parent)
+        State._structure_version = next(_parent_changes)
 
     @property
     def input_data_ports(self):
@@ -1429,21 +1473,33 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         else:
             return True
 
+    @lock_state_machine
+    @Observable.observed
+    def state_execution_status(self, state_execution_status):
+        self._state_execution_status = state_execution_status
+
+    # the observed setter keeps the method name 'state_execution_status' in the notifications
+    _notify_state_execution_status = state_execution_status
+
     @property
     def state_execution_status(self):
         """Property for the _state_execution_status field
 
+        If the :data:`rafcon.core.execution.execution_status_buffer.execution_status_buffer` is enabled, changes are
+        recorded in the buffer instead of being notified to the observers.
         """
         return self._state_execution_status
 
     @state_execution_status.setter
-    @lock_state_machine
-    @Observable.observed
     def state_execution_status(self, state_execution_status):
         if not isinstance(state_execution_status, StateExecutionStatus):
             raise TypeError("state_execution_status must be of type StateExecutionStatus")
 
-        self._state_execution_status = state_execution_status
+        if execution_status_buffer.enabled:
+            self._state_execution_status = state_execution_status
+            execution_status_buffer.record(self)
+        else:
+            self._notify_state_execution_status(state_execution_status)
 
     @property
     def is_root_state(self):
@@ -1540,11 +1596,21 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         """
         return self._run_id
 
+    def defer_semantic_data_loading(self, loader):
+        """Load the semantic data on first access instead of now
+
+        :param loader: a function without arguments returning the semantic data as dict
+        """
+        self._semantic_data_loader = loader
+
     @property
     def semantic_data(self):
         """Property for the _semantic_data field
 
         """
+        if self._semantic_data_loader is not None:
+            loader, self._semantic_data_loader = self._semantic_data_loader, None
+            self._semantic_data = Vividict(loader())
         return self._semantic_data
 
     @semantic_data.setter
@@ -1553,6 +1619,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     def semantic_data(self, semantic_data):
         if not isinstance(semantic_data, dict):
             raise TypeError("semantic_data must be of type Vividict or dict")
+        self._semantic_data_loader = None
         if isinstance(semantic_data, dict):
             self._semantic_data = Vividict(semantic_data)
         else:
@@ -0,0 +1,415 @@
+# Copyright (C) 2020 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: container
+   :synopsis: Storage of state machines in a single file
+
+A state machine container is a zip file, which holds the files of the folder format of a state machine (see
+:mod:`rafcon.core.storage.storage`) at the same relative paths. Opening or copying a container only needs a few
+system calls, independent of the number of states. Additionally, the container holds an index, which maps the paths
+of the states (see :meth:`rafcon.core.states.state.State.get_path`) onto their folders in the container. Thus single
+states can be loaded without reading the whole container (see :func:`load_state_from_container`).
+
+Containers are loaded and saved with :func:`rafcon.core.storage.storage.load_state_machine_from_path` and
+:func:`rafcon.core.storage.storage.save_state_machine_to_path`, if the path is an existing container or ends with
+:data:`CONTAINER_FILE_EXTENSION`.
+"""
+from builtins import str
+import json
+import os
+import posixpath
+import zipfile
+
+from rafcon.utils import log
+from rafcon.utils import storage_utils
+
+logger = log.get_logger(__name__)
+
+#: The file extension of state machine containers
+CONTAINER_FILE_EXTENSION = ".rafcon.zip"
+#: The name of the index within the container
+INDEX_FILE = "index.json"
+CONTAINER_FORMAT_VERSION = 1
+
+# files and folders of a state machine folder, which are not copied into a container
+_IGNORED_FOLDERS = ("__pycache__", ".git", ".svn")
+_IGNORED_FILE_EXTENSIONS = (".pyc", ".tmp")
+
+
+def is_container(path):
+    """Checks whether the path points to a state machine container
+
+    :param str path: the path to check
+    :rtype: bool
+    """
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def is_container_path(path):
+    """Checks whether the state machine at path is stored, or is to be stored, as container
+
+    :param str path: the path of the state machine
+    :rtype: bool
+    """
+    return path.endswith(CONTAINER_FILE_EXTENSION) and not os.path.isdir(path) or is_container(path)
+
+
+def get_container_state_path(container_path, folder):
+    """Returns the path, which is used as `file_system_path` of the states loaded from a container
+
+    :param str container_path: the path of the container
+    :param str folder: the folder of the state within the container
+    """
+    return posixpath.join(container_path, folder) if folder else container_path
+
+
+def split_container_path(path):
+    """Splits a path pointing into a container into the path of the container and the name within the container
+
+    :param str path: the path of a file, e.g. the meta data file of a state loaded from a container
+    :return: the path of the container and the name of the file within the container or None, if the path does not
+        point into a container
+    :rtype: tuple(str, str)
+    """
+    container_path = path
+    while True:
+        if os.path.exists(container_path):
+            if container_path == path or not is_container(container_path):
+                return None
+            return container_path, path[len(container_path):].lstrip("/" + os.sep).replace(os.sep, "/")
+        parent_path = os.path.dirname(container_path)
+        if parent_path == container_path or not parent_path:
+            return None
+        container_path = parent_path
+
+
+def read_file(path):
+    """Reads a text file from a container
+
+    :param str path: the path of the file within a container (see :func:`split_container_path`)
+    :return: the content of the file or None, if it does not exist
+    :rtype: str
+    """
+    split_path = split_container_path(path)
+    if split_path is None:
+        return None
+    with zipfile.ZipFile(split_path[0]) as container:
+        if split_path[1] not in container.namelist():
+            return None
+        return _read_text(container, split_path[1])
+
+
+def _read_text(container, name):
+    return container.read(name).decode('utf-8')
+
+
+def _write_container(container_path, files):
+    """Writes the files into a new container, which then replaces the container at container_path
+
+    :param str container_path: the path of the container
+    :param dict files: the contents of the files mapped by their names
+    """
+    directory = os.path.dirname(os.path.realpath(container_path))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    temp_container_path = os.path.join(directory, ".{0}.{1}.tmp".format(os.path.basename(container_path),
+                                                                         os.getpid()))
+    try:
+        with zipfile.ZipFile(temp_container_path, 'w', zipfile.ZIP_DEFLATED) as container:
+            for name, content in files.items():
+                container.writestr(name, content)
+        # os.rename does not replace existing files on Windows
+        getattr(os, 'replace', os.rename)(temp_container_path, container_path)
+    except Exception:
+        if os.path.exists(temp_container_path):
+            os.remove(temp_container_path)
+        raise
+
+
+def write_files(container_path, files):
+    """Adds files to an existing container or replaces them, e.g. to store the meta data of the GUI
+
+    :param str container_path: the path of the container
+    :param dict files: the contents of the files mapped by their names within the container
+    """
+    with zipfile.ZipFile(container_path) as container:
+        all_files = {name: container.read(name) for name in container.namelist() if name not in files}
+    all_files.update(files)
+    _write_container(container_path, all_files)
+
+
+def _create_index(states):
+    return json.dumps({"version": CONTAINER_FORMAT_VERSION, "states": states}, indent=4, sort_keys=True)
+
+
+def read_index(container_path):
+    """Reads the index of a container
+
+    :param str container_path: the path of the container
+    :return: the folders of the states within the container mapped by the paths of the states
+    :rtype: dict
+    """
+    with zipfile.ZipFile(container_path) as container:
+        return json.loads(_read_text(container, INDEX_FILE))["states"]
+
+
+def _add_state_files(state, parent_folder, files, index, compact):
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.container_state import ContainerState
+    from rafcon.core.storage import storage
+
+    folder = posixpath.join(parent_folder, storage.get_storage_id_for_state(state))
+    index[state.get_path()] = folder
+    files[posixpath.join(folder, storage.FILE_NAME_CORE_DATA)] = storage_utils.dump_objects_to_json_string(state, compact)
+    if isinstance(state, ExecutionState):
+        files[posixpath.join(folder, storage.SCRIPT_FILE)] = state.script_text
+    if state.semantic_data:
+        files[posixpath.join(folder, storage.SEMANTIC_DATA_FILE)] = \
+            storage_utils.dump_objects_to_json_string(state.semantic_data, compact)
+    if isinstance(state, ContainerState):
+        for child_state in state.states.values():
+            _add_state_files(child_state, folder, files, index, compact)
+
+
+def save_state_machine_to_container(state_machine, container_path, as_copy=False, compact=False):
+    """Saves a state machine into a container
+
+    Files of an existing container, which are not written by the core, e.g. the meta data of the GUI, are kept for the
+    states, which still exist.
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
+    :param str container_path: the path of the container
+    :param bool as_copy: Whether to use a copy storage for the state machine
+    :param bool compact: Whether to write compact json files
+    """
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.container_state import ContainerState
+    from rafcon.core.storage import storage
+
+    state_machine.acquire_modification_lock()
+    try:
+        root_state = state_machine.root_state
+        storage.load_deferred_data(root_state)
+
+        old_update_time = state_machine.last_update
+        state_machine.last_update = storage_utils.get_current_time_string()
+        state_machine_json = storage_utils.dump_objects_to_json_string(state_machine.to_dict(), compact)
+        files = {storage.STATEMACHINE_FILE: state_machine_json}
+        index = {}
+        _add_state_files(root_state, "", files, index, compact)
+
+        if is_container(container_path):
+            folders = set(index.values())
+            folders.add("")
+            with zipfile.ZipFile(container_path) as old_container:
+                for name in old_container.namelist():
+                    if name not in files and name != INDEX_FILE and posixpath.dirname(name) in folders:
+                        files[name] = old_container.read(name)
+        files[INDEX_FILE] = _create_index(index)
+        _write_container(container_path, files)
+
+        if not as_copy:
+            state_machine.file_system_path = container_path
+            states = [root_state]
+            while states:
+                state = states.pop()
+                state.file_system_path = get_container_state_path(container_path, index[state.get_path()])
+                if isinstance(state, ExecutionState):
+                    state.script.filename = storage.SCRIPT_FILE
+                elif isinstance(state, ContainerState):
+                    states.extend(state.states.values())
+            if state_machine.marked_dirty:
+                state_machine.marked_dirty = False
+        else:
+            state_machine.last_update = old_update_time
+        logger.debug("State machine with id {0} was saved in container {1}".format(state_machine.state_machine_id,
+                                                                                  container_path))
+    finally:
+        state_machine.release_modification_lock()
+
+
+def read_state_directories_from_container(container, container_path, folder):
+    """Reads the files of the state in the given folder of the container and of all its child states
+
+    This is the counterpart of :func:`rafcon.core.storage.storage.read_state_directories` for containers. Only the
+    files within the folder are read.
+
+    :param zipfile.ZipFile container: the opened container
+    :param str container_path: the path of the container
+    :param str folder: the folder of the state within the container
+    :return: the files of the state directories mapped by their paths (see :func:`get_container_state_path`)
+    :rtype: dict[str, rafcon.core.storage.storage.StateFiles]
+    """
+    from rafcon.core.storage import storage
+
+    file_names = {}
+    child_folders = {}
+    prefix = folder + "/"
+    for name in container.namelist():
+        if not name.startswith(prefix) or name.endswith("/"):
+            continue
+        directory, file_name = posixpath.split(name)
+        file_names.setdefault(directory, set()).add(file_name)
+        # register all directories between the folder and the file
+        while directory != folder:
+            parent_directory = posixpath.dirname(directory)
+            child_folders.setdefault(parent_directory, set()).add(directory)
+            directory = parent_directory
+
+    state_directories = {}
+    for directory in set(file_names) | set(child_folders):
+        child_paths = [get_container_state_path(container_path, child_folder)
+                       for child_folder in sorted(child_folders.get(directory, []))]
+        names = file_names.get(directory, set())
+        if storage.FILE_NAME_CORE_DATA not in names:
+            state_files = storage.StateFiles(None, None, None, None, None, child_paths)
+        else:
+            def read_file_if_existing(file_name):
+                if file_name not in names:
+                    return None
+                return _read_text(container, posixpath.join(directory, file_name))
+            semantic_data_path = None
+            if storage.SEMANTIC_DATA_FILE in names:
+                semantic_data_path = get_container_state_path(container_path,
+                                                              posixpath.join(directory, storage.SEMANTIC_DATA_FILE))
+            state_files = storage.StateFiles(
+                get_container_state_path(container_path, posixpath.join(directory, storage.FILE_NAME_CORE_DATA)),
+                _read_text(container, posixpath.join(directory, storage.FILE_NAME_CORE_DATA)),
+                read_file_if_existing(storage.SCRIPT_FILE), read_file_if_existing(storage.SEMANTIC_DATA_FILE),
+                semantic_data_path, child_paths)
+        state_directories[get_container_state_path(container_path, directory)] = state_files
+    return state_directories
+
+
+def load_state_machine_from_container(container_path, state_machine_id=None):
+    """Loads a state machine from a container
+
+    Use :func:`rafcon.core.storage.storage.load_state_machine_from_path` instead of calling this function directly.
+
+    :param str container_path: the path of the container
+    :param state_machine_id: the id of the loaded state machine
+    :rtype: rafcon.core.state_machine.StateMachine
+    """
+    from rafcon.core.storage import storage
+
+    with zipfile.ZipFile(container_path) as container:
+        state_machine_dict = storage_utils.load_objects_from_json_string(
+            _read_text(container, storage.STATEMACHINE_FILE))
+
+        def read_state_directories(root_state_storage_id):
+            root_state_path = get_container_state_path(container_path, root_state_storage_id)
+            return root_state_path, read_state_directories_from_container(container, container_path,
+                                                                          root_state_storage_id)
+        return storage.load_state_machine_from_dict(state_machine_dict, container_path, read_state_directories,
+                                                    state_machine_id)
+
+
+def load_state_from_container(container_path, state_path):
+    """Loads a single state (with its child states) from a container
+
+    Only the files of the state are read from the container.
+
+    :param str container_path: the path of the container
+    :param str state_path: the path of the state in the state machine (see
+        :meth:`rafcon.core.states.state.State.get_path`)
+    :return: the loaded state
+    :raises KeyError: if the state is not in the container
+    """
+    from rafcon.core.storage import storage
+
+    with zipfile.ZipFile(container_path) as container:
+        folder = json.loads(_read_text(container, INDEX_FILE))["states"][state_path]
+        state_directories = read_state_directories_from_container(container, container_path, folder)
+    return storage.assemble_state(None, get_container_state_path(container_path, folder), state_directories)
+
+
+def _get_state_id(core_data):
+    return storage_utils.load_objects_from_json_string(core_data, as_dict=True)["state_id"]
+
+
+def convert_folder_to_container(folder_path, container_path):
+    """Converts a state machine in the folder format into a container
+
+    All files of the state machine, including e.g. the meta data of the GUI, are copied into the container. The state
+    machine is not decoded.
+
+    :param str folder_path: the path of the state machine folder
+    :param str container_path: the path of the container to create
+    """
+    from rafcon.core.storage import storage
+
+    files = {}
+    for directory, folder_names, file_names in os.walk(folder_path):
+        folder_names[:] = [folder_name for folder_name in folder_names if folder_name not in _IGNORED_FOLDERS]
+        relative_directory = os.path.relpath(directory, folder_path)
+        for file_name in file_names:
+            if file_name.endswith(_IGNORED_FILE_EXTENSIONS):
+                continue
+            name = file_name if relative_directory == os.curdir else \
+                posixpath.join(*(relative_directory.split(os.sep) + [file_name]))
+            with open(os.path.join(directory, file_name), 'rb') as file_pointer:
+                files[name] = file_pointer.read()
+    if storage.STATEMACHINE_FILE not in files:
+        raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(folder_path))
+
+    state_machine_dict = json.loads(files[storage.STATEMACHINE_FILE].decode('utf-8'))
+    root_folder = state_machine_dict.get('root_state_storage_id', state_machine_dict.get('root_state_id'))
+    index = {}
+    folders = [(root_folder, None)]
+    while folders:
+        folder, parent_state_path = folders.pop()
+        core_data_name = posixpath.join(folder, storage.FILE_NAME_CORE_DATA)
+        if core_data_name not in files:
+            continue
+        state_id = _get_state_id(files[core_data_name].decode('utf-8'))
+        state_path = state_id if parent_state_path is None else parent_state_path + "/" + state_id
+        index[state_path] = folder
+        child_folders = set(name[len(folder) + 1:].split("/")[0] for name in files
+                            if name.startswith(folder + "/") and name.count("/") > folder.count("/") + 1)
+        folders.extend((posixpath.join(folder, child_folder), state_path) for child_folder in child_folders)
+    files[INDEX_FILE] = _create_index(index)
+    _write_container(container_path, files)
+
+
+def convert_container_to_folder(container_path, folder_path):
+    """Converts a container into a state machine in the folder format
+
+    :param str container_path: the path of the container
+    :param str folder_path: the path of the state machine folder to create, must not exist or be empty
+    """
+    if os.path.isdir(folder_path) and os.listdir(folder_path):
+        raise ValueError("The target folder {0} is not empty".format(folder_path))
+    with zipfile.ZipFile(container_path) as container:
+        for name in container.namelist():
+            if name == INDEX_FILE or name.endswith("/"):
+                continue
+            file_path = os.path.join(folder_path, *name.split("/"))
+            if not os.path.exists(os.path.dirname(file_path)):
+                os.makedirs(os.path.dirname(file_path))
+            with open(file_path, 'wb') as file_pointer:
+                file_pointer.write(container.read(name))
+
+
+def convert(source_path, target_path):
+    """Converts a state machine between the folder format and the container format
+
+    The format of the target is given by its path: paths ending with :data:`CONTAINER_FILE_EXTENSION` are containers.
+
+    :param str source_path: the path of the state machine to convert
+    :param str target_path: the path of the converted state machine
+    """
+    source_is_container = is_container(source_path)
+    target_is_container = target_path.endswith(CONTAINER_FILE_EXTENSION)
+    if not source_is_container and target_is_container:
+        convert_folder_to_container(source_path, target_path)
+    elif source_is_container and not target_is_container:
+        convert_container_to_folder(source_path, target_path)
+    else:
+        raise ValueError("Either the source {0} or the target {1} has to be a container".format(source_path,
+                                                                                                  target_path))
+    logger.info("Converted state machine {0} to {1}".format(source_path, target_path))
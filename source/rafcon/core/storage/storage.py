@@ -16,10 +16,18 @@
 
 """
 
+from future import standard_library
+standard_library.install_aliases()
 from weakref import ref
 from future.utils import string_types
 from builtins import str
+from builtins import range
+from collections import namedtuple
+from functools import partial
 import os
+import hashlib
+import queue
+import threading
 import re
 import math
 import shutil
@@ -40,6 +48,7 @@ from rafcon.core.custom_exceptions import LibraryNotFoundException
 from rafcon.core.constants import DEFAULT_SCRIPT_PATH
 from rafcon.core.config import global_config
 from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import container
 
 logger = log.get_logger(__name__)
 
@@ -66,6 +75,81 @@ if os.path.exists(DEFAULT_SCRIPT_PATH):
         shutil.rmtree(f)
 
 
+# The content hashes and file stats of the files written or read by the storage mapped by their paths. A file is only
+# rewritten, if its content changed or the file was changed by someone else. The entries of a state machine are
+# dropped by :func:`forget_stored_files`, e.g. when it is closed.
+_stored_files = {}
+# The state folders and stats of the directories, whose obsolete state folders were removed, mapped by their paths
+_cleaned_directories = {}
+
+
+def _get_file_stat(path):
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime, stat_result.st_size
+
+
+def _get_content_hash(content):
+    return hashlib.sha1(content.encode('utf-8')).digest()
+
+
+def _remember_file(path, content, stat_result):
+    _stored_files[os.path.normpath(path)] = (_get_content_hash(content), (stat_result.st_mtime, stat_result.st_size))
+
+
+def forget_stored_files(base_path):
+    """Drops the remembered files and directories of a state machine
+
+    Afterwards, all files of the state machine are written on its next save.
+
+    :param str base_path: the path of the state machine
+    """
+    base_path = os.path.normpath(base_path)
+    prefix = os.path.join(base_path, "")
+    for cache in (_stored_files, _cleaned_directories):
+        for path in [path for path in cache if path == base_path or path.startswith(prefix)]:
+            del cache[path]
+
+
+def write_file_if_changed(path, content):
+    """Writes the content atomically into the file, if it differs from the content last written or read
+
+    :param str path: the path of the file
+    :param str content: the content of the file
+    :return: True, if the file was written
+    :rtype: bool
+    """
+    path = os.path.normpath(path)
+    content_hash = _get_content_hash(content)
+    stored_file = _stored_files.get(path)
+    if stored_file is not None and stored_file[0] == content_hash and stored_file[1] == _get_file_stat(path):
+        return False
+    write_file(path, content, atomic=True)
+    _stored_files[path] = (content_hash, _get_file_stat(path))
+    return True
+
+
+def _remove_obsolete_folders_if_changed(states, path):
+    """Calls :func:`remove_obsolete_folders`, unless the states and the directory did not change since the last call"""
+    path = os.path.normpath(path)
+    state_folders = sorted(get_storage_id_for_state(state) for state in states)
+    cleaned_directory = _cleaned_directories.get(path)
+    if cleaned_directory is not None and cleaned_directory == (state_folders, _get_file_stat(path)):
+        return
+    remove_obsolete_folders(states, path)
+    _cleaned_directories[path] = None
+
+
+def _remember_cleaned_directory(states, path):
+    """Remembers the state folders and the stat of the directory after its state folders were saved"""
+    path = os.path.normpath(path)
+    if path in _cleaned_directories:
+        state_folders = sorted(get_storage_id_for_state(state) for state in states)
+        _cleaned_directories[path] = (state_folders, _get_file_stat(path))
+
+
 def remove_obsolete_folders(states, path):
     """Removes obsolete state machine folders
 
@@ -146,23 +230,36 @@ def clean_path(base_path):
     return base_path
 
 
-def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False):
+def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False,
+                               compact=False):
     """Saves a state machine recursively to the file system
 
     The `as_copy` flag determines whether the state machine is saved as copy. If so (`as_copy=True`), some state
     machine attributes will be left untouched, such as the `file_system_path` or the `dirty_flag`.
 
+    If the path is an existing state machine container or ends with
+    :data:`rafcon.core.storage.container.CONTAINER_FILE_EXTENSION`, the state machine is saved as container.
+
     :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
     :param str base_path: base_path to which all further relative paths refers to
     :param bool delete_old_state_machine: Whether to delete any state machine existing at the given path
     :param bool as_copy: Whether to use a copy storage for the state machine
+    :param bool compact: Whether to write compact json files, e.g. for machine-generated copies such as auto-backups
     """
+    if container.is_container_path(base_path):
+        if delete_old_state_machine and os.path.exists(base_path):
+            os.remove(base_path)
+        container.save_state_machine_to_container(state_machine, base_path, as_copy, compact)
+        return
+
     # warns the user in the logger when using deprecated names
     clean_path_from_deprecated_naming(base_path)
 
     state_machine.acquire_modification_lock()
     try:
         root_state = state_machine.root_state
+        # the files of a lazily loaded state machine might be deleted or moved in the following
+        load_deferred_data(root_state)
 
         # clean old path first
         if delete_old_state_machine:
@@ -176,17 +273,23 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         old_update_time = state_machine.last_update
         state_machine.last_update = storage_utils.get_current_time_string()
         state_machine_dict = state_machine.to_dict()
-        storage_utils.write_dict_to_json(state_machine_dict, os.path.join(base_path, STATEMACHINE_FILE))
+        write_file_if_changed(os.path.join(base_path, STATEMACHINE_FILE),
+                              storage_utils.dump_objects_to_json_string(state_machine_dict, compact))
 
         # set the file_system_path of the state machine
         if not as_copy:
+            if state_machine.file_system_path and \
+                    os.path.normpath(state_machine.file_system_path) != os.path.normpath(base_path):
+                # the state machine was moved, its former location is not saved anymore
+                forget_stored_files(state_machine.file_system_path)
             state_machine.file_system_path = copy.copy(base_path)
         else:
             state_machine.last_update = old_update_time
 
         # add root state recursively
-        remove_obsolete_folders([root_state], base_path)
-        save_state_recursively(root_state, base_path, "", as_copy)
+        _remove_obsolete_folders_if_changed([root_state], base_path)
+        save_state_recursively(root_state, base_path, "", as_copy, compact)
+        _remember_cleaned_directory([root_state], base_path)
 
         if state_machine.marked_dirty and not as_copy:
             state_machine.marked_dirty = False
@@ -212,7 +315,7 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
         destination_script_file = os.path.join(state_path_full, SCRIPT_FILE)
 
         try:
-            write_file(destination_script_file, state.script_text)
+            write_file_if_changed(destination_script_file, state.script_text)
         except Exception:
             logger.exception("Storing of script file failed: {0} -> {1}".format(state.get_path(),
                                                                                 destination_script_file))
@@ -223,33 +326,36 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
             state.script.path = state_path_full
 
 
-def save_semantic_data_for_state(state, state_path_full):
+def save_semantic_data_for_state(state, state_path_full, compact=False):
     """Saves the semantic data in a separate json file.
 
     :param state: The state of which the script file should be saved
     :param str state_path_full: The path to the file system storage location of the state
+    :param bool compact: Whether to write compact json
     """
 
     destination_script_file = os.path.join(state_path_full, SEMANTIC_DATA_FILE)
 
     if state.semantic_data:
         try:
-            storage_utils.write_dict_to_json(state.semantic_data, destination_script_file)
+            write_file_if_changed(destination_script_file,
+                                  storage_utils.dump_objects_to_json_string(state.semantic_data, compact))
         except IOError:
             logger.exception("Storing of semantic data for state {0} failed! Destination path: {1}".
                              format(state.get_path(), destination_script_file))
             raise
 
 
-def save_state_recursively(state, base_path, parent_path, as_copy=False):
+def save_state_recursively(state, base_path, parent_path, as_copy=False, compact=False):
     """Recursively saves a state to a json file
 
-    It calls this method on all its substates.
+    It calls this method on all its substates. Only files whose content changed are written.
 
     :param state: State to be stored
     :param base_path: Path to the state machine
     :param parent_path: Path to the parent state
     :param bool as_copy: Temporary storage flag to signal that the given path is not the new file_system_path
+    :param bool compact: Whether to write compact json files
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
@@ -260,32 +366,43 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
     if not os.path.exists(state_path_full):
         os.makedirs(state_path_full)
 
-    storage_utils.write_dict_to_json(state, os.path.join(state_path_full, FILE_NAME_CORE_DATA))
+    write_file_if_changed(os.path.join(state_path_full, FILE_NAME_CORE_DATA),
+                          storage_utils.dump_objects_to_json_string(state, compact))
     if not as_copy:
         state.file_system_path = state_path_full
 
     if isinstance(state, ExecutionState):
         save_script_file_for_state_and_source_path(state, state_path_full, as_copy)
 
-    save_semantic_data_for_state(state, state_path_full)
+    save_semantic_data_for_state(state, state_path_full, compact)
 
     # create yaml files for all children
     if isinstance(state, ContainerState):
-        remove_obsolete_folders(state.states.values(), os.path.join(base_path, state_path))
-        for state in state.states.values():
-            save_state_recursively(state, base_path, state_path, as_copy)
+        _remove_obsolete_folders_if_changed(state.states.values(), state_path_full)
+        for child_state in state.states.values():
+            save_state_recursively(child_state, base_path, state_path, as_copy, compact)
+        _remember_cleaned_directory(state.states.values(), state_path_full)
 
 
 @measure_time
-def load_state_machine_from_path(base_path, state_machine_id=None):
+def load_state_machine_from_path(base_path, state_machine_id=None, lazy=None):
     """Loads a state machine from the given path
 
+    The path can also point to a state machine container (see :mod:`rafcon.core.storage.container`).
+
     :param base_path: An optional base path for the state machine.
+    :param bool lazy: if True, the scripts and the semantic data of the states are only read when first accessed; the
+        default is taken from the ``LOAD_SM_LAZY`` config option. Ignored for containers.
     :return: a tuple of the loaded container state, the version of the state and the creation time
     :raises ValueError: if the provided path does not contain a valid state machine
     """
     logger.debug("Loading state machine from path {0}...".format(base_path))
 
+    if container.is_container(base_path):
+        return container.load_state_machine_from_container(base_path, state_machine_id)
+    if lazy is None:
+        lazy = global_config.get_config_value("LOAD_SM_LAZY", False)
+
     state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
     state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
 
@@ -302,6 +419,15 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
             raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
 
     state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
+
+    def read_root_state_directories(root_state_storage_id):
+        root_state_path = os.path.join(base_path, root_state_storage_id)
+        return root_state_path, read_state_directories(root_state_path, lazy)
+    return load_state_machine_from_dict(state_machine_dict, base_path, read_root_state_directories,
+                                        state_machine_id, lazy)
+
+
+def _check_rafcon_version(state_machine_dict):
     if 'used_rafcon_version' in state_machine_dict:
         previously_used_rafcon_version = StrictVersion(state_machine_dict['used_rafcon_version']).version
         active_rafcon_version = StrictVersion(rafcon.__version__).version
@@ -338,6 +464,23 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
             logger.warning(rafcon_older_than_sm_version)
             logger.warning(note_about_possible_incompatibility)
 
+
+def load_state_machine_from_dict(state_machine_dict, base_path, read_root_state_directories, state_machine_id=None,
+                                 lazy=False):
+    """Creates a state machine from the content of its state machine file and assembles its states
+
+    This is the part of :func:`load_state_machine_from_path`, which is independent of the storage format.
+
+    :param dict state_machine_dict: the decoded content of the state machine file
+    :param str base_path: the path of the state machine
+    :param read_root_state_directories: function receiving the storage id of the root state and returning the path of
+        the root state and the files of all states (see :func:`read_state_directories`)
+    :param state_machine_id: the id of the loaded state machine
+    :param bool lazy: whether the loading of scripts and semantic data was deferred
+    :return: the loaded state machine
+    """
+    _check_rafcon_version(state_machine_dict)
+
     state_machine = StateMachine.from_dict(state_machine_dict, state_machine_id)
     if "root_state_storage_id" not in state_machine_dict:
         root_state_storage_id = state_machine_dict['root_state_id']
@@ -345,11 +488,11 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     else:
         root_state_storage_id = state_machine_dict['root_state_storage_id']
 
-    root_state_path = os.path.join(base_path, root_state_storage_id)
+    root_state_path, state_directories = read_root_state_directories(root_state_storage_id)
     state_machine.file_system_path = base_path
     dirty_states = []
-    state_machine.root_state = load_state_recursively(parent=state_machine, state_path=root_state_path,
-                                                      dirty_states=dirty_states)
+    state_machine.root_state = _assemble_state_recursively(state_machine, root_state_path, state_directories,
+                                                           dirty_states, lazy)
     if state_machine.root_state is None:
         return  # a corresponding exception has been handled with a proper error log in load_state_recursively
     if len(dirty_states) > 0:
@@ -369,46 +512,202 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     return state_machine
 
 
-def load_state_from_path(state_path):
+def assemble_state(parent, state_path, state_directories):
+    """Creates a state from the files of its state directory and of the directories of its child states
+
+    :param parent: the parent of the state
+    :param str state_path: the path of the state
+    :param dict state_directories: the files of the state directories (see :func:`read_state_directories`)
+    :return: the loaded state
+    """
+    return _assemble_state_recursively(parent, state_path, state_directories, [], lazy=False)
+
+
+def load_state_from_path(state_path, lazy=None):
     """Loads a state from a given path
 
     :param state_path: The path of the state on the file system.
+    :param bool lazy: see :func:`load_state_machine_from_path`
     :return: the loaded state
     """
-    return load_state_recursively(parent=None, state_path=state_path)
+    return load_state_recursively(parent=None, state_path=state_path, lazy=lazy)
 
 
-def load_state_recursively(parent, state_path=None, dirty_states=[]):
+#: The files of a state directory read by :func:`read_state_directories`. `core_data_path` is None, if the directory
+#: contains no state, `script` and `semantic_data` are None, if the files do not exist or were not read (lazy loading).
+#: `semantic_data_path` is None, if the state has no semantic data file.
+StateFiles = namedtuple('StateFiles', ['core_data_path', 'core_data', 'script', 'semantic_data', 'semantic_data_path',
+                                       'child_paths'])
+
+
+def _read_text_file(path):
+    with open(path, 'r') as file_pointer:
+        content = file_pointer.read()
+        _remember_file(path, content, os.fstat(file_pointer.fileno()))
+    return content
+
+
+def _read_script_file(state_path, filename):
+    path = os.path.join(state_path, filename)
+    if not os.path.isfile(path):
+        # the state might be stored in a container
+        return container.read_file(path)
+    return _read_text_file(path)
+
+
+def _read_state_directory(state_path, lazy=False):
+    """Reads the files of a single state directory
+
+    :param str state_path: the path of the state directory
+    :param bool lazy: if True, the script and the semantic data are not read
+    :rtype: StateFiles
+    """
+    if not os.path.isdir(state_path):
+        return StateFiles(None, None, None, None, None, [])
+    file_names = set()
+    child_paths = []
+    for name in os.listdir(state_path):
+        path = os.path.join(state_path, name)
+        if os.path.isdir(path):
+            child_paths.append(path)
+        else:
+            file_names.add(name)
+
+    # TODO: Should be removed with next minor release
+    core_data_name = FILE_NAME_CORE_DATA if FILE_NAME_CORE_DATA in file_names else FILE_NAME_CORE_DATA_OLD
+    if core_data_name not in file_names:
+        return StateFiles(None, None, None, None, None, child_paths)
+    core_data_path = os.path.join(state_path, core_data_name)
+    semantic_data_path = os.path.join(state_path, SEMANTIC_DATA_FILE) if SEMANTIC_DATA_FILE in file_names else None
+    script = semantic_data = None
+    if not lazy:
+        if SCRIPT_FILE in file_names:
+            script = _read_text_file(os.path.join(state_path, SCRIPT_FILE))
+        if semantic_data_path is not None:
+            semantic_data = _read_text_file(semantic_data_path)
+    return StateFiles(core_data_path, _read_text_file(core_data_path), script, semantic_data, semantic_data_path,
+                      child_paths)
+
+
+def read_state_directories(state_path, lazy=False, number_of_threads=None):
+    """Reads the files of the state stored at the given path and of all its child states
+
+    The directory tree is traversed by a pool of threads, each listing a state directory and reading its files. The
+    content of the files is not decoded. This hides the latency of the file system, e.g. for state machines on network
+    file systems.
+
+    :param str state_path: the path of the (root) state directory
+    :param bool lazy: if True, the scripts and the semantic data are not read
+    :param int number_of_threads: the number of threads reading the files, the default is taken from the
+        ``LOAD_SM_THREADS`` config option; with a value smaller than 2, the files are read in the calling thread
+    :return: the files of the state directories mapped by their paths
+    :rtype: dict[str, StateFiles]
+    """
+    if number_of_threads is None:
+        number_of_threads = global_config.get_config_value("LOAD_SM_THREADS", 8)
+    state_directories = {}
+    if not number_of_threads or number_of_threads < 2:
+        paths = [state_path]
+        while paths:
+            path = paths.pop()
+            state_files = state_directories[path] = _read_state_directory(path, lazy)
+            if state_files.core_data_path is not None:
+                paths.extend(state_files.child_paths)
+        return state_directories
+
+    paths = queue.Queue()
+    lock = threading.Lock()
+    finished = threading.Event()
+    exceptions = []
+    # number of paths put into the queue, which were not read, yet
+    pending = [1]
+
+    def read_state_directories_from_queue():
+        while True:
+            path = paths.get()
+            if path is None:
+                return
+            child_paths = []
+            try:
+                state_files = _read_state_directory(path, lazy)
+                if state_files.core_data_path is not None:
+                    child_paths = state_files.child_paths
+            except Exception as e:
+                state_files = None
+                exceptions.append(e)
+            with lock:
+                state_directories[path] = state_files
+                if exceptions:
+                    child_paths = []
+                pending[0] += len(child_paths) - 1
+                for child_path in child_paths:
+                    paths.put(child_path)
+                if pending[0] == 0:
+                    finished.set()
+
+    threads = [threading.Thread(target=read_state_directories_from_queue, name="StateDirectoryReader-{}".format(i))
+               for i in range(number_of_threads)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    paths.put(state_path)
+    finished.wait()
+    for _ in threads:
+        paths.put(None)
+    if exceptions:
+        raise exceptions[0]
+    return state_directories
+
+
+def _load_semantic_data(path):
+    try:
+        return storage_utils.load_objects_from_json_string(_read_text_file(path))
+    except Exception as e:
+        logger.error("Semantic data could not be loaded from {0}: {1}".format(path, e))
+        return {}
+
+
+def load_state_recursively(parent, state_path=None, dirty_states=[], lazy=None):
     """Recursively loads the state
 
-    It calls this method on each sub-state of a container state.
+    First, the files of the state and all its child states are read using :func:`read_state_directories`. Then the
+    states are created and assembled.
 
     :param parent:  the root state of the last load call to which the loaded state will be added
     :param state_path: the path on the filesystem where to find the meta file for the state
     :param dirty_states: a dict of states which changed during loading
+    :param bool lazy: see :func:`load_state_machine_from_path`
     :return:
     """
+    if lazy is None:
+        lazy = global_config.get_config_value("LOAD_SM_LAZY", False)
+    state_directories = read_state_directories(state_path, lazy)
+    return _assemble_state_recursively(parent, state_path, state_directories, dirty_states, lazy)
+
+
+def _assemble_state_recursively(parent, state_path, state_directories, dirty_states, lazy):
+    """Creates the state from the files read before and assembles it with its child states
+
+    It calls this method on each sub-state of a container state.
+    """
     from rafcon.core.states.execution_state import ExecutionState
     from rafcon.core.states.container_state import ContainerState
     from rafcon.core.states.hierarchy_state import HierarchyState
 
-    path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA)
-
     logger.debug("Load state recursively: {0}".format(str(state_path)))
-
-    # TODO: Should be removed with next minor release
-    if not os.path.exists(path_core_data):
-        path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
+    state_files = state_directories[state_path]
 
     try:
-        state_info = load_data_file(path_core_data)
+        if state_files.core_data_path is None:
+            raise ValueError("Data file not found: {0}".format(os.path.join(state_path, FILE_NAME_CORE_DATA)))
+        state_info = storage_utils.load_objects_from_json_string(state_files.core_data)
     except ValueError as e:
         logger.exception("Error while loading state data: {0}".format(e))
         return
     except LibraryNotFoundException as e:
         logger.error("Library could not be loaded: {0}\n"
                      "Skipping library and continuing loading the state machine".format(e))
-        state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
+        state_info = storage_utils.load_objects_from_json_string(state_files.core_data, as_dict=True)
         state_id = state_info["state_id"]
         dummy_state = HierarchyState(LIBRARY_NOT_FOUND_DUMMY_STATE_NAME, state_id=state_id)
         # set parent of dummy state
@@ -436,32 +735,38 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     # read script file if state is an ExecutionState
     if isinstance(state, ExecutionState):
-        script_text = read_file(state_path, state.script.filename)
-        state.script.set_script_without_compilation(script_text)
+        if lazy:
+            state.script.defer_script_loading(partial(_read_script_file, state_path, state.script.filename))
+        elif state.script.filename == SCRIPT_FILE:
+            state.script.set_script_without_compilation(state_files.script)
+        else:
+            state.script.set_script_without_compilation(_read_script_file(state_path, state.script.filename))
 
     # load semantic data
-    try:
-        semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
-        state.semantic_data = semantic_data
-    except Exception as e:
-        # semantic data file does not have to be there
-        pass
+    if lazy:
+        if state_files.semantic_data_path is not None:
+            state.defer_semantic_data_loading(partial(_load_semantic_data, state_files.semantic_data_path))
+    elif state_files.semantic_data is not None:
+        try:
+            state.semantic_data = storage_utils.load_objects_from_json_string(state_files.semantic_data)
+        except Exception as e:
+            # semantic data file does not have to be valid
+            pass
 
     one_of_my_child_states_not_found = False
 
     # load child states
-    for p in os.listdir(state_path):
-        child_state_path = os.path.join(state_path, p)
-        if os.path.isdir(child_state_path):
-            if not os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
-                # this means that child_state_path is a folder, not containing a valid state
-                # this also happens when pip creates __pycache__ folders for the script.py files upon installing rafcon
-                continue
-            child_state = load_state_recursively(state, child_state_path, dirty_states)
-            if not child_state:
-                return None
-            if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
-                one_of_my_child_states_not_found = True
+    for child_state_path in state_files.child_paths:
+        child_core_data_path = state_directories[child_state_path].core_data_path
+        if child_core_data_path is None or os.path.basename(child_core_data_path) != FILE_NAME_CORE_DATA:
+            # this means that child_state_path is a folder, not containing a valid state
+            # this also happens when pip creates __pycache__ folders for the script.py files upon installing rafcon
+            continue
+        child_state = _assemble_state_recursively(state, child_state_path, state_directories, dirty_states, lazy)
+        if not child_state:
+            return None
+        if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
+            one_of_my_child_states_not_found = True
 
     if one_of_my_child_states_not_found:
         # omit adding transitions and data flows in this case
@@ -487,6 +792,25 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     return state
 
 
+def load_deferred_data(state):
+    """Loads the scripts and semantic data of the state and its child states, whose loading was deferred
+
+    This is required before the files of a lazily loaded state machine are moved or deleted.
+
+    :param state: the (root) state
+    """
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.container_state import ContainerState
+    states = [state]
+    while states:
+        state = states.pop()
+        state.semantic_data
+        if isinstance(state, ExecutionState):
+            state.script.script
+        elif isinstance(state, ContainerState):
+            states.extend(state.states.values())
+
+
 def load_data_file(path_of_file):
     """ Loads the content of a file by using json.load.
 
@@ -496,6 +820,10 @@ def load_data_file(path_of_file):
     """
     if os.path.exists(path_of_file):
         return storage_utils.load_objects_from_json(path_of_file)
+    # the file might be stored in a container
+    content = container.read_file(path_of_file)
+    if content is not None:
+        return storage_utils.load_objects_from_json_string(content)
     raise ValueError("Data file not found: {0}".format(path_of_file))
 
 
@@ -26,6 +26,7 @@ from builtins import str
 import copy
 import json
 import difflib
+import weakref
 from collections import namedtuple
 
 from gtkmvc3.model_mt import ModelMT
@@ -48,12 +49,13 @@ from rafcon.core.states.execution_state import ExecutionState
 from rafcon.core.states.hierarchy_state import HierarchyState, ContainerState
 from rafcon.core.states.library_state import LibraryState
 from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrencyState
-from rafcon.core.states.state import State
+from rafcon.core.states.state import State, PATH_SEPARATOR
 from rafcon.gui.models import ContainerStateModel, LibraryStateModel
 from rafcon.gui.models.signals import MetaSignalMsg, ActionSignalMsg
 from rafcon.gui.utils.notification_overview import NotificationOverview
 
 from rafcon.utils import log
+from rafcon.utils import storage_utils
 from rafcon.utils.constants import RAFCON_TEMP_PATH_BASE, BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS
 from rafcon.utils.storage_utils import substitute_modules
 
@@ -70,46 +72,220 @@ HISTORY_DEBUG_LOG_FILE = RAFCON_TEMP_PATH_BASE + '/test_file.txt'
 StateImage = namedtuple('StateImage', ['core_data', 'meta_data', 'state_path', 'semantic_data', 'file_system_path', 'script_text', 'children'])
 StateImage.__new__.__defaults__ = (None, None, None, None, None, None, None)  # Make all optional
 
-def create_state_image(state_m):
-    """ Generates a tuple that holds the state as yaml-strings and its meta data in a dictionary.
+# rough memory estimate of the python objects of a state image node besides its strings
+STATE_IMAGE_NODE_SIZE = 256
+
+
+class _StateImageStoreEntry(object):
+    """The cached image parts of one state of a :class:`StateImageStore`"""
+
+    def __init__(self, state_ref):
+        self.state_ref = state_ref
+        self.core = None
+        self.image = None
+        self.state_model_ref = None
+        self.is_start = None
+        self.meta_data_was_scaled = None
+        self.own_meta = None
+        self.meta = None
+
+
+class StateImageStore(object):
+    """Cache of the state images of one state machine, which shares unchanged parts between subsequent images
+
+    The images of a state are assembled from nodes per state: the serialized core data of a state is only
+    regenerated, after the state was invalidated by a change and an image node (or meta data dictionary) is only
+    recreated, if its own data or one of its children nodes changed. Thus, consecutive images of a large state machine
+    reference the same nodes for all unchanged subtrees, which makes creating them cheap and lets the modification
+    history only hold the changed core elements and meta data entries of each action.
+
+    The store relies on being invalidated for each modification (see :meth:`invalidate`), which is done by the
+    :class:`rafcon.gui.models.modification_history.ModificationsHistoryModel`. The images and meta data dictionaries
+    handed out must not be modified.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        # estimated number of bytes of all nodes created so far, used to estimate the size of actions
+        self.created_bytes = 0
+
+    def _get_entry(self, state):
+        entry = self._entries.get(id(state))
+        if entry is None or entry.state_ref() is not state:
+            key = id(state)
+
+            def remove_entry(state_ref):
+                if key in self._entries and self._entries[key].state_ref is state_ref:
+                    del self._entries[key]
+            entry = _StateImageStoreEntry(weakref.ref(state, remove_entry))
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, state=None, core=True, meta=True, recursive=False):
+        """Marks the cached image data of a state as outdated
+
+        :param rafcon.core.states.state.State state: The changed state, if None, all cached data is invalidated
+        :param bool core: Whether the core data of the state changed
+        :param bool meta: Whether the meta data of the state or its elements changed
+        :param bool recursive: Whether also the data of all child states is invalidated
+        """
+        if state is None:
+            for entry in self._entries.values():
+                if core:
+                    entry.core = None
+                if meta:
+                    entry.own_meta = None
+            return
+        entry = self._entries.get(id(state))
+        if entry is not None and entry.state_ref() is state:
+            if core:
+                entry.core = None
+            if meta:
+                entry.own_meta = None
+        if recursive and isinstance(state, ContainerState):
+            for child_state in state.states.values():
+                self.invalidate(child_state, core, meta, recursive)
+
+    def _get_core(self, entry, state):
+        if entry.core is None:
+            core_data = storage_utils.dump_objects_to_json_string(state, compact=True)
+            script_text = state.script.script if isinstance(state, ExecutionState) else None
+            entry.core = (core_data, script_text, copy.deepcopy(state.semantic_data))
+            self.created_bytes += len(core_data) + len(script_text or '') + STATE_IMAGE_NODE_SIZE
+        return entry.core
+
+    def _get_image_node(self, state_m, state_path):
+        state = state_m.state
+        entry = self._get_entry(state)
+        core_data, script_text, semantic_data = self._get_core(entry, state)
+        children = {}
+        if isinstance(state, ContainerState):
+            for child_state_id, child_state_m in state_m.states.items():
+                children[child_state_id] = self._get_image_node(child_state_m,
+                                                                state_path + PATH_SEPARATOR + child_state_id)
+        image = entry.image
+        if image is None or image.state_path != state_path or image.file_system_path != state.file_system_path or \
+                image.core_data != core_data or image.script_text != script_text or \
+                image.semantic_data != semantic_data or not _are_same_children(image.children, children):
+            image = StateImage(core_data=core_data, state_path=state_path, semantic_data=semantic_data,
+                               file_system_path=state.file_system_path, script_text=script_text, children=children)
+            entry.image = image
+            self.created_bytes += STATE_IMAGE_NODE_SIZE
+        return image
+
+    def _get_meta(self, state_m):
+        state = state_m.state
+        entry = self._get_entry(state)
+        meta_data_was_scaled = state_m.meta_data_was_scaled if isinstance(state_m, LibraryStateModel) else None
+        if entry.own_meta is None or entry.state_model_ref() is not state_m or entry.is_start != state_m.is_start or \
+                entry.meta_data_was_scaled != meta_data_was_scaled:
+            entry.own_meta = get_state_element_meta(state_m, with_parent_linkage=False, with_child_states=False)
+            entry.state_model_ref = weakref.ref(state_m)
+            entry.is_start = state_m.is_start
+            entry.meta_data_was_scaled = meta_data_was_scaled
+            self.created_bytes += STATE_IMAGE_NODE_SIZE
+        child_states_meta = {}
+        if isinstance(state_m, ContainerStateModel):
+            for child_state_m in state_m.states.values():
+                child_states_meta[child_state_m.state.state_id] = self._get_meta(child_state_m)
+        meta = entry.meta
+        if meta is None or meta['state'] is not entry.own_meta['state'] or \
+                not _are_same_children(meta['states'], child_states_meta):
+            meta = dict(entry.own_meta)
+            meta['states'] = child_states_meta
+            entry.meta = meta
+        return meta
+
+    def get_state_image(self, state_m):
+        """Returns the image of a state, see :func:`create_state_image`
+
+        :param rafcon.gui.models.abstract_state.AbstractStateModel state_m: The model of the state
+        :return: the state image
+        :rtype: StateImage
+        """
+        image = self._get_image_node(state_m, state_m.state.get_path())
+        return image._replace(meta_data=self.get_state_element_meta(state_m))
+
+    def get_state_element_meta(self, state_m, with_parent_linkage=True):
+        """Returns the meta data of a state and its elements, see :func:`get_state_element_meta`
+
+        :param rafcon.gui.models.abstract_state.AbstractStateModel state_m: The model of the state
+        :param bool with_parent_linkage: Whether to include the meta data of the parent's connections of the state
+        :return: the meta data dictionary
+        :rtype: dict
+        """
+        meta = self._get_meta(state_m)
+        if with_parent_linkage:
+            meta = dict(meta)
+            meta['related_parent_transitions'], meta['related_parent_data_flows'] = get_related_parent_meta(state_m)
+        return meta
+
+
+def _are_same_children(children, other_children):
+    if len(children) != len(other_children):
+        return False
+    for child_id, child in children.items():
+        if other_children.get(child_id) is not child:
+            return False
+    return True
+
+
+def are_state_images_equal(state_image, other_state_image):
+    """Compares the core data of two state images including all child states, the meta data is ignored
+
+    :param StateImage state_image: The first state image
+    :param StateImage other_state_image: The second state image
+    :return: True, if both images represent the same state
+    :rtype: bool
+    """
+    if state_image is other_state_image:
+        return True
+    if state_image.core_data != other_state_image.core_data or \
+            state_image.script_text != other_state_image.script_text or \
+            state_image.semantic_data != other_state_image.semantic_data or \
+            state_image.file_system_path != other_state_image.file_system_path or \
+            set(state_image.children) != set(other_state_image.children):
+        return False
+    return all(are_state_images_equal(child_image, other_state_image.children[child_state_id])
+               for child_state_id, child_image in state_image.children.items())
+
+
+def create_state_image(state_m, image_store=None):
+    """ Generates a tuple that holds the state as json-strings and its meta data in a dictionary.
     The tuple consists of:
     [0] json_str for state,
-    [1] dict of child_state tuples,
-    [2] dict of model_meta-data of self and elements
-    [3] path of state in state machine
-    [4] script_text
-    [5] file system path
-    [6] semantic data
+    [1] dict of model_meta-data of self and elements
+    [2] path of state in state machine
+    [3] semantic data
+    [4] file system path
+    [5] script_text
+    [6] dict of child_state tuples
     #   states-meta - [state-, transitions-, data_flows-, outcomes-, inputs-, outputs-, scopes, states-meta]
 
-    :param rafcon.core.states.state.State state: The state that should be stored
+    Only the image of the state itself holds meta data, the images of the child states do not.
+
+    :param rafcon.gui.models.abstract_state.AbstractStateModel state_m: The model of the state that should be stored
+    :param StateImageStore image_store: If given, the image is created by the store sharing unchanged child images
     :return: state_tuple tuple
     """
-    state = state_m.state
-    core_data = json.dumps(state, cls=JSONObjectEncoder,
-                           indent=4, check_circular=False, sort_keys=True)
-
-    child_state_images = {}
-    if isinstance(state, ContainerState):
-        for child_state_id, child_state_m in state_m.states.items():
-            child_state_images[child_state_id] = create_state_image(child_state_m)
-
-    meta_data = get_state_element_meta(state_m)
-
-    script_content = state.script.script if isinstance(state, ExecutionState) else None
+    if image_store is not None:
+        return image_store.get_state_image(state_m)
+    return StateImageStore().get_state_image(state_m)
 
-    stage_image = StateImage(core_data=core_data, meta_data=meta_data, state_path=state.get_path(),
-                             semantic_data=copy.deepcopy(state.semantic_data), file_system_path=state.file_system_path,
-                             script_text=script_content, children=child_state_images)
-    return stage_image
 
+def create_state_from_image(state_image, excluded_state_ids=()):
+    """Creates a state from a state image
 
-def create_state_from_image(state_image):
+    :param StateImage state_image: The image of the state
+    :param excluded_state_ids: The ids of child states, which are not created. If child states of a container state
+        are excluded, its transitions and data flows are not added, but returned in addition: state, transitions,
+        data_flows
+    :return: the state created from the image
+    """
     # Transitions and data flows are not added, as also states are not added
     # We have to wait until the child states are loaded, before adding transitions and data flows, as otherwise the
     # validity checks for transitions and data flows would fail
-    state_info = json.loads(state_image.core_data,
-                            cls=JSONObjectDecoder, substitute_modules=substitute_modules)
+    state_info = storage_utils.load_objects_from_json_string(state_image.core_data)
     if not isinstance(state_info, tuple):
         state = state_info
     else:
@@ -118,7 +294,7 @@ def create_state_from_image(state_image):
         data_flows = state_info[2]
 
     state._file_system_path = state_image.file_system_path
-    state.semantic_data = state_image.semantic_data
+    state.semantic_data = copy.deepcopy(state_image.semantic_data)
 
     if isinstance(state, BarrierConcurrencyState):
         child_state = create_state_from_image(state_image.children[UNIQUE_DECIDER_STATE_ID])
@@ -139,34 +315,52 @@ def create_state_from_image(state_image):
             pass  # Tolerate script compilation errors
     # print("------------- ", state)
     for child_state_id, child_state_tuple in state_image.children.items():
+        if child_state_id in excluded_state_ids or child_state_id == UNIQUE_DECIDER_STATE_ID:
+            continue
         child_state = create_state_from_image(child_state_tuple)
         # do_storage_test(child_state)
 
         # print("++++ new cild", child_state  # child_state_tuple, child_state)
-        if not child_state.state_id == UNIQUE_DECIDER_STATE_ID:
-            try:
-                state.add_state(child_state)
-            except Exception as e:
-                logger.debug(str(e))
-                logger.error(
-                    "try to add state %s to state %s with states %s" % (child_state, state, state.states.keys()))
-
-        def print_states(state):
-            if isinstance(state, ContainerState):
-                for state_id, child_state in state.states.items():
-                    logger.verbose(child_state.get_path())
-                    print_states(child_state)
-                    # print("got from tuple:")
-                    # print_states(state)
+        try:
+            state.add_state(child_state)
+        except Exception as e:
+            logger.debug(str(e))
+            logger.error(
+                "try to add state %s to state %s with states %s" % (child_state, state, state.states.keys()))
 
     # Child states were added, now we can add transitions and data flows
     if isinstance(state_info, tuple):
+        # transitions and data flows might be connected to the excluded child states
+        if excluded_state_ids:
+            return state, transitions, data_flows
         state.transitions = transitions
         state.data_flows = data_flows
 
     return state
 
 
+def get_core_object_from_image(state_image, list_name, core_object_id):
+    """Creates a single core object of a state image without creating the whole state with its child states
+
+    :param StateImage state_image: The image of the state the core object belongs to
+    :param str list_name: The name of the state's property holding the core object, e.g. 'transitions'
+    :param core_object_id: The id of the core object
+    :return: the core object
+    """
+    if list_name == 'states':
+        return create_state_from_image(state_image.children[core_object_id])
+    state_info = storage_utils.load_objects_from_json_string(state_image.core_data)
+    if isinstance(state_info, tuple):
+        state, transitions, data_flows = state_info
+        if list_name == 'transitions':
+            return transitions[core_object_id]
+        if list_name == 'data_flows':
+            return data_flows[core_object_id]
+    else:
+        state = state_info
+    return getattr(state, list_name)[core_object_id]
+
+
 def meta_dump_or_deepcopy(meta):
     """Function to observe meta data vivi-dict copy process and to debug it at one point"""
     if DEBUG_META_REFERENCES:  # debug copy
@@ -175,22 +369,37 @@ def meta_dump_or_deepcopy(meta):
     return copy.deepcopy(meta)
 
 
-def get_state_element_meta(state_model, with_parent_linkage=True, with_verbose=False, level=None):
+def get_related_parent_meta(state_model):
+    """Returns the meta data of the transitions and data flows of the parent state connected to a state
+
+    :param rafcon.gui.models.abstract_state.AbstractStateModel state_model: The model of the state
+    :return: the meta data of the related transitions and of the related data flows, each mapped by the element ids
+    :rtype: tuple(dict, dict)
+    """
+    related_parent_transitions = {}
+    related_parent_data_flows = {}
+    if not state_model.state.is_root_state:
+        child_state_id = state_model.state.state_id
+        for transition_m in state_model.parent.transitions:
+            transition = transition_m.transition
+            if transition.from_state == child_state_id or transition.to_state == child_state_id:
+                related_parent_transitions[transition.transition_id] = meta_dump_or_deepcopy(transition_m.meta)
+        for data_flow_m in state_model.parent.data_flows:
+            data_flow = data_flow_m.data_flow
+            if data_flow.from_state == child_state_id or data_flow.to_state == child_state_id:
+                related_parent_data_flows[data_flow.data_flow_id] = meta_dump_or_deepcopy(data_flow_m.meta)
+    return related_parent_transitions, related_parent_data_flows
+
+
+def get_state_element_meta(state_model, with_parent_linkage=True, with_verbose=False, level=None,
+                           with_child_states=True):
     meta_dict = {'state': copy.deepcopy(state_model.meta), 'is_start': False, 'data_flows': {}, 'transitions': {},
                  'outcomes': {}, 'input_data_ports': {}, 'output_data_ports': {}, 'scoped_variables': {}, 'states': {},
                  'related_parent_transitions': {}, 'related_parent_data_flows': {}}
     if with_parent_linkage:
         with_parent_linkage = False
-        if not state_model.state.is_root_state:
-            child_state_id = state_model.state.state_id
-            for transition_m in state_model.parent.transitions:
-                transition = transition_m.transition
-                if transition.from_state == child_state_id or transition.to_state == child_state_id:
-                    meta_dict['related_parent_transitions'][transition.transition_id] = meta_dump_or_deepcopy(transition_m.meta)
-            for data_flow_m in state_model.parent.data_flows:
-                data_flow = data_flow_m.data_flow
-                if data_flow.from_state == child_state_id or data_flow.to_state == child_state_id:
-                    meta_dict['related_parent_data_flows'][data_flow.data_flow_id] = meta_dump_or_deepcopy(data_flow_m.meta)
+        meta_dict['related_parent_transitions'], meta_dict['related_parent_data_flows'] = \
+            get_related_parent_meta(state_model)
 
     if with_verbose:
         logger.verbose("STORE META for STATE: {0} {1}".format(state_model.state.state_id, state_model.state.name))
@@ -216,7 +425,7 @@ def get_state_element_meta(state_model, with_parent_linkage=True, with_verbose=F
 
     meta_dict['state'] = meta_dump_or_deepcopy(state_model.meta)
     if isinstance(state_model, ContainerStateModel):
-        for child_state_id, child_state_m in state_model.states.items():
+        for child_state_id, child_state_m in (state_model.states.items() if with_child_states else []):
             meta_dict['states'][child_state_m.state.state_id] = get_state_element_meta(child_state_m, with_parent_linkage)
             if with_verbose:
                 logger.verbose("FINISHED STORE META for STATE: id {0} other ids {1} parent state-id {2}"
@@ -414,6 +623,10 @@ class CoreObjectIdentifier(object):
         return "{0}:{1}:{2}:{3}".format(self._type, self._sm_id, self._path, self._id)
 
 
+# rough memory estimate of an action besides the data of its state images
+ACTION_SIZE = 1024
+
+
 class AbstractAction(object):
     action_type = None
     after_overview = None
@@ -422,9 +635,11 @@ class AbstractAction(object):
     def __init__(self, parent_path, state_machine_model, overview=None):
         self.parent_path = parent_path
         self.state_machine_model = state_machine_model
+        # estimated memory size of the data, which is only referenced by this action
+        self.estimated_size = ACTION_SIZE
 
         self.before_overview = NotificationOverview() if overview is None else overview
-        self.before_state_image = self.get_state_image()  # tuple of state and states-list of storage tuple
+        self.before_state_image = self.create_state_image()  # tuple of state and states-list of storage tuple
 
     def prepare_destruction(self):
         self.before_overview.prepare_destruction()
@@ -442,7 +657,22 @@ class AbstractAction(object):
 
     def set_after(self, overview):
         self.after_overview = overview
-        self.after_state_image = self.get_state_image()
+        self.after_state_image = self.create_state_image()
+
+    @property
+    def image_store(self):
+        """The state image store of the modification history of the state machine or None, if there is no history"""
+        history = getattr(self.state_machine_model, 'history', None)
+        return history.image_store if history is not None else None
+
+    def create_state_image(self):
+        """Creates the state image of the action and adds the size of its newly created parts to the estimated size"""
+        image_store = self.image_store
+        created_bytes = image_store.created_bytes if image_store is not None else 0
+        state_image = self.get_state_image()
+        if image_store is not None:
+            self.estimated_size += image_store.created_bytes - created_bytes
+        return state_image
 
     def get_state_image(self):
         pass
@@ -476,7 +706,10 @@ class MetaDataAction(AbstractAction):
 
     def get_state_image(self):
         parent_state_model = self.state_machine_model.get_state_model_by_path(self.parent_path)
-        meta_data = get_state_element_meta(parent_state_model)
+        if self.image_store is not None:
+            meta_data = self.image_store.get_state_element_meta(parent_state_model)
+        else:
+            meta_data = get_state_element_meta(parent_state_model)
         state_image = StateImage(meta_data=meta_data)
         return state_image
 
@@ -525,7 +758,7 @@ class Action(ModelMT, AbstractAction):
 
     def get_state_image(self):
         parent_state_m = self.state_machine_model.get_state_model_by_path(self.parent_path)
-        state_image = create_state_image(parent_state_m)
+        state_image = create_state_image(parent_state_m, self.image_store)
         return state_image
 
     def get_state_changed(self):
@@ -566,17 +799,40 @@ class Action(ModelMT, AbstractAction):
             logger.warning("The model of the state changes is performed on should not be another one, afterwards. "
                            "\n{0}\n{1}".format(previous_model, actual_model))
 
+    def get_unchanged_child_state_ids(self, state_image):
+        """Returns the ids of the child states of the current state, which are identical to those of a state image
+
+        Those child states (and their models) are kept when updating the state from the image, only the changed
+        child states need to be recreated.
+
+        :param StateImage state_image: The image the state is going to be updated from
+        :return: the ids of the unchanged child states
+        :rtype: set
+        """
+        if self.image_store is None:
+            return set()
+        state_m = self.state_machine_model.get_state_model_by_path(state_image.state_path)
+        current_state_image = self.image_store.get_state_image(state_m)
+        return set(child_state_id for child_state_id, child_image in current_state_image.children.items()
+                   if child_state_id != UNIQUE_DECIDER_STATE_ID and child_state_id in state_image.children and
+                   are_state_images_equal(child_image, state_image.children[child_state_id]))
+
     def update_state_from_image(self, state, state_image):
         assert state.get_path() == state_image.state_path
         # print(self.parent_path, self.parent_path.split('/'), len(self.parent_path.split('/')))
         path_of_state = state.get_path()
-        state_from_image = create_state_from_image(state_image)
+        # unchanged child states are neither recreated from the image nor removed from the state
+        kept_state_ids = self.get_unchanged_child_state_ids(state_image)
+        stored_transitions = stored_data_flows = None
+        state_from_image = create_state_from_image(state_image, kept_state_ids)
+        if isinstance(state_from_image, tuple):
+            state_from_image, stored_transitions, stored_data_flows = state_from_image
 
         previous_model = self.state_machine_model.get_state_model_by_path(path_of_state)
         # TODO affected models should be more to allow recursive notification scheme and less updated elements
         self.emit_undo_redo_signal(action_parent_m=previous_model, affected_models=[previous_model, ], after=False)
 
-        self.update_state(state, state_from_image)
+        self.update_state(state, state_from_image, kept_state_ids, stored_transitions, stored_data_flows)
 
         actual_state_model = self.state_machine_model.get_state_model_by_path(path_of_state)
         self.compare_models(previous_model, actual_state_model)
@@ -597,7 +853,16 @@ class Action(ModelMT, AbstractAction):
 
             insert_state_meta_data(meta_dict=state_image.meta_dict, state_model=new_state_m)
 
-    def update_state(self, state, stored_state):
+    def update_state(self, state, stored_state, kept_state_ids=(), stored_transitions=None, stored_data_flows=None):
+        """Updates a state to the stored state
+
+        :param rafcon.core.states.state.State state: The state to update
+        :param rafcon.core.states.state.State stored_state: The state created from a state image
+        :param kept_state_ids: The ids of unchanged child states, which are neither removed from the state nor
+            contained in the stored state
+        :param dict stored_transitions: The transitions of the stored state, if it was created without the kept states
+        :param dict stored_data_flows: The data flows of the stored state, if it was created without the kept states
+        """
         assert type(stored_state) is type(state)
 
         is_root = state.is_root_state
@@ -612,7 +877,8 @@ class Action(ModelMT, AbstractAction):
                     state.remove_transition(t_id)
 
             for old_state_id in list(state.states.keys()):
-                state.remove_state(old_state_id, force=True)
+                if old_state_id not in kept_state_ids:
+                    state.remove_state(old_state_id, force=True)
 
         if is_root:
             for outcome_id in list(state.outcomes.keys()):
@@ -675,14 +941,19 @@ class Action(ModelMT, AbstractAction):
                 for t_id in list(state.transitions.keys()):
                     state.remove_transition(t_id)
 
-            for t_id, t in stored_state.transitions.items():
+            if stored_transitions is None:
+                stored_transitions = stored_state.transitions
+            if stored_data_flows is None:
+                stored_data_flows = stored_state.data_flows
+
+            for t_id, t in stored_transitions.items():
                 state.add_transition(t.from_state, t.from_outcome, t.to_state, t.to_outcome, t.transition_id)
 
             for t in list(state.transitions.values()):
                 if UNIQUE_DECIDER_STATE_ID == t.from_state and UNIQUE_DECIDER_STATE_ID == t.to_state:
                     state.remove_transition(t.transition_id)
 
-            for df_id, df in stored_state.data_flows.items():
+            for df_id, df in stored_data_flows.items():
                 state.add_data_flow(df.from_state, df.from_key, df.to_state, df.to_key, df.data_flow_id)
 
     def add_core_object_to_state(self, state, core_obj):
@@ -838,17 +1109,17 @@ class AddObjectAction(Action):
 
         assert state.get_path() == state_image.state_path
         path_of_state = state.get_path()
-        state_image_of_state = create_state_from_image(state_image)
 
         previous_model = self.state_machine_model.get_state_model_by_path(path_of_state)
         self.emit_undo_redo_signal(action_parent_m=previous_model, affected_models=[previous_model, ], after=False)
 
+        state_image_of_state = state_image
         if self.added_object_identifier._type in ['InputDataPort', 'OutputDataPort', 'Outcome']:
             [state, state_image_of_state] = self.correct_reference_state(state,
                                                                              state_image_of_state,
                                                                              storage_path=state_image.state_path)
         list_name = self.action_type.replace('add_', '') + 's'
-        core_obj = getattr(state_image_of_state, list_name)[self.added_object_identifier._id]
+        core_obj = get_core_object_from_image(state_image_of_state, list_name, self.added_object_identifier._id)
         self.add_core_object_to_state(state, core_obj)
 
         actual_state_model = self.state_machine_model.get_state_model_by_path(path_of_state)
@@ -865,18 +1136,18 @@ class AddObjectAction(Action):
 
         assert state.get_path() == state_image.state_path
         path_of_state = state.get_path()
-        state_image_of_state = create_state_from_image(state_image)
 
         previous_model = self.state_machine_model.get_state_model_by_path(path_of_state)
         self.emit_undo_redo_signal(action_parent_m=previous_model, affected_models=[previous_model, ], after=False)
 
+        state_image_of_state = state_image
         if self.added_object_identifier._type in ['InputDataPort', 'OutputDataPort', 'Outcome']:
             [state, state_image_of_state] = self.correct_reference_state(state,
                                                                              state_image_of_state,
                                                                              storage_path=state_image.state_path)
 
         list_name = self.action_type.replace('add_', '') + 's'
-        core_obj = getattr(state_image_of_state, list_name)[self.added_object_identifier._id]
+        core_obj = get_core_object_from_image(state_image_of_state, list_name, self.added_object_identifier._id)
         # undo
         self.remove_core_object_from_state(state, core_obj)
 
@@ -892,7 +1163,7 @@ class AddObjectAction(Action):
         for path_element in storage_path.split('/'):
             partial_path.pop(0)
         for path_element in partial_path:
-            state_image_of_state = state_image_of_state.states[path_element]
+            state_image_of_state = state_image_of_state.children[path_element]
             state = state.states[path_element]
 
         return state, state_image_of_state
@@ -964,19 +1235,20 @@ class RemoveObjectAction(Action):
 
         assert state.get_path() == state_image.state_path
         path_of_state = state.get_path()
-        state_image_of_state = create_state_from_image(state_image)
 
         previous_model = self.state_machine_model.get_state_model_by_path(path_of_state)
         self.emit_undo_redo_signal(action_parent_m=previous_model, affected_models=[previous_model, ], after=False)
 
+        state_image_of_state = state_image
         if self.removed_object_identifier._type in ['InputDataPort', 'OutputDataPort', 'Outcome']:
             [state, state_image_of_state] = self.correct_reference_state(state,
                                                                              state_image_of_state,
                                                                              storage_path=state_image.state_path)
-        list_name = self.action_type.replace('remove_', '') + 's'
-        core_obj = getattr(state_image_of_state, list_name)[self.removed_object_identifier._id]
 
+        # removed transitions and data flows are restored by the linkage adjustment
         if self.action_type not in ['remove_transition', 'remove_data_flow']:
+            list_name = self.action_type.replace('remove_', '') + 's'
+            core_obj = get_core_object_from_image(state_image_of_state, list_name, self.removed_object_identifier._id)
             self.add_core_object_to_state(state, core_obj)
 
         self.adjust_linkage()
@@ -1024,9 +1296,9 @@ class RemoveObjectAction(Action):
         for path_element in storage_path.split('/'):
             logger.debug("pop: " + partial_path.pop(0))
         for path_element in partial_path:
-            state_image_of_state = state_image_of_state.states[path_element]
+            state_image_of_state = state_image_of_state.children[path_element]
             state = state.states[path_element]
-            logger.debug("state is now: {0} {1}".format(state.state_id, state_image_of_state.state_id))
+            logger.debug("state is now: {0} {1}".format(state.state_id, state_image_of_state.state_path))
 
         return state, state_image_of_state
 
@@ -22,13 +22,15 @@
 """
 
 from builtins import range
-from builtins import next
 from builtins import str
+from collections import deque
 from os import path
 from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GObject
+from gi.repository import GLib
 from threading import RLock
+from weakref import WeakKeyDictionary, ref
 
 import rafcon
 
@@ -36,13 +38,14 @@ from rafcon.core.state_machine_manager import StateMachineManager
 from rafcon.core.execution.execution_history import ConcurrencyItem, CallItem, ScopedDataItem, HistoryItem
 from rafcon.core.singleton import state_machine_execution_engine
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
-from rafcon.core.execution.execution_history import CallType, StateMachineStartItem
+from rafcon.core.execution.execution_history import CallType, StateMachineStartItem, ExecutionHistory
 
 from rafcon.gui.controllers.utils.extended_controller import ExtendedController
 from rafcon.gui.models.state_machine_manager import StateMachineManagerModel
 from rafcon.gui.views.execution_history import ExecutionHistoryView
 from rafcon.gui.singleton import state_machine_execution_model
 from rafcon.gui.config import global_gui_config
+from rafcon.gui.utils import constants
 
 from rafcon.utils import log
 
@@ -61,16 +64,22 @@ class ExecutionHistoryTreeController(ExtendedController):
     LABEL_NAME_STORAGE_ID = 0
     HISTORY_ITEM_STORAGE_ID = 1
     TOOL_TIP_STORAGE_ID = 2
+    NODE_STORAGE_ID = 3
+    # the only child row of collapsed nodes, whose rows of the children were not yet created
+    PLACEHOLDER_ROW = ("", None, None, None)
     TOOL_TIP_TEXT = "Right click for more details\n" \
                     "Middle click for external more detailed viewer\n" \
                     "Double click to select corresponding state"
+    EVICTED_ITEMS_TOOL_TIP_TEXT = "Double click to load older history items from the execution log file"
+    EVICTED_ITEMS_PAGE_SIZE = 100
 
     def __init__(self, model=None, view=None):
         assert isinstance(model, StateMachineManagerModel)
         assert isinstance(view, ExecutionHistoryView)
 
         super(ExecutionHistoryTreeController, self).__init__(model, view)
-        self.history_tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_PYOBJECT, GObject.TYPE_STRING)
+        self.history_tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_PYOBJECT, GObject.TYPE_STRING,
+                                                GObject.TYPE_PYOBJECT)
         # a TreeView
         self.history_tree = view['history_tree']
         self.history_tree.set_model(self.history_tree_store)
@@ -79,16 +88,24 @@ class ExecutionHistoryTreeController(ExtendedController):
         self.observe_model(state_machine_execution_model)
         self._expansion_state = {}
         self._update_lock = RLock()
+        # number of evicted history items per execution history, which were loaded from the execution log file
+        self._number_of_loaded_evicted_items = WeakKeyDictionary()
+        self._update_id = None
+        self._reset_tree()
 
         self.update()
 
     def destroy(self):
+        if self._update_id is not None:
+            GLib.source_remove(self._update_id)
+            self._update_id = None
         self.clean_history(None, None)
         super(ExecutionHistoryTreeController, self).destroy()
 
     def register_view(self, view):
         super(ExecutionHistoryTreeController, self).register_view(view)
         self.history_tree.connect('button_press_event', self.mouse_click)
+        self.history_tree.connect('test-expand-row', self._on_test_expand_row)
         view['reload_button'].connect('clicked', self.reload_history)
         view['clean_button'].connect('clicked', self.clean_history)
         view['open_separately_button'].connect('clicked', self.open_selected_history_separately)
@@ -100,12 +117,13 @@ class ExecutionHistoryTreeController(ExtendedController):
 
         # check if valid history item (in case of concurrency not all tree items has a history item in the tree store
         if selected_history_item is None and model.iter_has_child(row):
-            child_iter = model.iter_nth_child(row, 0)
-            selected_history_item = model.get_value(child_iter, self.HISTORY_ITEM_STORAGE_ID)
+            selected_history_item = self.get_history_item_for_tree_iter(row)
             if selected_history_item is None:
                 logger.info("The selected element could not be connected to a run-id. Therefore, no run-id is handed "\
                             "to the external execution log viewer.")
                 return
+        if not isinstance(selected_history_item, HistoryItem):
+            selected_history_item = None
         run_id = selected_history_item.run_id if selected_history_item is not None else None
 
         selected_state_machine = self.model.get_selected_state_machine_model().state_machine
@@ -154,6 +172,13 @@ class ExecutionHistoryTreeController(ExtendedController):
             if row is not None:
                 histroy_item_path = self.history_tree_store.get_path(row)
                 histroy_item_iter = self.history_tree_store.get_iter(histroy_item_path)
+                history_item = self.history_tree_store[histroy_item_iter][self.HISTORY_ITEM_STORAGE_ID]
+                if isinstance(history_item, ExecutionHistory):
+                    self.load_evicted_history_items(history_item)
+                    return True
+                if self.get_history_item_for_tree_iter(histroy_item_iter) is None:
+                    # history items loaded from the execution log file do not reference a state
+                    return True
                 # logger.info(history_item.state_reference)
                 # TODO generalize double-click folding and unfolding -> also used in states tree of state machine
                 if histroy_item_path is not None and self.history_tree_store.iter_n_children(histroy_item_iter):
@@ -242,12 +267,6 @@ class ExecutionHistoryTreeController(ExtendedController):
 
             return True
 
-    # TODO: implement! To do this efficiently a mechanism is needed that does not regenerate the whole tree view
-    # TODO: the appropriate state machine would have to be observed as well
-    # @ExtendedController.observe("execution_history_container", after=True)
-    # def model_changed(self, model, prop_name, info):
-    #     #self.update()
-
     def get_history_item_for_tree_iter(self, child_tree_iter):
         """Hands history item for tree iter and compensate if tree item is a dummy item
 
@@ -257,9 +276,9 @@ class ExecutionHistoryTreeController(ExtendedController):
         """
         history_item = self.history_tree_store[child_tree_iter][self.HISTORY_ITEM_STORAGE_ID]
         if history_item is None:  # is dummy item
-            if self.history_tree_store.iter_n_children(child_tree_iter) > 0:
-                child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, 0)
-                history_item = self.history_tree_store[child_iter][self.HISTORY_ITEM_STORAGE_ID]
+            node = self.history_tree_store[child_tree_iter][self.NODE_STORAGE_ID]
+            if node is not None and node.dummy:
+                history_item = node.history_item
             else:
                 logger.debug("In a dummy history should be respective real call element.")
         return history_item
@@ -268,6 +287,9 @@ class ExecutionHistoryTreeController(ExtendedController):
         """Iter recursively all tree items and store expansion state"""
 
         def store_tree_expansion(child_tree_iter, expansion_state):
+            # placeholders of not yet created rows have no expansion state
+            if self.history_tree_store[child_tree_iter][self.NODE_STORAGE_ID] is None:
+                return
 
             tree_item_path = self.history_tree_store.get_path(child_tree_iter)
             history_item = self.get_history_item_for_tree_iter(child_tree_iter)
@@ -303,13 +325,15 @@ class ExecutionHistoryTreeController(ExtendedController):
             history_item = self.get_history_item_for_tree_iter(child_tree_iter)
 
             # restore expansion state if tree item path is valid and expansion state was not stored already
+            # the rows of the children are created, when the row is expanded
             if tree_item_path and history_item in expansion_state:
                 if expansion_state[history_item]:
                     self.history_tree.expand_to_path(tree_item_path)
 
             for n in range(self.history_tree_store.iter_n_children(child_tree_iter)):
                 child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, n)
-                restore_tree_expansion(child_iter, expansion_state)
+                if self.history_tree_store[child_iter][self.NODE_STORAGE_ID] is not None:
+                    restore_tree_expansion(child_iter, expansion_state)
 
         root_iter = self.history_tree_store.get_iter_first()
         if not root_iter:
@@ -335,6 +359,9 @@ class ExecutionHistoryTreeController(ExtendedController):
         for state_machine_id in list(self._expansion_state.keys()):
             if state_machine_id not in self.model.state_machines:
                 del self._expansion_state[state_machine_id]
+        state_machine = self._get_shown_state_machine()
+        if state_machine is not None and state_machine.state_machine_id not in self.model.state_machines:
+            self._reset_tree()
 
     @ExtendedController.observe("execution_engine", after=True)
     def execution_history_focus(self, model, prop_name, info):
@@ -352,14 +379,27 @@ class ExecutionHistoryTreeController(ExtendedController):
             if not self.model.selected_state_machine_id == self.model.state_machine_manager.active_state_machine_id:
                 pass
             else:
-                self.update()
+                self._schedule_update()
+
+    def _schedule_update(self):
+        """Updates the tree after a short delay, multiple requests within the delay cause a single update
+
+        Especially when stepping through a state machine, the execution engine notifies many changes in a short time.
+        """
+        if self._update_id is None:
+            self._update_id = GLib.timeout_add(constants.EXECUTION_HISTORY_UPDATE_DELAY, self._scheduled_update)
+
+    def _scheduled_update(self):
+        self._update_id = None
+        self.update()
+        return False
 
     def clean_history(self, widget, event=None):
         """Triggered when the 'Clean History' button is clicked.
 
         Empties the execution history tree by adjusting the start index and updates tree store and view.
         """
-        self.history_tree_store.clear()
+        self._reset_tree()
         selected_sm_m = self.model.get_selected_state_machine_model()
         if selected_sm_m:
             # the core may continue running without the GUI and for this it needs its execution histories
@@ -369,133 +409,503 @@ class ExecutionHistoryTreeController(ExtendedController):
 
     def reload_history(self, widget, event=None):
         """Triggered when the 'Reload History' button is clicked."""
-        self.update()
+        self.update(rebuild=True)
 
-    def update(self):
-        """
-        rebuild the tree view of the history item tree store
-        :return:
+    def update(self, rebuild=False):
+        """Adds the history items, which were added to the execution histories since the last update, to the tree
+
+        The tree is rebuilt, if another state machine was selected, if history items were removed from the end of the
+        execution histories by backward stepping, or if requested. The nodes of history items evicted because of the
+        budget of the execution history are removed from the tree.
+
+        :param bool rebuild: Whether to rebuild the tree from scratch
         """
-        # with self._update_lock:
         with self._update_lock:
-            self._store_expansion_state()
-            self.history_tree_store.clear()
             selected_sm_m = self.model.get_selected_state_machine_model()
-            if not selected_sm_m:
-                return
+            state_machine = selected_sm_m.state_machine if selected_sm_m else None
+            if rebuild or state_machine is not self._get_shown_state_machine() or \
+                    not self._is_tree_up_to_date(state_machine):
+                self._store_expansion_state()
+                self._reset_tree()
+                if state_machine is None:
+                    return
+                self._state_machine_ref = ref(state_machine)
+                self.insert_new_history_items(state_machine)
+                self._restore_expansion_state()
+            elif state_machine is not None:
+                self.insert_new_history_items(state_machine)
 
-            for execution_number, execution_history in enumerate(selected_sm_m.state_machine.execution_histories):
-                if len(execution_history) > 0:
-                    first_history_item = execution_history[0]
-                    # the next lines filter out the StateMachineStartItem, which is not intended to
-                    # be displayed, but merely as convenient entry point in the saved log file
-                    if isinstance(first_history_item, StateMachineStartItem):
-                        if len(execution_history) > 1:
-                            first_history_item = execution_history[1]
-                            tree_item = self.history_tree_store.insert_after(
-                                None,
-                                None,
-                                (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                                 first_history_item, self.TOOL_TIP_TEXT))
-                            self.insert_execution_history(tree_item, execution_history[1:], is_root=True)
-                        else:
-                            pass  # there was only the Start item in the history
-                    else:
-                        tree_item = self.history_tree_store.insert_after(
-                            None,
-                            None,
-                            (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                             first_history_item, self.TOOL_TIP_TEXT))
-                        self.insert_execution_history(tree_item, execution_history, is_root=True)
+    def _get_shown_state_machine(self):
+        return self._state_machine_ref() if self._state_machine_ref is not None else None
+
+    def _reset_tree(self):
+        self.history_tree_store.clear()
+        self._root_node = HistoryTreeNode(None)
+        self._root_node.populated = True
+        self._state_machine_ref = None
+        self._run_cursors = []
+        self._cursors = []
+
+    def _is_tree_up_to_date(self, state_machine):
+        """Checks whether the tree can be updated by only adding new history items
+
+        :param rafcon.core.state_machine.StateMachine state_machine: The state machine shown in the tree
+        :return: False, if the tree contains execution histories or history items, which do no longer exist
+        :rtype: bool
+        """
+        execution_histories = state_machine.execution_histories
+        if len(execution_histories) < len(self._run_cursors):
+            return False
+        for cursor, execution_history in zip(self._run_cursors, execution_histories):
+            if cursor.execution_history is not execution_history:
+                return False
+        return not any(cursor.is_outdated() for cursor in self._cursors)
+
+    def load_evicted_history_items(self, execution_history):
+        """Load the next page of evicted history items of an execution history from the execution log file
+
+        :param ExecutionHistory execution_history: the execution history with evicted items
+        """
+        if execution_history.execution_history_storage is None:
+            logger.info("Set EXECUTION_LOG_ENABLE to True in your config to keep history items, which are evicted from "
+                        "the execution history because of EXECUTION_HISTORY_MAX_ITEMS or EXECUTION_HISTORY_MAX_BYTES.")
+            return
+        number_of_loaded_items = self._number_of_loaded_evicted_items.get(execution_history, 0)
+        self._number_of_loaded_evicted_items[execution_history] = min(
+            number_of_loaded_items + self.EVICTED_ITEMS_PAGE_SIZE, execution_history.number_of_evicted_items)
+        self.update(rebuild=True)
 
-            self._restore_expansion_state()
+    def insert_evicted_history_items(self, parent, execution_history):
+        """Insert the loaded evicted items of an execution history and an entry for loading further items
 
-    def insert_history_item(self, parent, history_item, description, dummy=False):
-        """Enters a single history item into the tree store
+        The evicted items are read from the execution log file and inserted as flat list, as they do not reference
+        their states anymore.
 
-        :param Gtk.TreeItem parent: Parent tree item
+        :param HistoryTreeNode parent: the parent to add the items to
+        :param ExecutionHistory execution_history: the execution history with evicted items
+        """
+        number_of_loaded_items = self._number_of_loaded_evicted_items.get(execution_history, 0)
+        records = execution_history.get_evicted_item_records(number_of_loaded_items) if number_of_loaded_items else []
+        number_of_remaining_items = execution_history.number_of_evicted_items - len(records)
+        # the entries are inserted before the retained history items
+        position = 0
+        if number_of_remaining_items > 0:
+            if execution_history.execution_history_storage is None:
+                description = "{0} older items were evicted".format(number_of_remaining_items)
+            else:
+                description = "{0} older items were evicted - double click to load them".format(
+                    number_of_remaining_items)
+            self.insert_node(parent, HistoryTreeNode(
+                parent, content=(description, execution_history, self.EVICTED_ITEMS_TOOL_TIP_TEXT)), position)
+            position += 1
+
+        descriptions = {('CallItem', 'EXECUTE'): "Call", ('CallItem', 'CONTAINER'): "Enter",
+                        ('ReturnItem', 'EXECUTE'): "Return", ('ReturnItem', 'CONTAINER'): "Exit",
+                        ('ConcurrencyItem', 'CONTAINER'): "Concurrency"}
+        for record in reversed(records):
+            description = descriptions.get((record['item_type'], record.get('call_type')))
+            if description is None:  # the StateMachineStartItem
+                continue
+            self.insert_node(parent, HistoryTreeNode(
+                parent, content=(record['state_name'] + " - " + description + " (from log file)", None, None)),
+                position)
+            position += 1
+
+    def insert_history_item(self, parent, history_item, description, dummy=False, position=None):
+        """Enters a single history item into the tree
+
+        :param HistoryTreeNode parent: Parent tree node
         :param HistoryItem history_item: History item to be inserted
         :param str description: A description to be added to the entry
         :param None dummy: Whether this is just a dummy entry (wrapper for concurrency items)
-        :return: Inserted tree item
-        :rtype: Gtk.TreeItem
+        :param int position: The position among the children of the parent, by default the item is appended
+        :return: Inserted tree node
+        :rtype: HistoryTreeNode
         """
         if not history_item.state_reference:
             logger.error("This must never happen! Current history_item is {}".format(history_item))
             return None
-        content = None
+        return self.insert_node(parent, HistoryTreeNode(parent, history_item, description, dummy), position)
+
+    def insert_node(self, parent, node, position=None):
+        """Inserts a node into the tree
 
-        if global_gui_config.get_config_value("SHOW_PATH_NAMES_IN_EXECUTION_HISTORY", False):
-            content = (history_item.state_reference.name + " - " +
-                           history_item.state_reference.get_path() + " - " +
-                           description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
+        A row is only created for the node, if the children of the parent are shown. Otherwise, the parent gets a
+        placeholder row, so that it can be expanded.
+
+        :param HistoryTreeNode parent: Parent tree node
+        :param HistoryTreeNode node: The node to be inserted
+        :param int position: The position among the children of the parent, by default the node is appended
+        :return: The inserted node
+        :rtype: HistoryTreeNode
+        """
+        if parent.children is None:
+            parent.children = []
+        if position is None:
+            parent.children.append(node)
+        else:
+            parent.children.insert(position, node)
+        if parent.populated:
+            self._insert_row(parent, node, -1 if position is None else position)
+        elif parent.tree_iter is not None and self.history_tree_store.iter_children(parent.tree_iter) is None:
+            self.history_tree_store.append(parent.tree_iter, self.PLACEHOLDER_ROW)
+        return node
+
+    def _get_row(self, node):
+        if node.content is not None:
+            content = node.content
         else:
-            content = (history_item.state_reference.name + " - " +
-                           description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
+            history_item = node.history_item
+            if global_gui_config.get_config_value("SHOW_PATH_NAMES_IN_EXECUTION_HISTORY", False):
+                label = history_item.state_reference.name + " - " + history_item.state_reference.get_path() + \
+                    " - " + node.description
+            else:
+                label = history_item.state_reference.name + " - " + node.description
+            content = (label, None if node.dummy else history_item, None if node.dummy else self.TOOL_TIP_TEXT)
+        return content + (node, )
+
+    def _insert_row(self, parent, node, position=-1):
+        node.tree_iter = self.history_tree_store.insert(parent.tree_iter, position, self._get_row(node))
+        if node.children:
+            self.history_tree_store.append(node.tree_iter, self.PLACEHOLDER_ROW)
+
+    def _forget_rows(self, node):
+        """Resets the references of a node and its descendants to their rows, after the rows were removed"""
+        node.tree_iter = None
+        if node.populated:
+            node.populated = False
+            for child in node.children or []:
+                self._forget_rows(child)
+
+    def _on_test_expand_row(self, tree_view, tree_iter, path):
+        """Creates the rows of the children of a node, before it is expanded the first time"""
+        node = self.history_tree_store[tree_iter][self.NODE_STORAGE_ID]
+        if node is not None and not node.populated:
+            placeholder_iter = self.history_tree_store.iter_children(tree_iter)
+            node.populated = True
+            for child in node.children or []:
+                self._insert_row(node, child)
+            if placeholder_iter is not None:
+                self.history_tree_store.remove(placeholder_iter)
+        return False
+
+    def insert_new_history_items(self, state_machine):
+        """Inserts the history items into the tree, which were added since the last call
+
+        :param rafcon.core.state_machine.StateMachine state_machine: The state machine shown in the tree
+        """
+        execution_histories = state_machine.execution_histories
+        for run_index in range(len(self._run_cursors), len(execution_histories)):
+            cursor = ExecutionHistoryCursor(execution_histories[run_index], self._root_node, run_index + 1)
+            self._run_cursors.append(cursor)
+            self._cursors.append(cursor)
 
-        tree_item = self.history_tree_store.insert_before(
-            parent, None, content)
-        return tree_item
+        for cursor in list(self._cursors):
+            if not cursor.finished:
+                self._insert_new_history_items_of_cursor(cursor)
+        self._cursors = [cursor for cursor in self._cursors if not cursor.finished]
 
-    def insert_execution_history(self, parent, execution_history, is_root=False):
-        """Insert a list of history items into a the tree store
+    def _insert_new_history_items_of_cursor(self, cursor):
+        """Inserts the history items of an execution history, which were added since the last call
 
-        If there are concurrency history items, the method is called recursively.
+        If there are concurrency history items, the execution histories of the concurrent branches get cursors, too.
 
-        :param Gtk.TreeItem parent: the parent to add the next history item to
-        :param ExecutionHistory execution_history: all history items of a certain state machine execution
-        :param bool is_root: Whether this is the root execution history
+        :param ExecutionHistoryCursor cursor: The cursor of the execution history
         """
-        current_parent = parent
-        execution_history_iterator = iter(execution_history)
-        for history_item in execution_history_iterator:
-            if isinstance(history_item, ConcurrencyItem):
-                self.insert_concurrent_execution_histories(current_parent, history_item.execution_histories)
-
-            elif isinstance(history_item, CallItem):
-                tree_item = self.insert_history_item(current_parent, history_item, "Enter" if is_root else "Call")
-                if not tree_item:
-                    return
-                if history_item.call_type is CallType.EXECUTE:
-                    # this is necessary that already the CallType.EXECUTE item opens a new hierarchy in the
-                    # tree view and not the CallType.CONTAINER item
-                    next_history_item = history_item.next
-                    if next_history_item and next_history_item.call_type is CallType.CONTAINER:
-                        current_parent = tree_item
-                        self.insert_history_item(current_parent, next_history_item, "Enter")
-                        try:
-                            next(execution_history_iterator)  # skips the next history item in the iterator
-                        except StopIteration as e:
-                            # the execution engine does not have another item
-                            return
-
-            else:  # history_item is ReturnItem
-                if current_parent is None:
-                    # The reasons here can be: missing history items, items in the wrong order etc.
-                    # Does not happen when using RAFCON without plugins
-                    logger.error("Invalid execution history: current_parent is None")
-                    return
-                if history_item.call_type is CallType.EXECUTE:
-                    self.insert_history_item(current_parent, history_item, "Return")
-                else:  # CONTAINER
-                    self.insert_history_item(current_parent, history_item, "Exit")
-                    current_parent = self.history_tree_store.iter_parent(current_parent)
+        execution_history = cursor.execution_history
+        if execution_history.number_of_evicted_items != cursor.number_of_evicted_items:
+            self._remove_evicted_history_items(cursor)
+        number_of_items = len(execution_history)
+        # the StateMachineStartItem is not intended to be displayed, but merely as convenient entry point in the saved
+        # log file
+        if cursor.index == 0 and number_of_items > 0 and isinstance(execution_history[0], StateMachineStartItem):
+            cursor.index = 1
+            cursor.last_item = execution_history[0]
+            cursor.item_nodes.append(None)
+        if cursor.index >= number_of_items:
+            return
+
+        if cursor.node is None and not cursor.stopped:
+            self._insert_execution_history_node(cursor)
 
-            is_root = False
+        for index in range(cursor.index, number_of_items):
+            cursor.item_nodes.append(
+                None if cursor.stopped else self._insert_next_history_item(cursor, execution_history[index]))
+        cursor.index = number_of_items
+        cursor.last_item = execution_history[number_of_items - 1]
 
-    def insert_concurrent_execution_histories(self, parent, concurrent_execution_histories):
-        """Adds the child execution histories of a concurrency state.
+    def _remove_evicted_history_items(self, cursor):
+        """Removes the nodes of the history items, which were evicted from the execution history since the last update
 
-        :param Gtk.TreeItem parent: the parent to add the next history item to
-        :param list[ExecutionHistory] concurrent_execution_histories: a list of all child execution histories
-        :return:
+        As the oldest items are evicted, the nodes of the evicted items are the first ones in the order of the tree.
+        Their retained descendants are moved to the node of the run or branch, which is also where they are placed
+        when rebuilding the tree. The entries of the evicted items and the first history item of the node of the
+        run or branch are updated.
+
+        :param ExecutionHistoryCursor cursor: The cursor of the execution history
         """
-        for execution_history in concurrent_execution_histories:
-            if len(execution_history) >= 1:
-                first_history_item = execution_history[0]
-                # this is just a dummy item to have an extra parent for each branch
-                # gives better overview in case that one of the child state is a simple execution state
-                tree_item = self.insert_history_item(parent, first_history_item, "Concurrency Branch", dummy=True)
-                self.insert_execution_history(tree_item, execution_history)
+        execution_history = cursor.execution_history
+        number_of_evicted_items = execution_history.number_of_evicted_items - cursor.number_of_evicted_items
+        cursor.number_of_evicted_items = execution_history.number_of_evicted_items
+        cursor.is_root = False
+        removed_nodes = set()
+        # the nodes of concurrent branches, which are removed with all their descendants
+        removed_branch_nodes = set()
+        for _ in range(min(number_of_evicted_items, len(cursor.item_nodes))):
+            entry = cursor.item_nodes.popleft()
+            if isinstance(entry, HistoryTreeNode):
+                removed_nodes.add(entry)
+            elif entry is not None:  # the cursors of the branches of a concurrency item
+                for branch_cursor in entry:
+                    branch_cursor.finish()
+                    if branch_cursor.node is not None:
+                        removed_branch_nodes.add(branch_cursor.node)
+                if entry is cursor.concurrency_cursors:
+                    cursor.concurrency_cursors = []
+        cursor.index = max(0, cursor.index - number_of_evicted_items)
+        if cursor.node is None:
+            return
+
+        if cursor.current_parent in removed_nodes:
+            cursor.current_parent = cursor.node
+        if cursor.execute_call_node in removed_nodes:
+            cursor.execute_call_node = None
+        for branch_cursor in cursor.concurrency_cursors:
+            if branch_cursor.parent in removed_nodes:
+                branch_cursor.parent = cursor.node
+
+        node = cursor.node
+        retained_children = []
+        moved_nodes = set()
+        for child in node.children or []:
+            if child.content is not None or child in removed_branch_nodes:
+                # the entries of the evicted items are recreated below
+                if node.populated:
+                    self.history_tree_store.remove(child.tree_iter)
+            elif child in removed_nodes:
+                if node.populated:
+                    self.history_tree_store.remove(child.tree_iter)
+                descendants = self._get_retained_descendants(child, removed_nodes, removed_branch_nodes)
+                moved_nodes.update(descendants)
+                retained_children.extend(descendants)
+            else:
+                retained_children.append(child)
+        node.children = retained_children
+        for index, child in enumerate(retained_children):
+            if child in moved_nodes:
+                child.parent = node
+                self._forget_rows(child)
+                if node.populated:
+                    self._insert_row(node, child, index)
+        if not retained_children and not node.populated and node.tree_iter is not None:
+            # the placeholder row is recreated for the entries of the evicted items
+            self.history_tree_store.remove(self.history_tree_store.iter_children(node.tree_iter))
+        self.insert_evicted_history_items(node, execution_history)
+
+        first_history_item = execution_history[0]
+        if cursor.branch_cursors is None:
+            node.content = self._get_run_node_content(cursor, first_history_item)
+        else:
+            node.history_item = first_history_item
+        if node.tree_iter is not None:
+            self.history_tree_store[node.tree_iter] = self._get_row(node)
+
+    def _get_retained_descendants(self, node, removed_nodes, removed_branch_nodes):
+        """Returns the descendants of a removed node, whose parents are removed as well, in the order of the tree"""
+        retained_descendants = []
+        for child in node.children or []:
+            if child in removed_branch_nodes:
+                continue
+            if child in removed_nodes:
+                retained_descendants.extend(self._get_retained_descendants(child, removed_nodes, removed_branch_nodes))
+            else:
+                retained_descendants.append(child)
+        return retained_descendants
+
+    def _get_run_node_content(self, cursor, first_history_item):
+        # if the history is truncated, the first item does not necessarily refer to the root state
+        root_state = self._get_shown_state_machine().root_state if cursor.is_truncated else \
+            first_history_item.state_reference
+        return root_state.name + " - Run " + str(cursor.run_number), first_history_item, self.TOOL_TIP_TEXT
+
+    def _insert_execution_history_node(self, cursor):
+        """Inserts the node of a run or a concurrent branch, which is the parent of its history items"""
+        execution_history = cursor.execution_history
+        first_history_item = execution_history[cursor.index]
+        if cursor.branch_cursors is None:  # a run of the state machine
+            content = self._get_run_node_content(cursor, first_history_item)
+            cursor.node = self.insert_node(self._root_node, HistoryTreeNode(self._root_node, content=content), 0)
+            cursor.is_root = not cursor.is_truncated
+        else:
+            # this is just a dummy item to have an extra parent for each branch
+            # gives better overview in case that one of the child state is a simple execution state
+            # the branches keep their order, even if a later branch got its first item before
+            position = None
+            for branch_cursor in cursor.branch_cursors[cursor.branch_cursors.index(cursor) + 1:]:
+                if branch_cursor.node is not None:
+                    position = cursor.parent.children.index(branch_cursor.node)
+                    break
+            cursor.node = self.insert_history_item(cursor.parent, first_history_item, "Concurrency Branch",
+                                                   dummy=True, position=position)
+            if cursor.node is None:
+                cursor.stopped = True
+                return
+        cursor.current_parent = cursor.node
+        if cursor.is_truncated:
+            self.insert_evicted_history_items(cursor.node, execution_history)
+
+    def _insert_next_history_item(self, cursor, history_item):
+        """Inserts the next history item of an execution history
+
+        :param ExecutionHistoryCursor cursor: The cursor of the execution history
+        :param HistoryItem history_item: The history item following the last inserted one
+        :return: The node of the history item, the cursors of the branches for a concurrency item or None, if the
+            history item could not be inserted
+        """
+        # the concurrent branches are complete, as soon as the concurrency state continues
+        for branch_cursor in cursor.concurrency_cursors:
+            self._insert_new_history_items_of_cursor(branch_cursor)
+            branch_cursor.finished = True
+        cursor.concurrency_cursors = []
+
+        is_root = cursor.is_root
+        cursor.is_root = False
+        execute_call_node = cursor.execute_call_node
+        cursor.execute_call_node = None
+        if execute_call_node is not None and getattr(history_item, 'call_type', None) is CallType.CONTAINER:
+            # this is necessary that already the CallType.EXECUTE item opens a new hierarchy in the
+            # tree view and not the CallType.CONTAINER item
+            cursor.current_parent = execute_call_node
+            return self.insert_history_item(cursor.current_parent, history_item, "Enter")
+
+        elif isinstance(history_item, ConcurrencyItem):
+            branch_cursors = []
+            for execution_history in history_item.execution_histories:
+                branch_cursors.append(ExecutionHistoryCursor(execution_history, cursor.current_parent,
+                                                             branch_cursors=branch_cursors))
+            cursor.concurrency_cursors = branch_cursors
+            self._cursors.extend(branch_cursors)
+            for branch_cursor in branch_cursors:
+                self._insert_new_history_items_of_cursor(branch_cursor)
+            return branch_cursors
+
+        elif isinstance(history_item, CallItem):
+            # the call of the container is only not preceded by the call of the execute method for the root state or
+            # if the latter was evicted
+            is_enter = is_root or history_item.call_type is CallType.CONTAINER
+            tree_node = self.insert_history_item(cursor.current_parent, history_item, "Enter" if is_enter else "Call")
+            if not tree_node:
+                cursor.stopped = True
+                return None
+            if history_item.call_type is CallType.EXECUTE:
+                cursor.execute_call_node = tree_node
+            return tree_node
+
+        else:  # history_item is ReturnItem
+            if cursor.current_parent is self._root_node:
+                # The reasons here can be: missing history items, items in the wrong order etc.
+                # Does not happen when using RAFCON without plugins
+                logger.error("Invalid execution history: current_parent is None")
+                cursor.stopped = True
+                return None
+            if history_item.call_type is CallType.EXECUTE:
+                return self.insert_history_item(cursor.current_parent, history_item, "Return")
+            # CONTAINER
+            tree_node = self.insert_history_item(cursor.current_parent, history_item, "Exit")
+            # the items of a truncated history stay within the node of the run or branch, even if they leave containers
+            # entered before the first retained item
+            if cursor.current_parent is not cursor.node or not cursor.is_truncated:
+                cursor.current_parent = cursor.current_parent.parent
+            return tree_node
+
+
+class HistoryTreeNode(object):
+    """A node of the execution history tree
+
+    The nodes of all history items are kept, but rows in the tree store are only created for the children of expanded
+    nodes. Thus, the size of the tree store does not depend on the length of the execution histories, but only on
+    the part of the tree the user looked at.
+
+    :param HistoryTreeNode parent: The parent node, None for the root node
+    :param HistoryItem history_item: The history item of the node
+    :param str description: A description to be added to the name of the state of the history item
+    :param bool dummy: Whether this is just a dummy entry (wrapper for concurrency items)
+    :param tuple content: Optional fixed content of the row, used for nodes not showing a single history item
+    """
+    __slots__ = ('parent', 'children', 'history_item', 'description', 'dummy', 'content', 'tree_iter', 'populated')
+
+    def __init__(self, parent, history_item=None, description=None, dummy=False, content=None):
+        self.parent = parent
+        self.children = None
+        self.history_item = history_item
+        self.description = description
+        self.dummy = dummy
+        self.content = content
+        self.tree_iter = None
+        # whether rows were created for the children
+        self.populated = False
+
+
+class ExecutionHistoryCursor(object):
+    """The position up to which the items of an execution history were inserted into the tree
+
+    :param ExecutionHistory execution_history: The execution history of a run or a concurrent branch
+    :param HistoryTreeNode parent: The node to insert the node of the run or branch into
+    :param int run_number: The number of the run, None for concurrent branches
+    :param list[ExecutionHistoryCursor] branch_cursors: The cursors of all branches of the concurrency history item,
+        None for runs
+    """
+    __slots__ = ('execution_history', 'parent', 'run_number', 'branch_cursors', 'number_of_evicted_items', 'node',
+                 'current_parent', 'index', 'last_item', 'item_nodes', 'is_root', 'execute_call_node',
+                 'concurrency_cursors', 'stopped', 'finished')
+
+    def __init__(self, execution_history, parent, run_number=None, branch_cursors=None):
+        self.execution_history = execution_history
+        self.parent = parent
+        self.run_number = run_number
+        self.branch_cursors = branch_cursors
+        self.number_of_evicted_items = execution_history.number_of_evicted_items
+        self.node = None
+        self.current_parent = None
+        self.index = 0
+        self.last_item = None
+        # per inserted history item: its node, the cursors of its branches for concurrency items or None
+        self.item_nodes = deque()
+        self.is_root = False
+        # the node of the last history item, if it is a call of the execute method
+        self.execute_call_node = None
+        # the cursors of the branches of the last history item, if it is a concurrency item
+        self.concurrency_cursors = []
+        # whether the remaining items cannot be inserted because of an invalid history
+        self.stopped = False
+        # whether no further items can be added to the execution history
+        self.finished = False
+
+    @property
+    def is_truncated(self):
+        """Whether older items were evicted from the execution history, i.e. items might return from containers,
+        which were entered before the first item"""
+        return self.number_of_evicted_items > 0
+
+    def is_outdated(self):
+        """Whether history items were removed from the end of the execution history, e.g. by backward stepping, since
+        they were inserted into the tree"""
+        execution_history = self.execution_history
+        # the indices of the inserted items are shifted by the number of items evicted in the meantime
+        index = self.index - (execution_history.number_of_evicted_items - self.number_of_evicted_items)
+        if index <= 0:
+            # all inserted items were evicted, only retained items can be removed by backward stepping
+            return False
+        if len(execution_history) < index:
+            return True
+        return execution_history[index - 1] is not self.last_item
+
+    def finish(self):
+        """Stops inserting items of the execution history and of its concurrent branches, e.g. after their
+        concurrency item was evicted"""
+        self.stopped = True
+        self.finished = True
+        for entry in self.item_nodes:
+            if isinstance(entry, list):
+                for branch_cursor in entry:
+                    branch_cursor.finish()
@@ -14,7 +14,6 @@ from builtins import str
 from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GObject
-import shelve
 import os.path
 
 import rafcon.utils.execution_log as log_helper
@@ -29,7 +28,7 @@ class ExecutionLogTreeController(ExtendedController):
 
     RUN_ID_STORAGE_ID = 1
 
-    def __init__(self, model, view, filename, run_id_to_select):
+    def __init__(self, model, view, filename, run_id_to_select, item_filter=None):
 
         logger.verbose("Select run_id: {0}".format(run_id_to_select))
         super(ExecutionLogTreeController, self).__init__(model, view)
@@ -39,11 +38,22 @@ class ExecutionLogTreeController(ExtendedController):
             exit()
 
         self.run_id_to_select = run_id_to_select
-        self.hist_items = shelve.open(filename, 'r')
-        self.start, self.next_, self.concurrent, self.hierarchy, self.items = \
-            log_helper.log_to_collapsed_structure(self.hist_items,
-                                                  throw_on_pickle_error=False,
-                                                  include_erroneous_data_ports=True)
+        self.item_filter = item_filter
+        self.hist_items = log_helper.open_execution_log(filename)
+        if item_filter is not None and item_filter.is_active:
+            # only list the matching state executions, using the index of the log if available
+            log_index = log_helper.open_execution_log_index(filename)
+            self.start, self.next_, self.concurrent, self.hierarchy = None, {}, {}, {}
+            self.items = {item['run_id']: item for item in log_helper.iter_collapsed_items(
+                self.hist_items, item_filter.state_path, item_filter.run_id_range, item_filter.time_window,
+                throw_on_pickle_error=False, include_erroneous_data_ports=True, log_index=log_index)}
+            if log_index is not None:
+                log_index.close()
+        else:
+            self.start, self.next_, self.concurrent, self.hierarchy, self.items = \
+                log_helper.log_to_collapsed_structure(self.hist_items,
+                                                      throw_on_pickle_error=False,
+                                                      include_erroneous_data_ports=True)
         # create a TreeStore with one string column to use as the model
         self.tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_STRING)
         self.item_iter = {}
@@ -53,7 +63,8 @@ class ExecutionLogTreeController(ExtendedController):
 
         # we'll add some data now - 4 rows with 3 child rows each
         if not self.start:
-            logger.warning('WARNING: no start item found, just listing all items')
+            if self.item_filter is None or not self.item_filter.is_active:
+                logger.warning('WARNING: no start item found, just listing all items')
             elements = [(None, run_id) for run_id in self.items.keys()]
         else:
             elements = [(None, self.start['run_id'])]
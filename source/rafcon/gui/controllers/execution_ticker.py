@@ -115,6 +115,31 @@ class ExecutionTickerController(ExtendedController):
         from rafcon.gui.utils.notification_overview import NotificationOverview
         from rafcon.core.states.state import State
 
+        if 'kwargs' in info and 'method_name' in info['kwargs']:
+            overview = NotificationOverview(info)
+            if overview.get_cause() == 'state_execution_status':
+                active_state = overview.get_affected_model().state
+                assert isinstance(active_state, State)
+                self.show_active_state(active_state)
+
+    @ExtendedController.observe("state_execution_status_signal", signal=True)
+    def on_state_execution_status_signal(self, model, prop_name, info):
+        """ Show the state with the latest execution status change in the widget
+
+        :param model: the state machine model, whose states changed their execution status
+        :param prop_name: the name of the signal
+        :param info: information containing the :class:`rafcon.gui.models.signals.ExecutionStatusSignalMsg`
+        """
+        if info.arg.state_models:
+            self.show_active_state(info.arg.state_models[-1].state)
+
+    def show_active_state(self, active_state):
+        """ Show the path of the given state in the widget
+
+        :param rafcon.core.states.state.State active_state: the state, whose execution status changed last
+        """
+        from rafcon.core.states.state import State
+
         def name_and_next_state(state):
             assert isinstance(state, State)
             if state.is_root_state_of_library:
@@ -134,19 +159,13 @@ class ExecutionTickerController(ExtendedController):
                 path = separator + '..' + path
             return path
 
-        if 'kwargs' in info and 'method_name' in info['kwargs']:
-            overview = NotificationOverview(info)
-            if overview.get_cause() == 'state_execution_status':
-                active_state = overview.get_affected_model().state
-                assert isinstance(active_state, State)
-
-                path_depth = rafcon.gui.singleton.global_gui_config.get_config_value("EXECUTION_TICKER_PATH_DEPTH", 3)
+        path_depth = rafcon.gui.singleton.global_gui_config.get_config_value("EXECUTION_TICKER_PATH_DEPTH", 3)
 
-                message = self._fix_text_of_label + create_path(active_state, path_depth)
-                if rafcon.gui.singleton.main_window_controller.view is not None:
-                    self.ticker_text_label.set_text(message)
-                else:
-                    logger.warning("Not initialized yet")
+        message = self._fix_text_of_label + create_path(active_state, path_depth)
+        if rafcon.gui.singleton.main_window_controller.view is not None:
+            self.ticker_text_label.set_text(message)
+        else:
+            logger.warning("Not initialized yet")
 
     def stop_sm_m_observation(self, sm_m):
         self.relieve_model(sm_m)
@@ -70,6 +70,7 @@ class GraphicalEditorController(ExtendedController):
 
     drag_motion_handler_id = None
     focus_changed_handler_id = None
+    _content_views_update_id = None
 
     def __init__(self, model, view):
         """Constructor"""
@@ -79,6 +80,7 @@ class GraphicalEditorController(ExtendedController):
         assert isinstance(self.model, StateMachineModel)
         self.observe_model(rafcon.gui.singleton.gui_config_model)
         self.observe_model(rafcon.gui.singleton.runtime_config_model)
+        self.observe_model(model.selection)
         self.root_state_m = model.root_state
 
         self.canvas = MyCanvas()
@@ -93,6 +95,9 @@ class GraphicalEditorController(ExtendedController):
                        "".format(time.time() - start_time, self.model.state_machine_id))
 
     def destroy(self):
+        if self._content_views_update_id is not None:
+            GLib.source_remove(self._content_views_update_id)
+            self._content_views_update_id = None
         if self.view:
             self.view.editor.prepare_destruction()
         super(GraphicalEditorController, self).destroy()
@@ -105,6 +110,7 @@ class GraphicalEditorController(ExtendedController):
         self.focus_changed_handler_id = self.view.editor.connect('focus-changed', self._move_focused_item_into_viewport)
         self.view.editor.connect("drag-data-received", self.on_drag_data_received)
         self.drag_motion_handler_id = self.view.editor.connect("drag-motion", self.on_drag_motion)
+        self.view.editor.connect("visible-area-changed", self._on_visible_area_changed)
 
         try:
             self.setup_canvas()
@@ -349,6 +355,8 @@ class GraphicalEditorController(ExtendedController):
 
         model = notification.model
         view = self.canvas.get_view_for_model(model)
+        if view is None:  # The content of the parent state is not shown, the meta data is applied once it is shown
+            return
 
         if meta_signal_message.change == 'show_content':
             library_state_m = model
@@ -356,7 +364,10 @@ class GraphicalEditorController(ExtendedController):
             if library_state_m.meta['gui']['show_content'] is not library_state_m.show_content():
                 logger.warning("The content of the LibraryState won't be shown, because "
                                "MAX_VISIBLE_LIBRARY_HIERARCHY is 1.")
-            if library_state_m.show_content():
+            if not library_state_v.content_populated:
+                # The library state is not visible, its content is added on demand
+                pass
+            elif library_state_m.show_content():
                 if not library_state_m.state_copy_initialized:
                     logger.warning("Show library content without initialized state copy does not work {0}"
                                    "".format(library_state_m))
@@ -378,6 +389,22 @@ class GraphicalEditorController(ExtendedController):
         self.canvas.request_update(view, matrix=True)
         self.canvas.wait_for_update()
 
+    @ExtendedController.observe("focus_signal", signal=True)
+    def focus_changed(self, selection_m, signal_name, info):
+        """Creates the view of a newly focused element, if the content of its parent states is not drawn, yet
+
+        :param rafcon.gui.models.selection.Selection selection_m: The selection of the state machine
+        :param str signal_name: Always "focus_signal"
+        :param info: Information containing the :class:`rafcon.gui.models.signals.FocusSignalMsg`
+        """
+        focus_m = info['arg'].new_focus
+        if focus_m is None or self.canvas.get_view_for_model(focus_m):
+            return
+        focused_item = self.add_parent_content_views_for_model(focus_m)
+        if focused_item:
+            self.canvas.wait_for_update()
+            self._move_focused_item_into_viewport(self.view.editor, focused_item)
+
     @ExtendedController.observe("ongoing_complex_actions", after=True)
     def update_of_ongoing_complex_actions(self, model, prop_name, info):
         # only once at the end of an complex action the ongoing complex actions dictionary is empty
@@ -385,6 +412,22 @@ class GraphicalEditorController(ExtendedController):
             action_name, action_dict = self.model.complex_action_observer.nested_action_already_in[-1]
             self.adapt_complex_action(action_dict['target'], action_dict['new'])
 
+    @ExtendedController.observe("state_execution_status_signal", signal=True)
+    def state_execution_status_changed(self, model, prop_name, info):
+        """Redraws the states, whose execution status changed since the last update
+
+        The signal is emitted at a limited rate with the latest changes of the execution status, replacing the
+        notification for each change of a state_execution_status.
+
+        :param rafcon.gui.models.state_machine.StateMachineModel model: The state machine model
+        :param str prop_name: The name of the signal
+        :param info: Information containing the :class:`rafcon.gui.models.signals.ExecutionStatusSignalMsg`
+        """
+        for state_m in info.arg.state_models:
+            state_v = self.canvas.get_view_for_model(state_m)
+            if state_v:  # Children of LibraryStates are only drawn, if the library content is shown
+                self.canvas.request_update(state_v, matrix=False)
+
     @ExtendedController.observe("state_machine", after=True)
     def state_machine_change_after(self, model, prop_name, info):
         """Called on any change within th state machine
@@ -424,6 +467,20 @@ class GraphicalEditorController(ExtendedController):
                     if not parent_library_root_state_m.parent.show_content():
                         return
 
+            # the views of the content of states are only created, if the states are visible, thus only react to the
+            # notification if the view of the changed element exists (changes of removed elements are handled below)
+            if method_name in ['add_state', 'add_transition', 'add_data_flow']:
+                state_v = self.canvas.get_view_for_model(model)
+                if not state_v or not state_v.content_populated:
+                    return
+            elif method_name in ['transition_change', 'data_flow_change']:
+                if not self.canvas.get_view_for_model(model):
+                    return
+            elif 'remove' not in method_name:
+                state_m = model if isinstance(model, AbstractStateModel) else getattr(model, 'parent', None)
+                if not self.canvas.get_view_for_model(state_m):
+                    return
+
             if method_name == 'state_execution_status':
                 state_v = self.canvas.get_view_for_model(model)
                 if state_v:  # Children of LibraryStates are not modeled, yet
@@ -638,6 +695,8 @@ class GraphicalEditorController(ExtendedController):
     @lock_state_machine
     def adapt_complex_action(self, old_state_m, new_state_m):
         old_state_v = self.canvas.get_view_for_model(old_state_m)
+        if old_state_v is None:  # The content of the parent state is not shown, the new view is created on demand
+            return
         parent_state_v = self.canvas.get_view_for_model(new_state_m.parent)
         old_state_v.remove()
 
@@ -720,7 +779,7 @@ class GraphicalEditorController(ExtendedController):
         :return:
         """
         state_machine_m = self.model
-        state_v = self.canvas.get_view_for_model(state_m)
+        state_v = self.add_parent_content_views_for_model(state_m)
         if state_v is None:
             logger.warning('There is no view for state model {0}'.format(state_m))
         self.move_item_into_viewport(state_v)
@@ -815,22 +874,45 @@ class GraphicalEditorController(ExtendedController):
             # Keep state within parent
             pass
 
-        if isinstance(state_m, LibraryStateModel) and state_m.show_content() and state_m.state_copy_initialized:
-            gui_helper_meta_data.scale_library_content(state_m)
-            self.add_state_view_for_model(state_m.state_copy, state_v, hierarchy_level=hierarchy_level + 1)
-
-        elif isinstance(state_m, ContainerStateModel):
-            num_child_state = 0
-
+        if isinstance(state_m, ContainerStateModel):
             for scoped_variable_m in state_m.scoped_variables:
                 state_v.add_scoped_variable(scoped_variable_m)
 
-            for child_state_m in state_m.states.values():
+        # The views of the content are only created for visible states, for all others they are created on demand
+        if self._has_content(state_m) and self._is_content_view_required(state_v):
+            self._add_content_views(state_v)
+
+        return state_v
+
+    @staticmethod
+    def _has_content(state_m):
+        return isinstance(state_m, (ContainerStateModel, LibraryStateModel))
+
+    @lock_state_machine
+    def _add_content_views(self, state_v):
+        """Creates the views of the content of a state
+
+        The content of a `ContainerState` are its child states, transitions and data flows, the content of a
+        `LibraryState` is its state copy, if the library content is shown. The views of the content are created
+        (recursively) by :meth:`add_state_view_for_model`, thus the content of child states is only added, if they are
+        visible.
+
+        :param StateView state_v: The view of the state, whose content is to be drawn
+        """
+        state_m = state_v.model
+        hierarchy_level = state_v.hierarchy_level
+        state_v.content_populated = True
+
+        if isinstance(state_m, LibraryStateModel):
+            if state_m.show_content() and state_m.state_copy_initialized:
+                gui_helper_meta_data.scale_library_content(state_m)
+                self.add_state_view_for_model(state_m.state_copy, state_v, hierarchy_level=hierarchy_level + 1)
+
+        elif isinstance(state_m, ContainerStateModel):
+            for num_child_state, child_state_m in enumerate(state_m.states.values()):
                 # generate optional meta data for child state - not used if valid meta data already in child state model
                 child_rel_pos, child_size = gui_helper_meta_data.generate_default_state_meta_data(state_m, self.canvas,
                                                                                                   num_child_state)
-                num_child_state += 1
-
                 self.add_state_view_for_model(child_state_m, state_v, child_rel_pos, child_size, hierarchy_level + 1)
 
             for transition_m in state_m.transitions:
@@ -839,7 +921,124 @@ class GraphicalEditorController(ExtendedController):
             for data_flow_m in state_m.data_flows:
                 self.add_data_flow_view_for_model(data_flow_m, state_m)
 
-        return state_v
+    @lock_state_machine
+    def _remove_content_views(self, state_v):
+        """Removes the views of the content of a state, see :meth:`_add_content_views`
+
+        :param StateView state_v: The view of the state, whose content is to be removed
+        """
+        children = self.canvas.get_children(state_v)
+        connection_views = [child for child in children if isinstance(child, (TransitionView, DataFlowView))]
+        state_views = [child for child in children if isinstance(child, StateView)]
+        for child_v in connection_views + state_views:
+            child_v.remove()
+        state_v.content_populated = False
+        self.canvas.request_update(state_v, matrix=False)
+
+    def _populate_content_views(self, state_v):
+        """Creates the views of the content of a state and stores meta data generated for the content
+
+        :param StateView state_v: The view of the state, whose content is to be drawn
+        """
+        state_m = state_v.model
+        hash_before = state_m.meta_data_hash()
+        self._add_content_views(state_v)
+        if hash_before.digest() != state_m.meta_data_hash().digest():
+            self._meta_data_changed(None, state_m, 'append_to_last_change', True)
+
+    def _is_content_view_required(self, state_v, keep=False):
+        """Checks whether the content of a state is to be drawn
+
+        The content of a state is drawn, if the state is at least GAPHAS_EDITOR_CONTENT_MIN_SIZE pixels large and
+        lies within the visible area of the editor. For already drawn content, only half of the size is required and a
+        larger margin around the visible area is used, so that the views are not removed and created repeatedly.
+
+        :param StateView state_v: The view of the state
+        :param bool keep: Whether the content is already drawn
+        :return: Whether the views of the content of the state are required
+        :rtype: bool
+        """
+        min_size = rafcon.gui.singleton.global_gui_config.get_config_value('GAPHAS_EDITOR_CONTENT_MIN_SIZE', 0)
+        if not min_size:
+            return True
+        if keep:
+            min_size /= 2.
+            margin = gui_constants.CONTENT_VIEW_REMOVAL_MARGIN
+        else:
+            margin = gui_constants.CONTENT_VIEW_CREATION_MARGIN
+
+        editor = self.view.editor
+        x, y, width, height = editor.get_item_area(state_v)
+        if min(width, height) < min_size:
+            return False
+        # The visible area is not known before the editor is shown
+        if editor.get_allocation().width <= 1 or editor.get_allocation().height <= 1:
+            return True
+        area_x, area_y, area_width, area_height = editor.get_visible_area(margin)
+        return x < area_x + area_width and area_x < x + width and y < area_y + area_height and area_y < y + height
+
+    def _on_visible_area_changed(self, view):
+        """Schedules the update of the content views, once the visible area has not changed for a short time"""
+        if self._content_views_update_id is not None:
+            GLib.source_remove(self._content_views_update_id)
+        self._content_views_update_id = GLib.timeout_add(gui_constants.CONTENT_VIEW_UPDATE_DELAY,
+                                                         self._update_content_views)
+
+    def _update_content_views(self):
+        """Creates the views of the content of visible states and removes those of states far outside the view
+
+        The content of states containing selected or focused items is never removed.
+        """
+        self._content_views_update_id = None
+        if self.model.ongoing_complex_actions:
+            self._on_visible_area_changed(self.view.editor)
+            return False
+
+        kept_state_views = set()
+        for item in self.view.editor.selected_items | {self.view.editor.focused_item}:
+            while item is not None:
+                kept_state_views.add(item)
+                item = self.canvas.get_parent(item)
+
+        root_state_v = self.canvas.get_view_for_model(self.root_state_m)
+        if root_state_v:
+            self._update_content_views_of_state(root_state_v, kept_state_views)
+        return False
+
+    def _update_content_views_of_state(self, state_v, kept_state_views):
+        if not self._has_content(state_v.model):
+            return
+        if not state_v.content_populated:
+            if self._is_content_view_required(state_v):
+                self._populate_content_views(state_v)
+        elif state_v not in kept_state_views and not self._is_content_view_required(state_v, keep=True):
+            self._remove_content_views(state_v)
+        else:
+            for child_state_v in list(state_v.child_state_views()):
+                self._update_content_views_of_state(child_state_v, kept_state_views)
+
+    def add_parent_content_views_for_model(self, model):
+        """Creates the views of the content of all states containing the given model
+
+        :param model: The model of a state, a state element or a connection
+        :return: The view of the model or None, if it is not drawn (e.g. within a library, whose content is hidden)
+        """
+        if isinstance(model, (TransitionModel, DataFlowModel)):
+            parent_state_m = model.parent
+        else:
+            state_m = model if isinstance(model, AbstractStateModel) else model.parent
+            parent_state_m = state_m.parent if state_m else None
+        parent_state_models = []
+        while parent_state_m is not None:
+            parent_state_models.insert(0, parent_state_m)
+            parent_state_m = parent_state_m.parent
+        for parent_state_m in parent_state_models:
+            parent_state_v = self.canvas.get_view_for_model(parent_state_m)
+            if parent_state_v is None:
+                return None
+            if not parent_state_v.content_populated:
+                self._populate_content_views(parent_state_v)
+        return self.canvas.get_view_for_model(model)
 
     @lock_state_machine
     def add_transition_view_for_model(self, transition_m, parent_state_m):
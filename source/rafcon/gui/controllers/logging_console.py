@@ -10,9 +10,9 @@
 # Rico Belder <rico.belder@dlr.de>
 
 from gi.repository import Gtk
-import threading
+from gi.repository import GLib
 
-from rafcon.gui.utils import wait_for_gui, constants
+from rafcon.gui.utils import constants
 from rafcon.gui.helpers.label import create_menu_item
 from rafcon.gui.models.config_model import ConfigModel
 from rafcon.gui.views.logging_console import LoggingConsoleView
@@ -33,14 +33,18 @@ class LoggingConsoleController(ExtendedController):
         assert isinstance(view, LoggingConsoleView)
         super(LoggingConsoleController, self).__init__(model, view)
 
-        self._lock = threading.Lock()
-        self._log_entries = []
+        self._log_entries = log_helpers.LogEntryBuffer(
+            self.model.config.get_config_value('LOGGING_CONSOLE_BUFFER_SIZE', 100000))
+        self._max_lines = self.model.config.get_config_value('LOGGING_CONSOLE_MAX_LINES', 5000)
+        # Whether the view shows the latest entries, otherwise older entries are shown and new ones are not printed
+        self._shows_latest_entries = True
         self._enables = self._get_config_enables()
         log_helpers.LoggingViewHandler.add_logging_view('main', self)
 
     def register_view(self, view):
         super(LoggingConsoleController, self).register_view(view)
         view.text_view.connect('populate_popup', self.add_clear_menu_item)
+        view['scrollable'].get_vadjustment().connect('value-changed', self._on_scroll)
         self.view.set_enables(self._enables)
         self.update_filtered_buffer()
 
@@ -49,40 +53,88 @@ class LoggingConsoleController(ExtendedController):
         log_helpers.LoggingViewHandler.remove_logging_view('main')
         super(LoggingConsoleController, self).destroy()
 
-    def print_message(self, message, log_level, new=True):
+    def print_message(self, message, log_level):
+        """Stores a new log entry and triggers printing it, can be called from any thread
+
+        The entry is not printed directly. Instead, a single idle callback is scheduled for all entries logged until
+        the GUI thread gets to print them, which then prints the entries in chunks.
+        """
         if self.view is None:
             return
-        # Store all new log entries
-        if new:
-            with self._lock:
-                self._log_entries.append((log_level, message))
-        self.view.print_message(message, log_level)
+        if self._log_entries.append(log_level, message):
+            GLib.idle_add(self._print_new_entries, priority=self.view.logging_priority)
+
+    def _print_new_entries(self):
+        """Prints a chunk of new log entries
+
+        :return: True, if there are further new entries, so that the callback is called again
+        :rtype: bool
+        """
+        if self.view is None or self.view.quit_flag:
+            return False
+        entries = self._log_entries.fetch_new_entries(constants.LOGGING_CONSOLE_CHUNK_SIZE)
+        if self._shows_latest_entries:
+            last_shown_entry_id = self.view.last_shown_entry_id
+            self.view.append_entries([entry for entry in entries if self._is_entry_enabled(entry) and
+                                      (last_shown_entry_id is None or entry.entry_id > last_shown_entry_id)],
+                                     self._max_lines)
+        return self._log_entries.has_new_entries()
+
+    def _is_entry_enabled(self, entry):
+        return self._enables.get(LoggingConsoleView.get_log_level_name(entry.log_level), True)
 
     def print_filtered_buffer(self):
+        """Prints the latest log entries matching the current filter settings"""
         # remember cursor position
         self.view.store_cursor_position()
 
         # update text buffer
         self.view.clean_buffer()
-
-        for entry in self._log_entries:
-            level = entry[0]
-            message = entry[1]
-            self.print_message(message, level, new=False)
+        self._shows_latest_entries = True
+        self.view.append_entries(self._log_entries.get_entries(self._is_entry_enabled, max_count=self._max_lines),
+                                 self._max_lines)
 
         # restore cursor position
-        wait_for_gui()
         self.view.restore_cursor_position()
 
         self.view.scroll_to_cursor_onscreen()
 
+    def _on_scroll(self, adjustment):
+        """Loads older or newer log entries into the view, if it was scrolled to the top or bottom
+
+        The text buffer holds only a window of at most `LOGGING_CONSOLE_MAX_LINES` lines of the stored log entries.
+        If the user scrolls to the top, the window is moved to older entries, if the user scrolls to the bottom, to newer
+        ones. While the window does not contain the latest entries, new entries are not printed.
+        """
+        if self.view is None or self._enables['CONSOLE_FOLLOW_LOGGING']:
+            return
+        value = adjustment.get_value()
+        if value <= adjustment.get_lower():
+            first_shown_entry_id = self.view.first_shown_entry_id
+            if first_shown_entry_id is None:
+                return
+            entries = self._log_entries.get_entries(self._is_entry_enabled, before_id=first_shown_entry_id,
+                                                    max_count=constants.LOGGING_CONSOLE_CHUNK_SIZE)
+            if entries:
+                last_shown_entry_id = self.view.last_shown_entry_id
+                self.view.prepend_entries(entries, self._max_lines)
+                if self.view.last_shown_entry_id != last_shown_entry_id:
+                    self._shows_latest_entries = False
+        elif not self._shows_latest_entries and \
+                value + adjustment.get_page_size() >= adjustment.get_upper():
+            entries = self._log_entries.get_entries(self._is_entry_enabled, after_id=self.view.last_shown_entry_id,
+                                                    max_count=constants.LOGGING_CONSOLE_CHUNK_SIZE)
+            if len(entries) < constants.LOGGING_CONSOLE_CHUNK_SIZE:
+                self._shows_latest_entries = True
+            self.view.append_entries(entries, self._max_lines)
+
     def update_filtered_buffer(self):
         if self.view is None:
             return
         self.print_filtered_buffer()
 
     def _clear_buffer(self, widget, data=None):
-        self._log_entries = []
+        self._log_entries.clear()
         self.print_filtered_buffer()
 
     def add_clear_menu_item(self, widget, menu):
@@ -113,7 +165,7 @@ class LoggingConsoleController(ExtendedController):
 
             self._enables = current_enables
             self.view.set_enables(self._enables)
-            if filtered_buffer_update_needed:
+            if filtered_buffer_update_needed or not self._shows_latest_entries:
                 self.update_filtered_buffer()
             else:
                 self.view.scroll_to_cursor_onscreen()
@@ -160,6 +160,11 @@ class MainWindowController(ExtendedController):
         self.execution_ticker_ctrl = ExecutionTickerController(self.state_machine_execution_model, None)
         self.add_controller('execution_ticker_ctrl', self.execution_ticker_ctrl)
 
+        # execution status changes of states are forwarded coalesced at a limited rate
+        execution_status_update_rate = gui_config.get_config_value("EXECUTION_STATUS_UPDATE_RATE", 30)
+        if execution_status_update_rate:
+            state_machine_manager_model.start_execution_status_updates(execution_status_update_rate)
+
         ######################################################
         # menu bar
         ######################################################
@@ -693,6 +698,7 @@ class MainWindowController(ExtendedController):
         
         # state-editor will relieve it's model => it won't observe the state machine manager any more
         self.get_controller('states_editor_ctrl').prepare_destruction()  # avoid new state editor TODO tbd (deleted)
+        self.model.stop_execution_status_updates()
         rafcon.core.singleton.state_machine_manager.delete_all_state_machines()
         rafcon.core.singleton.library_manager.prepare_destruction()
 
@@ -1,10 +1,34 @@
 #!/usr/bin/env python
 # Example 1: execution_log_viewer.py your_execution_log.shelve xxxxxxx.run_id.00000000000000000003
 # Example 2: rafcon_execution_log_viewer your_execution_log.shelve xxxxxxx.run_id.00000000000000000003
+# Example 3: rafcon_execution_log_viewer your_execution_log.binlog --state-path Root/Start --start-time "2020-01-01 02:00"
 from rafcon.gui.views.utils.single_widget_window import SingleWidgetWindowView
 from rafcon.gui.views.execution_log_viewer import ExecutionLogTreeView
 from rafcon.gui.controllers.utils.single_widget_window import SingleWidgetWindowController
 from rafcon.gui.controllers.execution_log_viewer import ExecutionLogTreeController
+from rafcon.utils.execution_log import ExecutionLogFilter
+
+
+def parse_time(time_string):
+    """Parse a time given as seconds since the epoch or as local date and time
+
+    :param str time_string: the time or None
+    :return: the time in seconds since the epoch or None
+    :rtype: float
+    """
+    if time_string is None:
+        return None
+    try:
+        return float(time_string)
+    except ValueError:
+        pass
+    import time
+    for time_format in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M'):
+        try:
+            return time.mktime(time.strptime(time_string, time_format))
+        except ValueError:
+            pass
+    raise ValueError("Invalid time: {0}".format(time_string))
 
 
 def main():
@@ -13,15 +37,28 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("file", help="path to the log file")
     parser.add_argument("run_id", help="optional run_id of history item to select", default=None, nargs='?')
+    parser.add_argument("--state-path", help="only list the executions of the state with this path (by ids or "
+                                             "names) and of its descendants", default=None)
+    parser.add_argument("--start-time", help="only list state executions started after this time "
+                                             "(seconds since the epoch or YYYY-MM-DD HH:MM[:SS])", default=None)
+    parser.add_argument("--end-time", help="only list state executions started before this time", default=None)
     args = parser.parse_args()
 
+    item_filter = None
+    if args.state_path or args.start_time or args.end_time:
+        time_window = None
+        if args.start_time or args.end_time:
+            time_window = (parse_time(args.start_time), parse_time(args.end_time))
+        item_filter = ExecutionLogFilter(state_path=args.state_path, time_window=time_window)
+
     # single widget window generation with respective size and title
     single_view = SingleWidgetWindowView(ExecutionLogTreeView, 1024, 786, "Execution Log Viewer")
     single_view.top = 'execution_log_paned'
     single_view['execution_log_paned'] = single_view.widget_view['execution_log_paned']
 
     model = []  # use a not None model to avoid AssertionError in register_adapters methods
-    log_tree_ctrl = SingleWidgetWindowController(model, single_view, ExecutionLogTreeController, args.file, args.run_id)
+    log_tree_ctrl = SingleWidgetWindowController(model, single_view, ExecutionLogTreeController, args.file, args.run_id,
+                                                 item_filter)
 
     # log_tree_ctrl = SingleWidgetWindowController(None, single_view, ExecutionLogTreeController, file, run_id)
 
@@ -513,7 +513,7 @@ class AbstractStateModel(MetaModel, Hashable):
             # print("nothing to parse", tmp_meta)
             return False
 
-    def store_meta_data(self, copy_path=None):
+    def store_meta_data(self, copy_path=None, compact=False):
         """Save meta data of state model to the file system
 
         This method generates a dictionary of the meta data of the state together with the meta data of all state
@@ -526,6 +526,7 @@ class AbstractStateModel(MetaModel, Hashable):
         Dues the core elements of the state machine has to be stored first.
 
         :param str copy_path: Optional copy path if meta data is not stored to the file system path of state machine
+        :param bool compact: Whether to write compact json, e.g. for auto-backups
         """
         if copy_path:
             meta_file_path_json = os.path.join(copy_path, self.state.get_storage_path(), storage.FILE_NAME_META_DATA)
@@ -535,9 +536,17 @@ class AbstractStateModel(MetaModel, Hashable):
                              "respective state was stored and a file system path is set.".format(self))
                 return
             meta_file_path_json = os.path.join(self.state.file_system_path, storage.FILE_NAME_META_DATA)
+        storage_utils.write_dict_to_json(self.get_meta_data_for_storage(), meta_file_path_json, compact)
+
+    def get_meta_data_for_storage(self):
+        """Returns the meta data of the state together with the meta data of all state elements, as it is stored
+
+        :return: the meta data, as stored in the meta data file of the state
+        :rtype: Vividict
+        """
         meta_data = deepcopy(self.meta)
         self._generate_element_meta_data(meta_data)
-        storage_utils.write_dict_to_json(meta_data, meta_file_path_json)
+        return meta_data
 
     def copy_meta_data_from_state_m(self, source_state_m):
         """Dismiss current meta data and copy meta data from given state model
@@ -337,6 +337,8 @@ class AutoBackupModel(ModelMT):
         self.cancel_timed_thread()
         if not core_singletons.shut_down_signal:
             self.clean_lock_file(True)
+        if self._tmp_storage_path is not None:
+            storage.forget_stored_files(self._tmp_storage_path)
 
     def prepare_destruction(self):
         """Prepares the model for destruction
@@ -472,10 +474,12 @@ class AutoBackupModel(ModelMT):
             sm = self.state_machine_model.state_machine
             logger.debug('Performing auto backup of state machine {} to temp folder'.format(sm.state_machine_id))
             self.update_tmp_storage_path()
-            storage.save_state_machine_to_path(sm, self._tmp_storage_path, delete_old_state_machine=True, as_copy=True)
+            # auto-backups are machine-generated copies, so the faster compact json format is sufficient
+            storage.save_state_machine_to_path(sm, self._tmp_storage_path, delete_old_state_machine=True, as_copy=True,
+                                               compact=True)
             self.update_last_backup_meta_data()
             self.write_backup_meta_data()
-            self.state_machine_model.store_meta_data(copy_path=self._tmp_storage_path)
+            self.state_machine_model.store_meta_data(copy_path=self._tmp_storage_path, compact=True)
             self.last_backup_time = time.time()  # used as 'last-backup' time
             with self.timer_request_lock:
                 self._timer_request_time = None
@@ -31,7 +31,8 @@ from gtkmvc3.observable import Observable
 
 from rafcon.gui.action import ActionDummy, Action, StateMachineAction, StateAction, DataPortAction, \
     ScopedVariableAction, OutcomeAction, TransitionAction, DataFlowAction, AddObjectAction, RemoveObjectAction, \
-    MetaDataAction, get_state_element_meta, StateImage
+    MetaDataAction, StateElementAction, StateImage, StateImageStore
+from rafcon.gui.config import global_gui_config
 from rafcon.gui.models.signals import ActionSignalMsg
 
 from rafcon.core.states.state import State
@@ -40,6 +41,7 @@ from rafcon.core.state_elements.data_flow import DataFlow
 from rafcon.core.state_elements.data_port import DataPort, InputDataPort
 from rafcon.core.state_elements.logical_port import Outcome
 from rafcon.core.state_elements.scope import ScopedVariable
+from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.state_elements.transition import Transition
 
 from rafcon.gui.models.abstract_state import AbstractStateModel
@@ -68,6 +70,8 @@ class ModificationsHistoryModel(ModelMT):
         assert isinstance(state_machine_model, StateMachineModel)
         self.state_machine_model = state_machine_model
         self.__state_machine_id = state_machine_model.state_machine.state_machine_id
+        # shares the unchanged parts of the state images of all actions
+        self.image_store = StateImageStore()
         self._tmp_meta_storage = None
         self.tmp_meta_storage = self.get_root_state_element_meta()
 
@@ -80,7 +84,7 @@ class ModificationsHistoryModel(ModelMT):
         self.busy = False
         self.count_before = 0
 
-        self.modifications = ModificationsHistory()
+        self.modifications = ModificationsHistory(max_bytes=self._get_max_bytes_config_value())
         self.change_count = 0
 
         self.fake = False
@@ -107,8 +111,49 @@ class ModificationsHistoryModel(ModelMT):
     def tmp_meta_storage(self, value):
         self._tmp_meta_storage = value
 
+    @staticmethod
+    def _get_max_bytes_config_value():
+        value = global_gui_config.get_config_value("HISTORY_MAX_BYTES", None)
+        # None is read as string from the config file
+        if value is None or value == "None":
+            return None
+        return int(value)
+
     def get_root_state_element_meta(self):
-        return get_state_element_meta(self.state_machine_model.root_state)
+        return self.image_store.get_state_element_meta(self.state_machine_model.root_state)
+
+    def _invalidate_state_images(self, overview):
+        """Marks the cached images of the states changed by a core modification as outdated
+
+        Besides the state owning the changed element, also its parent is invalidated, as modifications of a state can
+        modify connections of the parent.
+
+        :param rafcon.gui.utils.notification_overview.NotificationOverview overview: The overview of the modification
+        """
+        core_element = overview.get_affected_core_element()
+        state = core_element.parent if isinstance(core_element, StateElement) else core_element
+        if not isinstance(state, State):
+            self.image_store.invalidate()
+            return
+        self.image_store.invalidate(state)
+        if isinstance(state.parent, State):
+            self.image_store.invalidate(state.parent)
+
+    def _invalidate_state_images_of_action(self, action):
+        """Marks the cached meta data of the states modified by undoing or redoing an action as outdated
+
+        The meta data is inserted without notifications, while core modifications are notified.
+
+        :param rafcon.gui.action.AbstractAction action: The undone or redone action
+        """
+        if isinstance(action, StateElementAction):  # modifies no meta data
+            return
+        if isinstance(action, (Action, MetaDataAction)) and not isinstance(action, StateMachineAction):
+            state = self.state_machine_model.state_machine.get_state_by_path(action.parent_path, as_check=True)
+            if state is not None:
+                self.image_store.invalidate(state, core=False, recursive=True)
+                return
+        self.image_store.invalidate(core=False)
 
     def update_internal_tmp_storage(self):
         if self.check_gaphas_consistency:
@@ -156,6 +201,7 @@ class ModificationsHistoryModel(ModelMT):
             self.busy = True
             self.modifications.go_to_history_element(target_history_id)
             self.busy = False
+            self.image_store.invalidate(core=False)
 
             self._re_initiate_observation()
             self.update_internal_tmp_storage()
@@ -167,6 +213,7 @@ class ModificationsHistoryModel(ModelMT):
             self.busy = True
             self.modifications.undo()
             self.busy = False
+            self._invalidate_state_images_of_action(action)
             if isinstance(action, StateMachineAction):
                 self._re_initiate_observation()
             self.update_internal_tmp_storage()
@@ -180,6 +227,8 @@ class ModificationsHistoryModel(ModelMT):
             self.busy = True
             self.modifications.redo()
             self.busy = False
+            if action is not None:
+                self._invalidate_state_images_of_action(action)
             if isinstance(action, StateMachineAction):
                 self._re_initiate_observation()
             self.update_internal_tmp_storage()
@@ -360,9 +409,18 @@ class ModificationsHistoryModel(ModelMT):
 
     @ModelMT.observe("state_meta_signal", signal=True)  # meta data of root_state_model changed
     def meta_changed_notify_after(self, changed_model, prop_name, info):
+        overview = NotificationOverview(info)
+        affected_model = overview.get_affected_model()
+        affected_state_m = affected_model if isinstance(affected_model, AbstractStateModel) else \
+            getattr(affected_model, 'parent', None)
+        if isinstance(affected_state_m, AbstractStateModel):
+            self.image_store.invalidate(affected_state_m.state, core=False,
+                                        recursive=overview.get_signal_message().affects_children)
+        else:
+            self.image_store.invalidate(core=False)
+
         if not self.with_meta_data_actions:
             return
-        overview = NotificationOverview(info)
         if self.busy:
             return
         if overview.get_signal_message().origin == 'load_meta_data':
@@ -375,7 +433,7 @@ class ModificationsHistoryModel(ModelMT):
                 overview.get_signal_message().change in ['append_to_last_change'] or \
                 overview.get_signal_message().origin in ['group_states', 'ungroup_state', 'substitute_state']:
             # update last actions after_state_image -> meta-data
-            self.active_action.after_state_image = self.active_action.get_state_image()
+            self.active_action.after_state_image = self.active_action.create_state_image()
             self.update_internal_tmp_storage()
         else:
             if isinstance(overview.get_affected_model(), AbstractStateModel):
@@ -443,6 +501,10 @@ class ModificationsHistoryModel(ModelMT):
 
     @ModelMT.observe("action_signal", signal=True)
     def action_signal_after_complex_action(self, model, prop_name, info):
+        # the meta data of the models created by complex actions is set without notifications
+        if isinstance(info['arg'], ActionSignalMsg) and info['arg'].after and info['arg'].action != 'undo/redo' and \
+                isinstance(info['arg'].action_parent_m, AbstractStateModel):
+            self.image_store.invalidate(info['arg'].action_parent_m.state, core=False, recursive=True)
         if self.busy:  # if proceeding undo or redo
             return
         if isinstance(model, AbstractStateModel) and isinstance(info['arg'], ActionSignalMsg) and \
@@ -508,17 +570,21 @@ class ModificationsHistoryModel(ModelMT):
         :param prop_name: The property that was changed
         :param info: Information about the change
         """
-        if self.busy or info.method_name == 'state_change' and \
+        if info.method_name == 'state_change' and \
                 info.kwargs.prop_name == 'state' and \
                 info.kwargs.method_name in BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS:
             return
-        else:
-            # avoid to vast computation time
-            if 'kwargs' in info and 'method_name' in info['kwargs'] and \
-                    info['kwargs']['method_name'] in BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS:
-                return
+        # avoid to vast computation time
+        if 'kwargs' in info and 'method_name' in info['kwargs'] and \
+                info['kwargs']['method_name'] in BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS:
+            return
 
-            overview = NotificationOverview(info)
+        # the cached state images are also outdated by the modifications of undo and redo
+        overview = NotificationOverview(info)
+        self._invalidate_state_images(overview)
+        if self.busy:
+            return
+        else:
 
             # handle interrupts of action caused by exceptions
             if overview.get_result() == "CRASH in FUNCTION" or isinstance(overview.get_result(), Exception):
@@ -589,11 +655,15 @@ class ModificationsHistoryModel(ModelMT):
         :param info: Information about the change
         """
         # execution_status-changes are not observed
-        if self.busy or info.method_name in BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS:
+        if info.method_name in BY_EXECUTION_TRIGGERED_OBSERVABLE_STATE_METHODS:
             return
-        else:
-            overview = NotificationOverview(info)
 
+        # the cached state images are also outdated by the modifications of undo and redo
+        overview = NotificationOverview(info)
+        self._invalidate_state_images(overview)
+        if self.busy:
+            return
+        else:
             # handle interrupts of action caused by exceptions
             if overview.get_result() == "CRASH in FUNCTION" or isinstance(overview.get_result(), Exception):
                 if self.count_before == 1:
@@ -672,6 +742,16 @@ class HistoryTreeElement(object):
     def old_next_ids(self):
         return self._old_next_ids
 
+    def remove_next_id(self, next_id):
+        """Removes the link to a next element, which is either the current next element or in the old next ids
+
+        :param int next_id: The history_id of the removed next element
+        """
+        if self.__next_id == next_id:
+            self.__next_id = None
+        elif next_id in self._old_next_ids:
+            self._old_next_ids.remove(next_id)
+
 
 class ModificationsHistory(Observable):
     """The Class holds a all time history and a trail history. The trail history holds directly all modifications made
@@ -685,11 +765,19 @@ class ModificationsHistory(Observable):
     change that was insert for debugging reasons.
     - the pointer are pointing on the next undo ... so redo is pointer + 1
     - all_actions is a type of a tree # prev_id, action, next_id, old_next_ids
+
+    If a maximal size is given, the oldest actions are evicted, whenever the estimated size of all actions exceeds it.
+    Evicted actions are removed from the all time history, the history ids of the remaining actions do not change.
+
+    :param int max_bytes: The maximal estimated memory size of all actions in bytes, None means no limit
     """
 
-    def __init__(self):
+    def __init__(self, max_bytes=None):
         Observable.__init__(self)
-        self._full_history = []
+        self.max_bytes = max_bytes
+        self._full_history = {}
+        self._next_history_id = 0
+        self._estimated_size = 0
         self._current_history_element = None
 
         # insert initial dummy element
@@ -703,9 +791,18 @@ class ModificationsHistory(Observable):
         return self._current_history_element
 
     def prepare_destruction(self):
-        for tree_element in self._full_history:
+        for tree_element in self._full_history.values():
             tree_element.prepare_destruction()
-        del self._full_history[:]
+        self._full_history.clear()
+        self._estimated_size = 0
+
+    def get_estimated_size(self):
+        """Returns the estimated memory size of all actions in bytes
+
+        :return: the estimated size of all actions
+        :rtype: int
+        """
+        return self._estimated_size
 
     def is_undo_possible(self):
         return self.current_history_element.prev_id is not None
@@ -714,7 +811,13 @@ class ModificationsHistory(Observable):
         return self.current_history_element.next_id is not None
 
     def get_element_for_history_id(self, history_id):
-        return self._full_history[history_id]
+        """Returns the element of the all time history with the given history_id
+
+        :param int history_id: The history_id of the element
+        :return: the element or None, if the element was evicted
+        :rtype: HistoryTreeElement
+        """
+        return self._full_history.get(history_id)
 
     def get_next_element(self, for_history_element=None):
         for_history_element = for_history_element or self.current_history_element
@@ -734,8 +837,10 @@ class ModificationsHistory(Observable):
         prev_id = None if not self.current_history_element else self.current_history_element.history_id
 
         self._current_history_element = HistoryTreeElement(prev_id=prev_id, action=action)
-        self._current_history_element.history_id = len(self._full_history)
-        self._full_history.append(self.current_history_element)
+        self._current_history_element.history_id = self._next_history_id
+        self._next_history_id += 1
+        self._full_history[self._current_history_element.history_id] = self.current_history_element
+        self._estimated_size += action.estimated_size
 
         # set pointer of previous element
         if prev_id is not None:
@@ -745,6 +850,54 @@ class ModificationsHistory(Observable):
             if not prev_old_next_ids == prev_tree_elem.old_next_ids:
                 logger.verbose("This action has created a new branch in the state machine modification-history")
 
+        self._limit_size()
+
+    def _limit_size(self):
+        """Evicts the oldest actions while the estimated size of all actions exceeds the maximal size
+
+        First, the branches, which are not part of the current branch, are evicted beginning with the oldest branch.
+        Then, the oldest executed actions are evicted, whereby the current action is always kept.
+        """
+        if self.max_bytes is None or self._estimated_size <= self.max_bytes:
+            return
+
+        branches = [(branch_id, tree_element.history_id) for tree_element in self._full_history.values()
+                    for branch_id in tree_element.old_next_ids]
+        for branch_id, prev_id in sorted(branches):
+            if self._estimated_size <= self.max_bytes:
+                return
+            # the branch might have been evicted as part of an older branch
+            if prev_id in self._full_history:
+                self._full_history[prev_id].remove_next_id(branch_id)
+                self._evict_branch(branch_id)
+
+        initial_element = self._full_history[0]
+        while self._estimated_size > self.max_bytes and initial_element is not self.current_history_element:
+            oldest_element = self.get_next_element(initial_element)
+            if oldest_element is self.current_history_element:
+                break
+            # the initial element takes over the position of the evicted action
+            initial_element.remove_next_id(oldest_element.history_id)
+            for branch_id in list(oldest_element.old_next_ids):
+                self._evict_branch(branch_id)
+            initial_element.next_id = oldest_element.next_id
+            self.get_next_element(initial_element).prev_id = initial_element.history_id
+            self._evict_element(oldest_element)
+
+    def _evict_element(self, tree_element):
+        del self._full_history[tree_element.history_id]
+        self._estimated_size -= tree_element.action.estimated_size
+        tree_element.prepare_destruction()
+
+    def _evict_branch(self, history_id):
+        history_ids = [history_id]
+        while history_ids:
+            tree_element = self._full_history[history_ids.pop()]
+            if tree_element.next_id is not None:
+                history_ids.append(tree_element.next_id)
+            history_ids.extend(tree_element.old_next_ids)
+            self._evict_element(tree_element)
+
     @Observable.observed
     def undo(self):
         if not self.is_undo_possible():
@@ -798,7 +951,7 @@ class ModificationsHistory(Observable):
         return current_branch_history_ids
 
     def get_history_path_from_current_to_target_history_id(self, target_history_id):
-        if not (0 <= target_history_id < len(self._full_history)):
+        if target_history_id not in self._full_history:
             raise ValueError("target_history_id does not exist")
         undo_history_ids = []
         redo_history_ids = []
@@ -821,7 +974,9 @@ class ModificationsHistory(Observable):
 
     @Observable.observed
     def reset(self):
-        self._full_history = []
+        self._full_history = {}
+        self._next_history_id = 0
+        self._estimated_size = 0
         self._current_history_element = None
 
         # insert initial dummy element
@@ -15,6 +15,7 @@
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
 import os
+import posixpath
 import threading
 from copy import copy, deepcopy
 
@@ -25,7 +26,7 @@ from gtkmvc3.observer import Observer
 from rafcon.core.state_machine import StateMachine
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.states.library_state import LibraryState
-from rafcon.core.storage import storage
+from rafcon.core.storage import container, storage
 from rafcon.gui.config import global_gui_config
 from rafcon.gui.models.meta import MetaModel
 from rafcon.gui.models import ContainerStateModel, AbstractStateModel, StateModel, LibraryStateModel
@@ -61,11 +62,13 @@ class StateMachineModel(MetaModel, Hashable):
     state_action_signal = Signal()
     sm_selection_changed_signal = Signal()
     destruction_signal = Signal()
+    state_execution_status_signal = Signal()
 
     suppress_new_root_state_model_one_time = False
 
     __observables__ = ("state_machine", "root_state", "meta_signal", "state_meta_signal", "sm_selection_changed_signal",
-                       "action_signal", "state_action_signal", "destruction_signal", "ongoing_complex_actions")
+                       "action_signal", "state_action_signal", "destruction_signal", "ongoing_complex_actions",
+                       "state_execution_status_signal")
 
     @measure_time
     def __init__(self, state_machine, meta=None, load_meta_data=True):
@@ -100,6 +103,8 @@ class StateMachineModel(MetaModel, Hashable):
         self.state_action_signal = Signal()
         self.sm_selection_changed_signal = Signal()
         self.destruction_signal = Signal()
+        # emitted with the models of the states, whose execution status changed, if the execution status buffer is used
+        self.state_execution_status_signal = Signal()
 
         self.temp = Vividict()
 
@@ -381,21 +386,46 @@ class StateMachineModel(MetaModel, Hashable):
             self.meta = tmp_meta
             self.meta_signal.emit(MetaSignalMsg("load_meta_data", "all", True))
 
-    def store_meta_data(self, copy_path=None):
+    def store_meta_data(self, copy_path=None, compact=False):
         """Save meta data of the state machine model to the file system
 
         This method generates a dictionary of the meta data of the state machine and stores it on the filesystem.
 
         :param str copy_path: Optional, if the path is specified, it will be used instead of the file system path
+        :param bool compact: Whether to write compact json files, e.g. for auto-backups
         """
-        if copy_path:
-            meta_file_json = os.path.join(copy_path, storage.FILE_NAME_META_DATA)
-        else:
-            meta_file_json = os.path.join(self.state_machine.file_system_path, storage.FILE_NAME_META_DATA)
+        path = copy_path if copy_path else self.state_machine.file_system_path
+        if container.is_container(path):
+            self._store_meta_data_in_container(path, compact)
+            return
+
+        meta_file_json = os.path.join(path, storage.FILE_NAME_META_DATA)
+        storage_utils.write_dict_to_json(self.meta, meta_file_json, compact)
 
-        storage_utils.write_dict_to_json(self.meta, meta_file_json)
+        self.root_state.store_meta_data(copy_path, compact)
 
-        self.root_state.store_meta_data(copy_path)
+    def _store_meta_data_in_container(self, container_path, compact=False):
+        """Stores the meta data of the state machine model and of all state models in a state machine container
+
+        The meta data files are placed in the folders of the states listed in the index of the container, which is
+        written when saving the state machine. All files are written at once, as the container is rewritten.
+
+        :param str container_path: the path of the container
+        :param bool compact: Whether to write compact json files
+        """
+        index = container.read_index(container_path)
+        files = {storage.FILE_NAME_META_DATA: storage_utils.dump_objects_to_json_string(self.meta, compact)}
+        state_models = [self.root_state]
+        while state_models:
+            state_m = state_models.pop()
+            folder = index.get(state_m.state.get_path())
+            if folder is None:
+                continue
+            files[posixpath.join(folder, storage.FILE_NAME_META_DATA)] = \
+                storage_utils.dump_objects_to_json_string(state_m.get_meta_data_for_storage(), compact)
+            if isinstance(state_m, ContainerStateModel):
+                state_models.extend(state_m.states.values())
+        container.write_files(container_path, files)
 
 
 class ComplexActionObserver(Observer):
@@ -12,11 +12,15 @@
 # Rico Belder <rico.belder@dlr.de>
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 import os
+from collections import OrderedDict
 
+from gi.repository import GLib
 from gtkmvc3.model_mt import ModelMT
 
+from rafcon.core.execution.execution_status_buffer import execution_status_buffer
 from rafcon.core.state_machine_manager import StateMachineManager
 
+from rafcon.gui.models.signals import ExecutionStatusSignalMsg
 from rafcon.gui.models.state_machine import StateMachineModel
 
 from rafcon.utils.vividict import Vividict
@@ -67,6 +71,8 @@ class StateMachineManagerModel(ModelMT):
         else:
             self.meta = Vividict()
 
+        self._execution_status_timer_id = None
+
         # check if the sm_manager_model exists several times
         self.__class__.__sm_manager_creation_counter += 1
         if self.__class__.__sm_manager_creation_counter == 2:
@@ -113,6 +119,46 @@ class StateMachineManagerModel(ModelMT):
                 del self.state_machines[sm_id_to_delete]
                 sm_m.destroy()
 
+    def start_execution_status_updates(self, rate):
+        """Delivers execution status changes of states coalesced at the given rate
+
+        The executing threads only record the changed states in the
+        :data:`rafcon.core.execution.execution_status_buffer.execution_status_buffer` instead of notifying the
+        observers of the states. The changes are collected by the GTK main loop `rate` times per second and
+        forwarded by one `state_execution_status_signal` per state machine model.
+
+        :param float rate: the number of updates per second
+        """
+        if self._execution_status_timer_id is not None:
+            return
+        execution_status_buffer.enable()
+        self._execution_status_timer_id = GLib.timeout_add(max(1, int(1000. / rate)),
+                                                           self._forward_execution_status_changes)
+
+    def stop_execution_status_updates(self):
+        """Stops the coalesced execution status updates, changes are notified by the observers of the states again"""
+        if self._execution_status_timer_id is None:
+            return
+        GLib.source_remove(self._execution_status_timer_id)
+        self._execution_status_timer_id = None
+        self._forward_execution_status_changes()
+        execution_status_buffer.disable()
+
+    def _forward_execution_status_changes(self):
+        state_models_per_state_machine = OrderedDict()
+        for state in execution_status_buffer.drain():
+            state_machine = state.get_state_machine()
+            if state_machine is None or state_machine.state_machine_id not in self.state_machines:
+                continue
+            try:
+                state_m = self.state_machines[state_machine.state_machine_id].get_state_model_by_path(state.get_path())
+            except ValueError:  # children of library states are only modeled, if the library content is shown
+                continue
+            state_models_per_state_machine.setdefault(state_machine.state_machine_id, []).append(state_m)
+        for sm_id, state_models in state_models_per_state_machine.items():
+            self.state_machines[sm_id].state_execution_status_signal.emit(ExecutionStatusSignalMsg(state_models))
+        return True
+
     def get_state_machine_model(self, state_m):
         """ Get respective state machine model for handed state model
 
@@ -41,7 +41,7 @@ from rafcon.gui.mygaphas.utils import gap_draw_helper
 from rafcon.gui.mygaphas.utils.cache.image_cache import ImageCache
 
 from rafcon.gui.models import AbstractStateModel, LibraryStateModel, ContainerStateModel
-from rafcon.gui.helpers.meta_data import contains_geometric_info
+from rafcon.gui.helpers.meta_data import contains_geometric_info, resize_state_meta
 from rafcon.gui.helpers.label import set_label_markup
 from rafcon.gui.config import global_gui_config as gui_config
 from rafcon.gui.runtime_config import global_runtime_config
@@ -76,6 +76,9 @@ class StateView(Element):
 
         self._state_m = ref(state_m)
         self.hierarchy_level = hierarchy_level
+        # Whether the views of the content (child states, transitions, data flows) have been created, which is only
+        # done, when the state is visible (see GraphicalEditorController)
+        self.content_populated = False
 
         self._income = None
         self._outcomes = []
@@ -387,8 +390,7 @@ class StateView(Element):
         if isinstance(self.model, ContainerStateModel):
             for scoped_port_v in self.scoped_variables:
                 update_port_position(scoped_port_v, scoped_port_v.model.get_meta_data_editor())
-            for transition_m in self.model.transitions:
-                transition_v = self.canvas.get_view_for_model(transition_m)
+            for transition_v in self.get_transitions():
                 transition_v.apply_meta_data()
 
             if recursive:
@@ -871,7 +873,20 @@ class StateView(Element):
                 new_port_rel_pos = calc_new_rel_pos(port_v.handle.pos, old_state_size, new_state_size)
                 port_v.handle.pos = new_port_rel_pos
 
-            if isinstance(state_v.model, ContainerStateModel):
+            if not state_v.content_populated and (isinstance(state_v.model, ContainerStateModel) or
+                                                  state_v.show_content()):
+                # There are no views of the content, thus its meta data is resized directly
+                if isinstance(state_v.model, ContainerStateModel):
+                    for transition_m in state_v.model.transitions:
+                        waypoints = transition_m.get_meta_data_editor()['waypoints']
+                        transition_m.set_meta_data_editor('waypoints', [
+                            calc_new_rel_pos(waypoint, old_state_size, new_state_size) for waypoint in waypoints])
+                    child_state_models = state_v.model.states.values()
+                else:
+                    child_state_models = [state_v.model.state_copy]
+                for child_state_m in child_state_models:
+                    resize_state_meta(child_state_m, (width_factor, height_factor))
+            elif isinstance(state_v.model, ContainerStateModel):
                 for transition_v in state_v.get_transitions():
                     for waypoint in transition_v.waypoints:
                         old_rel_pos = self.canvas.get_matrix_i2i(transition_v, transition_v.parent).transform_point(
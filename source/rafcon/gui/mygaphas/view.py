@@ -13,6 +13,7 @@
 
 from contextlib import contextmanager
 from weakref import ref
+from gi.repository import GObject
 from gtkmvc3.observer import Observer
 
 from gaphas.view import GtkView
@@ -28,6 +29,7 @@ class ExtendedGtkView(GtkView, Observer):
     hovered_handle = None
     _selection = None
     _widget_pos = None
+    _visible_area = None
 
     def __init__(self, graphical_editor_v, state_machine_m, *args):
         GtkView.__init__(self, *args)
@@ -139,6 +141,50 @@ class ExtendedGtkView(GtkView, Observer):
     def redraw_complete_screen(self):
         self.queue_draw_area(0, 0, self.get_allocation().width, self.get_allocation().height)
 
+    def request_update(self, *args, **kwargs):
+        """Extends the base class method to emit the `visible-area-changed` signal
+
+        All changes of the view matrix (zooming, panning, scrolling) and of the widget size are followed by a request
+        to update all items. Thus, the signal is emitted here, if the zoom, the position or the size of the visible
+        area changed since the last request.
+        """
+        super(ExtendedGtkView, self).request_update(*args, **kwargs)
+        allocation = self.get_allocation()
+        visible_area = tuple(self._matrix[i] for i in range(6)) + (allocation.width, allocation.height)
+        if visible_area != self._visible_area:
+            self._visible_area = visible_area
+            self.emit('visible-area-changed')
+
+    def get_visible_area(self, margin=0.):
+        """Returns the visible area of the view in view coordinates
+
+        :param float margin: The visible area is enlarged on each side by this factor of its width and height
+        :return: The area as tuple of x, y, width and height
+        :rtype: tuple(float)
+        """
+        width = self.get_allocation().width
+        height = self.get_allocation().height
+        return -margin * width, -margin * height, (1 + 2 * margin) * width, (1 + 2 * margin) * height
+
+    def get_item_area(self, item):
+        """Returns the area covered by an element in view coordinates
+
+        The matrices of the element and its parents are combined directly, so that the area is also valid for elements,
+        which have just been added to the canvas and thus have not yet been updated.
+
+        :param gaphas.item.Element item: The element
+        :return: The area as tuple of x, y, width and height
+        :rtype: tuple(float)
+        """
+        x0, y0, x1, y1 = 0., 0., item.width, item.height
+        while item is not None:
+            x0, y0 = item.matrix.transform_point(x0, y0)
+            x1, y1 = item.matrix.transform_point(x1, y1)
+            item = self.canvas.get_parent(item)
+        x0, y0 = self._matrix.transform_point(x0, y0)
+        x1, y1 = self._matrix.transform_point(x1, y1)
+        return x0, y0, x1 - x0, y1 - y0
+
     def get_zoom_factor(self):
         """Returns the current zoom factor of the view
 
@@ -317,3 +363,6 @@ class ExtendedGtkView(GtkView, Observer):
                 # Make sure everything's updated
                 self.request_update((), self._canvas.get_all_items())
             self._widget_pos = new_widget_pos
+
+
+GObject.signal_new('visible-area-changed', ExtendedGtkView, GObject.SignalFlags.RUN_LAST, None, ())
@@ -25,6 +25,7 @@ from rafcon.utils.gui_functions import call_gui_callback
 
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
+from rafcon.core.storage import container
 
 import rafcon.gui.start
 import rafcon.gui.singleton as gui_singletons
@@ -69,6 +70,15 @@ def trigger_gui_signals(*args):
 
 
 def convert(config_path, source_path, target_path=None, gui_config_path=None):
+    if container.is_container(source_path) or target_path and \
+            target_path.endswith(container.CONTAINER_FILE_EXTENSION):
+        # conversions between the folder format and the container format do not need the GUI, containers are
+        # converted into a folder next to the container by default
+        if not target_path:
+            target_path = os.path.splitext(os.path.splitext(source_path)[0])[0]
+        container.convert(source_path, target_path)
+        return
+
     logger.info("RAFCON launcher")
     rafcon.gui.start.setup_l10n(logger)
 
@@ -146,7 +156,11 @@ def convert_libraries_in_path(config_path, lib_path, target_path=None, gui_confi
     """
     for lib in os.listdir(lib_path):
         child_lib_path = os.path.join(lib_path, lib)
-        if os.path.isdir(child_lib_path) and not '.' == lib[0]:
+        if container.is_container(child_lib_path):
+            lib_target_path = None if not target_path else \
+                os.path.join(target_path, lib[:-len(container.CONTAINER_FILE_EXTENSION)])
+            convert(config_path, child_lib_path, lib_target_path, gui_config_path)
+        elif os.path.isdir(child_lib_path) and not '.' == lib[0]:
             lib_target_path = None if not target_path else os.path.join(target_path, lib)
             if os.path.exists(os.path.join(child_lib_path, "statemachine.yaml")) or \
                     os.path.exists(os.path.join(child_lib_path, "statemachine.json")):
@@ -163,10 +177,17 @@ if __name__ == '__main__':
     if len(sys.argv) < 3:
         logger.error("Wrong number of arguments")
         logger.error("Usage: resave_state_machine.py config_path library_folder_to_convert optional_target_folder gui_config_path")
+        logger.error("To convert a state machine into a container, pass a target ending with {0}, to convert a "
+                     "container into the folder format, pass the container".format(container.CONTAINER_FILE_EXTENSION))
         exit(0)
     config_path = sys.argv[1]
     gui_config_path = None if len(sys.argv) < 5 else sys.argv[4]
     folder_to_convert = sys.argv[2]
     target_path = None if len(sys.argv) < 4 else sys.argv[3]
     logger.info("folder to convert: " + folder_to_convert)
-    convert_libraries_in_path(config_path, folder_to_convert, target_path, gui_config_path)
+    if container.is_container(folder_to_convert) or target_path and \
+            target_path.endswith(container.CONTAINER_FILE_EXTENSION):
+        # a single state machine is converted between the folder format and the container format
+        convert(config_path, folder_to_convert, target_path, gui_config_path)
+    else:
+        convert_libraries_in_path(config_path, folder_to_convert, target_path, gui_config_path)
@@ -70,6 +70,18 @@ MINIMUM_NAME_SIZE_FOR_DISPLAY = 10
 MINIMUM_PORT_SIZE_FOR_DISPLAY = 4
 MINIMUM_PORT_NAME_SIZE_FOR_DISPLAY = 4
 
+# Margins around the visible area of the graphical editor, relative to its size, within which the views of the content
+# of states are created or kept
+CONTENT_VIEW_CREATION_MARGIN = 0.25
+CONTENT_VIEW_REMOVAL_MARGIN = 1.
+# Delay in milliseconds between a change of the visible area and the update of the content views
+CONTENT_VIEW_UPDATE_DELAY = 100
+# Delay in milliseconds between a change of the execution mode and the update of the execution history tree
+EXECUTION_HISTORY_UPDATE_DELAY = 100
+
+# Maximum number of log entries printed to the logging console at once
+LOGGING_CONSOLE_CHUNK_SIZE = 500
+
 GRID_SIZE = 10
 PADDING_LEFT = 15
 BORDER_WIDTH_STATE_SIZE_FACTOR = 25.
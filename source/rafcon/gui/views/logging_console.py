@@ -13,7 +13,7 @@
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
 from future.utils import string_types
-import threading
+from collections import deque
 
 from gtkmvc3.view import View
 from gi.repository import Gtk
@@ -26,11 +26,11 @@ logger = log.get_logger(__name__)
 
 class LoggingConsoleView(View):
 
+    LOG_LEVEL_TAGS = {'VERBOSE': "debug", 'DEBUG': "debug", 'INFO': "info", 'WARNING': "warning", 'ERROR': "error"}
+
     def __init__(self):
         View.__init__(self)
 
-        self._lock = threading.Lock()
-
         self.text_view = Gtk.TextView()
         self.text_view.set_property('editable', False)
 
@@ -45,6 +45,9 @@ class LoggingConsoleView(View):
 
         self._enables = {}
         self._auto_scroll_handler_id = None
+        # The ids and numbers of lines of the log entries in the text buffer
+        self._shown_entries = deque()
+        self._shown_lines = 0
 
         scrollable = Gtk.ScrolledWindow()
         scrollable.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
@@ -68,40 +71,110 @@ class LoggingConsoleView(View):
 
         start, end = self.filtered_buffer.get_bounds()
         self.filtered_buffer.delete(start, end)
+        self._shown_entries.clear()
+        self._shown_lines = 0
 
-    def print_message(self, message, log_level):
-        with self._lock:
-            if log_level <= log.logging.VERBOSE and self._enables.get('VERBOSE', False):
-                GLib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "debug",
-                              priority=GLib.PRIORITY_LOW)
-            if log.logging.VERBOSE < log_level <= log.logging.DEBUG and self._enables.get('DEBUG', True):
-                GLib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "debug",
-                              priority=self.logging_priority)
-            elif log.logging.DEBUG < log_level <= log.logging.INFO and self._enables.get('INFO', True):
-                GLib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "info",
-                              priority=self.logging_priority)
-            elif log.logging.INFO < log_level <= log.logging.WARNING and self._enables.get('WARNING', True):
-                GLib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "warning",
-                              priority=self.logging_priority)
-            elif log.logging.WARNING < log_level and self._enables.get('ERROR', True):
-                GLib.idle_add(self.print_to_text_view, message, self.filtered_buffer, "error",
-                              priority=self.logging_priority)
-
-    def print_to_text_view(self, text, text_buf, use_tag=None):
-        time, source, message = self.split_text(text)
-        text_buf.insert_with_tags_by_name(text_buf.get_end_iter(), time + " ", "tertiary_text", "default")
-        text_buf.insert_with_tags_by_name(text_buf.get_end_iter(), source + ": ", "text", "default")
-        if use_tag:
-            if self.text_view.get_buffer().get_tag_table().lookup(use_tag) is not None:
-                text_buf.insert_with_tags_by_name(text_buf.get_end_iter(), message + "\n", use_tag, "default")
-            else:
-                text_buf.insert(text_buf.get_end_iter(), message + "\n")
-        else:
-            text_buf.insert(text_buf.get_end_iter(), message + "\n")
+    @property
+    def first_shown_entry_id(self):
+        """The id of the oldest log entry in the text buffer or None, if the buffer is empty"""
+        return self._shown_entries[0][0] if self._shown_entries else None
+
+    @property
+    def last_shown_entry_id(self):
+        """The id of the latest log entry in the text buffer or None, if the buffer is empty"""
+        return self._shown_entries[-1][0] if self._shown_entries else None
+
+    @staticmethod
+    def get_log_level_name(log_level):
+        """Returns the name of the log level, as used for the enables of the view
+
+        :param int log_level: The log level
+        :return: One of 'VERBOSE', 'DEBUG', 'INFO', 'WARNING' and 'ERROR'
+        :rtype: str
+        """
+        if log_level <= log.logging.VERBOSE:
+            return 'VERBOSE'
+        elif log_level <= log.logging.DEBUG:
+            return 'DEBUG'
+        elif log_level <= log.logging.INFO:
+            return 'INFO'
+        elif log_level <= log.logging.WARNING:
+            return 'WARNING'
+        return 'ERROR'
+
+    def append_entries(self, entries, max_lines):
+        """Appends log entries to the end of the text buffer
+
+        If the buffer then contains more than `max_lines` lines, the oldest entries are removed from it.
+
+        :param list[rafcon.utils.log_helpers.LogEntry] entries: The entries to be printed
+        :param int max_lines: The maximum number of lines in the text buffer
+        """
+        if not entries:
+            return
+        text_buf = self.filtered_buffer
+        text_iter = text_buf.get_end_iter()
+        for entry in entries:
+            num_lines = self._insert_entry(text_iter, entry)
+            self._shown_entries.append((entry.entry_id, num_lines))
+            self._shown_lines += num_lines
+
+        num_removed_lines = 0
+        while self._shown_lines > max_lines and len(self._shown_entries) > 1:
+            num_lines = self._shown_entries.popleft()[1]
+            self._shown_lines -= num_lines
+            num_removed_lines += num_lines
+        if num_removed_lines:
+            text_buf.delete(text_buf.get_start_iter(), text_buf.get_iter_at_line(num_removed_lines))
 
         if not self.quit_flag and self._enables['CONSOLE_FOLLOW_LOGGING']:
             self.scroll_to_cursor_onscreen()
 
+    def prepend_entries(self, entries, max_lines):
+        """Inserts older log entries at the beginning of the text buffer
+
+        If the buffer then contains more than `max_lines` lines, the latest entries are removed from it. The view
+        keeps showing the line, which was the first one before.
+
+        :param list[rafcon.utils.log_helpers.LogEntry] entries: The entries to be printed
+        :param int max_lines: The maximum number of lines in the text buffer
+        """
+        if not entries:
+            return
+        text_buf = self.filtered_buffer
+        previous_start_mark = text_buf.create_mark(None, text_buf.get_start_iter(), False)
+        text_iter = text_buf.get_start_iter()
+        shown_entries = []
+        for entry in entries:
+            num_lines = self._insert_entry(text_iter, entry)
+            shown_entries.append((entry.entry_id, num_lines))
+            self._shown_lines += num_lines
+        self._shown_entries.extendleft(reversed(shown_entries))
+
+        removed_lines = False
+        while self._shown_lines > max_lines and len(self._shown_entries) > 1:
+            self._shown_lines -= self._shown_entries.pop()[1]
+            removed_lines = True
+        if removed_lines:
+            text_buf.delete(text_buf.get_iter_at_line(self._shown_lines), text_buf.get_end_iter())
+
+        self.text_view.scroll_to_mark(previous_start_mark, 0., True, 0., 0.)
+        text_buf.delete_mark(previous_start_mark)
+
+    def _insert_entry(self, text_iter, entry):
+        """Inserts a log entry at the given position, the iterator is moved to the end of the inserted text
+
+        :return: The number of inserted lines
+        :rtype: int
+        """
+        text_buf = self.filtered_buffer
+        time, source, message = self.split_text(entry.message)
+        tag = self.LOG_LEVEL_TAGS[self.get_log_level_name(entry.log_level)]
+        text_buf.insert_with_tags_by_name(text_iter, time + " ", "tertiary_text", "default")
+        text_buf.insert_with_tags_by_name(text_iter, source + ": ", "text", "default")
+        text_buf.insert_with_tags_by_name(text_iter, message + "\n", tag, "default")
+        return message.count("\n") + 1
+
     @staticmethod
     def split_text(text_to_split):
         """Split text
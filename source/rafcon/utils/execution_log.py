@@ -17,15 +17,44 @@ import shelve
 import json
 import pickle
 
+from rafcon.core.execution.binary_log import BinaryLogReader, is_binary_log
+from rafcon.core.execution.log_index import ExecutionLogIndex, get_run_id_number
 from rafcon.utils.vividict import Vividict
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
 
+def open_execution_log(filename):
+    """Open an execution log file for reading
+
+    Binary logs (see :mod:`rafcon.core.execution.binary_log`) are opened with a reader streaming the records from the
+    file, shelve logs are opened read-only. Both can be passed to the functions of this module.
+
+    :param str filename: the path of the execution log file
+    :return: a mapping from history item ids to the dictionaries of the history items, with a close() method
+    """
+    if is_binary_log(filename):
+        return BinaryLogReader(filename)
+    return shelve.open(filename, 'r')
+
+
+def open_execution_log_index(filename):
+    """Open the sidecar index of an execution log file (see :mod:`rafcon.core.execution.log_index`)
+
+    The index can be passed as `log_index` to the streaming functions of this module, which then only read the
+    matching items instead of the whole log.
+
+    :param str filename: the path of the execution log file
+    :return: the index or None, if there is no complete and up-to-date index for the log
+    :rtype: rafcon.core.execution.log_index.ExecutionLogIndex
+    """
+    return ExecutionLogIndex.open(filename)
+
+
 def log_to_raw_structure(execution_history_items):
     """
     :param dict execution_history_items: history items, in the simplest case
-           directly the opened shelve log file
+           directly the opened log file (see :func:`open_execution_log`)
     :return: start_item, the StateMachineStartItem of the log file
              previous, a dict mapping history_item_id --> history_item_id of previous history item
              next_, a dict mapping history_item_id --> history_item_id of the next history item (except if
@@ -41,19 +70,25 @@ def log_to_raw_structure(execution_history_items):
     grouped_by_run_id = {}
     start_item = None
 
+    # the item types of the already processed items; for logs streamed in the order of writing, this avoids reading
+    # the previous item again
+    item_types = {}
+
     for k,v in execution_history_items.items():
+        item_types[k] = v['item_type']
         if v['item_type'] == 'StateMachineStartItem':
             start_item = v
         else:
             # connect the item to its predecessor
             prev_item_id = native_str(v['prev_history_item_id'])
 
-            if prev_item_id in execution_history_items:
+            if prev_item_id in item_types or prev_item_id in execution_history_items:
                 ## should always be the case except if shelve is broken/missing data
 
                 previous[k] = prev_item_id
-                if execution_history_items[prev_item_id]['item_type'] == 'ConcurrencyItem' and \
-                   execution_history_items[k]['item_type'] != 'ReturnItem':
+                prev_item_type = item_types[prev_item_id] if prev_item_id in item_types else \
+                    execution_history_items[prev_item_id]['item_type']
+                if prev_item_type == 'ConcurrencyItem' and v['item_type'] != 'ReturnItem':
                     # this is not a return  item, thus this 'previous' relationship of this
                     # item must be a call item of one of the concurrent branches of
                     # the concurrency state
@@ -76,6 +111,346 @@ def log_to_raw_structure(execution_history_items):
     return start_item, previous, next_, concurrent, grouped_by_run_id
 
 
+def _collapse_start_item(item):
+    """Collapse the StateMachineStartItem of a log into the representation used by the collapsed structure
+
+    :param dict item: the stored StateMachineStartItem
+    :return: the collapsed start item
+    :rtype: dict
+    """
+    execution_item = {}
+    ## add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
+              'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
+              'used_rafcon_version', 'creation_time', 'last_update', 'os_environment']:
+        try:
+            execution_item[l] = item[l]
+        except KeyError:
+            logger.warning("Key {} not in history start item".format(str(l)))
+
+    ## add extended properties (added in later rafcon versions),
+    ## will add default value if not existing instead
+    for l, default in [('semantic_data', {}),
+                       ('is_library', None),
+                       ('library_state_name', None),
+                       ('library_name', None),
+                       ('library_path', None)]:
+        execution_item[l] = item.get(l, default)
+    return execution_item
+
+
+def _unpickle_data(data_dict, throw_on_pickle_error=True, include_erroneous_data_ports=False):
+    r = dict()
+    # support backward compatibility
+    if isinstance(data_dict, string_types):  # formerly data dict was a json string
+        r = json.loads(data_dict)
+    else:
+        for k, v in data_dict.items():
+            if not k.startswith('!'):  # ! indicates storage error
+                try:
+                    r[k] = pickle.loads(v)
+                except Exception as e:
+                    if throw_on_pickle_error:
+                        raise
+                    elif include_erroneous_data_ports:
+                        r['!' + k] = (str(e), v)
+                    else:
+                        pass  # ignore
+            elif include_erroneous_data_ports:
+                r[k] = v
+
+    return r
+
+
+def _collapse_call_and_return_item(call_item, return_item, throw_on_pickle_error=True,
+                                   include_erroneous_data_ports=False):
+    """Merge the call and the return item of a state execution into one collapsed item
+
+    :param dict call_item: the stored CallItem of the state execution
+    :param dict return_item: the stored ReturnItem of the state execution
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :return: the collapsed item
+    :rtype: dict
+    """
+    execution_item = {}
+    # add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
+        execution_item[l] = call_item[l]
+
+    # add extended properties (added in later rafcon versions),
+    # will add default value if not existing instead
+    for l, default in [('semantic_data', {}),
+                       ('is_library', None),
+                       ('library_state_name', None),
+                       ('library_name', None),
+                       ('library_path', None)]:
+        execution_item[l] = return_item.get(l, default)
+
+    for l in ['outcome_name', 'outcome_id']:
+        execution_item[l] = return_item[l]
+    for l in ['timestamp']:
+        execution_item[l+'_call'] = call_item[l]
+        execution_item[l+'_return'] = return_item[l]
+
+    def unpickle_data(data_dict):
+        return _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports)
+
+    execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
+    execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
+    execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
+    execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
+    # backward compatibility
+    if not isinstance(execution_item['semantic_data'], Vividict):
+        execution_item['semantic_data'] = unpickle_data(execution_item['semantic_data'])
+    return execution_item
+
+
+def _iter_log_items(execution_history_items, item_filter=None, log_index=None):
+    """Iterate over the items of a log, streaming them if the log supports it (see :func:`open_execution_log`)
+
+    If an index of the log and an active filter are given, only the call and return items of the matching state
+    executions are read.
+    """
+    if log_index is None or item_filter is None or not item_filter.is_active:
+        if isinstance(execution_history_items, BinaryLogReader):
+            return execution_history_items.iter_items()
+        return iter(execution_history_items.items())
+    return _read_indexed_items(execution_history_items, log_index.find_state_executions(
+        item_filter.state_path, item_filter.run_id_range, item_filter.time_window))
+
+
+def _is_streamed_in_order(execution_history_items, item_filter=None, log_index=None):
+    """Check whether :func:`_iter_log_items` yields the items of a log in the order they were written"""
+    if log_index is not None and item_filter is not None and item_filter.is_active:
+        return True
+    return isinstance(execution_history_items, BinaryLogReader)
+
+
+def _read_indexed_items(execution_history_items, indexed_items):
+    for key, offset in indexed_items:
+        if offset is not None and isinstance(execution_history_items, BinaryLogReader):
+            yield key, execution_history_items.read_item_at(offset)
+        else:
+            yield key, execution_history_items[key]
+
+
+class ExecutionLogFilter(object):
+    """Filter for the items of an execution log
+
+    All criteria are optional, an item must fulfill all given criteria.
+
+    :ivar str state_path: only items of the state with this path (e.g. "ROOTID/CHILDID") or of its descendants; the
+        path can either be given by state ids or by state names (`path_by_name`)
+    :ivar tuple run_id_range: (first, last) run_ids (or their counters) of the state executions to include; either
+        bound can be None
+    :ivar tuple time_window: (start, end) time stamps (seconds since the epoch) in which the state execution must have
+        been started; either bound can be None
+    """
+
+    def __init__(self, state_path=None, run_id_range=None, time_window=None):
+        self.state_path = state_path
+        self.run_id_range = None
+        if run_id_range is not None:
+            self.run_id_range = tuple(None if bound is None else get_run_id_number(bound) for bound in run_id_range)
+        self.time_window = time_window
+
+    @property
+    def is_active(self):
+        return self.state_path is not None or self.run_id_range is not None or self.time_window is not None
+
+    def matches_state_path(self, item):
+        if self.state_path is None:
+            return True
+        for path in (item.get('path'), item.get('path_by_name')):
+            if path is not None and (path == self.state_path or path.startswith(self.state_path + '/')):
+                return True
+        return False
+
+    def matches_run_id(self, item):
+        if self.run_id_range is None:
+            return True
+        first, last = self.run_id_range
+        run_id_number = get_run_id_number(item['run_id'])
+        if run_id_number is None:
+            return False
+        return (first is None or run_id_number >= first) and (last is None or run_id_number <= last)
+
+    def matches_time(self, timestamp):
+        if self.time_window is None:
+            return True
+        start, end = self.time_window
+        return (start is None or timestamp >= start) and (end is None or timestamp <= end)
+
+    def matches(self, item):
+        """Check whether a stored call item (or a collapsed item) fulfills all criteria of the filter"""
+        timestamp = item['timestamp'] if 'timestamp' in item else item['timestamp_call']
+        return self.matches_state_path(item) and self.matches_run_id(item) and self.matches_time(timestamp)
+
+
+def iter_execution_graph(execution_history_items):
+    """Walk the previous/next/concurrent relationships of the log incrementally
+
+    In contrast to :func:`log_to_raw_structure`, the relationships are yielded one by one, instead of being collected in
+    dictionaries. Only the ids of the ConcurrencyItems are remembered, so for logs streamed in the order of writing
+    (binary logs) the memory consumption is independent of the size of the log. Such logs are read sequentially, other
+    logs are additionally accessed by the ids of the previous history items.
+
+    :param execution_history_items: history items, in the simplest case directly the opened log file (see
+           :func:`open_execution_log`)
+    :return: tuples (relation, previous history_item_id, history_item_id, history item), with relation being 'start'
+             (previous history_item_id is then None), 'next' or 'concurrent'
+    """
+    streamed_in_order = _is_streamed_in_order(execution_history_items)
+    concurrency_item_ids = set()
+    for k, v in _iter_log_items(execution_history_items):
+        k = native_str(k)
+        if v['item_type'] == 'ConcurrencyItem':
+            concurrency_item_ids.add(k)
+        if v['item_type'] == 'StateMachineStartItem':
+            yield 'start', None, k, v
+            continue
+        prev_item_id = native_str(v['prev_history_item_id'])
+        if not streamed_in_order and prev_item_id not in concurrency_item_ids and \
+                prev_item_id in execution_history_items and \
+                execution_history_items[prev_item_id]['item_type'] == 'ConcurrencyItem':
+            # the ConcurrencyItem might not have been read yet
+            concurrency_item_ids.add(prev_item_id)
+        if prev_item_id in concurrency_item_ids and v['item_type'] != 'ReturnItem':
+            yield 'concurrent', prev_item_id, k, v
+        else:
+            yield 'next', prev_item_id, k, v
+
+
+def iter_collapsed_items(execution_history_items, state_path=None, run_id_range=None, time_window=None,
+                         throw_on_pickle_error=True, include_erroneous_data_ports=False, log_index=None):
+    """Yield the collapsed items of the log one at a time
+
+    This is the streaming counterpart of the items of :func:`log_to_collapsed_structure`: the CallItem of a state
+    execution is kept until its ReturnItem is read, then the collapsed item is yielded. For logs streamed in the order
+    of writing (binary logs), only the currently running state executions are held in memory, as the ReturnItem of type
+    EXECUTE is the last item of a state execution. Items not matching the filter are dropped as early as possible.
+    Executions without ReturnItem (e.g. of an aborted run) are not yielded.
+
+    :param execution_history_items: history items, in the simplest case directly the opened log file (see
+           :func:`open_execution_log`)
+    :param str state_path: see :class:`ExecutionLogFilter`
+    :param tuple run_id_range: see :class:`ExecutionLogFilter`
+    :param tuple time_window: see :class:`ExecutionLogFilter`
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param log_index: the index of the log (see :func:`open_execution_log_index`), used to only read the items of the
+           matching state executions
+    :return: the collapsed items, in the order in which the state executions finished
+    """
+    item_filter = ExecutionLogFilter(state_path, run_id_range, time_window)
+    # run_id --> {call_type: stored item} of the started, but not yet finished state executions
+    call_items = {}
+    container_return_items = {}
+    # only needed for logs not streamed in the order of writing, in which items can follow the final ReturnItem
+    finished_run_ids = set()
+    streamed_in_order = _is_streamed_in_order(execution_history_items, item_filter, log_index)
+
+    def collapse(call_item, return_item):
+        return _collapse_call_and_return_item(call_item, return_item, throw_on_pickle_error,
+                                              include_erroneous_data_ports)
+
+    for k, v in _iter_log_items(execution_history_items, item_filter, log_index):
+        item_type = v['item_type']
+        if item_type not in ('CallItem', 'ReturnItem'):
+            continue
+        run_id = v['run_id']
+        if run_id in finished_run_ids:
+            continue
+        if item_type == 'CallItem':
+            if not item_filter.matches(v):
+                continue
+            # library states and their state copies share the run_id, the outer call comes first
+            call_items.setdefault(run_id, {}).setdefault(v['call_type'], v)
+        elif run_id in call_items:
+            if v['call_type'] == 'EXECUTE':
+                calls = call_items.pop(run_id)
+                container_return_items.pop(run_id, None)
+                if not streamed_in_order:
+                    finished_run_ids.add(run_id)
+                yield collapse(calls.get('EXECUTE', calls.get('CONTAINER')), v)
+            else:
+                # the ReturnItem of type EXECUTE follows, except for the root state
+                container_return_items[run_id] = v
+
+    # fall back to the container calls, should only happen for the root state
+    for run_id, return_item in container_return_items.items():
+        calls = call_items.pop(run_id)
+        yield collapse(calls.get('EXECUTE', calls.get('CONTAINER')), return_item)
+
+
+def query_execution_log(execution_history_items, state_path=None, run_id_range=None, time_window=None,
+                        item_type=None, log_index=None):
+    """Yield the history items fulfilling all given criteria
+
+    With an index of the log, only the matching items are read, otherwise the whole log is scanned.
+
+    :param execution_history_items: history items, in the simplest case directly the opened log file (see
+           :func:`open_execution_log`)
+    :param str state_path: see :class:`ExecutionLogFilter`
+    :param tuple run_id_range: see :class:`ExecutionLogFilter`
+    :param tuple time_window: see :class:`ExecutionLogFilter`
+    :param str item_type: the type of the history items, e.g. "CallItem"
+    :param log_index: the index of the log (see :func:`open_execution_log_index`)
+    :return: tuples of history item id and history item
+    """
+    if log_index is not None:
+        for key, value in _read_indexed_items(execution_history_items, log_index.find_items(
+                state_path, run_id_range, time_window, item_type)):
+            yield key, value
+        return
+    item_filter = ExecutionLogFilter(state_path, run_id_range, time_window)
+    for k, v in _iter_log_items(execution_history_items):
+        if item_type is not None and v['item_type'] != item_type:
+            continue
+        if v['item_type'] == 'StateMachineStartItem' and item_filter.state_path is not None:
+            continue
+        if item_filter.matches(v):
+            yield k, v
+
+
+def _get_DataFrame_columns(item, data_columns):
+    # remove columns which are not generic over all states (basically the
+    # data flow stuff)
+    df_keys = list(item.keys())
+    df_keys.remove('data_ins')
+    df_keys.remove('data_outs')
+    df_keys.remove('scoped_data_ins')
+    df_keys.remove('scoped_data_outs')
+    df_keys.remove('semantic_data')
+    df_keys.sort()
+    item_keys = list(df_keys)
+    for key, selected_columns in data_columns:
+        df_keys.extend([key + '__' + s for s in selected_columns])
+    return item_keys, df_keys
+
+
+def _collapsed_item_to_DataFrame_row(item, item_keys, data_columns):
+    row_data = [item[k] for k in item_keys]
+    for key, selected_columns in data_columns:
+        for column_key in selected_columns:
+            row_data.append(item[key].get(column_key, None))
+    return row_data
+
+
+def _rows_to_DataFrame(df_items, df_keys):
+    import pandas as pd
+    df = pd.DataFrame(df_items, columns=df_keys)
+    # convert epoch to datetime
+    df.timestamp_call = pd.to_datetime(df.timestamp_call, unit='s')
+    df.timestamp_return = pd.to_datetime(df.timestamp_return, unit='s')
+
+    # use call timestamp as index
+    df_timed = df.set_index(df.timestamp_call)
+    df_timed.sort_index(inplace=True)
+    return df_timed
+
+
 def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=True,
                                include_erroneous_data_ports=False, full_next=False):
     """
@@ -85,7 +460,7 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     The collapsed items hold input as well as output data (direct and scoped), and the outcome
     the state execution.
     :param dict execution_history_items: history items, in the simplest case
-           directly the opened shelve log file
+           directly the opened log file (see :func:`open_execution_log`)
     :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
     :param bool include_erroneous_data_ports: flag if to include erroneous data ports
     :param bool full_next: flag to indicate if the next relationship has also to be created at the end
@@ -119,52 +494,13 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     if len(next_) == 0 or len(next_) == 1:
         for rid, gitems in grouped.items():
             if gitems[0]['item_type'] == 'StateMachineStartItem':
-                item = gitems[0]
-                execution_item = {}
-                ## add base properties will throw if not existing
-                for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
-                          'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
-                          'used_rafcon_version', 'creation_time', 'last_update', 'os_environment']:
-                    try:
-                        execution_item[l] = item[l]
-                    except KeyError:
-                        logger.warning("Key {} not in history start item".format(str(l)))
-
-                ## add extended properties (added in later rafcon versions),
-                ## will add default value if not existing instead
-                for l, default in [('semantic_data', {}),
-                                     ('is_library', None),
-                                     ('library_state_name', None),
-                                     ('library_name', None),
-                                     ('library_path', None)]:
-                    execution_item[l] = item.get(l, default)
-
-                start_item = execution_item
+                start_item = _collapse_start_item(gitems[0])
         return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
 
     # build collapsed items
     for rid, gitems in grouped.items():
         if gitems[0]['item_type'] == 'StateMachineStartItem':
-            item = gitems[0]
-            execution_item = {}
-            ## add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
-                      'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
-                      'used_rafcon_version', 'creation_time', 'last_update', 'os_environment']:
-                try:
-                    execution_item[l] = item[l]
-                except KeyError:
-                    logger.warning("Key {} not in history start item".format(str(l)))
-
-            ## add extended properties (added in later rafcon versions),
-            ## will add default value if not existing instead
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = item.get(l, default)
-
+            execution_item = _collapse_start_item(gitems[0])
             start_item = execution_item
 
             collapsed_next[rid] = execution_history_items[next_[gitems[0]['history_item_id']]]['run_id']
@@ -249,59 +585,8 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
                     else:
                         collapsed_concurrent[prev_rid] = [rid]
 
-            # assemble grouped item
-            execution_item = {}
-            # add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
-                execution_item[l] = call_item[l]
-
-            # add extended properties (added in later rafcon versions),
-            # will add default value if not existing instead
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = return_item.get(l, default)
-
-            for l in ['outcome_name', 'outcome_id']:
-                execution_item[l] = return_item[l]
-            for l in ['timestamp']:
-                execution_item[l+'_call'] = call_item[l]
-                execution_item[l+'_return'] = return_item[l]
-
-            def unpickle_data(data_dict):
-                r = dict()
-                # support backward compatibility
-                if isinstance(data_dict, string_types):  # formerly data dict was a json string
-                    r = json.loads(data_dict)
-                else:
-                    for k, v in data_dict.items():
-                        if not k.startswith('!'):  # ! indicates storage error
-                            try:
-                                r[k] = pickle.loads(v)
-                            except Exception as e:
-                                if throw_on_pickle_error:
-                                    raise
-                                elif include_erroneous_data_ports:
-                                    r['!' + k] = (str(e), v)
-                                else:
-                                    pass  # ignore
-                        elif include_erroneous_data_ports:
-                            r[k] = v
-
-                return r
-
-            execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
-            execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
-            execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
-            execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
-            # backward compatibility
-            if isinstance(execution_item['semantic_data'], Vividict):
-                execution_item['semantic_data'] = execution_item['semantic_data']
-            else:
-                execution_item['semantic_data'] = unpickle_data(execution_item['semantic_data'])
-
+            execution_item = _collapse_call_and_return_item(call_item, return_item, throw_on_pickle_error,
+                                                            include_erroneous_data_ports)
             collapsed_items[rid] = execution_item
 
     return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
@@ -333,46 +618,54 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     if len(gitems) == 0:
         return pd.DataFrame()
 
-    # remove columns which are not generic over all states (basically the
-    # data flow stuff)
-    df_keys = list(list(gitems.values())[0].keys())
-    df_keys.remove('data_ins')
-    df_keys.remove('data_outs')
-    df_keys.remove('scoped_data_ins')
-    df_keys.remove('scoped_data_outs')
-    df_keys.remove('semantic_data')
-    df_keys.sort()
-
-    df_items = []
-
-    for rid, item in gitems.items():
-        row_data = [item[k] for k in df_keys]
-
-        for key, selected_columns in [('data_ins', data_in_columns),
-                                      ('data_outs', data_out_columns),
-                                      ('scoped_data_ins', scoped_in_columns),
-                                      ('scoped_data_outs', scoped_out_columns),
-                                      ('semantic_data', semantic_data_columns)]:
-            for column_key in selected_columns:
-                row_data.append(item[key].get(column_key, None))
-        df_items.append(row_data)
-
-    for key, selected_columns in [('data_ins', data_in_columns),
-                                  ('data_outs', data_out_columns),
-                                  ('scoped_data_ins', scoped_in_columns),
-                                  ('scoped_data_outs', scoped_out_columns),
-                                  ('semantic_data', semantic_data_columns)]:
-        df_keys.extend([key + '__' + s for s in selected_columns])
-    df = pd.DataFrame(df_items, columns=df_keys)
-    # convert epoch to datetime
-    df.timestamp_call = pd.to_datetime(df.timestamp_call, unit='s')
-    df.timestamp_return = pd.to_datetime(df.timestamp_return, unit='s')
+    data_columns = [('data_ins', data_in_columns),
+                    ('data_outs', data_out_columns),
+                    ('scoped_data_ins', scoped_in_columns),
+                    ('scoped_data_outs', scoped_out_columns),
+                    ('semantic_data', semantic_data_columns)]
+    item_keys, df_keys = _get_DataFrame_columns(list(gitems.values())[0], data_columns)
+    df_items = [_collapsed_item_to_DataFrame_row(item, item_keys, data_columns) for item in gitems.values()]
+    return _rows_to_DataFrame(df_items, df_keys)
 
-    # use call timestamp as index
-    df_timed = df.set_index(df.timestamp_call)
-    df_timed.sort_index(inplace=True)
 
-    return df_timed
+def log_to_DataFrame_chunks(execution_history_items, chunk_size=10000, data_in_columns=[], data_out_columns=[],
+                            scoped_in_columns=[], scoped_out_columns=[], semantic_data_columns=[],
+                            throw_on_pickle_error=True, state_path=None, run_id_range=None, time_window=None,
+                            log_index=None):
+    """
+    Yields the collapsed items in pandas.DataFrames of at most `chunk_size` rows, built from
+    :func:`iter_collapsed_items`. The columns are the same as the ones of :func:`log_to_DataFrame`, but each chunk is
+    only sorted by the call timestamp within itself. This allows to analyse logs, which do not fit into memory as a
+    whole, e.g. by aggregating the chunks or appending them to an on-disk store.
+
+    :param int chunk_size: the maximum number of rows per DataFrame
+    :param str state_path: see :class:`ExecutionLogFilter`
+    :param tuple run_id_range: see :class:`ExecutionLogFilter`
+    :param tuple time_window: see :class:`ExecutionLogFilter`
+    :param log_index: the index of the log (see :func:`open_execution_log_index`)
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("The Python package 'pandas' is required for log_to_DataFrame_chunks.")
+
+    data_columns = [('data_ins', data_in_columns),
+                    ('data_outs', data_out_columns),
+                    ('scoped_data_ins', scoped_in_columns),
+                    ('scoped_data_outs', scoped_out_columns),
+                    ('semantic_data', semantic_data_columns)]
+    item_keys = df_keys = None
+    df_items = []
+    for item in iter_collapsed_items(execution_history_items, state_path, run_id_range, time_window,
+                                     throw_on_pickle_error=throw_on_pickle_error, log_index=log_index):
+        if item_keys is None:
+            item_keys, df_keys = _get_DataFrame_columns(item, data_columns)
+        df_items.append(_collapsed_item_to_DataFrame_row(item, item_keys, data_columns))
+        if len(df_items) >= chunk_size:
+            yield _rows_to_DataFrame(df_items, df_keys)
+            df_items = []
+    if df_items:
+        yield _rows_to_DataFrame(df_items, df_keys)
 
 
 def log_to_ganttplot(execution_history_items):
@@ -18,6 +18,7 @@
 """
 import os
 import tarfile
+import threading
 import stat
 import shutil
 from os.path import realpath, dirname, join, expanduser
@@ -97,13 +98,35 @@ def read_file(file_path, filename=None):
     return file_content
 
     
-def write_file(file_path, content, create_full_path=False):
+def write_file(file_path, content, create_full_path=False, atomic=False):
+    """Write the content into the file
+
+    :param str file_path: the path of the file
+    :param str content: the content of the file
+    :param bool create_full_path: whether to create the directory of the file, if it does not exist
+    :param bool atomic: if True, the content is written into a temporary file, which then replaces the file, so that
+        readers never see a partially written file
+    """
     file_path = os.path.realpath(file_path)
+    head, tail = os.path.split(file_path)
     if create_full_path:
-        head, tail = os.path.split(file_path)
         create_path(head)
-    with open(file_path, 'w') as file_pointer:
-        file_pointer.write(content)
+    if not atomic:
+        with open(file_path, 'w') as file_pointer:
+            file_pointer.write(content)
+        return
+    temp_file_path = os.path.join(head, ".{0}.{1}.{2}.tmp".format(tail, os.getpid(), threading.current_thread().ident))
+    try:
+        with open(temp_file_path, 'w') as file_pointer:
+            file_pointer.write(content)
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_file_path)
+        # os.rename does not replace existing files on Windows
+        getattr(os, 'replace', os.rename)(temp_file_path, file_path)
+    except Exception:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
     
         
 def get_default_config_path():
@@ -9,8 +9,12 @@
 # Franz Steinmetz <franz.steinmetz@dlr.de>
 # Rico Belder <rico.belder@dlr.de>
 
+from builtins import object
+from collections import deque, namedtuple
+from itertools import islice
 import logging
 import sys
+import threading
 
 
 class NoHigherLevelFilter(logging.Filter):
@@ -87,3 +91,103 @@ class LoggingViewHandler(logging.Handler):
             raise
         except:
             self.handleError(record)
+
+
+LogEntry = namedtuple('LogEntry', ['entry_id', 'log_level', 'message'])
+
+
+class LogEntryBuffer(object):
+    """A thread-safe ring buffer of log entries
+
+    The buffer keeps the latest `max_entries` entries, older ones are dropped. The logging threads only append
+    entries, while a consumer, like the logging console, fetches the entries added since its last fetch in chunks
+    of limited size. Thus, the consumer does not need to be notified about each single entry.
+
+    :param int max_entries: The maximum number of stored entries
+    """
+
+    def __init__(self, max_entries):
+        self._entries = deque(maxlen=max_entries)
+        self._new_entries = deque(maxlen=max_entries)
+        self._next_entry_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, log_level, message):
+        """Appends a new entry
+
+        :param int log_level: The log level of the entry
+        :param str message: The formatted log message
+        :return: True, if the entry is the only one not yet fetched, i.e. if the consumer has to be triggered
+        :rtype: bool
+        """
+        with self._lock:
+            entry = LogEntry(self._next_entry_id, log_level, message)
+            self._next_entry_id += 1
+            self._entries.append(entry)
+            self._new_entries.append(entry)
+            return len(self._new_entries) == 1
+
+    def has_new_entries(self):
+        """Whether entries were appended since the last call of :meth:`fetch_new_entries`"""
+        return len(self._new_entries) > 0
+
+    def fetch_new_entries(self, max_count=None):
+        """Removes and returns the oldest entries, which were not yet fetched
+
+        :param int max_count: The maximum number of returned entries, if None, all new entries are returned
+        :return: The entries in the order of their creation
+        :rtype: list[LogEntry]
+        """
+        with self._lock:
+            if max_count is None or max_count >= len(self._new_entries):
+                entries = list(self._new_entries)
+                self._new_entries.clear()
+            else:
+                entries = [self._new_entries.popleft() for _ in range(max_count)]
+        return entries
+
+    def get_entries(self, condition=None, before_id=None, after_id=None, max_count=None):
+        """Returns stored entries
+
+        By default, the latest entries are returned. If `before_id` is given, the latest entries older than the
+        entry with this id are returned, if `after_id` is given, the oldest entries newer than the entry with this id.
+
+        :param condition: Optional function, which is called with an entry and returns whether to return the entry
+        :param int before_id: Only return entries older than the entry with this id
+        :param int after_id: Only return entries newer than the entry with this id
+        :param int max_count: The maximum number of returned entries
+        :return: The entries in the order of their creation
+        :rtype: list[LogEntry]
+        """
+        entries = []
+        with self._lock:
+            if not self._entries:
+                return entries
+            first_id = self._entries[0].entry_id
+            if after_id is not None:
+                for entry in islice(self._entries, max(0, after_id + 1 - first_id), None):
+                    if condition is None or condition(entry):
+                        entries.append(entry)
+                        if max_count is not None and len(entries) >= max_count:
+                            break
+                return entries
+            if before_id is None:
+                candidates = reversed(self._entries)
+            else:
+                candidates = reversed(list(islice(self._entries, 0, max(0, before_id - first_id))))
+            for entry in candidates:
+                if condition is None or condition(entry):
+                    entries.append(entry)
+                    if max_count is not None and len(entries) >= max_count:
+                        break
+        entries.reverse()
+        return entries
+
+    def clear(self):
+        """Removes all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._new_entries.clear()
@@ -54,8 +54,20 @@ def orify(e, changed_callback):
         e.set = lambda: or_set(e)
         e.clear = lambda: or_clear(e)
         e.callbacks = list()
-    # Keep track of one callback per multi event
-    e.callbacks.append(changed_callback)
+    # Keep track of one callback per multi event, copy on write as the callbacks are called without lock
+    e.callbacks = e.callbacks + [changed_callback]
+
+
+def remove_callback(e, changed_callback):
+    """Remove a callback added to an event by :func:`orify`
+
+    :param e: the orified event
+    :param changed_callback: the callback to remove
+    """
+    if hasattr(e, "callbacks") and changed_callback in e.callbacks:
+        callbacks = list(e.callbacks)
+        callbacks.remove(changed_callback)
+        e.callbacks = callbacks
 
 
 def create(*events):
@@ -20,8 +20,15 @@ import json
 import yaml
 from time import gmtime, strftime, strptime, mktime
 
+from jsonconversion.conversion import get_class_from_qualified_name, string2type
 from jsonconversion.decoder import JSONObjectDecoder
 from jsonconversion.encoder import JSONObjectEncoder
+from jsonconversion.jsonobject import JSONObject
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 substitute_modules = {
     # backward compatibiliy (remove in next minor release): state elements
@@ -61,6 +68,124 @@ substitute_modules = {
 }
 
 
+#: The module name of builtin types in the json files, which is the name of Python 2 to keep the format
+BUILTINS_STR = "__builtin__"
+
+# Type tables of the json codec: qualified names of the classes mapped by the classes (encoding) and vice versa
+# (decoding). Builtin types are registered upfront, all other classes (e.g. states and state elements) when first
+# encoded or decoded. Thus, classes do not need to be looked up by their module path for each object.
+_qualified_names = {}
+_classes = {}
+_types = {}
+
+
+def _register_builtin_types():
+    for builtin_type in (tuple, set, int, float, str, bool, list, dict, object, type(None)):
+        qualified_name = BUILTINS_STR + "." + builtin_type.__name__
+        _qualified_names[builtin_type] = qualified_name
+        for name in (qualified_name, "builtins." + builtin_type.__name__):
+            _classes[name] = builtin_type
+            _types[name] = builtin_type
+        _types[builtin_type.__name__] = builtin_type
+    if np:
+        _classes["numpy.ndarray"] = np.ndarray
+
+
+_register_builtin_types()
+
+
+def _get_qualified_name(cls):
+    try:
+        return _qualified_names[cls]
+    except KeyError:
+        module = cls.__module__
+        qualified_name = (BUILTINS_STR if module in ("builtins", "__builtin__") else module) + "." + cls.__name__
+        _qualified_names[cls] = qualified_name
+        return qualified_name
+
+
+def _get_class(qualified_name):
+    try:
+        return _classes[qualified_name]
+    except KeyError:
+        cls = get_class_from_qualified_name(substitute_modules.get(qualified_name, qualified_name))
+        _classes[qualified_name] = cls
+        return cls
+
+
+def _get_type(type_string):
+    try:
+        return _types[type_string]
+    except KeyError:
+        type_object = string2type(substitute_modules.get(type_string, type_string))
+        _types[type_string] = type_object
+        return type_object
+
+
+def _to_json_tree(obj):
+    """Converts an object into a tree of dicts, lists and basic types, which can be encoded by the json module
+
+    The result is identical to the conversions of the :class:`jsonconversion.encoder.JSONObjectEncoder`:
+    :class:`JSONObject`\ s are converted using their `to_dict` method, tuples, sets and numpy arrays are converted to
+    dicts with their items and types are converted to their qualified names.
+    """
+    if obj is None or obj.__class__ in (str, int, float, bool):
+        return obj
+    if isinstance(obj, (tuple, set)):
+        return {'__jsonqualname__': _qualified_names[tuple if isinstance(obj, tuple) else set],
+                'items': [_to_json_tree(item) for item in obj]}
+    if isinstance(obj, dict):
+        return {key: _to_json_tree(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_to_json_tree(item) for item in obj]
+    if isinstance(obj, (str, int, float)):
+        return obj
+    if isinstance(obj, JSONObject):
+        dictionary = {key: _to_json_tree(value) for key, value in obj.to_dict().items()}
+        dictionary['__jsonqualname__'] = _get_qualified_name(obj.__class__)
+        return dictionary
+    if isinstance(obj, type):
+        return {'__type__': _get_qualified_name(obj)}
+    if np and isinstance(obj, np.ndarray):
+        return {'__jsonqualname__': "numpy.ndarray", "items": obj.tolist()}
+    raise TypeError("Object of type {0} is not JSON serializable".format(obj.__class__.__name__))
+
+
+def _int_key(key):
+    # int() only accepts strings starting with a sign or a digit (ignoring whitespace), so that exceptions are avoided
+    # for the vast majority of keys
+    stripped_key = key.strip()
+    if stripped_key and (stripped_key[0].isdigit() or stripped_key[0] in "+-"):
+        try:
+            return int(key)
+        except ValueError:
+            pass
+    return key
+
+
+def _from_json_tree(dictionary):
+    """Object hook of the json decoder reverting :func:`_to_json_tree`
+
+    The result is identical to the one of :class:`jsonconversion.decoder.JSONObjectDecoder`: dicts with a qualified
+    name are converted into objects of the class, type names into types and keys are converted to integers, where
+    possible.
+    """
+    if '__jsonqualname__' in dictionary:
+        cls = _get_class(dictionary.pop('__jsonqualname__'))
+        if cls is tuple:
+            return tuple(dictionary['items'])
+        if cls is set:
+            return set(dictionary['items'])
+        if np and cls is np.ndarray:
+            return np.array(dictionary['items'])
+        if hasattr(cls, "from_dict"):
+            return cls.from_dict(dictionary)
+        return dictionary
+    if '__type__' in dictionary:
+        return _get_type(dictionary['__type__'])
+    return {_int_key(key): value for key, value in dictionary.items()}
+
+
 TIME_STRING_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
@@ -99,16 +224,34 @@ def load_dict_from_yaml(path):
     return dictionary
 
 
-def write_dict_to_json(dictionary, path, **kwargs):
+def dump_objects_to_json_string(dictionary, compact=False, **kwargs):
+    """
+    Convert a dictionary to the json string written by :func:`write_dict_to_json`.
+
+    The objects are converted using pre-registered type tables (see :func:`_to_json_tree`), which is considerably
+    faster than the :class:`jsonconversion.encoder.JSONObjectEncoder`, while producing the same output.
+    :param dictionary: The dictionary to convert
+    :param bool compact: If True, the json string is neither indented nor contains spaces, which is much faster to
+        generate, e.g. for machine-generated copies such as auto-backups
+    :param kwargs: optional additional parameters for dumper
+    :return: the json string
+    """
+    if compact:
+        return json.dumps(_to_json_tree(dictionary), separators=(',', ':'), sort_keys=True, check_circular=False,
+                          **kwargs)
+    return json.dumps(_to_json_tree(dictionary), indent=4, separators=(', ', ': '), sort_keys=True,
+                      check_circular=False, **kwargs)
+
+
+def write_dict_to_json(dictionary, path, compact=False, **kwargs):
     """
     Write a dictionary to a json file.
     :param path: The relative path to save the dictionary to
     :param dictionary: The dictionary to get saved
+    :param bool compact: Whether to write compact json (see :func:`dump_objects_to_json_string`)
     :param kwargs: optional additional parameters for dumper
     """
-    result_string = json.dumps(dictionary, cls=JSONObjectEncoder,
-                               indent=4, separators=(', ', ': '), builtins_str="__builtin__", sort_keys=True,
-                               check_circular=False, **kwargs)
+    result_string = dump_objects_to_json_string(dictionary, compact, **kwargs)
     with open(path, 'w') as f:
         # We cannot write directly to the file, as otherwise the 'encode' method wouldn't be called
         f.write(result_string)
@@ -120,10 +263,19 @@ def load_objects_from_json(path, as_dict=False):
     :param path: The relative path of the json file.
     :return: The dictionary specified in the json file
     """
-    f = open(path, 'r')
+    with open(path, 'r') as f:
+        return load_objects_from_json_string(f.read(), as_dict)
+
+
+def load_objects_from_json_string(json_string, as_dict=False):
+    """Loads a dictionary from a json string, e.g. the content of a json file read before.
+
+    The objects are created using pre-registered type tables (see :func:`_from_json_tree`), which is considerably
+    faster than the :class:`jsonconversion.decoder.JSONObjectDecoder`, while producing the same objects.
+
+    :param str json_string: The json string
+    :return: The dictionary specified in the json string
+    """
     if as_dict:
-        result = json.load(f)
-    else:
-        result = json.load(f, cls=JSONObjectDecoder, substitute_modules=substitute_modules)
-    f.close()
-    return result
+        return json.loads(json_string)
+    return json.loads(json_string, object_hook=_from_json_tree)
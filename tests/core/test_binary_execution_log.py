@@ -0,0 +1,96 @@
+import os
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage as global_storage
+from rafcon.core.execution.binary_log import BinaryExecutionHistoryStorage, BinaryLogReader, is_binary_log
+import rafcon.utils.execution_log as log_helper
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def test_binary_log_storage():
+    filename = os.path.join(testing_utils.get_unique_temp_path(), "test.binlog")
+    storage = BinaryExecutionHistoryStorage(filename, max_queue_size=10)
+    for index in range(100):
+        storage.store_item("item{0}".format(index), {"index": index, "data": b"x" * index})
+    assert storage.get_item("item42") == {"index": 42, "data": b"x" * 42}
+    assert storage.get_item("unknown") is None
+    storage.close()
+    assert storage.get_item("item99")["index"] == 99
+    assert is_binary_log(filename)
+
+    with BinaryLogReader(filename) as reader:
+        assert len(reader) == 100
+        assert "item7" in reader
+        assert reader["item7"]["index"] == 7
+        # the records are streamed in the order they were written
+        assert [value["index"] for value in reader.values()] == list(range(100))
+
+    # an incompletely written record is ignored
+    with open(filename, "rb+") as log_file:
+        log_file.truncate(os.path.getsize(filename) - 10)
+    with BinaryLogReader(filename) as reader:
+        assert len(reader) == 99
+        assert len(list(reader.items())) == 99
+
+
+def test_binary_log_write_error():
+    filename = os.path.join(testing_utils.get_unique_temp_path(), "test.binlog")
+    storage = BinaryExecutionHistoryStorage(filename, max_queue_size=2)
+    # the writer fails on the closed file, then neither storing items nor closing the log must block
+    storage._file.close()
+    for index in range(100):
+        storage.store_item("item{0}".format(index), {"index": index})
+    storage.flush()
+    assert storage.error is not None
+    storage.close()
+    assert not storage._writer.is_alive()
+
+
+@pytest.mark.parametrize("compression", [False, True])
+def test_binary_execution_log(caplog, compression):
+    testing_utils.initialize_environment_core(
+        core_config={'EXECUTION_LOG_ENABLE': True,
+                     'EXECUTION_LOG_FORMAT': 'binary',
+                     'EXECUTION_LOG_COMPRESSION': compression,
+                     'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path() + '/test_execution_log'})
+    try:
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        filename = state_machine.get_last_execution_log_filename()
+        assert filename.endswith(".binlog")
+        execution_log = log_helper.open_execution_log(filename)
+        assert len(execution_log) == 36
+
+        start, next_, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(execution_log)
+        prod2 = [v for v in collapsed_items.values() if v['state_name'] == 'MakeProd2'][0]
+        assert prod2['data_ins']['input_1'] == 0
+        assert prod2['data_outs']['output_1'] == 3
+        assert prod2['scoped_data_outs']['product'] == 1
+
+        try:
+            df = log_helper.log_to_DataFrame(execution_log)
+            all_starts = df.groupby('state_name').get_group('Start')
+            assert list(all_starts['outcome_name']) == ['success', 'success', 'done']
+        except ImportError:  # if pandas is not installed
+            pass
+        execution_log.close()
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        global_config.set_config_value('EXECUTION_LOG_FORMAT', 'shelve')
+        global_config.set_config_value('EXECUTION_LOG_COMPRESSION', False)
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+from rafcon.core.execution.execution_history import CallItem, ReturnItem
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.utils import log
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.utils import wait_for_execution_engine_sync_counter
+
+logger = log.get_logger(__name__)
+
+LOOP_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["counter"] = inputs["counter"] + 1
+    return "loop" if outputs["counter"] < 20 else "done"
+"""
+
+# state machine start item, call and return item of the root state and a call and return item per iteration
+NUMBER_OF_HISTORY_ITEMS = 1 + 2 + 2 * 20
+
+
+def create_loop_state_machine():
+    loop_state = ExecutionState("Loop", state_id="LOOP")
+    loop_state.add_input_data_port("counter", "int", 0, data_port_id=1)
+    loop_state.add_output_data_port("counter", "int", 0, data_port_id=2)
+    loop_state.add_outcome("loop", 1)
+    loop_state.add_outcome("done", 2)
+    loop_state.script_text = LOOP_SCRIPT
+
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_scoped_variable("counter", "int", 0, scoped_variable_id=11)
+    root_state.add_state(loop_state)
+    root_state.set_start_state(loop_state.state_id)
+    root_state.add_transition(loop_state.state_id, 1, loop_state.state_id, None)
+    root_state.add_transition(loop_state.state_id, 2, root_state.state_id, 0)
+    root_state.add_data_flow(root_state.state_id, 11, loop_state.state_id, 1)
+    root_state.add_data_flow(loop_state.state_id, 2, root_state.state_id, 11)
+    return StateMachine(root_state)
+
+
+@pytest.mark.parametrize("log_enabled", [True, False])
+def test_bounded_history(caplog, log_enabled):
+    testing_utils.initialize_environment_core({
+        "EXECUTION_HISTORY_MAX_ITEMS": 10,
+        "EXECUTION_LOG_ENABLE": log_enabled,
+        "EXECUTION_LOG_PATH": testing_utils.get_unique_temp_path(),
+    })
+    try:
+        state_machine = create_loop_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+
+        execution_history = state_machine.execution_histories[0]
+        assert len(execution_history) == 10
+        assert execution_history.number_of_evicted_items == NUMBER_OF_HISTORY_ITEMS - 10
+        assert execution_history[0].prev is None
+        # the call item of the root state was evicted
+        assert not execution_history.is_backward_step_possible()
+
+        records = execution_history.get_evicted_item_records(5)
+        if not log_enabled:
+            assert records == []
+            return
+        assert len(records) == 5
+        first_record = execution_history.execution_history_storage.get_item(execution_history[0].history_item_id)
+        assert first_record['prev_history_item_id'] == records[0]['history_item_id']
+        for newer_record, older_record in zip(records, records[1:]):
+            assert newer_record['prev_history_item_id'] == older_record['history_item_id']
+        assert execution_history.get_evicted_item_records(5, offset=3)[0] == records[3]
+
+        all_records = execution_history.get_evicted_item_records(NUMBER_OF_HISTORY_ITEMS)
+        assert len(all_records) == execution_history.number_of_evicted_items
+        assert all_records[-1]['item_type'] == 'StateMachineStartItem'
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_backward_step_within_retained_window(caplog):
+    testing_utils.initialize_environment_core({"EXECUTION_HISTORY_MAX_ITEMS": 4})
+    try:
+        state_machine = create_loop_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        with state_machine_execution_engine._status.execution_condition_variable:
+            state_machine_execution_engine.synchronization_counter = 0
+
+        state_machine_execution_engine.step_mode(state_machine.state_machine_id)
+        wait_for_execution_engine_sync_counter(1, logger)
+        for _ in range(5):
+            state_machine_execution_engine.step_into()
+            wait_for_execution_engine_sync_counter(1, logger)
+
+        execution_history = state_machine.execution_histories[0]
+        assert execution_history.number_of_evicted_items > 0
+        assert isinstance(execution_history.get_last_history_item(), ReturnItem)
+
+        # one step back is possible, the call item of the last loop iteration is retained
+        state_machine_execution_engine.backward_step()
+        wait_for_execution_engine_sync_counter(1, logger)
+        assert isinstance(execution_history.get_last_history_item(), ReturnItem)
+        assert not execution_history.is_backward_step_possible()
+
+        # further backward steps are refused and the execution switches back to the step mode
+        state_machine_execution_engine.backward_step()
+        wait_for_execution_engine_sync_counter(1, logger)
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.STEP_MODE
+
+        state_machine_execution_engine.stop()
+        state_machine_execution_engine.join()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -95,6 +95,90 @@ def test_concurrency_barrier_save_load(caplog):
     finally:
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=1)
 
+
+SLOW_SCRIPT = """
+import time
+def execute(self, inputs, outputs, gvm):
+    # wait for the output of the fast state to be merged into the scoped data of the barrier state
+    end_time = time.time() + 5
+    while time.time() < end_time and not any(key.endswith("FAST") for key in self.parent.scoped_data):
+        self.preemptive_wait(0.01)
+    outputs["fast_output_merged"] = any(key.endswith("FAST") for key in self.parent.scoped_data)
+    return 0
+"""
+
+FAST_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["fast_output_merged"] = True
+    return 0
+"""
+
+EARLY_DECIDER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    assert self.wait_for_children(["FAST"], timeout=5)
+    outputs["finished_first"] = sorted(self.final_outcomes_dict.keys())
+    outputs["fast_input"] = inputs["fast_input"]
+    self.wait_for_children()
+    outputs["finished_last"] = sorted(self.final_outcomes_dict.keys())
+    return 0
+"""
+
+
+def create_as_completed_barrier_state(decider_early_start):
+    barrier_state = BarrierConcurrencyState("Barrier", "BARRIER", decider_early_start=decider_early_start)
+    for state_id, script in [("SLOW", SLOW_SCRIPT), ("FAST", FAST_SCRIPT)]:
+        state = ExecutionState(state_id.capitalize(), state_id)
+        state.add_output_data_port("fast_output_merged", "bool", data_port_id=1)
+        state.script_text = script
+        barrier_state.add_state(state)
+        output_port_id = barrier_state.add_output_data_port(state_id, "bool")
+        barrier_state.add_data_flow(state_id, 1, barrier_state.state_id, output_port_id)
+    decider_state = barrier_state.states[UNIQUE_DECIDER_STATE_ID]
+    decider_state.add_output_data_port("finished_first", "list", data_port_id=1)
+    decider_state.add_output_data_port("finished_last", "list", data_port_id=2)
+    decider_state.add_output_data_port("fast_input", "bool", data_port_id=3)
+    decider_state.add_input_data_port("fast_input", "bool", data_port_id=4)
+    barrier_state.add_data_flow("FAST", 1, UNIQUE_DECIDER_STATE_ID, 4)
+    for name, port_id, data_type in [("finished_first", 1, "list"), ("finished_last", 2, "list"),
+                                     ("fast_input", 3, "bool")]:
+        output_port_id = barrier_state.add_output_data_port(name, data_type)
+        barrier_state.add_data_flow(UNIQUE_DECIDER_STATE_ID, port_id, barrier_state.state_id, output_port_id)
+    decider_state.script_text = EARLY_DECIDER_SCRIPT
+    barrier_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, barrier_state.state_id, 0)
+    return barrier_state
+
+
+@pytest.mark.parametrize("decider_early_start", [False, True])
+def test_concurrency_barrier_as_completed(caplog, decider_early_start):
+    testing_utils.initialize_environment_core()
+    try:
+        barrier_state = create_as_completed_barrier_state(decider_early_start)
+        state_machine = StateMachine(barrier_state)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        assert barrier_state.final_outcome.outcome_id == 0
+        # the output of the fast state is merged, while the slow state is still running
+        assert barrier_state.output_data["SLOW"] is True
+        assert barrier_state.output_data["finished_last"] == ["FAST", "SLOW"]
+        # the inputs of the decider state are updated with the data of the finished child states
+        assert barrier_state.output_data["fast_input"] is True
+        if decider_early_start:
+            # the decider state sees the partial results
+            assert barrier_state.output_data["finished_first"] == ["FAST"]
+        else:
+            assert barrier_state.output_data["finished_first"] == ["FAST", "SLOW"]
+
+        test_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, test_path)
+        loaded_state_machine = storage.load_state_machine_from_path(test_path)
+        assert loaded_state_machine.root_state.decider_early_start is decider_early_start
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
 if __name__ == '__main__':
     test_create_barrier_state_with_predefined_decider_state()
     test_concurrency_barrier_save_load(None)
@@ -0,0 +1,138 @@
+from copy import copy
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+
+# test environment elements
+import pytest
+
+
+def create_hierarchy_state():
+    state1 = ExecutionState("State1", state_id="STATE1")
+    state1.add_input_data_port("in", "int", 0, data_port_id=1)
+    state1.add_output_data_port("out", "int", 0, data_port_id=2)
+    state1.add_outcome("next", 3)
+
+    state2 = ExecutionState("State2", state_id="STATE2")
+    state2.add_input_data_port("in", "int", 0, data_port_id=1)
+    state2.add_output_data_port("out", "int", 0, data_port_id=2)
+
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_input_data_port("in", "int", 0, data_port_id=10)
+    root_state.add_output_data_port("out", "int", 0, data_port_id=11)
+    root_state.add_scoped_variable("scoped", "int", 0, scoped_variable_id=12)
+    root_state.add_state(state1)
+    root_state.add_state(state2)
+    root_state.set_start_state(state1.state_id)
+    root_state.add_transition(state1.state_id, 3, state2.state_id, None)
+    root_state.add_transition(state2.state_id, 0, root_state.state_id, 0)
+
+    root_state.add_data_flow(root_state.state_id, 10, state1.state_id, 1)
+    root_state.add_data_flow(state1.state_id, 2, state2.state_id, 1)
+    root_state.add_data_flow(state1.state_id, 2, root_state.state_id, 12)
+    root_state.add_data_flow(root_state.state_id, 12, state2.state_id, 1)
+    root_state.add_data_flow(state2.state_id, 2, root_state.state_id, 11)
+    return root_state
+
+
+def assert_indexes_consistent(container_state):
+    """Compares the results of the index lookups with a full scan of the connections"""
+    for transition in container_state.transitions.values():
+        origin = (transition.from_state, transition.from_outcome)
+        assert container_state.get_transition_by_origin(*origin) is transition
+    for data_flow in container_state.data_flows.values():
+        origin = (data_flow.from_state, data_flow.from_key)
+        target = (data_flow.to_state, data_flow.to_key)
+        assert container_state.get_data_flows_by_origin(*origin) == \
+            tuple(df for df in container_state.data_flows.values() if (df.from_state, df.from_key) == origin)
+        assert container_state.get_data_flows_by_target(*target) == \
+            tuple(df for df in container_state.data_flows.values() if (df.to_state, df.to_key) == target)
+
+
+def test_index_add_remove():
+    root_state = create_hierarchy_state()
+    assert_indexes_consistent(root_state)
+    assert len(root_state.get_data_flows_by_origin("STATE1", 2)) == 2
+    assert root_state.get_transition_by_origin("STATE2", 1) is None
+
+    # incremental updates on an already built index
+    transition_id = root_state.add_transition("STATE2", -1, "ROOT", -1)
+    assert root_state.get_transition_by_origin("STATE2", -1) is root_state.transitions[transition_id]
+    root_state.remove_transition(transition_id)
+    assert root_state.get_transition_by_origin("STATE2", -1) is None
+
+    data_flow_id = root_state.add_data_flow("ROOT", 10, "ROOT", 12)
+    assert root_state.get_data_flows_by_target("ROOT", 12)[-1] is root_state.data_flows[data_flow_id]
+    root_state.remove_data_flow(data_flow_id)
+    assert len(root_state.get_data_flows_by_target("ROOT", 12)) == 1
+    assert_indexes_consistent(root_state)
+
+    root_state.remove_state("STATE2")
+    assert root_state.get_data_flows_by_origin("ROOT", 12) == ()
+    assert_indexes_consistent(root_state)
+
+
+def test_index_modifications():
+    root_state = create_hierarchy_state()
+    assert_indexes_consistent(root_state)
+
+    transition = root_state.get_transition_by_origin("STATE1", 3)
+    transition.modify_target("ROOT", 0)
+    assert root_state.get_transition_by_origin("STATE1", 3).to_state == "ROOT"
+
+    data_flow = root_state.get_data_flows_by_target("STATE2", 1)[0]
+    data_flow.modify_origin("ROOT", 10)
+    assert data_flow in root_state.get_data_flows_by_origin("ROOT", 10)
+    assert data_flow not in root_state.get_data_flows_by_origin("STATE1", 2)
+    assert_indexes_consistent(root_state)
+
+    # invalid modifications are reverted and must not corrupt the index
+    with pytest.raises(ValueError):
+        data_flow.modify_target("STATE1", 2)
+    assert_indexes_consistent(root_state)
+
+    root_state.change_state_id("NEWROOT")
+    assert root_state.get_data_flows_by_target("ROOT", 11) == ()
+    assert len(root_state.get_data_flows_by_target("NEWROOT", 11)) == 1
+    assert_indexes_consistent(root_state)
+
+    root_state.data_flows = {}
+    assert root_state.get_data_flows_by_target("NEWROOT", 11) == ()
+    root_state.transitions = {}
+    assert root_state.get_transition_by_origin("STATE1", 3) is None
+
+
+def test_index_lookup_during_rejected_modification():
+    """The index must not keep the rejected value of a connection, which was looked up during its validity check"""
+    root_state = create_hierarchy_state()
+    transition = root_state.get_transition_by_origin("STATE1", 3)
+    check_transition_validity = root_state._check_transition_validity
+
+    def check_transition_validity_with_lookup(check_transition):
+        # e.g. a waiting execution rebuilds the index, while the transition already holds the new value
+        root_state._invalidate_connection_indexes()
+        assert root_state.get_transition_by_origin("STATE1", 4) is transition
+        return check_transition_validity(check_transition)
+
+    root_state._check_transition_validity = check_transition_validity_with_lookup
+    with pytest.raises(ValueError):
+        transition.from_outcome = 4
+    with pytest.raises(ValueError):
+        transition.modify_origin("STATE1", 4)
+    assert root_state.get_transition_by_origin("STATE1", 4) is None
+    assert root_state.get_transition_by_origin("STATE1", 3) is transition
+    assert_indexes_consistent(root_state)
+
+
+def test_index_of_copy():
+    root_state = create_hierarchy_state()
+    assert_indexes_consistent(root_state)
+    root_state_copy = copy(root_state)
+    for data_flow in root_state_copy.get_data_flows_by_origin("STATE1", 2):
+        assert data_flow.parent is root_state_copy
+    assert_indexes_consistent(root_state_copy)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
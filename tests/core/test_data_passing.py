@@ -0,0 +1,93 @@
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.execution.data_passing import pass_value, DEEP_COPY, SHARE, READ_ONLY
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+PRODUCER_SCRIPT = """
+import numpy as np
+def execute(self, inputs, outputs, gvm):
+    outputs["data"] = np.zeros((100, 100))
+    return 0
+"""
+
+CONSUMER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["writeable"] = inputs["data"].flags.writeable
+    return 0
+"""
+
+
+def create_state_machine():
+    producer = ExecutionState("Producer", state_id="PRODUCER")
+    producer.add_output_data_port("data", "numpy.ndarray", data_port_id=1)
+    producer.script_text = PRODUCER_SCRIPT
+
+    consumer = ExecutionState("Consumer", state_id="CONSUMER")
+    consumer.add_input_data_port("data", "numpy.ndarray", data_port_id=1)
+    consumer.add_output_data_port("writeable", "bool", data_port_id=2)
+    consumer.script_text = CONSUMER_SCRIPT
+
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_output_data_port("writeable", "bool", data_port_id=10)
+    root_state.add_state(producer)
+    root_state.add_state(consumer)
+    root_state.set_start_state(producer.state_id)
+    root_state.add_transition(producer.state_id, 0, consumer.state_id, None)
+    root_state.add_transition(consumer.state_id, 0, root_state.state_id, 0)
+    root_state.add_data_flow(producer.state_id, 1, consumer.state_id, 1)
+    root_state.add_data_flow(consumer.state_id, 2, root_state.state_id, 10)
+    return StateMachine(root_state)
+
+
+def test_pass_value_policies():
+    np = pytest.importorskip("numpy")
+    testing_utils.initialize_environment_core()
+    try:
+        array = np.ones(10)
+        values = {"list": [[1, 2], [3]], "array": array}
+
+        assert pass_value(values) is not values
+        assert pass_value(values)["list"] == values["list"]
+
+        global_config.set_config_value("DATA_PASSING_POLICIES", {"dict": SHARE, "numpy.ndarray": READ_ONLY})
+        assert pass_value(values) is values
+        read_only_array = pass_value(array)
+        assert np.shares_memory(read_only_array, array)
+        assert not read_only_array.flags.writeable
+        assert array.flags.writeable
+        with pytest.raises(ValueError):
+            read_only_array[0] = 0.
+        # types without read-only representation fall back to a deep copy
+        global_config.set_config_value("DATA_PASSING_POLICIES", {"list": READ_ONLY})
+        assert pass_value(values["list"]) is not values["list"]
+
+        global_config.set_config_value("DATA_PASSING_POLICIES", {"numpy.ndarray": DEEP_COPY})
+        assert not np.shares_memory(pass_value(array), array)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+
+
+@pytest.mark.parametrize("policy", [DEEP_COPY, READ_ONLY])
+def test_read_only_data_flow(caplog, policy):
+    pytest.importorskip("numpy")
+    testing_utils.initialize_environment_core({"DATA_PASSING_POLICIES": {"numpy.ndarray": policy}})
+    try:
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["writeable"] is (policy == DEEP_COPY)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
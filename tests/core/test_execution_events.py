@@ -0,0 +1,127 @@
+import threading
+import time
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+from rafcon.core.execution import execution_events
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+def create_state_machine(connect_outcome=True):
+    first = ExecutionState("First", state_id="FIRST")
+    first.script_text = SCRIPT
+    second = ExecutionState("Second", state_id="SECOND")
+    second.script_text = SCRIPT
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_state(first)
+    root_state.add_state(second)
+    root_state.set_start_state(first.state_id)
+    if connect_outcome:
+        root_state.add_transition(first.state_id, 0, second.state_id, None)
+    root_state.add_transition(second.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_execution_events(caplog):
+    testing_utils.initialize_environment_core()
+    entered_states = []
+    execution_modes = []
+    finished_state_machines = []
+
+    def on_state_entered(state):
+        entered_states.append(state.name)
+
+    def on_finished(state_machine):
+        finished_state_machines.append(state_machine)
+
+    state_machine_execution_engine.add_event_callback(execution_events.STATE_ENTERED, on_state_entered)
+    state_machine_execution_engine.add_event_callback(execution_events.EXECUTION_MODE_CHANGED, execution_modes.append)
+    state_machine_execution_engine.add_event_callback(execution_events.FINISHED, on_finished)
+    try:
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        done_callback_results = []
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine.execution_finished.add_done_callback(lambda future: done_callback_results.append(future.result()))
+
+        assert state_machine.wait_for_execution_finished(timeout=5)
+        assert state_machine_execution_engine.join(timeout=5)
+        assert state_machine_execution_engine.execution_finished.result() is state_machine
+        assert done_callback_results[0].name == "success"
+        assert entered_states == ["Root", "First", "Second"]
+        assert finished_state_machines == [state_machine]
+        assert execution_modes[0] is StateMachineExecutionStatus.STARTED
+        assert execution_modes[-1] is StateMachineExecutionStatus.FINISHED
+    finally:
+        state_machine_execution_engine.remove_event_callback(execution_events.STATE_ENTERED, on_state_entered)
+        state_machine_execution_engine.remove_event_callback(execution_events.EXECUTION_MODE_CHANGED,
+                                                             execution_modes.append)
+        state_machine_execution_engine.remove_event_callback(execution_events.FINISHED, on_finished)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def wait_for_missing_transition(state_machine):
+    """Starts the state machine and waits until the root state waits for the transition of the first state"""
+    first_state_finished = threading.Event()
+
+    def on_state_entered(state):
+        if state.name == "First":
+            first_state_finished.set()
+    state_machine_execution_engine.add_event_callback(execution_events.STATE_ENTERED, on_state_entered)
+    try:
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        assert first_state_finished.wait(5)
+    finally:
+        state_machine_execution_engine.remove_event_callback(execution_events.STATE_ENTERED, on_state_entered)
+    # give the root state time to run into the wait for the missing transition
+    time.sleep(0.2)
+
+
+def test_wake_up_on_new_transition(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine(connect_outcome=False)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        wait_for_missing_transition(state_machine)
+        assert not state_machine.execution_finished.done()
+
+        start = time.time()
+        state_machine.root_state.add_transition("FIRST", 0, "SECOND", None)
+        assert state_machine_execution_engine.join(timeout=2)
+        # the root state waited for the transition without polling
+        assert time.time() - start < 1.
+        assert state_machine.root_state.final_outcome.name == "success"
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=1)
+
+
+def test_wake_up_on_stop(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine(connect_outcome=False)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        wait_for_missing_transition(state_machine)
+
+        start = time.time()
+        state_machine_execution_engine.stop()
+        assert state_machine_execution_engine.join(timeout=2)
+        assert time.time() - start < 1.
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
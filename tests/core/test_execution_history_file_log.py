@@ -62,6 +62,74 @@ def test_execution_log(caplog):
     finally:
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
 
+@pytest.mark.parametrize("log_format", ["shelve", "binary"])
+def test_streaming_execution_log_analysis(caplog, log_format):
+    from rafcon.core.config import global_config
+    testing_utils.initialize_environment_core(
+        core_config={'EXECUTION_LOG_ENABLE': True,
+                     'EXECUTION_LOG_FORMAT': log_format,
+                     'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
+    try:
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        execution_log = log_helper.open_execution_log(state_machine.get_last_execution_log_filename())
+        start, next_, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(execution_log)
+        collapsed_items.pop(start['run_id'])
+
+        streamed_items = list(log_helper.iter_collapsed_items(execution_log))
+        assert len(streamed_items) == len(collapsed_items)
+        for item in streamed_items:
+            collapsed_item = collapsed_items[item['run_id']]
+            assert sorted(item.keys()) == sorted(collapsed_item.keys())
+            for key in ['state_name', 'path', 'outcome_name', 'timestamp_call', 'timestamp_return']:
+                assert item[key] == collapsed_item[key]
+            for key in ['data_ins', 'data_outs', 'scoped_data_ins', 'scoped_data_outs']:
+                assert sorted(item[key].keys()) == sorted(collapsed_item[key].keys())
+
+        relations = list(log_helper.iter_execution_graph(execution_log))
+        assert len(relations) == len(execution_log)
+        assert sum(1 for relation in relations if relation[0] == 'start') == 1
+        start, previous, next_, concurrent, grouped = log_helper.log_to_raw_structure(execution_log)
+        assert sorted((prev_id, item_id) for relation, prev_id, item_id, _ in relations if relation == 'concurrent') == \
+            sorted((prev_id, item_id) for prev_id, item_ids in concurrent.items() for item_id in item_ids)
+
+        # filter by state path
+        start_states = list(log_helper.iter_collapsed_items(execution_log, state_path="Root/Start"))
+        assert [item['outcome_name'] for item in start_states] == ['success', 'success', 'done']
+        factory_path = [item['path'] for item in streamed_items if item['state_name'] == 'Factory'][0]
+        factory_items = list(log_helper.iter_collapsed_items(execution_log, state_path=factory_path))
+        assert len(factory_items) == sum(1 for item in streamed_items if item['path'].startswith(factory_path))
+        assert len(factory_items) > 1
+
+        # filter by run_id range and time window
+        run_ids = sorted(item['run_id'] for item in streamed_items)
+        items_in_range = list(log_helper.iter_collapsed_items(execution_log, run_id_range=(run_ids[1], run_ids[3])))
+        assert sorted(item['run_id'] for item in items_in_range) == run_ids[1:4]
+        timestamps = sorted(item['timestamp_call'] for item in streamed_items)
+        items_in_window = list(log_helper.iter_collapsed_items(execution_log, time_window=(timestamps[2], None)))
+        assert len(items_in_window) == sum(1 for timestamp in timestamps if timestamp >= timestamps[2])
+
+        try:
+            chunks = list(log_helper.log_to_DataFrame_chunks(execution_log, chunk_size=4))
+            assert [len(chunk) for chunk in chunks[:-1]] == [4] * (len(chunks) - 1)
+            assert sum(len(chunk) for chunk in chunks) == len(streamed_items)
+            assert list(chunks[0].columns) == list(log_helper.log_to_DataFrame(execution_log).columns)
+        except ImportError:  # if pandas is not installed
+            pass
+        execution_log.close()
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        global_config.set_config_value('EXECUTION_LOG_FORMAT', 'shelve')
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
 if __name__ == '__main__':
     test_execution_log(None)
     # pytest.main([__file__])
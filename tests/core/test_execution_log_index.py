@@ -0,0 +1,87 @@
+import os
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage as global_storage
+from rafcon.core.execution.log_index import ExecutionLogIndex, get_index_filename
+import rafcon.utils.execution_log as log_helper
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def run_execution_file_log_test(log_format):
+    testing_utils.initialize_environment_core(
+        core_config={'EXECUTION_LOG_ENABLE': True,
+                     'EXECUTION_LOG_FORMAT': log_format,
+                     'EXECUTION_LOG_INDEX': True,
+                     'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path() + '/test_execution_log'})
+    state_machine = global_storage.load_state_machine_from_path(
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "execution_file_log_test")))
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+    filename = state_machine.get_last_execution_log_filename()
+    rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    return filename
+
+
+def assert_index_matches_log(filename):
+    execution_log = log_helper.open_execution_log(filename)
+    log_index = log_helper.open_execution_log_index(filename)
+    assert log_index is not None
+    try:
+        assert len(log_index) == len(execution_log)
+
+        start_calls = log_helper.query_execution_log(execution_log, state_path="Root/Start", item_type="CallItem",
+                                                     log_index=log_index)
+        scanned_start_calls = log_helper.query_execution_log(execution_log, state_path="Root/Start",
+                                                             item_type="CallItem")
+        assert sorted(key for key, _ in start_calls) == sorted(key for key, _ in scanned_start_calls)
+
+        streamed_items = list(log_helper.iter_collapsed_items(execution_log))
+        timestamps = sorted(item['timestamp_call'] for item in streamed_items)
+        run_ids = sorted(item['run_id'] for item in streamed_items)
+        for criteria in [dict(state_path="Root/Start"),
+                         dict(state_path=[item['path'] for item in streamed_items
+                                          if item['state_name'] == 'Factory'][0]),
+                         dict(time_window=(timestamps[3], timestamps[-3])),
+                         dict(run_id_range=(run_ids[2], None))]:
+            indexed = list(log_helper.iter_collapsed_items(execution_log, log_index=log_index, **criteria))
+            scanned = list(log_helper.iter_collapsed_items(execution_log, **criteria))
+            assert len(indexed) > 0
+            assert [item['run_id'] for item in indexed] == [item['run_id'] for item in scanned]
+    finally:
+        log_index.close()
+        execution_log.close()
+
+
+@pytest.mark.parametrize("log_format", ["shelve", "binary"])
+def test_execution_log_index(caplog, log_format):
+    try:
+        filename = run_execution_file_log_test(log_format)
+        assert os.path.isfile(get_index_filename(filename))
+        assert_index_matches_log(filename)
+
+        # build the index on demand
+        os.remove(get_index_filename(filename))
+        assert log_helper.open_execution_log_index(filename) is None
+        ExecutionLogIndex.build(filename).close()
+        assert_index_matches_log(filename)
+
+        if log_format == "binary":
+            # the index does not cover records appended afterwards
+            with open(filename, "ab") as log_file:
+                log_file.write(b"\0")
+            assert log_helper.open_execution_log_index(filename) is None
+    finally:
+        global_config.set_config_value('EXECUTION_LOG_FORMAT', 'shelve')
+        global_config.set_config_value('EXECUTION_LOG_INDEX', False)
+        testing_utils.shutdown_environment_only_core(caplog=caplog,
+                                                     expected_warnings=1 if log_format == "binary" else 0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,97 @@
+# core elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+from rafcon.core.execution.execution_status_buffer import ExecutionStatusBuffer, execution_status_buffer
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.state import StateExecutionStatus
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+class ExecutionStatusObserver(object):
+    """Counts the after notifications of the observable state_execution_status setter of a state"""
+
+    def __init__(self, state):
+        self.notifications = 0
+        self._notify_method_after = state._notify_method_after
+        state._notify_method_after = self.notify_method_after
+
+    def notify_method_after(self, instance, method_name, *args):
+        if method_name == "state_execution_status":
+            self.notifications += 1
+        return self._notify_method_after(instance, method_name, *args)
+
+
+def create_state_machine():
+    first = ExecutionState("First", state_id="FIRST")
+    first.script_text = SCRIPT
+    second = ExecutionState("Second", state_id="SECOND")
+    second.script_text = SCRIPT
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_state(first)
+    root_state.add_state(second)
+    root_state.set_start_state(first.state_id)
+    root_state.add_transition(first.state_id, 0, second.state_id, None)
+    root_state.add_transition(second.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_drain_coalesces_changes():
+    buffer = ExecutionStatusBuffer()
+    first = ExecutionState("First")
+    second = ExecutionState("Second")
+    for state in (first, second, first):
+        buffer.record(state)
+    assert buffer.drain() == [second, first]
+    assert buffer.drain() == []
+
+    buffer.enable()
+    buffer.enable()
+    buffer.disable()
+    assert buffer.enabled
+    buffer.record(first)
+    buffer.disable()
+    assert not buffer.enabled
+    assert buffer.drain() == []
+
+
+def test_execution_with_execution_status_buffer(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        root_state = state_machine.root_state
+        observer = ExecutionStatusObserver(root_state.states["FIRST"])
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        assert state_machine.wait_for_execution_finished(timeout=5)
+        state_machine_execution_engine.stop()
+        notifications_without_buffer = observer.notifications
+        assert notifications_without_buffer > 0
+
+        # if the buffer is enabled, the observers are not notified, but the changed states are recorded
+        execution_status_buffer.enable()
+        try:
+            state_machine_execution_engine.start(state_machine.state_machine_id)
+            assert state_machine.wait_for_execution_finished(timeout=5)
+            state_machine_execution_engine.stop()
+            assert observer.notifications == notifications_without_buffer
+            changed_states = execution_status_buffer.drain()
+            assert len(changed_states) == len(set(changed_states))
+            assert {state.state_id for state in changed_states} == {"ROOT", "FIRST", "SECOND"}
+            assert all(state.state_execution_status is StateExecutionStatus.INACTIVE for state in changed_states)
+        finally:
+            execution_status_buffer.disable()
+
+        root_state.states["FIRST"].state_execution_status = StateExecutionStatus.INACTIVE
+        assert observer.notifications == notifications_without_buffer + 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
@@ -1,3 +1,6 @@
+import threading
+import time
+
 from rafcon.core.global_variable_manager import GlobalVariableManager
 import pytest
 from tests import utils as testing_utils
@@ -124,6 +127,112 @@ def test_type_check(caplog):
     assert a == 123
 
 
+def test_versions(caplog):
+    gvm = GlobalVariableManager()
+    assert gvm.get_version('a') == 0
+    assert gvm.get_if_newer('a', 0) == (False, None, 0)
+
+    d = {'a': 1}
+    gvm.set_variable('a', d)
+    version = gvm.get_version('a')
+    assert version > 0
+    newer, value, new_version = gvm.get_if_newer('a', 0)
+    assert newer and value == d and value is not d and new_version == version
+    assert gvm.get_if_newer('a', version) == (False, None, version)
+
+    gvm.set_variable('b', 1)
+    gvm.set_variable('a', 2)
+    assert gvm.get_version('a') > version
+    assert gvm.get_if_newer('a', version)[1] == 2
+
+    gvm.delete_variable('a')
+    assert gvm.get_version('a') == 0
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
+def test_concurrent_access(caplog):
+    gvm = GlobalVariableManager()
+    gvm.set_variable('counter', 0)
+    number_threads = 8
+    number_increments = 100
+
+    def increment():
+        for _ in range(number_increments):
+            access_key = gvm.lock_variable('counter', block=True)
+            counter = gvm.get_variable('counter', access_key=access_key)
+            gvm.set_variable('counter', counter + 1, access_key=access_key)
+            gvm.unlock_variable('counter', access_key)
+
+    def write_and_read(index):
+        key = 'key{}'.format(index)
+        for i in range(number_increments):
+            gvm.set_variable(key, [index, i])
+            assert gvm.get_variable(key) == [index, i]
+
+    threads = [threading.Thread(target=increment) for _ in range(number_threads)]
+    threads += [threading.Thread(target=write_and_read, args=(i,)) for i in range(number_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # no increment got lost
+    assert gvm.get_variable('counter') == number_threads * number_increments
+    assert len(gvm.get_all_keys()) == number_threads + 1
+
+    # readers wait for variables locked by someone else
+    access_key = gvm.lock_variable('counter')
+    values = []
+    reader = threading.Thread(target=lambda: values.append(gvm.get_variable('counter')))
+    reader.start()
+    time.sleep(0.1)
+    assert not values
+    gvm.set_variable('counter', -1, access_key=access_key)
+    gvm.unlock_variable('counter', access_key)
+    reader.join()
+    assert values == [-1]
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
+def test_wait_for_change(caplog):
+    from rafcon.core.states.execution_state import ExecutionState
+    gvm = GlobalVariableManager()
+    gvm.set_variable('a', 1)
+    version = gvm.get_version('a')
+
+    # changes since the given version are returned immediately
+    assert gvm.wait_for_change('a', timeout=0.01) == {}
+    assert gvm.wait_for_change(['a', 'b'], timeout=0.01, since_version=0) == {'a': version}
+
+    changes = []
+    gvm.add_change_callback(lambda key, version: changes.append((key, version)), 'b')
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(gvm.wait_for_change(['a', 'b'], since_version=version)))
+    waiter.start()
+    time.sleep(0.05)
+    assert not results
+    start = time.time()
+    gvm.set_variable('b', 2)
+    waiter.join(5)
+    assert time.time() - start < 1.
+    assert results == [{'b': gvm.get_version('b')}]
+    gvm.set_variable('a', 3)
+    gvm.delete_variable('b')
+    assert changes == [('b', results[0]['b']), ('b', 0)]
+
+    # the preemption of the waiting state ends the wait
+    state = ExecutionState("waiting")
+    waiter = threading.Thread(target=lambda: results.append(gvm.wait_for_change('a', state=state)))
+    waiter.start()
+    time.sleep(0.05)
+    start = time.time()
+    state.preempted = True
+    waiter.join(5)
+    assert time.time() - start < 1.
+    assert results[-1] == {}
+    assert gvm.wait_for_change('a', state=state) == {}
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_locks(None)
     # test_references(None)
@@ -0,0 +1,97 @@
+import os
+import shutil
+
+from rafcon.core.library_index import LibraryIndex
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+
+def copy_libraries(target_path):
+    shutil.copytree(os.path.join(testing_utils.LIBRARY_SM_PATH, "generic"), os.path.join(target_path, "generic"))
+    return target_path
+
+
+def age_directories(path, seconds=10):
+    """Sets the modification times of all directories into the past, so that they are cached by the index"""
+    for directory, _, _ in os.walk(path):
+        mtime = os.stat(directory).st_mtime - seconds
+        os.utime(directory, (mtime, mtime))
+
+
+def test_library_index(monkeypatch):
+    library_root_path = copy_libraries(testing_utils.get_unique_temp_path())
+    age_directories(library_root_path)
+    index_path = os.path.join(testing_utils.get_unique_temp_path(), "index", "library_index.json")
+
+    library_index = LibraryIndex(index_path)
+    library_tree = library_index.get_library_tree(library_root_path)
+    assert "wait" in library_tree["generic"]
+    assert library_tree["generic"]["wait"] == os.path.join(library_root_path, "generic", "wait")
+    library_index.save()
+    assert os.path.isfile(index_path)
+
+    # an unchanged library root is not listed again by a loaded index
+    listed_paths = []
+    original_listdir = os.listdir
+
+    def listdir(path):
+        listed_paths.append(path)
+        return original_listdir(path)
+
+    monkeypatch.setattr(os, "listdir", listdir)
+    library_index = LibraryIndex(index_path)
+    library_index.load()
+    assert library_index.get_library_tree(library_root_path) == library_tree
+    assert not listed_paths
+
+    # only the changed folder is listed again
+    shutil.copytree(os.path.join(library_root_path, "generic", "wait"),
+                    os.path.join(library_root_path, "generic", "wait_copy"))
+    changed_library_tree = library_index.get_library_tree(library_root_path)
+    assert listed_paths == [os.path.join(library_root_path, "generic")]
+    assert set(changed_library_tree["generic"]) - set(library_tree["generic"]) == {"wait_copy"}
+
+    # entries of directories, which are not visited anymore, are removed when saving
+    library_index.save()
+    library_index = LibraryIndex(index_path)
+    library_index.load()
+    library_index.get_library_tree(os.path.join(library_root_path, "generic"))
+    library_index.save()
+    library_index.load()
+    assert library_root_path not in library_index._entries
+    assert os.path.join(library_root_path, "generic") in library_index._entries
+
+
+def test_library_manager_with_index(caplog):
+    library_root_path = copy_libraries(testing_utils.get_unique_temp_path())
+    index_path = os.path.join(testing_utils.get_unique_temp_path(), "library_index.json")
+    testing_utils.initialize_environment_core(core_config={"LIBRARY_INDEX_PATH": index_path,
+                                                           "LIBRARY_INDEX_CHECK_INTERVAL": 3600.},
+                                              libraries={"test_libraries": library_root_path})
+    try:
+        from rafcon.core.singleton import library_manager
+        assert os.path.isfile(index_path)
+        assert "wait" in library_manager.libraries["test_libraries"]["generic"]
+
+        # a library added after the initialization is found by a forced update
+        shutil.copytree(os.path.join(library_root_path, "generic", "wait"),
+                        os.path.join(library_root_path, "generic", "new_wait"))
+        assert not library_manager.update_libraries()  # within the check interval
+        assert library_manager.update_libraries(force=True)
+        assert "new_wait" in library_manager.libraries["test_libraries"]["generic"]
+        assert not library_manager.update_libraries(force=True)
+        library_path = os.path.join("test_libraries", "generic")
+        assert library_manager.get_os_path_to_library(library_path, "new_wait")[0] == \
+            os.path.join(library_root_path, "generic", "new_wait")
+
+        # a library added after the last update is found on a lookup miss after the check interval
+        shutil.copytree(os.path.join(library_root_path, "generic", "wait"),
+                        os.path.join(library_root_path, "generic", "another_wait"))
+        library_manager._last_library_update = 0.
+        assert library_manager.get_os_path_to_library(library_path, "another_wait")[0] == \
+            os.path.join(library_root_path, "generic", "another_wait")
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
@@ -1,5 +1,6 @@
 import os
 from os.path import join
+from copy import copy
 
 # core elements
 import rafcon.core.singleton
@@ -177,6 +178,39 @@ def test_nested_library_state_machine(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_shared_library_template(caplog):
+    rafcon.core.singleton.library_manager.initialize()
+    lib_state1 = LibraryState("temporary_libraries", "hierarchy_library", "0.1", "lib1", state_id="LIB1")
+    lib_state2 = LibraryState("temporary_libraries", "hierarchy_library", "0.1", "lib2", state_id="LIB2")
+
+    # the library states share their template until the state copy is accessed
+    template = lib_state1.library_root_state
+    assert lib_state1._state_copy is None and lib_state2._state_copy is None
+    assert lib_state2.library_root_state is template
+    assert lib_state1.get_states_statistics(0) == template.get_states_statistics(0)
+    assert lib_state1 == copy(lib_state1)
+    for port_id, port in lib_state1.input_data_ports.items():
+        assert port is not template.input_data_ports[port_id]
+        assert port.parent is lib_state1
+    port_id = lib_state1.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+    lib_state1.set_input_runtime_value(port_id, 3.0)
+    assert lib_state2.input_data_port_runtime_values[port_id] == 1.0
+    assert lib_state1._state_copy is None
+
+    # the state copy is created on first access, modifications do not affect the template
+    state_copy = lib_state1.state_copy
+    assert state_copy is not template and lib_state1.library_root_state is state_copy
+    assert state_copy.parent is lib_state1 and state_copy.outcomes is lib_state1.outcomes
+    state_copy.name = "modified"
+    list(state_copy.states.values())[0].name = "modified child"
+    assert template.name == "library_hierarchy_state1"
+    assert "modified child" not in [state.name for state in lib_state2.state_copy.states.values()]
+
+    lib_state1.destroy()
+    assert lib_state2.library_root_state is not template and template.parent is not None
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 def test_rafcon_library_path_variable(caplog):
     rafcon.core.config.global_config.set_config_value("LIBRARY_PATHS", {})
     os.environ['RAFCON_LIBRARY_PATH'] = os.path.join(testing_utils.LIBRARY_SM_PATH, 'generic')
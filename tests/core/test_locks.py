@@ -0,0 +1,68 @@
+import threading
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def test_cached_state_machine_reference(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = HierarchyState("Root", state_id="ROOT")
+        child_state = HierarchyState("Child", state_id="CHILD")
+        grandchild_state = ExecutionState("Grandchild", state_id="GRANDCHILD")
+        child_state.add_state(grandchild_state)
+        assert grandchild_state.get_state_machine() is None
+
+        root_state.add_state(child_state)
+        state_machine = StateMachine(root_state)
+        assert grandchild_state.get_state_machine() is state_machine
+        assert grandchild_state.get_state_machine() is state_machine
+
+        # moving a parent of the state invalidates the cached reference
+        other_root_state = HierarchyState("Other root", state_id="OTHER")
+        other_state_machine = StateMachine(other_root_state)
+        root_state.remove_state(child_state.state_id, recursive=False, destroy=False)
+        assert grandchild_state.get_state_machine() is None
+        other_root_state.add_state(child_state)
+        assert grandchild_state.get_state_machine() is other_state_machine
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_scoped_data_independent_of_modification_lock(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = HierarchyState("Root", state_id="ROOT")
+        root_state.add_scoped_variable("counter", "int", 0, scoped_variable_id=1)
+        child_state = ExecutionState("Child", state_id="CHILD")
+        child_state.add_output_data_port("counter", "int", 0, data_port_id=1)
+        root_state.add_state(child_state)
+        root_state.add_data_flow(child_state.state_id, 1, root_state.state_id, 1)
+        state_machine = StateMachine(root_state)
+
+        updated = threading.Event()
+
+        def update_scoped_data():
+            root_state.add_state_execution_output_to_scoped_data({"counter": 1}, child_state)
+            root_state.update_scoped_variables_with_output_dictionary({"counter": 1}, child_state)
+            updated.set()
+
+        # the modification lock is held, e.g. by the GUI editing the state machine
+        with state_machine.modification_lock():
+            thread = threading.Thread(target=update_scoped_data)
+            thread.start()
+            assert updated.wait(5)
+        thread.join()
+        assert root_state.scoped_data["1ROOT"].value == 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,40 @@
+import logging
+
+from rafcon.utils.log_helpers import LogEntryBuffer
+
+
+def test_fetch_new_entries():
+    buffer = LogEntryBuffer(5)
+    assert buffer.append(logging.INFO, "first")
+    assert not buffer.append(logging.DEBUG, "second")
+    assert buffer.has_new_entries()
+    assert [entry.message for entry in buffer.fetch_new_entries(1)] == ["first"]
+    assert [entry.message for entry in buffer.fetch_new_entries()] == ["second"]
+    assert not buffer.has_new_entries()
+    assert buffer.fetch_new_entries() == []
+    # the consumer has to be triggered again after fetching all entries
+    assert buffer.append(logging.INFO, "third")
+
+
+def test_get_entries():
+    buffer = LogEntryBuffer(5)
+    for i in range(8):
+        buffer.append(logging.ERROR if i % 2 else logging.INFO, str(i))
+    # the oldest entries are dropped
+    assert len(buffer) == 5
+    assert [entry.entry_id for entry in buffer.get_entries()] == [3, 4, 5, 6, 7]
+    assert [entry.entry_id for entry in buffer.get_entries(max_count=2)] == [6, 7]
+
+    def is_error(entry):
+        return entry.log_level == logging.ERROR
+    assert [entry.entry_id for entry in buffer.get_entries(is_error)] == [3, 5, 7]
+    assert [entry.entry_id for entry in buffer.get_entries(is_error, before_id=7, max_count=1)] == [5]
+    assert [entry.entry_id for entry in buffer.get_entries(before_id=5)] == [3, 4]
+    assert [entry.entry_id for entry in buffer.get_entries(before_id=1)] == []
+    assert [entry.entry_id for entry in buffer.get_entries(after_id=4, max_count=2)] == [5, 6]
+    assert [entry.entry_id for entry in buffer.get_entries(is_error, after_id=0)] == [3, 5, 7]
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert not buffer.has_new_entries()
+    assert buffer.get_entries() == []
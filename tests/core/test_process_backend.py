@@ -0,0 +1,145 @@
+import os
+import time
+import pytest
+from future.utils import PY2
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID, PROCESS_BACKEND, THREAD_BACKEND
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# test environment elements
+from tests import utils as testing_utils
+
+pytestmark = pytest.mark.skipif(PY2, reason="The process backend requires Python 3")
+
+WORKER_SCRIPT = """
+import os
+def execute(self, inputs, outputs, gvm):
+    self.persistent_variables["runs"] = self.persistent_variables.get("runs", 0) + 1
+    gvm.set_variable(self.name, inputs["value"] * 2)
+    outputs["pid"] = os.getpid()
+    outputs["result"] = gvm.get_variable(self.name) + self.persistent_variables["runs"]
+    return 0
+"""
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    self.preemptive_wait()
+    outputs["preempted"] = self.preempted
+    return 0
+"""
+
+FAST_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+ERROR_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    raise ValueError("failure in worker process")
+"""
+
+
+def create_worker_state(name, script, execution_backend=PROCESS_BACKEND):
+    state = ExecutionState(name, state_id=name.upper(), execution_backend=execution_backend)
+    state.add_input_data_port("value", "int", 1, data_port_id=1)
+    state.add_output_data_port("result", "int", data_port_id=2)
+    state.add_output_data_port("pid", "int", data_port_id=3)
+    state.add_output_data_port("preempted", "bool", data_port_id=4)
+    state.script_text = script
+    return state
+
+
+def create_barrier_state_machine():
+    root_state = BarrierConcurrencyState("Root", state_id="ROOT")
+    for name in ["Worker1", "Worker2"]:
+        state = create_worker_state(name, WORKER_SCRIPT)
+        root_state.add_state(state)
+        for data_port_id, port_name in [(2, "result"), (3, "pid")]:
+            output_port_id = root_state.add_output_data_port(name + port_name, "int")
+            root_state.add_data_flow(state.state_id, data_port_id, root_state.state_id, output_port_id)
+    root_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def run_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+    rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+
+def test_process_backend_in_barrier_concurrency(caplog):
+    testing_utils.initialize_environment_core()
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        state_machine = create_barrier_state_machine()
+        run_state_machine(state_machine)
+        output_data = state_machine.root_state.output_data
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+        assert output_data["Worker1result"] == output_data["Worker2result"] == 3
+        assert output_data["Worker1pid"] != os.getpid()
+        assert output_data["Worker1pid"] != output_data["Worker2pid"]
+        assert gvm.get_variable("Worker1") == 2
+        worker_state = state_machine.root_state.states["WORKER1"]
+        assert worker_state.persistent_variables["runs"] == 1
+
+        # the persistent variables are passed to the next execution
+        run_state_machine(state_machine)
+        assert state_machine.root_state.output_data["Worker1result"] == 4
+    finally:
+        gvm.delete_variable("Worker1")
+        gvm.delete_variable("Worker2")
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_process_backend_preemption_and_errors(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = PreemptiveConcurrencyState("Root", state_id="ROOT")
+        root_state.add_state(create_worker_state("Waiting", WAITING_SCRIPT))
+        root_state.add_state(create_worker_state("Fast", FAST_SCRIPT, THREAD_BACKEND))
+        root_state.add_transition("FAST", 0, root_state.state_id, 0)
+        state_machine = StateMachine(root_state)
+
+        start = time.time()
+        run_state_machine(state_machine)
+        assert time.time() - start < 10
+        assert root_state.final_outcome.outcome_id == 0
+        waiting_state = root_state.states["WAITING"]
+        assert waiting_state.final_outcome.outcome_id == -2
+        assert waiting_state.output_data["preempted"] is True
+
+        error_state = create_worker_state("Error", ERROR_SCRIPT)
+        state_machine = StateMachine(error_state)
+        run_state_machine(state_machine)
+        assert error_state.final_outcome.outcome_id == -1
+        assert isinstance(error_state.output_data["error"], ValueError)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=1)
+
+
+def test_execution_backend_storage(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_barrier_state_machine()
+        state_machine.root_state.states["WORKER2"].execution_backend = THREAD_BACKEND
+        with pytest.raises(ValueError):
+            state_machine.root_state.states["WORKER2"].execution_backend = "cluster"
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, path)
+        loaded_state_machine = storage.load_state_machine_from_path(path)
+        assert loaded_state_machine.root_state.states["WORKER1"].execution_backend == PROCESS_BACKEND
+        assert loaded_state_machine.root_state.states["WORKER2"].execution_backend == THREAD_BACKEND
+        assert "execution_backend" not in loaded_state_machine.root_state.states["WORKER2"].to_dict()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
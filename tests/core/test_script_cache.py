@@ -0,0 +1,86 @@
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.script import compiled_code_cache
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+LOOP_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["counter"] = inputs["counter"] + 1
+    return "loop" if outputs["counter"] < {} else "done"
+"""
+
+NUMBER_OF_ITERATIONS = 50
+
+
+def create_loop_state_machine():
+    loop_state = ExecutionState("Loop", state_id="LOOP")
+    loop_state.add_input_data_port("counter", "int", 0, data_port_id=1)
+    loop_state.add_output_data_port("counter", "int", 0, data_port_id=2)
+    loop_state.add_outcome("loop", 1)
+    loop_state.add_outcome("done", 2)
+    loop_state.script_text = LOOP_SCRIPT.format(NUMBER_OF_ITERATIONS)
+
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_output_data_port("counter", "int", 0, data_port_id=10)
+    root_state.add_scoped_variable("counter", "int", 0, scoped_variable_id=11)
+    root_state.add_state(loop_state)
+    root_state.set_start_state(loop_state.state_id)
+    root_state.add_transition(loop_state.state_id, 1, loop_state.state_id, None)
+    root_state.add_transition(loop_state.state_id, 2, root_state.state_id, 0)
+    root_state.add_data_flow(root_state.state_id, 11, loop_state.state_id, 1)
+    root_state.add_data_flow(loop_state.state_id, 2, root_state.state_id, 11)
+    root_state.add_data_flow(loop_state.state_id, 2, root_state.state_id, 10)
+    return StateMachine(root_state)
+
+
+def test_script_compiled_once(caplog):
+    testing_utils.initialize_environment_core({"SCRIPT_RECOMPILATION_ON_STATE_EXECUTION": True})
+    try:
+        state_machine = create_loop_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+
+        compiled_code_cache.clear()
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["counter"] == NUMBER_OF_ITERATIONS
+        assert compiled_code_cache.misses == 1
+        assert compiled_code_cache.hits == NUMBER_OF_ITERATIONS - 1
+
+        # a changed script text has to be compiled again, an unchanged one not
+        loop_state = state_machine.get_state_by_path("ROOT/LOOP")
+        loop_state.script_text = LOOP_SCRIPT.format(NUMBER_OF_ITERATIONS * 2)
+        compiled_code_cache.clear()
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["counter"] == NUMBER_OF_ITERATIONS * 2
+        assert compiled_code_cache.misses == 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_cache_size_limit():
+    compiled_code_cache.clear()
+    max_size = compiled_code_cache.max_size
+    compiled_code_cache.max_size = 2
+    try:
+        for index in range(3):
+            script_hash = compiled_code_cache.get_script_hash(str(index))
+            compiled_code_cache.add(script_hash, "script.py", compile(str(index), "script.py", "eval"))
+        assert len(compiled_code_cache) == 2
+        assert compiled_code_cache.get(compiled_code_cache.get_script_hash("0"), "script.py") is None
+        assert compiled_code_cache.get(compiled_code_cache.get_script_hash("2"), "script.py") is not None
+        assert (compiled_code_cache.hits, compiled_code_cache.misses) == (1, 1)
+    finally:
+        compiled_code_cache.max_size = max_size
+        compiled_code_cache.clear()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
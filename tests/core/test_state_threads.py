@@ -0,0 +1,108 @@
+import threading
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.execution import state_threads
+from rafcon.core.execution.state_threads import WorkerPool
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+COUNTER_SCRIPT = """
+import threading
+def execute(self, inputs, outputs, gvm):
+    outputs["counter"] = inputs["counter"] + 1
+    outputs["thread_ids"] = inputs["thread_ids"] + [threading.current_thread().ident]
+    return "loop" if outputs["counter"] < 20 else "done"
+"""
+
+
+def create_loop_state(state_id):
+    loop_state = HierarchyState("Loop " + state_id, state_id=state_id)
+    loop_state.add_output_data_port("thread_ids", "list", data_port_id=1)
+    loop_state.add_scoped_variable("counter", "int", 0, scoped_variable_id=2)
+    loop_state.add_scoped_variable("thread_ids", "list", [], scoped_variable_id=3)
+
+    counter_state = ExecutionState("Counter", state_id=state_id + "COUNTER")
+    counter_state.add_input_data_port("counter", "int", 0, data_port_id=1)
+    counter_state.add_input_data_port("thread_ids", "list", [], data_port_id=2)
+    counter_state.add_output_data_port("counter", "int", 0, data_port_id=3)
+    counter_state.add_output_data_port("thread_ids", "list", [], data_port_id=4)
+    counter_state.add_outcome("loop", 1)
+    counter_state.add_outcome("done", 2)
+    counter_state.script_text = COUNTER_SCRIPT
+
+    loop_state.add_state(counter_state)
+    loop_state.set_start_state(counter_state.state_id)
+    loop_state.add_transition(counter_state.state_id, 1, counter_state.state_id, None)
+    loop_state.add_transition(counter_state.state_id, 2, loop_state.state_id, 0)
+    loop_state.add_data_flow(loop_state.state_id, 2, counter_state.state_id, 1)
+    loop_state.add_data_flow(loop_state.state_id, 3, counter_state.state_id, 2)
+    loop_state.add_data_flow(counter_state.state_id, 3, loop_state.state_id, 2)
+    loop_state.add_data_flow(counter_state.state_id, 4, loop_state.state_id, 3)
+    loop_state.add_data_flow(counter_state.state_id, 4, loop_state.state_id, 1)
+    return loop_state
+
+
+def create_state_machine():
+    root_state = BarrierConcurrencyState("Root", state_id="ROOT")
+    for state_id in ["BRANCHA", "BRANCHB"]:
+        root_state.add_state(create_loop_state(state_id))
+        root_state.add_output_data_port(state_id, "list", data_port_id=None)
+    for data_port_id, data_port in root_state.output_data_ports.items():
+        root_state.add_data_flow(data_port.name, 1, root_state.state_id, data_port_id)
+    root_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+@pytest.mark.parametrize("pool_enabled", [True, False])
+def test_execution_in_thread_pool(caplog, pool_enabled):
+    testing_utils.initialize_environment_core({"EXECUTION_THREAD_POOL_ENABLED": pool_enabled})
+    try:
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        output_data = state_machine.root_state.output_data
+        for branch in ["BRANCHA", "BRANCHB"]:
+            assert len(output_data[branch]) == 20
+            if pool_enabled:
+                # all children of the loop are executed in the thread of the loop state
+                assert len(set(output_data[branch])) == 1
+        if pool_enabled:
+            assert state_threads.get_worker_pool().number_of_workers > 0
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_nested_tasks_do_not_deadlock():
+    pool = WorkerPool(max_idle_workers=2, idle_timeout=0.5)
+    finished = []
+    all_finished = threading.Event()
+
+    def nested_task(depth):
+        if depth > 0:
+            # the parent task blocks until all its children finished, as concurrency states do
+            children = [threading.Event() for _ in range(3)]
+            for child in children:
+                pool.submit(lambda event=child: (nested_task(depth - 1), event.set()))
+            for child in children:
+                assert child.wait(5.)
+        finished.append(depth)
+        if len(finished) == 1 + 3 + 9:
+            all_finished.set()
+
+    pool.submit(lambda: nested_task(2))
+    assert all_finished.wait(10.)
+    assert pool.number_of_idle_workers <= 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+import time
+import zipfile
+import pytest
+from jsonconversion.decoder import JSONObjectDecoder
+from jsonconversion.encoder import JSONObjectEncoder
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import container, storage
+from rafcon.utils import storage_utils
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return {0}
+"""
+
+
+def create_state_machine(number_child_states=5):
+    root_state = HierarchyState("Root", state_id="ROOT")
+    root_state.add_semantic_data([], "root value", "key")
+    for i in range(number_child_states):
+        container_state = HierarchyState("Container" + str(i), state_id="CONTAINER" + str(i))
+        state = ExecutionState("Execution" + str(i), state_id="EXECUTION" + str(i))
+        state.script_text = SCRIPT.format(i)
+        state.add_semantic_data([], i, "index")
+        container_state.add_state(state)
+        root_state.add_state(container_state)
+    return StateMachine(root_state)
+
+
+def assert_loaded_correctly(state_machine, number_child_states=5):
+    root_state = state_machine.root_state
+    assert root_state.semantic_data["key"] == "root value"
+    assert len(root_state.states) == number_child_states
+    for i in range(number_child_states):
+        state = root_state.states["CONTAINER" + str(i)].states["EXECUTION" + str(i)]
+        assert state.script_text == SCRIPT.format(i)
+        assert state.semantic_data["index"] == i
+
+
+@pytest.mark.parametrize("number_of_threads", [1, 4])
+def test_read_state_directories(number_of_threads, caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(create_state_machine(), path)
+        root_state_path = os.path.join(path, storage.get_storage_id_for_state(create_state_machine().root_state))
+        os.mkdir(os.path.join(root_state_path, "__pycache__"))
+
+        state_directories = storage.read_state_directories(root_state_path, number_of_threads=number_of_threads)
+        # the root state, 10 child states and the folder without state
+        assert len(state_directories) == 12
+        assert state_directories[os.path.join(root_state_path, "__pycache__")].core_data_path is None
+        state_files = [files for files in state_directories.values() if files.script is not None]
+        assert len(state_files) == 5
+        assert all(files.semantic_data is not None for files in state_files)
+
+        lazy_state_directories = storage.read_state_directories(root_state_path, lazy=True,
+                                                                number_of_threads=number_of_threads)
+        assert set(lazy_state_directories) == set(state_directories)
+        assert all(files.script is None for files in lazy_state_directories.values())
+        for state_path, files in lazy_state_directories.items():
+            assert files.semantic_data is None
+            assert (files.semantic_data_path is None) == (state_directories[state_path].semantic_data is None)
+        assert_loaded_correctly(storage.load_state_machine_from_path(path))
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_lazy_loading(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(create_state_machine(), path)
+
+        state_machine = storage.load_state_machine_from_path(path, lazy=True)
+        state = state_machine.root_state.states["CONTAINER0"].states["EXECUTION0"]
+        assert state.script._script_loader is not None and state._semantic_data_loader is not None
+        # states without semantic data file have nothing to load
+        assert state_machine.root_state.states["CONTAINER0"]._semantic_data_loader is None
+        assert state.script_text == SCRIPT.format(0)
+        assert state.script._script_loader is None
+        assert_loaded_correctly(state_machine)
+
+        # the deferred data is loaded before the files are deleted
+        state_machine = storage.load_state_machine_from_path(path, lazy=True)
+        storage.save_state_machine_to_path(state_machine, path, delete_old_state_machine=True)
+        new_path = testing_utils.get_unique_temp_path()
+        state_machine = storage.load_state_machine_from_path(path, lazy=True)
+        storage.save_state_machine_to_path(state_machine, new_path)
+        shutil.rmtree(path)
+        assert_loaded_correctly(state_machine)
+        assert_loaded_correctly(storage.load_state_machine_from_path(new_path, lazy=True))
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def get_modification_times(path):
+    modification_times = {}
+    for directory, _, file_names in os.walk(path):
+        for file_name in file_names:
+            file_path = os.path.join(directory, file_name)
+            modification_times[file_path] = os.stat(file_path).st_mtime
+    return modification_times
+
+
+def test_incremental_saving(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_unique_temp_path()
+        state_machine = create_state_machine()
+        storage.save_state_machine_to_path(state_machine, path)
+        modification_times = get_modification_times(path)
+        time.sleep(0.01)
+
+        # only the changed script and the state machine file (if the last update changed) are written
+        state = state_machine.root_state.states["CONTAINER1"].states["EXECUTION1"]
+        state.script_text = SCRIPT.format("'changed'")
+        storage.save_state_machine_to_path(state_machine, path)
+        new_modification_times = get_modification_times(path)
+        assert set(new_modification_times) == set(modification_times)
+        changed_files = [file_path for file_path, modification_time in new_modification_times.items()
+                         if modification_time != modification_times[file_path]]
+        assert [file_path for file_path in changed_files if not file_path.endswith(storage.STATEMACHINE_FILE)] == \
+            [os.path.join(state.file_system_path, storage.SCRIPT_FILE)]
+
+        # files changed by someone else are rewritten, obsolete folders are removed
+        script_path = os.path.join(state.file_system_path, storage.SCRIPT_FILE)
+        with open(script_path, 'w') as file_pointer:
+            file_pointer.write("changed outside")
+        state_machine.root_state.remove_state("CONTAINER0")
+        storage.save_state_machine_to_path(state_machine, path)
+        assert not any("CONTAINER0" in file_path for file_path in get_modification_times(path))
+        assert not [file_name for file_name in os.listdir(state.file_system_path) if file_name.endswith(".tmp")]
+        loaded_state_machine = storage.load_state_machine_from_path(path)
+        loaded_state = loaded_state_machine.root_state.states["CONTAINER1"].states["EXECUTION1"]
+        assert loaded_state.script_text == SCRIPT.format("'changed'")
+        assert len(loaded_state_machine.root_state.states) == 4
+
+        # loaded files are not written again
+        modification_times = get_modification_times(path)
+        time.sleep(0.01)
+        storage.save_state_machine_to_path(loaded_state_machine, path)
+        new_modification_times = get_modification_times(path)
+        assert all(file_path.endswith(storage.STATEMACHINE_FILE) for file_path, modification_time in
+                   new_modification_times.items() if modification_time != modification_times[file_path])
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_forget_stored_files(caplog):
+    import rafcon.core.singleton as core_singletons
+    testing_utils.initialize_environment_core()
+
+    def is_remembered(path):
+        return any(file_path.startswith(os.path.join(path, "")) for file_path in storage._stored_files)
+
+    try:
+        path = testing_utils.get_unique_temp_path()
+        state_machine = create_state_machine()
+        storage.save_state_machine_to_path(state_machine, path)
+        assert is_remembered(path)
+
+        # the files of the former location are forgotten, if the state machine is saved elsewhere
+        new_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, new_path)
+        assert not is_remembered(path)
+        assert is_remembered(new_path)
+
+        # the files are forgotten, when the state machine is closed
+        assert os.path.normpath(new_path) in storage._cleaned_directories
+        core_singletons.state_machine_manager.add_state_machine(state_machine)
+        core_singletons.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        assert not is_remembered(new_path)
+        assert os.path.normpath(new_path) not in storage._cleaned_directories
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_container_format(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        container_path = testing_utils.get_unique_temp_path() + container.CONTAINER_FILE_EXTENSION
+        state_machine = create_state_machine()
+        storage.save_state_machine_to_path(state_machine, container_path)
+        assert container.is_container(container_path)
+        assert state_machine.file_system_path == container_path
+        state = state_machine.root_state.states["CONTAINER1"].states["EXECUTION1"]
+        assert state.file_system_path.startswith(container_path)
+
+        loaded_state_machine = storage.load_state_machine_from_path(container_path)
+        assert_loaded_correctly(loaded_state_machine)
+        assert loaded_state_machine.root_state == state_machine.root_state
+        assert not loaded_state_machine.marked_dirty
+
+        # single states are loaded using the index
+        state = container.load_state_from_container(container_path, state.get_path())
+        assert state.script_text == SCRIPT.format(1)
+        assert state.semantic_data["index"] == 1
+        # files of states are read through the container
+        state = loaded_state_machine.root_state.states["CONTAINER1"].states["EXECUTION1"]
+        assert storage._read_script_file(state.file_system_path, storage.SCRIPT_FILE) == SCRIPT.format(1)
+        assert storage.load_data_file(os.path.join(state.file_system_path, storage.SEMANTIC_DATA_FILE))["index"] == 1
+        with pytest.raises(ValueError):
+            storage.load_data_file(os.path.join(state.file_system_path, storage.FILE_NAME_META_DATA))
+        meta_data_name = container.read_index(container_path)[state.get_path()] + "/" + storage.FILE_NAME_META_DATA
+        container.write_files(container_path, {meta_data_name: "{}"})
+        assert storage.load_data_file(os.path.join(state.file_system_path, storage.FILE_NAME_META_DATA)) == {}
+
+        # round trip conversion: container -> folder -> container
+        folder_path = testing_utils.get_unique_temp_path()
+        container.convert(container_path, folder_path)
+        assert_loaded_correctly(storage.load_state_machine_from_path(folder_path))
+        other_container_path = testing_utils.get_unique_temp_path() + container.CONTAINER_FILE_EXTENSION
+        container.convert(folder_path, other_container_path)
+        assert container.read_index(other_container_path) == container.read_index(container_path)
+        assert_loaded_correctly(storage.load_state_machine_from_path(other_container_path))
+
+        # files not written by the core are kept for existing states, removed states are removed from the index
+        meta_data_path = os.path.join(folder_path, storage.get_storage_id_for_state(state_machine.root_state),
+                                      storage.FILE_NAME_META_DATA)
+        with open(meta_data_path, 'w') as file_pointer:
+            file_pointer.write("{}")
+        container.convert_folder_to_container(folder_path, container_path)
+        state_machine.root_state.remove_state("CONTAINER0")
+        storage.save_state_machine_to_path(state_machine, container_path)
+        index = container.read_index(container_path)
+        assert not any("CONTAINER0" in state_path for state_path in index)
+        assert len(index) == 9
+        meta_data_name = index["ROOT"] + "/" + storage.FILE_NAME_META_DATA
+        with zipfile.ZipFile(container_path) as opened_container:
+            assert meta_data_name in opened_container.namelist()
+        assert len(storage.load_state_machine_from_path(container_path).root_state.states) == 4
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_json_codec_compatibility(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        root_state = state_machine.root_state
+        root_state.add_semantic_data([], {"tuple": (1, 2), "set": {3}, "type": float, "ids": {4: None}}, "values")
+        root_state.add_scoped_variable("variable", "int", 5)
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, path)
+
+        # the files are identical to the ones written by the jsonconversion encoder and decoded alike
+        states = [root_state] + list(root_state.states.values())
+        for state in states:
+            with open(os.path.join(state.file_system_path, storage.FILE_NAME_CORE_DATA)) as file_pointer:
+                json_string = file_pointer.read()
+            assert json_string == json.dumps(state, cls=JSONObjectEncoder, indent=4, separators=(', ', ': '),
+                                             builtins_str="__builtin__", sort_keys=True, check_circular=False)
+            assert storage_utils.load_objects_from_json_string(json_string) == \
+                json.loads(json_string, cls=JSONObjectDecoder, substitute_modules=storage_utils.substitute_modules)
+        with open(os.path.join(root_state.file_system_path, storage.SEMANTIC_DATA_FILE)) as file_pointer:
+            json_string = file_pointer.read()
+        semantic_data = storage_utils.load_objects_from_json_string(json_string)
+        assert semantic_data == json.loads(json_string, cls=JSONObjectDecoder)
+        assert semantic_data["values"]["ids"] == {4: None}
+
+        compact_path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(state_machine, compact_path, as_copy=True, compact=True)
+        root_state_folder = storage.get_storage_id_for_state(root_state)
+        with open(os.path.join(compact_path, root_state_folder, storage.FILE_NAME_CORE_DATA)) as file_pointer:
+            assert "\n" not in file_pointer.read()
+        loaded_state_machine = storage.load_state_machine_from_path(compact_path)
+        assert loaded_state_machine.root_state == root_state
+        assert loaded_state_machine.root_state.semantic_data == root_state.semantic_data
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
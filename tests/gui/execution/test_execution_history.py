@@ -0,0 +1,131 @@
+import os
+import time
+import pytest
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.utils import wait_for_execution_engine_sync_counter
+
+# general tool elements
+from rafcon.utils import log
+logger = log.get_logger(__name__)
+
+
+def get_history_tree_labels(tree_store, tree_iter=None):
+    """Returns the labels of all rows below the given row as nested lists"""
+    labels = []
+    child_iter = tree_store.iter_children(tree_iter)
+    while child_iter is not None:
+        labels.append((tree_store[child_iter][0], get_history_tree_labels(tree_store, child_iter)))
+        child_iter = tree_store.iter_next(child_iter)
+    return labels
+
+
+def get_expanded_history_tree_labels(execution_history_ctrl, rebuild=False):
+    execution_history_ctrl.update(rebuild=rebuild)
+    execution_history_ctrl.history_tree.expand_all()
+    return get_history_tree_labels(execution_history_ctrl.history_tree_store)
+
+
+def test_incremental_execution_history_tree(gui):
+    """Compares the incrementally updated execution history tree with a rebuilt tree while stepping forwards and
+    backwards through concurrent branches"""
+    from rafcon.core.singleton import state_machine_execution_engine
+    import rafcon.gui.singleton as gui_singleton
+
+    menubar_ctrl = gui_singleton.main_window_controller.get_controller('menu_bar_controller')
+    execution_history_ctrl = gui_singleton.main_window_controller.get_controller('execution_history_ctrl')
+
+    sm = gui(
+        menubar_ctrl.on_open_activate, None, None,
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "backward_step_barrier_test"))
+    )
+    testing_utils.wait_for_gui()
+
+    with state_machine_execution_engine._status.execution_condition_variable:
+        state_machine_execution_engine.synchronization_counter = 0
+
+    def check_history_tree():
+        labels = gui(get_expanded_history_tree_labels, execution_history_ctrl)
+        assert labels
+        assert gui(get_expanded_history_tree_labels, execution_history_ctrl, True) == labels
+
+    gui(menubar_ctrl.on_step_mode_activate, sm.state_machine_id, None)
+    wait_for_execution_engine_sync_counter(1, logger)
+
+    # forward, the step into the barrier concurrency state starts three branches
+    for i in range(2):
+        gui(menubar_ctrl.on_step_into_activate, None, None)
+        wait_for_execution_engine_sync_counter(3, logger)
+        check_history_tree()
+
+    gui(menubar_ctrl.on_step_over_activate, None, None)
+    wait_for_execution_engine_sync_counter(3, logger)
+    check_history_tree()
+
+    gui(menubar_ctrl.on_step_out_activate, None, None)
+    wait_for_execution_engine_sync_counter(1, logger)
+    check_history_tree()
+
+    # backward stepping removes items from the execution histories
+    for i in range(3):
+        gui(menubar_ctrl.on_backward_step_activate, None, None)
+        wait_for_execution_engine_sync_counter(1, logger)
+        check_history_tree()
+
+    gui(menubar_ctrl.on_start_activate, None)
+    while not state_machine_execution_engine.finished_or_stopped():
+        time.sleep(0.1)
+    testing_utils.wait_for_gui()
+    check_history_tree()
+
+    gui(menubar_ctrl.on_stop_activate, None)
+
+
+@pytest.mark.parametrize('gui', [{"core_config": {"EXECUTION_HISTORY_MAX_ITEMS": 5}}], indirect=True,
+                         ids=["with bounded execution history"])
+def test_execution_history_tree_with_evicted_items(gui):
+    """Checks that the tree is updated without rebuilding it, while history items are evicted from the execution
+    histories, and that it matches a rebuilt tree"""
+    from rafcon.core.singleton import state_machine_execution_engine
+    import rafcon.gui.singleton as gui_singleton
+
+    menubar_ctrl = gui_singleton.main_window_controller.get_controller('menu_bar_controller')
+    execution_history_ctrl = gui_singleton.main_window_controller.get_controller('execution_history_ctrl')
+
+    sm = gui(
+        menubar_ctrl.on_open_activate, None, None,
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "backward_step_barrier_test"))
+    )
+    testing_utils.wait_for_gui()
+
+    with state_machine_execution_engine._status.execution_condition_variable:
+        state_machine_execution_engine.synchronization_counter = 0
+
+    def check_history_tree():
+        root_node = execution_history_ctrl._root_node
+        labels = gui(get_expanded_history_tree_labels, execution_history_ctrl)
+        assert execution_history_ctrl._root_node is root_node
+        assert gui(get_expanded_history_tree_labels, execution_history_ctrl, True) == labels
+        return labels
+
+    gui(menubar_ctrl.on_step_mode_activate, sm.state_machine_id, None)
+    wait_for_execution_engine_sync_counter(1, logger)
+    check_history_tree()
+
+    for i in range(2):
+        gui(menubar_ctrl.on_step_into_activate, None, None)
+        wait_for_execution_engine_sync_counter(3, logger)
+        check_history_tree()
+
+    gui(menubar_ctrl.on_step_over_activate, None, None)
+    wait_for_execution_engine_sync_counter(3, logger)
+    check_history_tree()
+
+    gui(menubar_ctrl.on_start_activate, None)
+    while not state_machine_execution_engine.finished_or_stopped():
+        time.sleep(0.1)
+    testing_utils.wait_for_gui()
+    assert "older items were evicted" in str(check_history_tree())
+
+    gui(menubar_ctrl.on_stop_activate, None)
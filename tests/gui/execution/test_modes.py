@@ -104,6 +104,11 @@ def test_execution_modes(gui):
             if overview.get_cause() == 'state_execution_status':
                 self.last_execution_change_at_state = overview.get_affected_model().state.get_path()
 
+        @Observer.observe("state_execution_status_signal", signal=True)
+        def coalesced_execution_change(self, model, prop_name, info):
+            if info.arg.state_models:
+                self.last_execution_change_at_state = info.arg.state_models[-1].state.get_path()
+
     execution_observer = call_gui_callback(ActiveStateObserver, sm_m)
 
     ############################################################
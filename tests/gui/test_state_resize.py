@@ -22,7 +22,9 @@ state_path_Ex = "YCBQQV/PBUVVY"
 config_options = {
 "gui_config":  {
     'HISTORY_ENABLED': True,
-    'GAPHAS_EDITOR_AUTO_FOCUS_OF_ROOT_STATE': False
+    'GAPHAS_EDITOR_AUTO_FOCUS_OF_ROOT_STATE': False,
+    # the views of all states are checked, also those of small states, whose views are created on demand otherwise
+    'GAPHAS_EDITOR_CONTENT_MIN_SIZE': 0
 },
 # If the GUI widget becomes too small, the resize tests will fail; thus, all sidebars are hidden in order
 # that the gui will have enough space
@@ -950,6 +950,76 @@ def test_reset_to_history_id(gui):
     assert history_4_hash == reset_history_4_hash
 
 
+@pytest.mark.parametrize('gui', [{"gui_config": {'HISTORY_ENABLED': True}}], indirect=True, ids=["with history"])
+def test_state_image_sharing(gui):
+    state_machine_m, state_dict = create_state_machine_m(gui)
+    sm_history = state_machine_m.history
+    root_state_m = state_machine_m.root_state
+    state1_id = state_dict["State1"].state_id
+
+    before_image = gui(sm_history.image_store.get_state_image, root_state_m)
+    gui(setattr, state_dict["State1"], "name", "Renamed State1")
+    after_image = gui(sm_history.image_store.get_state_image, root_state_m)
+
+    # only the image of the changed state is recreated, the images of unchanged states are shared
+    assert after_image.children[state1_id] is not before_image.children[state1_id]
+    assert '"Renamed State1"' in after_image.children[state1_id].core_data
+    for state_id, child_image in before_image.children.items():
+        if state_id != state1_id:
+            assert after_image.children[state_id] is child_image
+
+    gui(sm_history.undo)
+    undo_image = gui(sm_history.image_store.get_state_image, root_state_m)
+    assert undo_image.children[state1_id].core_data == before_image.children[state1_id].core_data
+
+
+def test_modifications_history_size_limit():
+    from rafcon.gui.action import ActionDummy
+    from rafcon.gui.models.modification_history import ModificationsHistory
+
+    def create_action(estimated_size):
+        action = ActionDummy()
+        action.estimated_size = estimated_size
+        return action
+
+    history = ModificationsHistory()
+    initial_size = history.get_estimated_size()
+    history.max_bytes = initial_size + 3000
+    for _ in range(3):
+        history.insert_action(create_action(1000))  # history ids 1, 2 and 3
+    assert history.get_estimated_size() == initial_size + 3000
+
+    # a new branch exceeds the limit, the old branch is evicted first
+    history.undo()
+    history.undo()
+    history.insert_action(create_action(1000))  # history id 4
+    assert history.get_element_for_history_id(2) is None
+    assert history.get_element_for_history_id(3) is None
+    assert not history.get_element_for_history_id(1).old_next_ids
+    assert history.get_estimated_size() == initial_size + 2000
+    with pytest.raises(ValueError):
+        history.go_to_history_element(3)
+
+    # afterwards the oldest actions are evicted
+    history.insert_action(create_action(1000))  # history id 5
+    history.insert_action(create_action(1000))  # history id 6
+    assert history.get_element_for_history_id(1) is None
+    assert history.get_executed_history_ids() == [6, 5, 4, 0]
+    assert history.get_element_for_history_id(4).prev_id == 0
+    assert history.get_estimated_size() == initial_size + 3000
+    # evicted actions are removed from the all time history
+    assert sorted(history._full_history) == [0, 4, 5, 6]
+
+    # the current action is always kept
+    history.max_bytes = initial_size + 500
+    history.insert_action(create_action(1000))  # history id 7
+    assert history.get_executed_history_ids() == [7, 0]
+    history.undo()
+    assert not history.is_undo_possible()
+    history.redo()
+    assert history.current_history_element.history_id == 7
+
+
 if __name__ == '__main__':
     testing_utils.dummy_gui(None)
     # test_add_remove_history(None)
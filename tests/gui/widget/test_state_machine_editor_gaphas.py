@@ -17,6 +17,9 @@ logger = log.get_logger(__name__)
 @pytest.mark.parametrize('gui', [{"libraries": {
     "ros": join(testing_utils.EXAMPLES_PATH, "libraries", "ros_libraries"),
     "turtle_libraries": join(testing_utils.EXAMPLES_PATH, "libraries", "turtle_libraries")
+}, "gui_config": {
+    # the views of the nested states are checked, independent of their size
+    'GAPHAS_EDITOR_CONTENT_MIN_SIZE': 0
 }}], indirect=True, ids=["with ros and turtle libraries"])
 def test_copy_delete_bug(gui):
     """The function triggers multiple actions that result into a gaphas bug.
@@ -86,6 +89,60 @@ def test_copy_delete_bug(gui):
     assert graphical_editor_ctrl.canvas.get_view_for_model(new_state_m)
 
 
+@pytest.mark.parametrize('gui', [{"gui_config": {'GAPHAS_EDITOR_CONTENT_MIN_SIZE': 50}}], indirect=True,
+                         ids=["with content views on demand"])
+def test_content_views_on_demand(gui):
+    """Checks that the views of the content of states are only created for large enough states or on demand"""
+    from rafcon.core.states.hierarchy_state import HierarchyState
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.state_machine import StateMachine
+
+    root_state = HierarchyState("Root")
+    parent_state = root_state
+    for level in range(6):
+        child_state = HierarchyState("Level {}".format(level))
+        parent_state.add_state(child_state)
+        parent_state = child_state
+    deepest_state = ExecutionState("Deepest")
+    parent_state.add_state(deepest_state)
+    first_level_state = list(root_state.states.values())[0]
+
+    state_machine = StateMachine(root_state)
+    gui(gui.core_singletons.state_machine_manager.add_state_machine, state_machine)
+    sm_id = state_machine.state_machine_id
+    sm_m = gui.singletons.state_machine_manager_model.state_machines[sm_id]
+    state_machines_ctrl = gui.singletons.main_window_controller.state_machines_editor_ctrl
+    graphical_editor_ctrl = state_machines_ctrl.get_controller(sm_id)
+    canvas = graphical_editor_ctrl.canvas
+    deepest_state_m = sm_m.get_state_model_by_path(deepest_state.get_path())
+    first_level_state_m = sm_m.get_state_model_by_path(first_level_state.get_path())
+
+    # Child states are by default much smaller than their parents, thus the deepest state is too small to be drawn
+    assert canvas.get_view_for_model(sm_m.root_state)
+    assert canvas.get_view_for_model(deepest_state_m) is None
+
+    # Focusing an element creates the views of all its parents
+    gui(setattr, sm_m.selection, 'focus', deepest_state_m)
+    assert canvas.get_view_for_model(deepest_state_m)
+    assert canvas.get_view_for_model(deepest_state_m.parent).content_populated
+
+    # The content of states is kept, as long as it contains the focus
+    gui(gui.singletons.global_gui_config.set_config_value, 'GAPHAS_EDITOR_CONTENT_MIN_SIZE', 1e9)
+    gui(graphical_editor_ctrl._update_content_views)
+    assert canvas.get_view_for_model(deepest_state_m)
+
+    gui(sm_m.selection.clear)
+    gui(delattr, sm_m.selection, 'focus')
+    gui(graphical_editor_ctrl._update_content_views)
+    assert not canvas.get_view_for_model(sm_m.root_state).content_populated
+    assert canvas.get_view_for_model(first_level_state_m) is None
+    assert canvas.get_view_for_model(deepest_state_m) is None
+
+    gui(gui.singletons.global_gui_config.set_config_value, 'GAPHAS_EDITOR_CONTENT_MIN_SIZE', 0)
+    gui(graphical_editor_ctrl._update_content_views)
+    assert canvas.get_view_for_model(deepest_state_m)
+
+
 if __name__ == '__main__':
     # testing_utils.dummy_gui(None)
     # test_copy_delete_bug(None)
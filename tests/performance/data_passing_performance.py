@@ -0,0 +1,85 @@
+# core elements
+from builtins import range
+from builtins import str
+from timeit import default_timer as timer
+
+import rafcon.core.singleton
+from rafcon.core.execution.data_passing import DEEP_COPY, SHARE, READ_ONLY
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+PRODUCER_SCRIPT = """
+import numpy as np
+def execute(self, inputs, outputs, gvm):
+    outputs["data"] = np.ones({0}, dtype=np.uint8)
+    return 0
+"""
+
+FORWARD_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["data"] = inputs["data"]
+    return 0
+"""
+
+
+def create_data_passing_state_machine(number_child_states=10, payload_size=100 * 1024 ** 2):
+    """Creates a chain of states passing an ndarray of `payload_size` bytes from one state to the next one"""
+    hierarchy = HierarchyState("hierarchy", state_id="ROOT")
+    hierarchy.add_output_data_port("data", "numpy.ndarray", data_port_id=1)
+
+    producer = ExecutionState("producer", state_id="PRODUCER")
+    producer.add_output_data_port("data", "numpy.ndarray", data_port_id=1)
+    producer.script_text = PRODUCER_SCRIPT.format(payload_size)
+    hierarchy.add_state(producer)
+    hierarchy.set_start_state(producer.state_id)
+
+    last_state = producer
+    for i in range(number_child_states):
+        state = ExecutionState("state" + str(i))
+        state.add_input_data_port("data", "numpy.ndarray", data_port_id=1)
+        state.add_output_data_port("data", "numpy.ndarray", data_port_id=2)
+        state.script_text = FORWARD_SCRIPT
+        hierarchy.add_state(state)
+        hierarchy.add_transition(last_state.state_id, 0, state.state_id, None)
+        hierarchy.add_data_flow(last_state.state_id, 1 if last_state is producer else 2, state.state_id, 1)
+        last_state = state
+
+    hierarchy.add_transition(last_state.state_id, 0, hierarchy.state_id, 0)
+    hierarchy.add_data_flow(last_state.state_id, 2, hierarchy.state_id, 1)
+    return StateMachine(hierarchy)
+
+
+def measure_data_passing(policy, number_child_states=10, payload_size=100 * 1024 ** 2):
+    """Executes the data passing state machine with the given policy for ndarrays and returns the duration"""
+    testing_utils.initialize_environment_core({"DATA_PASSING_POLICIES": {"numpy.ndarray": policy}})
+    try:
+        state_machine = create_data_passing_state_machine(number_child_states, payload_size)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        start = timer()
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        duration = timer() - start
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    logger.info("Data passing policy '{0}': {1} states, payload {2} MB, duration: {3:.3}s".format(
+        policy, number_child_states, payload_size // 1024 ** 2, duration))
+    return duration
+
+
+def test_data_passing_policies(number_child_states=10, payload_size=100 * 1024 ** 2):
+    durations = {}
+    for policy in [DEEP_COPY, READ_ONLY, SHARE]:
+        durations[policy] = measure_data_passing(policy, number_child_states, payload_size)
+    return durations
+
+
+if __name__ == '__main__':
+    test_data_passing_policies(10, 50 * 1024 ** 2)
+    test_data_passing_policies(10, 200 * 1024 ** 2)
@@ -0,0 +1,59 @@
+# core elements
+from builtins import range
+import threading
+from timeit import default_timer as timer
+
+import numpy as np
+
+from rafcon.core.global_variable_manager import GlobalVariableManager
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+def measure_concurrent_access(number_threads=30, number_operations=1000, payload_size=100 * 1024, newer_only=False):
+    """Lets `number_threads` threads exchange data through global variables and returns the duration
+
+    Each thread writes its own variable and reads the variable of its neighbour. The payload is a numpy array of
+    `payload_size` bytes, which is updated by every tenth operation.
+
+    :param bool newer_only: if True, the readers use `get_if_newer` instead of `get_variable`
+    """
+    gvm = GlobalVariableManager()
+    for i in range(number_threads):
+        gvm.set_variable("sensor{}".format(i), np.zeros(payload_size, dtype=np.uint8))
+
+    def exchange(index):
+        own_key = "sensor{}".format(index)
+        neighbour_key = "sensor{}".format((index + 1) % number_threads)
+        version = 0
+        for i in range(number_operations):
+            if i % 10 == 0:
+                gvm.set_variable(own_key, np.full(payload_size, i % 256, dtype=np.uint8))
+            if newer_only:
+                newer, value, version = gvm.get_if_newer(neighbour_key, version)
+            else:
+                value = gvm.get_variable(neighbour_key)
+
+    threads = [threading.Thread(target=exchange, args=(i,)) for i in range(number_threads)]
+    start = timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = timer() - start
+    logger.info("{0} threads with {1} operations each using {2}: duration: {3:.3}s".format(
+        number_threads, number_operations, "get_if_newer" if newer_only else "get_variable", duration))
+    return duration
+
+
+def test_gvm_concurrent_access(number_threads=30, number_operations=1000):
+    durations = {}
+    for newer_only in [False, True]:
+        durations[newer_only] = measure_concurrent_access(number_threads, number_operations, newer_only=newer_only)
+    return durations
+
+
+if __name__ == '__main__':
+    test_gvm_concurrent_access(30, 1000)
+    test_gvm_concurrent_access(30, 5000)
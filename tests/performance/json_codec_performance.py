@@ -0,0 +1,111 @@
+# core elements
+import json
+import os
+from timeit import default_timer as timer
+
+from jsonconversion.decoder import JSONObjectDecoder
+from jsonconversion.encoder import JSONObjectEncoder
+
+from rafcon.core.storage import storage
+from rafcon.utils import log
+from rafcon.utils import storage_utils
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+LIBRARIES = {
+    "generic": os.path.join(testing_utils.LIBRARY_SM_PATH, "generic"),
+    "ros": os.path.join(testing_utils.EXAMPLES_PATH, "libraries", "ros_libraries"),
+    "turtle_libraries": os.path.join(testing_utils.EXAMPLES_PATH, "libraries", "turtle_libraries"),
+    "tutorials": testing_utils.TUTORIAL_PATH,
+}
+
+
+def get_example_state_machine_paths():
+    return sorted(directory for directory, _, file_names in os.walk(testing_utils.EXAMPLES_PATH)
+                  if storage.STATEMACHINE_FILE in file_names)
+
+
+def get_json_strings(path):
+    json_strings = []
+    for directory, _, file_names in os.walk(path):
+        for file_name in (storage.FILE_NAME_CORE_DATA, storage.FILE_NAME_META_DATA):
+            if file_name in file_names:
+                with open(os.path.join(directory, file_name)) as file_pointer:
+                    json_strings.append(file_pointer.read())
+    return json_strings
+
+
+def legacy_decode(json_string):
+    return json.loads(json_string, cls=JSONObjectDecoder, substitute_modules=storage_utils.substitute_modules)
+
+
+def legacy_encode(objects):
+    return json.dumps(objects, cls=JSONObjectEncoder, indent=4, separators=(', ', ': '), builtins_str="__builtin__",
+                      sort_keys=True, check_circular=False)
+
+
+def measure(function, arguments, repetitions):
+    start = timer()
+    for _ in range(repetitions):
+        for argument in arguments:
+            function(argument)
+    return timer() - start
+
+
+def test_json_codec(repetitions=10):
+    """Compares the jsonconversion codec with the codec of storage_utils on the json files of the examples"""
+    testing_utils.initialize_environment_core(libraries=dict(LIBRARIES))
+    try:
+        json_strings = []
+        for path in get_example_state_machine_paths():
+            json_strings.extend(get_json_strings(path))
+        objects = [storage_utils.load_objects_from_json_string(json_string) for json_string in json_strings]
+        assert [legacy_encode(obj) for obj in objects] == \
+            [storage_utils.dump_objects_to_json_string(obj) for obj in objects]
+
+        durations = {
+            "legacy decode": measure(legacy_decode, json_strings, repetitions),
+            "decode": measure(storage_utils.load_objects_from_json_string, json_strings, repetitions),
+            "legacy encode": measure(legacy_encode, objects, repetitions),
+            "encode": measure(storage_utils.dump_objects_to_json_string, objects, repetitions),
+            "compact encode": measure(lambda obj: storage_utils.dump_objects_to_json_string(obj, compact=True),
+                                      objects, repetitions),
+        }
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    for name, duration in durations.items():
+        logger.info("{0} of {1} json files: {2:.3}s".format(name, len(json_strings) * repetitions, duration))
+    return durations
+
+
+def test_load_and_save_examples(repetitions=5):
+    """Loads and saves all example state machines, normally and as compact copy"""
+    testing_utils.initialize_environment_core(libraries=dict(LIBRARIES))
+    try:
+        paths = get_example_state_machine_paths()
+        target_path = testing_utils.get_unique_temp_path()
+        durations = dict.fromkeys(["load", "save", "compact save"], 0.)
+        for _ in range(repetitions):
+            for i, path in enumerate(paths):
+                start = timer()
+                state_machine = storage.load_state_machine_from_path(path)
+                durations["load"] += timer() - start
+                start = timer()
+                storage.save_state_machine_to_path(state_machine, os.path.join(target_path, str(i)), as_copy=True)
+                durations["save"] += timer() - start
+                start = timer()
+                storage.save_state_machine_to_path(state_machine, os.path.join(target_path, "compact" + str(i)),
+                                                   as_copy=True, compact=True)
+                durations["compact save"] += timer() - start
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    for name, duration in durations.items():
+        logger.info("{0} of {1} example state machines: {2:.3}s".format(name, len(paths) * repetitions, duration))
+    return durations
+
+
+if __name__ == '__main__':
+    test_json_codec()
+    test_load_and_save_examples()
@@ -0,0 +1,100 @@
+# core elements
+from builtins import range
+from builtins import str
+import os
+import tracemalloc
+from timeit import default_timer as timer
+
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.library_state import LibraryState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+LIBRARY_ROOT_KEY = "performance_libraries"
+
+
+def create_library(name, number_states):
+    """Creates a hierarchy state with a chain of `number_states` execution states"""
+    library_state = HierarchyState(name)
+    library_state.add_input_data_port("input", "int", 0)
+    library_state.add_output_data_port("output", "int")
+    previous_state = None
+    for i in range(number_states):
+        state = ExecutionState("State" + str(i))
+        state.add_input_data_port("input", "int", 0)
+        state.add_output_data_port("output", "int")
+        library_state.add_state(state)
+        if previous_state is None:
+            library_state.set_start_state(state.state_id)
+        else:
+            library_state.add_transition(previous_state.state_id, 0, state.state_id, None)
+        previous_state = state
+    library_state.add_transition(previous_state.state_id, 0, library_state.state_id, 0)
+    return library_state
+
+
+def create_library_state_machine(library_path, number_libraries, number_instances):
+    """Creates a state machine with `number_instances` library states of each of the `number_libraries` libraries"""
+    root_state = HierarchyState("Root", state_id="ROOT")
+    for i in range(number_libraries):
+        for j in range(number_instances):
+            library_state = LibraryState(LIBRARY_ROOT_KEY, "library" + str(i), "0.1", "instance{0}_{1}".format(i, j))
+            library_state.set_input_runtime_value(list(library_state.input_data_ports.keys())[0], j)
+            root_state.add_state(library_state)
+    return StateMachine(root_state)
+
+
+def measure_library_loading(number_libraries=40, number_instances=50, number_states=10):
+    """Loads a state machine with many instances of the same libraries
+
+    Returns the duration and the allocated memory of the loading and of creating the state copies of all library
+    states afterwards, which corresponds to the former eager copying of the library root states.
+    """
+    path = testing_utils.get_unique_temp_path()
+    library_path = os.path.join(path, "libraries")
+    testing_utils.initialize_environment_core(libraries={LIBRARY_ROOT_KEY: library_path})
+    try:
+        for i in range(number_libraries):
+            storage.save_state_machine_to_path(StateMachine(create_library("library" + str(i), number_states)),
+                                               os.path.join(library_path, "library" + str(i)))
+        rafcon.core.singleton.library_manager.initialize()
+        state_machine = create_library_state_machine(library_path, number_libraries, number_instances)
+        storage.save_state_machine_to_path(state_machine, os.path.join(path, "state_machine"))
+        state_machine.root_state.destroy(recursive=True)
+        rafcon.core.singleton.library_manager.clean_loaded_libraries()
+
+        tracemalloc.start()
+        start = timer()
+        state_machine = storage.load_state_machine_from_path(os.path.join(path, "state_machine"))
+        load_duration = timer() - start
+        load_memory = tracemalloc.get_traced_memory()[0]
+
+        start = timer()
+        for library_state in state_machine.root_state.states.values():
+            assert library_state.state_copy.parent is library_state
+        copy_duration = timer() - start
+        copy_memory = tracemalloc.get_traced_memory()[0] - load_memory
+        tracemalloc.stop()
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    logger.info("{0} instances of {1} libraries with {2} states: load {3:.3}s, {4:.1f} MB, "
+                "creating all state copies: {5:.3}s, {6:.1f} MB".format(
+                    number_instances, number_libraries, number_states, load_duration, load_memory / 1e6,
+                    copy_duration, copy_memory / 1e6))
+    return load_duration, load_memory, copy_duration, copy_memory
+
+
+def test_library_loading(number_libraries=40, number_instances=50, number_states=10):
+    return measure_library_loading(number_libraries, number_instances, number_states)
+
+
+if __name__ == '__main__':
+    test_library_loading(40, 5)
+    test_library_loading(40, 50)
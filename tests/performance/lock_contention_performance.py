@@ -0,0 +1,132 @@
+# core elements
+from builtins import range
+from builtins import str
+import threading
+import time
+from timeit import default_timer as timer
+
+import rafcon.core.singleton
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+COUNTER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["counter"] = inputs["counter"] + 1
+    return "loop" if outputs["counter"] < {0} else "done"
+"""
+
+
+def create_branch(state_id, number_iterations):
+    """Creates a hierarchy state looping over a counter state, which updates the scoped data in each iteration"""
+    loop_state = HierarchyState("Loop " + state_id, state_id=state_id)
+    loop_state.add_output_data_port("counter", "int", data_port_id=1)
+    loop_state.add_scoped_variable("counter", "int", 0, scoped_variable_id=2)
+
+    counter_state = ExecutionState("Counter", state_id=state_id + "COUNTER")
+    counter_state.add_input_data_port("counter", "int", 0, data_port_id=1)
+    counter_state.add_output_data_port("counter", "int", 0, data_port_id=2)
+    counter_state.add_outcome("loop", 1)
+    counter_state.add_outcome("done", 2)
+    counter_state.script_text = COUNTER_SCRIPT.format(number_iterations)
+
+    loop_state.add_state(counter_state)
+    loop_state.set_start_state(counter_state.state_id)
+    loop_state.add_transition(counter_state.state_id, 1, counter_state.state_id, None)
+    loop_state.add_transition(counter_state.state_id, 2, loop_state.state_id, 0)
+    loop_state.add_data_flow(loop_state.state_id, 2, counter_state.state_id, 1)
+    loop_state.add_data_flow(counter_state.state_id, 2, loop_state.state_id, 2)
+    loop_state.add_data_flow(counter_state.state_id, 2, loop_state.state_id, 1)
+    return loop_state
+
+
+def create_contention_state_machine(number_branches=32, number_iterations=100):
+    """Creates a barrier concurrency state with `number_branches` branches updating their scoped data concurrently"""
+    root_state = BarrierConcurrencyState("Root", state_id="ROOT")
+    for i in range(number_branches):
+        branch = create_branch("BRANCH" + str(i), number_iterations)
+        root_state.add_state(branch)
+        root_state.add_output_data_port(branch.state_id, "int", data_port_id=None)
+    for data_port_id, data_port in root_state.output_data_ports.items():
+        root_state.add_data_flow(data_port.name, 1, root_state.state_id, data_port_id)
+    root_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def measure_lock_contention(number_branches=32, number_iterations=100, concurrent_editing=False):
+    """Executes the contention state machine and returns the duration
+
+    :param bool concurrent_editing: if True, another thread repeatedly holds the modification lock of the state
+        machine during the execution, as e.g. the GUI does while the state machine is edited
+    """
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_contention_state_machine(number_branches, number_iterations)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        editing_finished = threading.Event()
+
+        def edit():
+            while not editing_finished.is_set():
+                with state_machine.modification_lock():
+                    time.sleep(0.001)
+
+        editor = threading.Thread(target=edit)
+        if concurrent_editing:
+            editor.start()
+        start = timer()
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        duration = timer() - start
+        editing_finished.set()
+        if concurrent_editing:
+            editor.join()
+
+        for output_value in state_machine.root_state.output_data.values():
+            assert output_value == number_iterations
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    logger.info("{0} branches with {1} scoped data updates each{2}: duration: {3:.3}s".format(
+        number_branches, number_iterations, " and concurrent editing" if concurrent_editing else "", duration))
+    return duration
+
+
+def measure_state_machine_lookup(number_lookups=100000):
+    """Measures the lookup of the state machine of a deeply nested state, as done by every locked method"""
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = HierarchyState("Root", state_id="ROOT")
+        state = root_state
+        for i in range(20):
+            child_state = HierarchyState("Level " + str(i))
+            state.add_state(child_state)
+            state = child_state
+        state_machine = StateMachine(root_state)
+        start = timer()
+        for _ in range(number_lookups):
+            assert state.get_state_machine() is state_machine
+        duration = timer() - start
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    logger.info("{0} state machine lookups at depth 20: duration: {1:.3}s".format(number_lookups, duration))
+    return duration
+
+
+def test_lock_contention(number_branches=32, number_iterations=100):
+    durations = {}
+    for concurrent_editing in [False, True]:
+        durations[concurrent_editing] = measure_lock_contention(number_branches, number_iterations, concurrent_editing)
+    measure_state_machine_lookup()
+    return durations
+
+
+if __name__ == '__main__':
+    test_lock_contention(32, 100)
+    test_lock_contention(32, 500)
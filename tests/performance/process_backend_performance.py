@@ -0,0 +1,67 @@
+# core elements
+from builtins import range
+from builtins import str
+from timeit import default_timer as timer
+
+import rafcon.core.singleton
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID, THREAD_BACKEND, PROCESS_BACKEND
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+CPU_BOUND_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    total = 0
+    for i in range({0}):
+        total += i % 7
+    outputs["total"] = total
+    return 0
+"""
+
+
+def create_cpu_bound_state_machine(execution_backend, number_branches=4, number_iterations=5 * 10 ** 6):
+    """Creates a barrier concurrency state with `number_branches` CPU bound pure Python branches"""
+    root_state = BarrierConcurrencyState("Root", state_id="ROOT")
+    for i in range(number_branches):
+        state = ExecutionState("Branch" + str(i), execution_backend=execution_backend)
+        state.add_output_data_port("total", "int", data_port_id=1)
+        state.script_text = CPU_BOUND_SCRIPT.format(number_iterations)
+        root_state.add_state(state)
+    root_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def measure_execution_backend(execution_backend, number_branches=4, number_iterations=5 * 10 ** 6):
+    """Executes the CPU bound state machine with the given execution backend and returns the duration"""
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_cpu_bound_state_machine(execution_backend, number_branches, number_iterations)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        start = timer()
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        duration = timer() - start
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    logger.info("Execution backend '{0}': {1} CPU bound branches, duration: {2:.3}s".format(
+        execution_backend, number_branches, duration))
+    return duration
+
+
+def test_execution_backends(number_branches=4, number_iterations=5 * 10 ** 6):
+    durations = {}
+    for execution_backend in [THREAD_BACKEND, PROCESS_BACKEND]:
+        durations[execution_backend] = measure_execution_backend(execution_backend, number_branches,
+                                                                 number_iterations)
+    return durations
+
+
+if __name__ == '__main__':
+    test_execution_backends(4)
+    test_execution_backends(8)
@@ -0,0 +1,88 @@
+# core elements
+from builtins import range
+from builtins import str
+from timeit import default_timer as timer
+
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import log
+
+from tests import utils as testing_utils
+
+logger = log.get_logger(__name__)
+
+
+def create_state_machine(number_containers=100, number_states=20):
+    """Creates a state machine with `number_containers` hierarchy states with `number_states` execution states each"""
+    root_state = HierarchyState("Root", state_id="ROOT")
+    for i in range(number_containers):
+        container_state = HierarchyState("Container" + str(i))
+        for j in range(number_states):
+            state = ExecutionState("State" + str(j))
+            state.add_semantic_data([], j, "index")
+            container_state.add_state(state)
+        root_state.add_state(container_state)
+    return StateMachine(root_state)
+
+
+def measure_loading(path, number_of_threads, lazy):
+    """Loads the state machine stored at path and returns the duration"""
+    global_config.set_config_value("LOAD_SM_THREADS", number_of_threads)
+    try:
+        start = timer()
+        state_machine = storage.load_state_machine_from_path(path, lazy=lazy)
+        duration = timer() - start
+    finally:
+        global_config.set_config_value("LOAD_SM_THREADS", 8)
+    number_of_states = state_machine.root_state.get_states_statistics(0)[0]
+    logger.info("Loading {0} states with {1} thread(s){2}: {3:.3}s".format(
+        number_of_states, number_of_threads, ", lazy" if lazy else "", duration))
+    return duration
+
+
+def measure_saving(state_machine, path, description):
+    """Saves the state machine to path and returns the duration"""
+    start = timer()
+    storage.save_state_machine_to_path(state_machine, path)
+    duration = timer() - start
+    logger.info("{0} save: {1:.3}s".format(description, duration))
+    return duration
+
+
+def test_saving(number_containers=100, number_states=20):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_unique_temp_path()
+        state_machine = create_state_machine(number_containers, number_states)
+        durations = {"full": measure_saving(state_machine, path, "Full")}
+        state = list(list(state_machine.root_state.states.values())[0].states.values())[0]
+        state.add_semantic_data([], "changed", "index")
+        durations["incremental"] = measure_saving(state_machine, path, "Incremental")
+        state_machine = storage.load_state_machine_from_path(path)
+        durations["after load"] = measure_saving(state_machine, path, "Unchanged after load")
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    return durations
+
+
+def test_loading(number_containers=100, number_states=20):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(create_state_machine(number_containers, number_states), path)
+        durations = {}
+        for number_of_threads, lazy in [(1, False), (8, False), (8, True)]:
+            durations[(number_of_threads, lazy)] = measure_loading(path, number_of_threads, lazy)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    return durations
+
+
+if __name__ == '__main__':
+    test_loading(100, 20)
+    test_loading(400, 20)
+    test_saving(100, 20)
+    test_saving(400, 20)